@@ -0,0 +1,17 @@
+"""Embedded analytical engine (DuckDB over Arrow) for local post-processing."""
+
+from src.analytics.engine import (
+    AnalyticsEngine,
+    AnalyticsUnavailableError,
+    is_available,
+    result_to_arrow,
+    table_name_for,
+)
+
+__all__ = [
+    "AnalyticsEngine",
+    "AnalyticsUnavailableError",
+    "is_available",
+    "result_to_arrow",
+    "table_name_for",
+]
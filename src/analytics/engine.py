@@ -0,0 +1,230 @@
+"""
+DuckDB analytical engine for local post-processing of KPI results.
+
+KPI rows are converted to Arrow tables and registered in an embedded DuckDB
+database, so reshaping, pivots and joins between KPI results run as vectorized
+SQL locally instead of Python loops over dicts. Raw extracts saved as Parquet
+or CSV can be registered too and queried repeatedly without touching
+PostgreSQL.
+
+DuckDB and PyArrow are optional dependencies:
+
+    pip install "product-kpis[analytics]"
+"""
+
+import importlib
+import importlib.util
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.models.result import KPIResult
+
+
+class AnalyticsUnavailableError(Exception):
+    """Raised when DuckDB or PyArrow is not installed."""
+
+    pass
+
+
+def is_available() -> bool:
+    """Return True if DuckDB and PyArrow can be imported."""
+    return all(
+        importlib.util.find_spec(module) is not None for module in ("duckdb", "pyarrow")
+    )
+
+
+def _require(module_name: str) -> Any:
+    """Import an optional dependency or raise AnalyticsUnavailableError."""
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as e:
+        raise AnalyticsUnavailableError(
+            f"{module_name} is not installed. "
+            'Install the analytics extra: pip install "product-kpis[analytics]"'
+        ) from e
+
+
+def table_name_for(kpi_name: str) -> str:
+    """
+    Derive a SQL-safe table name from a KPI name.
+
+    Example:
+        >>> table_name_for("First Time Right (Exports)")
+        'first_time_right_exports'
+    """
+    name = re.sub(r"[^0-9a-zA-Z]+", "_", kpi_name).strip("_").lower()
+    if not name or name[0].isdigit():
+        name = f"kpi_{name}"
+    return name
+
+
+def result_to_arrow(result: KPIResult) -> Any:
+    """
+    Convert a KPIResult into a pyarrow.Table (one column per result column).
+
+    Args:
+        result: The KPI result to convert
+
+    Returns:
+        pyarrow.Table with the result's columns in order.
+    """
+    pa = _require("pyarrow")
+    return pa.table({
+        column: [row.get(column) for row in result.rows] for column in result.columns
+    })
+
+
+class AnalyticsEngine:
+    """
+    Embedded DuckDB database holding KPI results and raw extracts as tables.
+
+    Example:
+        >>> with AnalyticsEngine() as analytics:
+        ...     analytics.register_results(report.results)
+        ...     columns, rows = analytics.query(
+        ...         "SELECT action_type, failed_exports FROM first_time_right_exports "
+        ...         "ORDER BY failed_exports DESC"
+        ...     )
+    """
+
+    def __init__(self, database: str | Path = ":memory:"):
+        """
+        Open (or create) a DuckDB database.
+
+        Args:
+            database: Path to a DuckDB file, or ":memory:" for a throwaway database.
+        """
+        duckdb = _require("duckdb")
+        _require("pyarrow")
+        self._conn = duckdb.connect(str(database))
+        # Keep Arrow tables alive for as long as DuckDB views reference them
+        self._arrow_tables: Dict[str, Any] = {}
+
+    @property
+    def connection(self) -> Any:
+        """The underlying DuckDB connection."""
+        return self._conn
+
+    def register_result(self, result: KPIResult, name: Optional[str] = None) -> str:
+        """
+        Register a KPI result as a queryable table.
+
+        Args:
+            result: The KPI result to register
+            name: Table name (defaults to a name derived from result.kpi_name)
+
+        Returns:
+            The table name the result was registered under.
+        """
+        table_name = name or table_name_for(result.kpi_name)
+        arrow_table = result_to_arrow(result)
+        self._conn.register(table_name, arrow_table)
+        self._arrow_tables[table_name] = arrow_table
+        return table_name
+
+    def register_results(self, results: Iterable[KPIResult]) -> List[str]:
+        """
+        Register every successful KPI result, skipping failed ones.
+
+        Returns:
+            Table names in registration order.
+        """
+        return [self.register_result(r) for r in results if r.success]
+
+    def register_extract(self, name: str, path: str | Path) -> str:
+        """
+        Register a Parquet or CSV extract on disk as a view.
+
+        The file is scanned lazily by DuckDB each time the view is queried.
+
+        Args:
+            name: View name to create
+            path: Path to a .parquet or .csv file
+
+        Returns:
+            The view name.
+
+        Raises:
+            ValueError: If the file extension is not supported.
+        """
+        path = Path(path)
+        readers = {".parquet": "read_parquet", ".csv": "read_csv_auto"}
+        reader = readers.get(path.suffix.lower())
+        if reader is None:
+            raise ValueError(f"Unsupported extract format: {path.suffix}")
+
+        table_name = table_name_for(name)
+        literal = str(path).replace("'", "''")
+        self._conn.execute(
+            f"CREATE OR REPLACE VIEW {table_name} AS SELECT * FROM {reader}('{literal}')"
+        )
+        return table_name
+
+    def tables(self) -> List[str]:
+        """Return the names of all tables and views currently registered."""
+        rows = self._conn.execute("SHOW TABLES").fetchall()
+        return sorted(row[0] for row in rows)
+
+    def query(
+        self, sql: str, params: Optional[Sequence[Any]] = None
+    ) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """
+        Run a SQL query and return (columns, rows) in KPIResult shape.
+
+        Args:
+            sql: DuckDB SQL, may reference registered results and extracts
+            params: Positional parameters for "?" placeholders
+        """
+        cursor = self._conn.execute(sql, list(params or []))
+        columns = [d[0] for d in cursor.description]
+        rows = [dict(zip(columns, values)) for values in cursor.fetchall()]
+        return columns, rows
+
+    def query_arrow(self, sql: str, params: Optional[Sequence[Any]] = None) -> Any:
+        """Run a SQL query and return the result as a pyarrow.Table."""
+        return self._conn.execute(sql, list(params or [])).fetch_arrow_table()
+
+    def to_result(
+        self,
+        kpi_name: str,
+        sql: str,
+        params: Optional[Sequence[Any]] = None,
+        parameters: Optional[Dict[str, Any]] = None,
+    ) -> KPIResult:
+        """
+        Run a post-processing query and wrap its output in a KPIResult.
+
+        Errors are captured in KPIResult.error, matching BaseKPI.execute.
+        """
+        start_time = datetime.now()
+        try:
+            columns, rows = self.query(sql, params)
+            return KPIResult(
+                kpi_name=kpi_name,
+                columns=columns,
+                rows=rows,
+                duration_seconds=(datetime.now() - start_time).total_seconds(),
+                parameters=parameters or {},
+            )
+        except Exception as e:
+            return KPIResult(
+                kpi_name=kpi_name,
+                columns=[],
+                rows=[],
+                duration_seconds=(datetime.now() - start_time).total_seconds(),
+                parameters=parameters or {},
+                error=str(e),
+            )
+
+    def close(self) -> None:
+        """Close the DuckDB connection."""
+        self._conn.close()
+        self._arrow_tables.clear()
+
+    def __enter__(self) -> "AnalyticsEngine":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
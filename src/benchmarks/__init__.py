@@ -0,0 +1 @@
+"""Benchmarks of the tool itself (start-up time)."""
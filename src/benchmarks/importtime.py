@@ -0,0 +1,217 @@
+"""
+Start-up import time benchmark for the CLI entry path.
+
+Runs `python -X importtime -c "import src.main, src.menu.console"` in fresh
+interpreters (everything the process imports before the menu renders), parses
+the per-module timings Python writes to stderr and fails when the package's
+import time exceeds a threshold or a heavy dependency is imported eagerly.
+
+    python -m src.benchmarks.importtime                  # check, 150 ms threshold
+    python -m src.benchmarks.importtime --threshold-ms 100 --runs 10
+    python -m src.benchmarks.importtime --record         # append to the history
+
+--record appends each measurement to IMPORT_TIME_HISTORY, so start-up latency
+can be tracked over time; the change against the previous record is printed.
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+# What `python -m src.main` imports before the menu renders
+ENTRY_MODULES = ("src.main", "src.menu.console")
+
+# Dependencies that must only be imported once a KPI, export or setting needs them
+HEAVY_MODULES = ("sqlalchemy", "keyring", "psycopg2", "duckdb", "pyarrow")
+
+DEFAULT_THRESHOLD_MS = 150.0
+DEFAULT_RUNS = 5
+IMPORT_TIME_HISTORY = Path("history") / "import_time.jsonl"
+
+# import time:       self [us] |  cumulative | imported package
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+@dataclass
+class ImportTiming:
+    """One line of -X importtime output."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportReport:
+    """Import timings of the entry path, as the median over several runs."""
+
+    total_ms: float
+    runs_ms: List[float]
+    slowest: List[ImportTiming] = field(default_factory=list)
+    heavy_modules: List[str] = field(default_factory=list)
+
+    def failures(self, threshold_ms: float) -> List[str]:
+        """Return why the report fails the benchmark, if it does."""
+        failures = []
+        if self.total_ms > threshold_ms:
+            failures.append(f"import time {self.total_ms:.1f} ms exceeds {threshold_ms:g} ms")
+        if self.heavy_modules:
+            failures.append(f"heavy modules imported at start-up: {', '.join(self.heavy_modules)}")
+        return failures
+
+
+def parse_importtime(stderr: str) -> List[ImportTiming]:
+    """
+    Parse the stderr of `python -X importtime`.
+
+    Nesting is encoded as two spaces of indentation per level before the
+    module name; lines that are not import timings are ignored.
+    """
+    timings = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            timings.append(
+                ImportTiming(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2)
+            )
+    return timings
+
+
+def _in_package(module: str, package: str) -> bool:
+    """Return True if `module` is `package` or one of its submodules."""
+    return module == package or module.startswith(package + ".")
+
+
+def package_imports(timings: Sequence[ImportTiming], package: str = "src") -> List[ImportTiming]:
+    """
+    Return the top-level imports of `package` and everything they imported.
+
+    -X importtime prints a module after the modules it imports, so the lines
+    since the previous top-level import belong to a top-level import.
+    """
+    selected: List[ImportTiming] = []
+    pending: List[ImportTiming] = []
+    for timing in timings:
+        pending.append(timing)
+        if timing.depth == 0:
+            if _in_package(timing.module, package):
+                selected.extend(pending)
+            pending = []
+    return selected
+
+
+def package_time_us(timings: Sequence[ImportTiming], package: str = "src") -> int:
+    """Sum the cumulative time of top-level imports of `package` (and what they import)."""
+    return sum(t.cumulative_us for t in package_imports(timings, package) if t.depth == 0)
+
+
+def imported_heavy_modules(timings: Sequence[ImportTiming]) -> List[str]:
+    """Return the HEAVY_MODULES that were imported by the package."""
+    imported = {t.module.split(".")[0] for t in package_imports(timings)}
+    return [name for name in HEAVY_MODULES if name in imported]
+
+
+def run_importtime(modules: Sequence[str] = ENTRY_MODULES) -> List[ImportTiming]:
+    """Import `modules` in a fresh interpreter and return its import timings."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(completed.stderr)
+
+
+def measure(modules: Sequence[str] = ENTRY_MODULES, runs: int = DEFAULT_RUNS) -> ImportReport:
+    """
+    Measure the import time of `modules` over `runs` fresh interpreters.
+
+    One warm-up run comes first, so compiling .pyc files is not measured.
+
+    Returns:
+        ImportReport with the median total and the slowest modules of the
+        median run.
+    """
+    run_importtime(modules)
+    measured = [run_importtime(modules) for _ in range(max(1, runs))]
+    measured.sort(key=package_time_us)
+    median = measured[len(measured) // 2]
+    slowest = sorted(package_imports(median), key=lambda t: t.self_us, reverse=True)
+    return ImportReport(
+        total_ms=package_time_us(median) / 1000,
+        runs_ms=[package_time_us(timings) / 1000 for timings in measured],
+        slowest=slowest[:10],
+        heavy_modules=imported_heavy_modules(median),
+    )
+
+
+def record(report: ImportReport, path: Path = IMPORT_TIME_HISTORY) -> Optional[float]:
+    """
+    Append a measurement to the history file.
+
+    Returns:
+        The previous record's total in ms, or None if this is the first.
+    """
+    previous = None
+    if path.exists():
+        lines = path.read_text().splitlines()
+        if lines:
+            previous = json.loads(lines[-1])["total_ms"]
+
+    entry: Dict[str, object] = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "total_ms": round(report.total_ms, 2),
+        "runs_ms": [round(ms, 2) for ms in report.runs_ms],
+        "heavy_modules": report.heavy_modules,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+    return previous
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark; exit status 1 if it fails."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.benchmarks.importtime",
+        description="Check the start-up import time of the CLI entry path",
+    )
+    parser.add_argument("--threshold-ms", type=float, default=DEFAULT_THRESHOLD_MS)
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument(
+        "--record", action="store_true", help=f"Append the result to {IMPORT_TIME_HISTORY}"
+    )
+    args = parser.parse_args(argv)
+
+    report = measure(runs=args.runs)
+    print(f"Import time of {', '.join(ENTRY_MODULES)}: {report.total_ms:.1f} ms (median)")
+    print(f"Runs: {', '.join(f'{ms:.1f}' for ms in report.runs_ms)} ms")
+    print("Slowest imports (self time):")
+    for timing in report.slowest:
+        print(f"  {timing.self_us / 1000:7.1f} ms  {timing.module}")
+
+    if args.record:
+        previous = record(report)
+        if previous is not None:
+            print(f"Change since last record: {report.total_ms - previous:+.1f} ms")
+
+    failures = report.failures(args.threshold_ms)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,21 @@
+"""Dev mode query result caching."""
+
+from src.cache.query_cache import (
+    CACHE_DIR,
+    canonical_params,
+    clear_cache,
+    load_from_cache,
+    make_query_id,
+    save_to_cache,
+)
+from src.cache.range_cache import execute_with_range_cache
+
+__all__ = [
+    "CACHE_DIR",
+    "canonical_params",
+    "clear_cache",
+    "execute_with_range_cache",
+    "load_from_cache",
+    "make_query_id",
+    "save_to_cache",
+]
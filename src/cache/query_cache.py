@@ -0,0 +1,116 @@
+"""
+File-system JSON cache for dev mode query results.
+
+Entries are stored under cache/{shop_id}/queries/{sha256}.json, keyed by a hash
+of the query identifier. The cache never expires; clear it from the Settings
+menu when fresh data is needed.
+"""
+
+import hashlib
+import json
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+CACHE_DIR = Path("cache")
+
+
+def canonical_params(params: Dict[str, Any]) -> str:
+    """Serialize parameters deterministically (sorted keys, dates as ISO strings)."""
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def make_query_id(query_name: str, params: Dict[str, Any]) -> str:
+    """Build the cache identifier for a query name and its parameters."""
+    return f"{query_name}:{canonical_params(params)}"
+
+
+def _cache_key(query_id: str) -> str:
+    """Return the SHA256 cache key for a query identifier."""
+    return hashlib.sha256(query_id.encode("utf-8")).hexdigest()
+
+
+def _cache_path(query_id: str, params: Dict[str, Any]) -> Path:
+    """Return the cache file path for a query, organized by shop_id."""
+    shop_id = params.get("shop_id") or "all"
+    return CACHE_DIR / str(shop_id) / "queries" / f"{_cache_key(query_id)}.json"
+
+
+def load_from_cache(
+    query_name: str, query_id: str, params: Dict[str, Any]
+) -> Optional[Tuple[List[str], List[Dict[str, Any]], Dict[str, Any]]]:
+    """
+    Load cached query results.
+
+    Args:
+        query_name: Descriptive name for the query (e.g. the KPI name)
+        query_id: Deterministic identifier of the query and its parameters
+        params: Query parameters (shop_id is used to organize the cache)
+
+    Returns:
+        Tuple of (columns, rows, metadata), or None if not cached.
+    """
+    path = _cache_path(query_id, params)
+    if not path.exists():
+        return None
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    return entry["columns"], entry["data"], entry.get("metadata", {})
+
+
+def save_to_cache(
+    query_name: str,
+    query_id: str,
+    params: Dict[str, Any],
+    columns: List[str],
+    rows: List[Dict[str, Any]],
+    duration_seconds: float,
+) -> None:
+    """
+    Save query results to the cache.
+
+    Args:
+        query_name: Descriptive name for the query (e.g. the KPI name)
+        query_id: Deterministic identifier of the query and its parameters
+        params: Query parameters
+        columns: Result column names
+        rows: Result rows
+        duration_seconds: How long the live query took
+    """
+    path = _cache_path(query_id, params)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    entry = {
+        "cache_key": _cache_key(query_id),
+        "query_name": query_name,
+        "shop_id": params.get("shop_id"),
+        "created_at": datetime.now().isoformat(),
+        "columns": columns,
+        "data": rows,
+        "metadata": {
+            "params": params,
+            "duration_seconds": duration_seconds,
+        },
+    }
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(entry, f, default=str)
+
+
+def clear_cache() -> bool:
+    """
+    Remove all cached data.
+
+    Returns:
+        True if a cache directory existed and was removed.
+    """
+    if not CACHE_DIR.exists():
+        return False
+    shutil.rmtree(CACHE_DIR)
+    return True
@@ -0,0 +1,148 @@
+"""
+Range-aware dev mode cache for KPIs that return one row per day.
+
+Results of KPIs with a `bucket_column` are stored per day and per parameter
+dimension (all parameters except start_date/end_date), under
+cache/ranges/{kpi}/{dimension hash}/{YYYY-MM-DD}.json. A requested range is
+assembled from cached days, and the KPI is executed only for the contiguous
+gaps. Days from today (UTC) onwards are still open and are never cached.
+"""
+
+import hashlib
+import json
+import re
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.cache import query_cache
+from src.models.result import KPIResult
+
+RANGE_PARAMS = ("start_date", "end_date")
+
+
+def _bucket_dir(kpi_name: str, params: Dict[str, Any]) -> Path:
+    """Return the cache directory for a KPI and its non-range parameters."""
+    dimensions = {k: v for k, v in params.items() if k not in RANGE_PARAMS}
+    dimension_key = hashlib.sha256(
+        query_cache.make_query_id(kpi_name, dimensions).encode("utf-8")
+    ).hexdigest()[:16]
+    safe_name = re.sub(r"[^0-9a-zA-Z]+", "_", kpi_name).strip("_").lower()
+    return query_cache.CACHE_DIR / "ranges" / safe_name / dimension_key
+
+
+def _bucket_value(value: Any) -> str:
+    """Normalize a bucket column value to a YYYY-MM-DD string."""
+    if hasattr(value, "isoformat"):
+        value = value.isoformat()
+    return str(value)[:10]
+
+
+def find_gaps(missing_days: List[date]) -> List[Tuple[date, date]]:
+    """
+    Collapse sorted missing days into contiguous (start, end) ranges.
+
+    Example:
+        >>> find_gaps([date(2026, 1, 1), date(2026, 1, 2), date(2026, 1, 5)])
+        [(date(2026, 1, 1), date(2026, 1, 2)), (date(2026, 1, 5), date(2026, 1, 5))]
+    """
+    gaps: List[Tuple[date, date]] = []
+    for day in missing_days:
+        if gaps and gaps[-1][1] + timedelta(days=1) == day:
+            gaps[-1] = (gaps[-1][0], day)
+        else:
+            gaps.append((day, day))
+    return gaps
+
+
+def _load_bucket(path: Path) -> Optional[Tuple[List[str], List[Dict[str, Any]]]]:
+    """Load a cached day, or None if missing or unreadable."""
+    if not path.exists():
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    return entry["columns"], entry["rows"]
+
+
+def _save_bucket(path: Path, columns: List[str], rows: List[Dict[str, Any]]) -> None:
+    """Store the rows of one completed day."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"columns": columns, "rows": rows}, f, default=str)
+
+
+def execute_with_range_cache(
+    kpi: Any,
+    engine: Any,
+    params: Dict[str, Any],
+    today: Optional[date] = None,
+    execute: Optional[Callable[[Dict[str, Any]], KPIResult]] = None,
+) -> KPIResult:
+    """
+    Execute a bucketed KPI, reusing cached days and querying only the gaps.
+
+    Args:
+        kpi: KPI instance with bucket_column set
+        engine: SQLAlchemy engine passed to kpi.execute for the gaps
+        params: KPI parameters (start_date/end_date select the range)
+        today: Override for the current UTC date (for testing)
+        execute: Runs the KPI for the given params (default: kpi.execute on
+            engine); only called when a query is needed
+
+    Returns:
+        KPIResult for the full range. from_cache is True only if no query ran.
+    """
+    start_time = datetime.now()
+    today = today or datetime.now(timezone.utc).date()
+    run_query = execute or (lambda query_params: kpi.execute(engine, query_params))
+    start_date, end_date = kpi.resolve_date_range(params)
+
+    if start_date > end_date:
+        # Let the KPI produce its own validation error
+        return run_query(params)
+
+    bucket_dir = _bucket_dir(kpi.name, params)
+    days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+
+    rows_by_day: Dict[date, List[Dict[str, Any]]] = {}
+    columns: List[str] = []
+    for day in days:
+        if day >= today:
+            continue
+        cached = _load_bucket(bucket_dir / f"{day.isoformat()}.json")
+        if cached is not None:
+            columns, rows_by_day[day] = cached
+
+    missing = [day for day in days if day not in rows_by_day]
+    for gap_start, gap_end in find_gaps(missing):
+        gap_params = {**params, "start_date": gap_start, "end_date": gap_end}
+        gap_result = run_query(gap_params)
+        if not gap_result.success:
+            gap_result.parameters = params
+            return gap_result
+
+        columns = gap_result.columns
+        gap_rows: Dict[str, List[Dict[str, Any]]] = {}
+        for row in gap_result.rows:
+            gap_rows.setdefault(_bucket_value(row.get(kpi.bucket_column)), []).append(row)
+
+        day = gap_start
+        while day <= gap_end:
+            day_rows = gap_rows.get(day.isoformat(), [])
+            rows_by_day[day] = day_rows
+            if day < today:
+                _save_bucket(bucket_dir / f"{day.isoformat()}.json", columns, day_rows)
+            day += timedelta(days=1)
+
+    rows = [row for day in days for row in rows_by_day[day]]
+    return KPIResult(
+        kpi_name=kpi.name,
+        columns=columns,
+        rows=rows,
+        duration_seconds=(datetime.now() - start_time).total_seconds(),
+        parameters=params,
+        from_cache=not missing,
+    )
@@ -0,0 +1,83 @@
+"""
+Per-day cache of quantile sketches.
+
+Sketch KPIs store one file per completed day, database and parameter
+dimension under cache/sketches/{kpi}/{dimension hash}/{YYYY-MM-DD}.json.
+Because sketches merge, any date range is assembled from cached days and only
+uncached days are scanned. Days from today (UTC) onwards are still open and
+are never cached.
+
+Like the other caches, it is only used in dev mode: production always scans.
+The database is part of the key, so mirrors, connection profiles and read
+replicas never share sketches.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.cache import query_cache
+
+
+def database_key(engine: Any) -> str:
+    """
+    Identify the database an engine connects to (without credentials).
+
+    Returns:
+        "host:port/database" of the engine's URL.
+    """
+    url = engine.url
+    return f"{url.host or ''}:{url.port or ''}/{url.database or ''}"
+
+
+def sketch_dir(kpi_name: str, database: str, dimensions: Dict[str, Any]) -> Path:
+    """
+    Return the cache directory for a KPI, database and non-range parameters.
+
+    Args:
+        kpi_name: KPI name
+        database: Database the sketches were built from (see database_key)
+        dimensions: Parameters other than the date range, plus anything that
+            changes the sketch layout (e.g. its relative accuracy)
+    """
+    dimension_key = hashlib.sha256(
+        query_cache.make_query_id(kpi_name, {**dimensions, "database": database}).encode("utf-8")
+    ).hexdigest()[:16]
+    safe_name = re.sub(r"[^0-9a-zA-Z]+", "_", kpi_name).strip("_").lower()
+    return query_cache.CACHE_DIR / "sketches" / safe_name / dimension_key
+
+
+def load_day(directory: Path, day: date) -> Optional[Dict[str, Any]]:
+    """Load the cached sketches of one day, or None if missing or unreadable."""
+    path = directory / f"{day.isoformat()}.json"
+    if not path.exists():
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def save_day(directory: Path, day: date, sketches: Dict[str, Any]) -> None:
+    """
+    Store the serialized sketches of one completed day.
+
+    Each writer uses its own temporary file, so concurrent runs saving the
+    same day never interleave; the last rename wins.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{day.isoformat()}.json"
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{day.isoformat()}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(sketches, f)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
@@ -3,6 +3,7 @@
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
+from typing import List, Optional
 
 
 class ExportFormat(Enum):
@@ -18,11 +19,53 @@ class RuntimeConfig:
     In-memory configuration (not persisted between sessions).
 
     dev_mode resets to False on each launch per specification.
+    mirror_url points KPI execution at a local mirror (see src.database.mirror)
+    instead of the database URL stored in the keychain.
+    bulk_fetch streams large results of KPIs that define bulk_query() straight
+    to CSV exports with COPY.
+    max_workers is the number of KPIs Run All executes concurrently.
+    max_retries/retry_base_delay control retries of transient connection
+    failures (exponential backoff starting at retry_base_delay seconds).
+    warmup connects to the database in the background while the menu is idle;
+    prefetch_count is how many of the most frequently run KPIs it prefetches.
+    preview_sample_percent/preview_sample_method are the TABLESAMPLE settings
+    of fast preview runs (see src.kpis.sampling).
+    profiles are the connection profiles Run All fans out to concurrently
+    (see src.credentials.keychain); empty runs against the default database.
+    use_replica routes KPIs to the stored read replica while its replication
+    lag is within the KPI's tolerance (replica_max_lag seconds unless the KPI
+    sets max_replica_lag); see src.database.replica.
+    load_budget is the total cost weight of KPIs allowed to query the database
+    at once (see src.runner.governor); None admits everything.
+    event_sink is where execution events go: "console" (event_level and up),
+    "jsonl" (all events, to events.jsonl in the output directory) or "off"
+    (see src.events).
+    profiling writes cProfile/tracemalloc artifacts for every KPI execution
+    and export of a run (see src.runner.profiling).
+    telemetry_directory receives Prometheus textfile metrics and OTLP JSON
+    spans of every run (see src.telemetry); None records nothing.
     """
 
     dev_mode: bool = False
     export_format: ExportFormat = ExportFormat.CSV
     output_directory: Path = field(default_factory=lambda: Path("output"))
+    mirror_url: Optional[str] = None
+    bulk_fetch: bool = False
+    max_workers: int = 1
+    max_retries: int = 3
+    retry_base_delay: float = 1.0
+    warmup: bool = False
+    prefetch_count: int = 0
+    preview_sample_percent: float = 1.0
+    preview_sample_method: str = "SYSTEM"
+    profiles: List[str] = field(default_factory=list)
+    use_replica: bool = False
+    replica_max_lag: float = 300.0
+    load_budget: Optional[float] = None
+    event_sink: str = "console"
+    event_level: str = "info"
+    profiling: bool = False
+    telemetry_directory: Optional[Path] = None
 
     def __post_init__(self):
         """Ensure output directory exists."""
@@ -3,14 +3,26 @@ Store and retrieve the database URL in the system keychain (macOS Keychain).
 
 Use this so you don't have to enter the DB URL every time you run scripts
 that need a database connection.
+
+Besides the default URL, named connection profiles (one per region or
+environment) are stored under "db_url:<name>"; the keychain cannot list
+entries, so the profile names are kept as a JSON list under "profiles".
+An optional read replica URL is stored per database under "replica_url"
+(default) or "replica_url:<profile>".
 """
 
-from typing import Optional
+import json
+from typing import Dict, List, Optional
 
 import keyring
 
 SERVICE_NAME = "product_kpis"
 DB_URL_KEY = "db_url"
+PROFILES_KEY = "profiles"
+PROFILE_KEY_PREFIX = "db_url:"
+REPLICA_URL_KEY = "replica_url"
+# The profile backed by the stored default URL (DB_URL_KEY)
+DEFAULT_PROFILE = "default"
 
 
 class KeychainAccessError(Exception):
@@ -20,6 +32,8 @@ class KeychainAccessError(Exception):
 
 # In-memory cache to avoid repeated keychain access in the same process
 _db_url_cache: Optional[str] = None
+_profile_url_cache: Dict[str, str] = {}
+_replica_url_cache: Dict[str, Optional[str]] = {}
 
 
 def get_db_url() -> str:
@@ -114,3 +128,135 @@ def get_masked_url() -> str:
             return f"{prefix}://{user_part}@{host_part}"
 
     return url
+
+
+def list_profiles() -> List[str]:
+    """
+    Return the names of the stored connection profiles.
+
+    DEFAULT_PROFILE is listed first when a default database URL is stored.
+    """
+    raw = keyring.get_password(SERVICE_NAME, PROFILES_KEY)
+    names = json.loads(raw) if raw else []
+    if has_db_url():
+        names = [DEFAULT_PROFILE] + [n for n in names if n != DEFAULT_PROFILE]
+    return names
+
+
+def get_profile_url(name: str) -> str:
+    """
+    Get the database URL of a named connection profile.
+
+    Args:
+        name: Profile name (DEFAULT_PROFILE returns the default URL)
+
+    Raises:
+        ValueError: If the profile does not exist.
+    """
+    if name == DEFAULT_PROFILE:
+        return get_db_url()
+    if name in _profile_url_cache:
+        return _profile_url_cache[name]
+
+    try:
+        url = keyring.get_password(SERVICE_NAME, PROFILE_KEY_PREFIX + name)
+    except keyring.errors.KeyringError as e:
+        raise KeychainAccessError(f"Cannot access keychain.\nDetails: {e}") from e
+
+    if not url or not url.strip():
+        raise ValueError(f"No database URL stored for profile '{name}'.")
+
+    _profile_url_cache[name] = url.strip()
+    return _profile_url_cache[name]
+
+
+def set_profile_url(name: str, url: str) -> None:
+    """
+    Store the database URL of a named connection profile.
+
+    Raises:
+        ValueError: If the name or URL is empty.
+    """
+    name = name.strip()
+    if not name:
+        raise ValueError("Profile name cannot be empty.")
+    if name == DEFAULT_PROFILE:
+        set_db_url(url)
+        return
+    if not url or not url.strip():
+        raise ValueError("Database URL cannot be empty.")
+
+    keyring.set_password(SERVICE_NAME, PROFILE_KEY_PREFIX + name, url.strip())
+    _profile_url_cache[name] = url.strip()
+
+    names = [n for n in list_profiles() if n != DEFAULT_PROFILE]
+    if name not in names:
+        keyring.set_password(SERVICE_NAME, PROFILES_KEY, json.dumps(names + [name]))
+
+
+def delete_profile(name: str) -> None:
+    """Remove a named connection profile (DEFAULT_PROFILE clears the default URL)."""
+    if name == DEFAULT_PROFILE:
+        clear_db_url()
+        return
+
+    try:
+        keyring.delete_password(SERVICE_NAME, PROFILE_KEY_PREFIX + name)
+    except keyring.errors.PasswordDeleteError:
+        pass
+    _profile_url_cache.pop(name, None)
+
+    names = [n for n in list_profiles() if n not in (DEFAULT_PROFILE, name)]
+    keyring.set_password(SERVICE_NAME, PROFILES_KEY, json.dumps(names))
+
+
+def _replica_key(profile: Optional[str]) -> str:
+    """Return the keychain entry holding the replica URL of a profile."""
+    if profile is None or profile == DEFAULT_PROFILE:
+        return REPLICA_URL_KEY
+    return f"{REPLICA_URL_KEY}:{profile}"
+
+
+def get_replica_url(profile: Optional[str] = None) -> Optional[str]:
+    """
+    Get the read replica URL of the default database or a connection profile.
+
+    Returns:
+        The replica URL, or None if no replica is stored.
+    """
+    key = _replica_key(profile)
+    if key in _replica_url_cache:
+        return _replica_url_cache[key]
+
+    try:
+        url = keyring.get_password(SERVICE_NAME, key)
+    except keyring.errors.KeyringError as e:
+        raise KeychainAccessError(f"Cannot access keychain.\nDetails: {e}") from e
+
+    _replica_url_cache[key] = url.strip() if url and url.strip() else None
+    return _replica_url_cache[key]
+
+
+def set_replica_url(url: str, profile: Optional[str] = None) -> None:
+    """
+    Store the read replica URL of the default database or a connection profile.
+
+    Raises:
+        ValueError: If URL is empty.
+    """
+    if not url or not url.strip():
+        raise ValueError("Replica URL cannot be empty.")
+
+    key = _replica_key(profile)
+    keyring.set_password(SERVICE_NAME, key, url.strip())
+    _replica_url_cache[key] = url.strip()
+
+
+def clear_replica_url(profile: Optional[str] = None) -> None:
+    """Remove the stored read replica URL."""
+    key = _replica_key(profile)
+    try:
+        keyring.delete_password(SERVICE_NAME, key)
+    except keyring.errors.PasswordDeleteError:
+        pass
+    _replica_url_cache[key] = None
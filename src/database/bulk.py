@@ -0,0 +1,235 @@
+"""
+Bulk data transfer using PostgreSQL COPY through the psycopg2 driver.
+
+COPY moves rows as a single server-formatted byte stream, bypassing the
+per-row Python object creation of a regular SQLAlchemy Result. It is used for
+local mirrors and for the opt-in bulk fetch path of large KPI results.
+"""
+
+import csv
+import io
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+# NULL string for fetch_columns. FORCE_QUOTE * quotes every non-NULL value, so
+# NULLs are the only unquoted fields; the marker parses as a float, which is
+# how csv.QUOTE_NONNUMERIC reads unquoted fields.
+_FETCH_NULL = "NaN"
+
+
+def render_query(cursor: Any, engine: Engine, query: str, params: Dict[str, Any]) -> str:
+    """
+    Inline bound parameters into a query.
+
+    COPY does not accept bind parameters, so values are rendered client-side
+    with the driver's own quoting (cursor.mogrify) rather than string formatting.
+
+    Args:
+        cursor: A psycopg2 cursor
+        engine: Engine whose dialect is used to compile :name placeholders
+        query: SQL using SQLAlchemy :name placeholders
+        params: Values for the placeholders
+
+    Returns:
+        The query with all parameters inlined and any trailing semicolon removed.
+    """
+    compiled = str(text(query).compile(dialect=engine.dialect))
+    rendered = cursor.mogrify(compiled, params)
+    if isinstance(rendered, bytes):
+        rendered = rendered.decode("utf-8")
+    return rendered.strip().rstrip(";").strip()
+
+
+def _copy_options(
+    format: str, header: bool, force_quote: bool = False, null: Optional[str] = None
+) -> str:
+    """Build the WITH (...) option list for a COPY statement."""
+    if format == "binary":
+        return "FORMAT binary"
+    if format == "csv":
+        options = f"FORMAT csv, HEADER {'true' if header else 'false'}"
+        if force_quote:
+            options += ", FORCE_QUOTE *"
+        if null is not None:
+            options += ", NULL '" + null.replace("'", "''") + "'"
+        return options
+    raise ValueError(f"Unsupported COPY format: {format}")
+
+
+def copy_out(
+    engine: Engine,
+    query: str,
+    params: Dict[str, Any],
+    stream: IO[Any],
+    format: str = "csv",
+    header: bool = True,
+    force_quote: bool = False,
+    null: Optional[str] = None,
+) -> int:
+    """
+    Run `COPY (query) TO STDOUT` and write the raw output to a stream.
+
+    Args:
+        engine: Source PostgreSQL engine
+        query: SELECT query using :name placeholders
+        params: Values for the placeholders
+        stream: Writable file-like object (binary for format="binary")
+        format: "csv" or "binary"
+        header: Include a header line (csv only)
+        force_quote: Quote every non-NULL value (csv only)
+        null: String written for NULL instead of an empty field (csv only)
+
+    Returns:
+        Number of rows copied.
+    """
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        sql = render_query(cursor, engine, query, params)
+        options = _copy_options(format, header, force_quote, null)
+        cursor.copy_expert(f"COPY ({sql}) TO STDOUT WITH ({options})", stream)
+        return cursor.rowcount
+    finally:
+        raw.close()
+
+
+def copy_from(
+    cursor: Any,
+    engine: Engine,
+    table: str,
+    stream: IO[Any],
+    format: str = "csv",
+    header: bool = True,
+    columns: Optional[list[str]] = None,
+) -> int:
+    """
+    Run `COPY table FROM STDIN` on an open cursor; the caller owns the transaction.
+
+    Args:
+        cursor: A psycopg2 cursor of the target database
+        engine: Target engine (used for identifier quoting)
+        table: Target table name (quoted as needed)
+        stream: Readable file-like object positioned at the start of the data
+        format: "csv" or "binary"
+        header: Whether the data starts with a header line (csv only)
+        columns: Optional column list for the COPY target
+
+    Returns:
+        Number of rows loaded.
+    """
+    preparer = engine.dialect.identifier_preparer
+    target = preparer.quote(table)
+    if columns:
+        target += " (" + ", ".join(preparer.quote(c) for c in columns) + ")"
+    cursor.copy_expert(
+        f"COPY {target} FROM STDIN WITH ({_copy_options(format, header)})", stream
+    )
+    return cursor.rowcount
+
+
+def copy_in(
+    engine: Engine,
+    table: str,
+    stream: IO[Any],
+    format: str = "csv",
+    header: bool = True,
+    truncate: bool = False,
+    columns: Optional[list[str]] = None,
+) -> int:
+    """
+    Load rows into a table with `COPY table FROM STDIN`, in one transaction.
+
+    Args:
+        engine: Target PostgreSQL engine
+        table: Target table name (quoted as needed)
+        stream: Readable file-like object positioned at the start of the data
+        format: "csv" or "binary"
+        header: Whether the data starts with a header line (csv only)
+        truncate: Empty the table first, in the same transaction. This fails
+            if other tables reference it by foreign key; see
+            src.database.mirror for loading related tables.
+        columns: Optional column list for the COPY target
+
+    Returns:
+        Number of rows loaded.
+    """
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        if truncate:
+            cursor.execute(f"TRUNCATE {engine.dialect.identifier_preparer.quote(table)}")
+        rowcount = copy_from(cursor, engine, table, stream, format, header, columns)
+        raw.commit()
+        return rowcount
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+
+
+def copy_to_csv(
+    engine: Engine, query: str, params: Dict[str, Any], output_path: Path
+) -> int:
+    """
+    Stream a query's result straight into a CSV file with COPY.
+
+    Rows never become Python objects: the server formats the CSV and the driver
+    writes the bytes to the file.
+
+    Returns:
+        Number of rows written (excluding the header).
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "wb") as f:
+        return copy_out(engine, query, params, f, format="csv", header=True)
+
+
+def fetch_columns(
+    engine: Engine, query: str, params: Dict[str, Any]
+) -> Tuple[List[str], Dict[str, List[Optional[str]]]]:
+    """
+    Fetch a query's result via COPY into column-oriented lists.
+
+    Values are returned as text (None for SQL NULL), as formatted by PostgreSQL;
+    empty strings stay "". Use fetch_arrow() for typed columns when PyArrow is
+    installed.
+
+    Returns:
+        Tuple of (columns, {column: values}).
+    """
+    buffer = io.BytesIO()
+    copy_out(
+        engine, query, params, buffer, format="csv", header=True,
+        force_quote=True, null=_FETCH_NULL,
+    )
+    buffer.seek(0)
+
+    lines = io.TextIOWrapper(buffer, encoding="utf-8", newline="")
+    # The header is not force-quoted, so it is read before switching readers
+    columns = next(csv.reader(lines), [])
+    values: List[List[Optional[str]]] = [[] for _ in columns]
+    for record in csv.reader(lines, quoting=csv.QUOTE_NONNUMERIC):
+        for i, value in enumerate(record):
+            # Only NULLs are unquoted, and unquoted fields are read as floats
+            values[i].append(None if isinstance(value, float) else value)
+    return columns, dict(zip(columns, values))
+
+
+def fetch_arrow(engine: Engine, query: str, params: Dict[str, Any]) -> Any:
+    """
+    Fetch a query's result via COPY into a typed pyarrow.Table.
+
+    Parsing happens in PyArrow's multithreaded CSV reader rather than per row in
+    Python. Requires the optional analytics extra.
+    """
+    from src.analytics.engine import _require
+
+    pa_csv = _require("pyarrow.csv")
+    buffer = io.BytesIO()
+    copy_out(engine, query, params, buffer, format="csv", header=True)
+    buffer.seek(0)
+    return pa_csv.read_csv(buffer)
@@ -0,0 +1,152 @@
+"""
+Catalog introspection for choosing index-friendly query strategies.
+
+Index definitions are read from pg_indexes once per engine and table and then
+served from an in-process cache, so KPIs can check which (expression) indexes
+exist without adding a catalog round-trip to every execution.
+"""
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+_INDEX_QUERY = text("""
+    SELECT indexname, indexdef
+    FROM pg_indexes
+    WHERE schemaname = :schema AND tablename = :table
+    ORDER BY indexname
+""")
+
+_cache: Dict[Tuple[str, str, str], List["IndexInfo"]] = {}
+_cache_lock = threading.Lock()
+
+
+@dataclass
+class IndexInfo:
+    """A table index as described by pg_indexes."""
+
+    name: str
+    definition: str
+    keys: List[str]
+    predicate: Optional[str] = None
+
+    @property
+    def leading_key(self) -> Optional[str]:
+        """The first key column or expression, normalized."""
+        return self.keys[0] if self.keys else None
+
+
+def normalize_expression(expression: str) -> str:
+    """
+    Normalize an index key for comparison.
+
+    Drops casts, redundant parentheses, sort options and whitespace, so
+    "((tags -> 'action_type'::text))" and "tags->'action_type'" compare equal.
+    """
+    expr = expression.strip()
+    expr = re.sub(r"\s+(ASC|DESC|NULLS FIRST|NULLS LAST)\b", "", expr, flags=re.IGNORECASE)
+    expr = re.sub(r"::[a-z_ ]+(\[\])?", "", expr, flags=re.IGNORECASE)
+    expr = re.sub(r"\s+", "", expr)
+    while expr.startswith("(") and expr.endswith(")") and _balanced(expr[1:-1]):
+        expr = expr[1:-1]
+    return expr.replace('"', "").lower()
+
+
+def _balanced(expr: str) -> bool:
+    """Return True if parentheses in expr are balanced."""
+    depth = 0
+    for char in expr:
+        depth += {"(": 1, ")": -1}.get(char, 0)
+        if depth < 0:
+            return False
+    return depth == 0
+
+
+def _split_top_level(expr: str) -> List[str]:
+    """Split on commas that are not nested in parentheses or quotes."""
+    parts: List[str] = []
+    depth = 0
+    in_quote = False
+    current = ""
+    for char in expr:
+        if char == "'":
+            in_quote = not in_quote
+        elif not in_quote and char == "(":
+            depth += 1
+        elif not in_quote and char == ")":
+            depth -= 1
+        elif not in_quote and char == "," and depth == 0:
+            parts.append(current)
+            current = ""
+            continue
+        current += char
+    if current.strip():
+        parts.append(current)
+    return parts
+
+
+def parse_index_definition(name: str, definition: str) -> IndexInfo:
+    """
+    Parse a CREATE INDEX statement from pg_indexes.indexdef.
+
+    Example:
+        >>> info = parse_index_definition(
+        ...     "ix", "CREATE INDEX ix ON public.t USING btree (creation_date)"
+        ... )
+        >>> info.keys
+        ['creation_date']
+    """
+    match = re.search(r"USING\s+\w+\s+\(", definition, flags=re.IGNORECASE)
+    if not match:
+        return IndexInfo(name=name, definition=definition, keys=[])
+
+    start = match.end()
+    depth = 1
+    end = start
+    while end < len(definition) and depth:
+        depth += {"(": 1, ")": -1}.get(definition[end], 0)
+        end += 1
+    key_list = definition[start:end - 1]
+
+    predicate = None
+    where = re.search(r"\bWHERE\b(.*)$", definition[end:], flags=re.IGNORECASE)
+    if where:
+        predicate = where.group(1).strip()
+
+    keys = [normalize_expression(k) for k in _split_top_level(key_list)]
+    return IndexInfo(name=name, definition=definition, keys=keys, predicate=predicate)
+
+
+def list_indexes(engine: Any, table: str, schema: str = "public") -> List[IndexInfo]:
+    """
+    Return the indexes of a table, cached per engine for the process lifetime.
+
+    Args:
+        engine: SQLAlchemy engine
+        table: Table name
+        schema: Schema name
+
+    Returns:
+        List of IndexInfo (empty if the table has no indexes).
+    """
+    cache_key = (str(engine.url), schema, table)
+    with _cache_lock:
+        if cache_key in _cache:
+            return _cache[cache_key]
+
+    with engine.connect() as conn:
+        result = conn.execute(_INDEX_QUERY, {"schema": schema, "table": table})
+        indexes = [parse_index_definition(row[0], row[1]) for row in result]
+
+    with _cache_lock:
+        _cache[cache_key] = indexes
+    return indexes
+
+
+def clear_index_cache() -> None:
+    """Forget cached index definitions (e.g. after creating an index)."""
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,117 @@
+"""
+Keyset pagination for detail-level KPI results.
+
+Instead of OFFSET (which re-reads every skipped row) each page continues
+after the last key of the previous one:
+
+    SELECT * FROM (query) AS keyset_source
+    WHERE (creation_date, id) > (:last_creation_date, :last_id)
+    ORDER BY creation_date, id
+    LIMIT :page_size
+
+The wrapped query must be a plain SELECT (no aggregates, DISTINCT or LIMIT)
+so PostgreSQL pushes the key predicate into it and walks an index that leads
+with the key columns, e.g. everstox_qm__export_http_i_tags_return_reference
+(creation_date, id, ...). Every page is fetched on a short-lived connection, so
+neither the rows nor a transaction are held between pages.
+"""
+
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+DEFAULT_PAGE_SIZE = 1000
+DEFAULT_KEY_COLUMNS = ("creation_date", "id")
+
+
+@dataclass
+class Page:
+    """One page of a keyset-paginated result."""
+
+    number: int
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    # Key of the last row, passed as `after` to fetch the next page
+    last_key: Optional[Tuple[Any, ...]] = None
+    has_more: bool = False
+
+
+class KeysetPager:
+    """
+    Fetch a query's rows page by page, ordered by its key columns.
+
+    The key columns must be output columns of the query, non-NULL and unique
+    in combination (e.g. creation_date plus the primary key). `admit`, if
+    given, is entered around every page's query (e.g. load governor admission).
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        query: str,
+        params: Dict[str, Any],
+        key_columns: Sequence[str] = DEFAULT_KEY_COLUMNS,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        admit: Callable[[], ContextManager[Any]] = nullcontext,
+    ):
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        if not key_columns:
+            raise ValueError("key_columns must not be empty")
+        self.engine = engine
+        self.query = query.strip().rstrip(";")
+        self.params = params
+        self.key_columns = tuple(key_columns)
+        self.page_size = page_size
+        self.admit = admit
+        self.columns: List[str] = []
+
+    def page_query(self, after: Optional[Tuple[Any, ...]]) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build the SQL and bind parameters for the page following `after`.
+
+        One extra row is requested to tell whether another page exists.
+        """
+        keys = ", ".join(self.key_columns)
+        query_params = {**self.params, "keyset_limit": self.page_size + 1}
+        where = ""
+        if after is not None:
+            placeholders = []
+            for i, value in enumerate(after):
+                query_params[f"keyset_after_{i}"] = value
+                placeholders.append(f":keyset_after_{i}")
+            where = f"WHERE ({keys}) > ({', '.join(placeholders)})"
+        sql = (
+            f"SELECT * FROM ({self.query}) AS keyset_source {where} "
+            f"ORDER BY {keys} LIMIT :keyset_limit"
+        )
+        return sql, query_params
+
+    def fetch(self, after: Optional[Tuple[Any, ...]] = None, number: int = 1) -> Page:
+        """Fetch one page of rows after the given key (the first page if None)."""
+        sql, query_params = self.page_query(after)
+        with self.admit(), self.engine.connect() as conn:
+            result = conn.execute(text(sql), query_params)
+            self.columns = list(result.keys())
+            rows = [dict(zip(self.columns, record)) for record in result]
+
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        last_key = tuple(rows[-1][column] for column in self.key_columns) if rows else None
+        return Page(number=number, rows=rows, last_key=last_key, has_more=has_more)
+
+    def pages(self) -> Iterator[Page]:
+        """Yield pages in key order until the result is exhausted."""
+        page = self.fetch()
+        while True:
+            yield page
+            if not page.has_more:
+                return
+            page = self.fetch(page.last_key, page.number + 1)
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """Yield rows in key order, fetching pages as they are consumed."""
+        for page in self.pages():
+            yield from page.rows
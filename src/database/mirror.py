@@ -0,0 +1,250 @@
+"""
+Local mirror of the tables KPIs read, for offline and repeated development.
+
+A mirror is a date-bounded, optionally shop-filtered slice of each table
+declared in BaseKPI.source_tables. Rows are extracted with `COPY ... TO STDOUT`
+and loaded into either:
+
+- a local PostgreSQL database (schema created from ddl.sql beforehand). Point
+  the executor at it with `--mirror URL` or Settings → Set local mirror URL, and
+  KPIs run unchanged against the slice. All tables are loaded in a single
+  transaction with `SET LOCAL session_replication_role = replica`, so the
+  slice's foreign keys to tables that are not mirrored (shop, address,
+  warehouse, ...) are not enforced. That needs a superuser (or, from
+  PostgreSQL 15, a role granted SET on the parameter), which a local mirror
+  database normally has. The mirrored tables are emptied with
+  `TRUNCATE ... CASCADE`, which also empties tables referencing them.
+- a DuckDB file, for ad-hoc analysis with src.analytics. KPI SQL is written for
+  PostgreSQL (hstore operators, AT TIME ZONE), so KPIs themselves cannot run
+  against a DuckDB mirror.
+"""
+
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy.engine import Engine
+
+from src.database.bulk import copy_from, copy_out
+from src.database.connection import init_db_engine
+from src.kpis.base import SourceTable
+
+# Spool extracts in memory up to this size before falling back to a temp file
+_SPOOL_MAX_BYTES = 64 * 1024 * 1024
+
+
+@dataclass
+class MirrorStats:
+    """Outcome of mirroring a single table."""
+
+    table: str
+    rows: int
+    duration_seconds: float
+
+
+def is_duckdb_target(target: str) -> bool:
+    """Return True if the mirror target is a DuckDB file rather than a PostgreSQL URL."""
+    return target.startswith("duckdb:") or Path(target).suffix in (".duckdb", ".db")
+
+
+def _duckdb_path(target: str) -> str:
+    """Strip an optional duckdb:/// prefix from a DuckDB target."""
+    if target.startswith("duckdb:///"):
+        return target[len("duckdb:///"):]
+    if target.startswith("duckdb:"):
+        return target[len("duckdb:"):]
+    return target
+
+
+def collect_source_tables(kpis: Iterable[Any]) -> List[SourceTable]:
+    """
+    Collect the distinct source tables declared by KPI classes or instances.
+
+    The first declaration of a table wins when several KPIs read it.
+    """
+    tables: Dict[str, SourceTable] = {}
+    for kpi in kpis:
+        for table in getattr(kpi, "source_tables", []):
+            tables.setdefault(table.name, table)
+    return list(tables.values())
+
+
+def build_extract_query(
+    engine: Engine, table: SourceTable, shop_id: Optional[str] = None
+) -> str:
+    """
+    Build the SELECT used to extract a table's slice.
+
+    Args:
+        engine: Source engine (used for identifier quoting)
+        table: Table declaration
+        shop_id: Optional shop filter
+
+    Returns:
+        SQL using :start_date, :end_date and :shop_id placeholders.
+    """
+    preparer = engine.dialect.identifier_preparer
+    conditions: List[str] = []
+
+    if table.date_column:
+        column = preparer.quote(table.date_column)
+        conditions.append(f"{column} >= :start_date")
+        conditions.append(f"{column} < :end_date + INTERVAL '1 day'")
+    if shop_id and table.shop_column:
+        conditions.append(f"{preparer.quote(table.shop_column)} = :shop_id")
+    if table.where:
+        conditions.append(f"({table.where})")
+
+    query = f"SELECT * FROM {preparer.quote(table.name)}"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    return query
+
+
+def _load_postgres(
+    source_engine: Engine,
+    target_engine: Engine,
+    tables: List[SourceTable],
+    shop_id: Optional[str],
+    params: Dict[str, Any],
+) -> List[MirrorStats]:
+    """
+    Copy slices into the existing tables of a PostgreSQL mirror (binary format).
+
+    Runs in one transaction on the target: foreign key triggers are off
+    (session_replication_role = replica) and all mirrored tables are truncated
+    together with CASCADE, so a failure leaves the previous mirror in place.
+    """
+    preparer = target_engine.dialect.identifier_preparer
+    stats: List[MirrorStats] = []
+    raw = target_engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute("SET LOCAL session_replication_role = replica")
+        if tables:
+            names = ", ".join(preparer.quote(table.name) for table in tables)
+            cursor.execute(f"TRUNCATE {names} CASCADE")
+        for table in tables:
+            started = datetime.now()
+            query = build_extract_query(source_engine, table, shop_id)
+            with tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_BYTES, mode="w+b") as buffer:
+                copy_out(source_engine, query, params, buffer, format="binary")
+                buffer.seek(0)
+                rows = copy_from(cursor, target_engine, table.name, buffer, format="binary")
+            stats.append(MirrorStats(
+                table=table.name,
+                rows=rows,
+                duration_seconds=(datetime.now() - started).total_seconds(),
+            ))
+        raw.commit()
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+    return stats
+
+
+def _load_duckdb(
+    source_engine: Engine,
+    analytics: Any,
+    table: SourceTable,
+    query: str,
+    params: Dict[str, Any],
+) -> int:
+    """Copy a slice into a DuckDB table (CSV format, types inferred by DuckDB)."""
+    fd, csv_path = tempfile.mkstemp(suffix=".csv")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            rows = copy_out(source_engine, query, params, f, format="csv")
+
+        quoted_name = '"' + table.name.replace('"', '""') + '"'
+        literal = csv_path.replace("'", "''")
+        analytics.connection.execute(
+            f"CREATE OR REPLACE TABLE {quoted_name} AS "
+            f"SELECT * FROM read_csv_auto('{literal}', header = true)"
+        )
+        return rows
+    finally:
+        os.remove(csv_path)
+
+
+def mirror_tables(
+    source_engine: Engine,
+    tables: List[SourceTable],
+    target: str,
+    start_date: date,
+    end_date: date,
+    shop_id: Optional[str] = None,
+) -> List[MirrorStats]:
+    """
+    Extract a slice of each table from the source and load it into the mirror.
+
+    Existing mirror tables are replaced, so re-running with a new range gives a
+    fresh slice. A PostgreSQL mirror is loaded in one transaction without
+    foreign key checks (see the module docstring).
+
+    Args:
+        source_engine: Engine for the production (or replica) database
+        tables: Tables to mirror
+        target: PostgreSQL URL or DuckDB file path (optionally duckdb:///path)
+        start_date: First day to include
+        end_date: Last day to include
+        shop_id: Optional shop filter
+
+    Returns:
+        MirrorStats for each table, in order.
+    """
+    if start_date > end_date:
+        raise ValueError("Invalid date range: start_date must be before or equal to end_date")
+
+    params: Dict[str, Any] = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "shop_id": shop_id,
+    }
+    stats: List[MirrorStats] = []
+
+    if is_duckdb_target(target):
+        from src.analytics import AnalyticsEngine
+
+        with AnalyticsEngine(_duckdb_path(target)) as analytics:
+            for table in tables:
+                started = datetime.now()
+                query = build_extract_query(source_engine, table, shop_id)
+                rows = _load_duckdb(source_engine, analytics, table, query, params)
+                stats.append(MirrorStats(
+                    table=table.name,
+                    rows=rows,
+                    duration_seconds=(datetime.now() - started).total_seconds(),
+                ))
+        return stats
+
+    target_engine = init_db_engine(target)
+    try:
+        return _load_postgres(source_engine, target_engine, tables, shop_id, params)
+    finally:
+        target_engine.dispose()
+
+
+def mirror_kpis(
+    source_engine: Engine,
+    kpis: Iterable[Any],
+    target: str,
+    start_date: date,
+    end_date: date,
+    shop_id: Optional[str] = None,
+) -> List[MirrorStats]:
+    """Mirror every table the given KPI classes or instances declare in source_tables."""
+    return mirror_tables(
+        source_engine,
+        collect_source_tables(kpis),
+        target,
+        start_date,
+        end_date,
+        shop_id,
+    )
+
@@ -0,0 +1,129 @@
+"""
+Read-replica routing for KPI queries.
+
+KPIs only read, so they can run on a streaming replica and keep load off the
+primary. A replica serves data as of its last replayed transaction, so before
+routing a KPI there the replication lag is compared with the staleness the KPI
+tolerates; when the replica is behind (or unreachable) the KPI runs on the
+primary instead.
+
+The lag is measured on the replica itself. A replica that has replayed all WAL
+it received, and whose WAL receiver is streaming and recently heard from the
+primary, reports 0 even when the primary has been idle for a while (where
+now() - pg_last_xact_replay_timestamp() alone would keep growing). A replica
+whose receiver is disconnected has also replayed everything it received, but
+that may be arbitrarily old, so its lag is the age of its last replayed
+transaction.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from sqlalchemy import text
+
+# pg_stat_wal_receiver has at most one row. Without pg_read_all_stats its
+# status is NULL, which counts as not streaming (the conservative answer).
+REPLICA_STATUS_QUERY = """
+    SELECT
+        pg_is_in_recovery() AS in_recovery,
+        pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() AS replayed_all,
+        (SELECT status FROM pg_stat_wal_receiver) AS receiver_status,
+        (SELECT EXTRACT(EPOCH FROM now() - last_msg_receipt_time)
+           FROM pg_stat_wal_receiver) AS receipt_age,
+        EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) AS replay_age
+"""
+
+# Seconds a lag measurement is reused before the replica is asked again
+LAG_CHECK_INTERVAL = 10.0
+
+# Seconds without a message from the primary after which a streaming receiver
+# is no longer trusted to be caught up (an idle primary sends keepalives every
+# wal_sender_timeout / 2, 30s by default)
+RECEIVER_MAX_SILENCE = 60.0
+
+
+def lag_from_status(
+    in_recovery: bool,
+    replayed_all: Optional[bool],
+    receiver_status: Optional[str],
+    receipt_age: Optional[float],
+    replay_age: Optional[float],
+    max_silence: float = RECEIVER_MAX_SILENCE,
+) -> Optional[float]:
+    """
+    Compute the replication lag from a replica's status (see REPLICA_STATUS_QUERY).
+
+    Returns:
+        0 for a server that is not in recovery, or a replica that has replayed
+        all WAL and is streaming from a primary it heard from within
+        `max_silence` seconds; otherwise the seconds since the last replayed
+        transaction, or None if the replica has not replayed anything yet.
+    """
+    if not in_recovery:
+        return 0.0
+    connected = (
+        receiver_status == "streaming"
+        and receipt_age is not None
+        and float(receipt_age) <= max_silence
+    )
+    if replayed_all and connected:
+        return 0.0
+    return None if replay_age is None else max(0.0, float(replay_age))
+
+
+def replication_lag(engine: Any) -> Optional[float]:
+    """
+    Return the replication lag of a replica in seconds.
+
+    Returns:
+        The lag as computed by lag_from_status.
+    """
+    with engine.connect() as conn:
+        status = conn.execute(text(REPLICA_STATUS_QUERY)).one()
+    return lag_from_status(*status)
+
+
+class ReplicaRouter:
+    """
+    A read replica's engine and its (cached) replication lag.
+
+    The executor compares the lag with each KPI's tolerance. The lag is
+    measured at most once per `check_interval` seconds and shared by all KPIs,
+    so routing a Run All costs one extra query rather than one per KPI.
+    Failing lag checks count as unknown lag, which routes to the primary.
+    """
+
+    def __init__(
+        self,
+        engine: Any,
+        check_interval: float = LAG_CHECK_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.engine = engine
+        self.check_interval = check_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._checked_at: Optional[float] = None
+        self._lag: Optional[float] = None
+
+    def lag(self) -> Optional[float]:
+        """Return the (recently measured) replication lag, or None if unknown."""
+        with self._lock:
+            now = self._clock()
+            if self._checked_at is None or now - self._checked_at >= self.check_interval:
+                try:
+                    self._lag = replication_lag(self.engine)
+                except Exception:
+                    self._lag = None
+                self._checked_at = now
+            return self._lag
+
+    def invalidate(self) -> None:
+        """Forget the last measurement, e.g. after a connection failure."""
+        with self._lock:
+            self._checked_at = None
+
+    def dispose(self) -> None:
+        """Close the replica's pooled connections."""
+        self.engine.dispose()
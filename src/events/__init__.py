@@ -0,0 +1,38 @@
+"""Structured execution events with buffered console and JSON lines sinks."""
+
+from src.events.event import (
+    DEBUG,
+    INFO,
+    KPI_FINISHED,
+    KPI_RETRY,
+    KPI_STARTED,
+    QUERY_ISSUED,
+    ROWS_FETCHED,
+    WARNING,
+    WARNING_RAISED,
+    Event,
+)
+from src.events.log import SINKS, EventLog, close, emit, flush, get_event_log
+from src.events.sinks import ConsoleSink, EventSink, JsonLinesSink
+
+__all__ = [
+    "DEBUG",
+    "INFO",
+    "KPI_FINISHED",
+    "KPI_RETRY",
+    "KPI_STARTED",
+    "QUERY_ISSUED",
+    "ROWS_FETCHED",
+    "SINKS",
+    "WARNING",
+    "WARNING_RAISED",
+    "ConsoleSink",
+    "Event",
+    "EventLog",
+    "EventSink",
+    "JsonLinesSink",
+    "close",
+    "emit",
+    "flush",
+    "get_event_log",
+]
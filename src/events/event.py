@@ -0,0 +1,42 @@
+"""Structured execution events."""
+
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+DEBUG = "debug"
+INFO = "info"
+WARNING = "warning"
+LEVELS = {DEBUG: 10, INFO: 20, WARNING: 30}
+
+# Event names
+KPI_STARTED = "kpi.started"
+QUERY_ISSUED = "query.issued"
+ROWS_FETCHED = "rows.fetched"
+KPI_FINISHED = "kpi.finished"
+KPI_RETRY = "kpi.retry"
+WARNING_RAISED = "warning"
+
+
+@dataclass
+class Event:
+    """One thing that happened while executing KPIs."""
+
+    name: str
+    level: str = DEBUG
+    kpi: Optional[str] = None
+    fields: Dict[str, Any] = field(default_factory=dict)
+    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    thread: str = field(default_factory=lambda: threading.current_thread().name)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a flat dictionary for JSON serialization."""
+        return {
+            "timestamp": self.timestamp.isoformat(),
+            "event": self.name,
+            "level": self.level,
+            "kpi": self.kpi,
+            "thread": self.thread,
+            **self.fields,
+        }
@@ -0,0 +1,148 @@
+"""
+Buffered, non-blocking event log.
+
+emit() only puts the event on an in-memory queue; a background writer thread
+drains the queue and hands batches to the sink. KPIs on worker threads
+therefore never wait for the console or a file, and a batch costs one write
+instead of one per line.
+
+The sink follows the runtime config: config.event_sink is "console" (events
+at config.event_level and above), "jsonl" (every event, appended to
+events.jsonl in the output directory) or "off" (emit() returns immediately).
+Call flush() before printing output that should appear after the events.
+"""
+
+import atexit
+import queue
+import threading
+from typing import Any, List, Optional, Tuple
+
+from src.config import get_config
+from src.events.event import DEBUG, Event
+from src.events.sinks import ConsoleSink, EventSink, JsonLinesSink
+
+SINK_CONSOLE = "console"
+SINK_JSONL = "jsonl"
+SINK_OFF = "off"
+SINKS = (SINK_CONSOLE, SINK_JSONL, SINK_OFF)
+
+EVENTS_FILENAME = "events.jsonl"
+
+# Upper bound of events handed to the sink in one write
+MAX_BATCH = 1000
+
+_STOP = object()
+
+
+class EventLog:
+    """Queue events and write them to a sink on a background thread."""
+
+    def __init__(self, sink: EventSink):
+        self.sink = sink
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._writer = threading.Thread(target=self._run, name="event-log", daemon=True)
+        self._writer.start()
+
+    def emit(self, event: Event) -> None:
+        """Queue an event for writing (never blocks)."""
+        self._queue.put_nowait(event)
+
+    def flush(self) -> None:
+        """Wait until every queued event has been written."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Write the remaining events, stop the writer and close the sink."""
+        self._queue.put_nowait(_STOP)
+        self._writer.join(timeout=5)
+        self.sink.close()
+
+    def _run(self) -> None:
+        """Writer thread: write queued events in batches until stopped."""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < MAX_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            events: List[Event] = [item for item in batch if item is not _STOP]
+            try:
+                if events:
+                    self.sink.write(events)
+            except Exception:
+                pass  # Logging must never break KPI execution
+            for _ in batch:
+                self._queue.task_done()
+            if len(events) < len(batch):
+                return
+
+
+_log: Optional[EventLog] = None
+_log_key: Optional[Tuple[str, str, str]] = None
+_log_lock = threading.Lock()
+
+
+def _create_sink(kind: str, level: str, output_directory: Any) -> Optional[EventSink]:
+    """Create the sink for config.event_sink, or None when events are off."""
+    if kind == SINK_CONSOLE:
+        return ConsoleSink(level)
+    if kind == SINK_JSONL:
+        return JsonLinesSink(output_directory / EVENTS_FILENAME)
+    return None
+
+
+def get_event_log() -> Optional[EventLog]:
+    """Get the event log for the current config, or None when events are off."""
+    global _log, _log_key
+
+    config = get_config()
+    key = (config.event_sink, config.event_level, str(config.output_directory))
+    if key == _log_key:
+        return _log
+
+    with _log_lock:
+        if key != _log_key:
+            if _log is not None:
+                _log.close()
+            sink = _create_sink(config.event_sink, config.event_level, config.output_directory)
+            _log = EventLog(sink) if sink is not None else None
+            _log_key = key
+        return _log
+
+
+def emit(name: str, kpi: Optional[str] = None, level: str = DEBUG, **fields: Any) -> None:
+    """
+    Record an execution event.
+
+    Args:
+        name: Event name (see src.events.event, e.g. QUERY_ISSUED)
+        kpi: Name of the KPI the event belongs to
+        level: DEBUG, INFO or WARNING
+        **fields: Structured details (JSON-serializable, or rendered with str())
+    """
+    log = get_event_log()
+    if log is not None:
+        log.emit(Event(name=name, level=level, kpi=kpi, fields=fields))
+
+
+def flush() -> None:
+    """Wait until all emitted events have been written."""
+    log = _log
+    if log is not None:
+        log.flush()
+
+
+def close() -> None:
+    """Write remaining events and close the sink (registered at exit)."""
+    global _log, _log_key
+
+    with _log_lock:
+        if _log is not None:
+            _log.close()
+        _log = None
+        _log_key = None
+
+
+atexit.register(close)
@@ -0,0 +1,78 @@
+"""Destinations for execution events, written in batches by the event log."""
+
+import json
+import sys
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import IO, List, Optional
+
+from src.events.event import INFO, LEVELS, WARNING, Event
+
+
+class EventSink(ABC):
+    """A destination for batches of events."""
+
+    @abstractmethod
+    def write(self, events: List[Event]) -> None:
+        """Write a batch of events (called from the event log's writer thread)."""
+        pass
+
+    def close(self) -> None:
+        """Release the sink's resources."""
+        pass
+
+
+class ConsoleSink(EventSink):
+    """
+    Human-readable event lines on the console.
+
+    Events below `level` are skipped. A batch is written with a single write,
+    so lines from parallel KPIs never interleave mid-line.
+    """
+
+    def __init__(self, level: str = INFO, stream: Optional[IO[str]] = None):
+        self.min_rank = LEVELS[level]
+        self.stream = stream
+
+    def format(self, event: Event) -> str:
+        """Render one event as a console line."""
+        prefix = f"  [{event.kpi}] " if event.kpi else "  "
+        if event.level == WARNING:
+            prefix += "Warning: "
+        if "message" in event.fields:
+            return prefix + str(event.fields["message"])
+        details = " ".join(f"{key}={value}" for key, value in event.fields.items())
+        return f"{prefix}{event.name} {details}".rstrip()
+
+    def write(self, events: List[Event]) -> None:
+        lines = [self.format(e) + "\n" for e in events if LEVELS[e.level] >= self.min_rank]
+        if lines:
+            stream = self.stream or sys.stdout
+            stream.write("".join(lines))
+            stream.flush()
+
+
+class JsonLinesSink(EventSink):
+    """Every event as one JSON object per line, appended to a file."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file: Optional[IO[str]] = None
+        self._lock = threading.Lock()
+
+    def write(self, events: List[Event]) -> None:
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(
+                "".join(json.dumps(e.to_dict(), default=str) + "\n" for e in events)
+            )
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
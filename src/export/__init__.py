@@ -1,9 +1,15 @@
-"""Export functionality for KPI reports (CSV, JSON)."""
+"""
+Export functionality for KPI reports (CSV, JSON).
+
+Exporters are imported when first requested: the CSV exporter pulls in the
+COPY support of src.database.bulk (SQLAlchemy), which a JSON export or a
+process that never exports should not pay for.
+"""
+
+from typing import Any
 
 from src.config import ExportFormat
 from src.export.base import Exporter
-from src.export.csv_exporter import CSVExporter
-from src.export.json_exporter import JSONExporter
 
 
 def get_exporter(format: ExportFormat) -> Exporter:
@@ -17,8 +23,25 @@ def get_exporter(format: ExportFormat) -> Exporter:
         An Exporter instance for the specified format
     """
     if format == ExportFormat.CSV:
+        from src.export.csv_exporter import CSVExporter
+
         return CSVExporter()
     elif format == ExportFormat.JSON:
+        from src.export.json_exporter import JSONExporter
+
         return JSONExporter()
     else:
         raise ValueError(f"Unsupported export format: {format}")
+
+
+def __getattr__(name: str) -> Any:
+    """Import CSVExporter and JSONExporter on first attribute access."""
+    if name == "CSVExporter":
+        from src.export.csv_exporter import CSVExporter
+
+        return CSVExporter
+    if name == "JSONExporter":
+        from src.export.json_exporter import JSONExporter
+
+        return JSONExporter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,7 +2,7 @@
 
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, Iterable, List
 
 from src.models.result import KPIResult
 
@@ -37,3 +37,35 @@ class Exporter(ABC):
     def file_extension(self) -> str:
         """Return the file extension for this export format."""
         pass
+
+    @property
+    def supports_copy(self) -> bool:
+        """
+        Whether this exporter can write COPY output directly.
+
+        Exporters returning True implement
+        export_copy(engine, query, params, output_path) -> int, which streams
+        the query's result into the output file and returns the row count.
+        Callers check this property before calling export_copy.
+        """
+        return False
+
+    @abstractmethod
+    def export_pages(
+        self, result: KPIResult, pages: Iterable[List[Dict[str, Any]]], output_path: Path
+    ) -> int:
+        """
+        Export a result whose rows arrive page by page (keyset drill-down).
+
+        Each page is written as soon as it arrives, so only one page is held in
+        memory. result.rows is ignored; result.columns gives the column order.
+
+        Args:
+            result: KPI result describing the export (name, columns, parameters)
+            pages: Lists of rows, in order
+            output_path: Full path to the output file
+
+        Returns:
+            Number of rows written.
+        """
+        pass
@@ -2,8 +2,9 @@
 
 import csv
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, Iterable, List
 
+from src.database.bulk import copy_to_csv
 from src.export.base import Exporter
 from src.models.result import KPIResult
 
@@ -15,6 +16,16 @@ class CSVExporter(Exporter):
     def file_extension(self) -> str:
         return "csv"
 
+    @property
+    def supports_copy(self) -> bool:
+        return True
+
+    def export_copy(
+        self, engine: Any, query: str, params: Dict[str, Any], output_path: Path
+    ) -> int:
+        """Stream a query's result into a CSV file via COPY ... TO STDOUT."""
+        return copy_to_csv(engine, query, params, output_path)
+
     def export(self, result: KPIResult, output_path: Path) -> None:
         """Export a single KPI result to CSV."""
         output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -25,6 +36,25 @@ class CSVExporter(Exporter):
                 writer.writeheader()
                 writer.writerows(result.rows)
 
+    def export_pages(
+        self, result: KPIResult, pages: Iterable[List[Dict[str, Any]]], output_path: Path
+    ) -> int:
+        """Export a paged result to CSV, writing each page as it arrives."""
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        row_count = 0
+        with open(output_path, "w", newline="", encoding="utf-8") as f:
+            writer = None
+            for page in pages:
+                if not page:
+                    continue
+                if writer is None:
+                    writer = csv.DictWriter(f, fieldnames=result.columns or list(page[0]))
+                    writer.writeheader()
+                writer.writerows(page)
+                row_count += len(page)
+        return row_count
+
     def export_report(self, results: List[KPIResult], output_path: Path) -> None:
         """Export multiple KPI results to a combined CSV report."""
         output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -42,6 +72,10 @@ class CSVExporter(Exporter):
                 writer.writerow([f"Status: {'Success' if result.success else 'Failed'}"])
                 writer.writerow([f"Duration: {result.duration_seconds:.2f}s"])
                 writer.writerow([f"Rows: {result.row_count}"])
+                if result.approximate:
+                    writer.writerow(["Approximate: yes (sampled preview)"])
+                for key, value in result.metadata.items():
+                    writer.writerow([f"{key}: {value}"])
 
                 if result.error:
                     writer.writerow([f"Error: {result.error}"])
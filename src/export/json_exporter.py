@@ -2,7 +2,7 @@
 
 import json
 from pathlib import Path
-from typing import Any, List
+from typing import Any, Dict, Iterable, List
 
 from src.export.base import Exporter
 from src.models.result import KPIResult
@@ -25,6 +25,8 @@ class JSONExporter(Exporter):
             "success": result.success,
             "error": result.error,
             "row_count": result.row_count,
+            "approximate": result.approximate,
+            "metadata": result.metadata,
             "columns": result.columns,
             "data": result.rows,
         }
@@ -38,6 +40,32 @@ class JSONExporter(Exporter):
         with open(output_path, "w", encoding="utf-8") as f:
             json.dump(data, f, indent=2, default=str)
 
+    def export_pages(
+        self, result: KPIResult, pages: Iterable[List[Dict[str, Any]]], output_path: Path
+    ) -> int:
+        """
+        Export a paged result to JSON, writing each page as it arrives.
+
+        The document has the same fields as export(); row_count follows the
+        data array because it is only known once the last page is written.
+        """
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        header = self._serialize_result(result)
+        del header["data"], header["row_count"]
+
+        row_count = 0
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(header, indent=2, default=str)[:-2])
+            f.write(',\n  "data": [')
+            for page in pages:
+                for row in page:
+                    f.write(",\n    " if row_count else "\n    ")
+                    f.write(json.dumps(row, default=str))
+                    row_count += 1
+            f.write(f'\n  ],\n  "row_count": {row_count}\n}}\n')
+        return row_count
+
     def export_report(self, results: List[KPIResult], output_path: Path) -> None:
         """Export multiple KPI results to a combined JSON report."""
         output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -13,7 +13,8 @@ def discover_kpis() -> List[Type[BaseKPI]]:
     Scan the kpis/ directory for BaseKPI subclasses.
 
     Any Python file in this directory containing a class that extends BaseKPI
-    will be automatically discovered and returned.
+    will be automatically discovered and returned. Classes found in several
+    modules (e.g. re-exported by a package __init__) are returned once.
 
     Returns:
         List of KPI classes (not instances) found in this package.
@@ -40,7 +41,7 @@ def discover_kpis() -> List[Type[BaseKPI]]:
                 if issubclass(obj, BaseKPI) and obj is not BaseKPI:
                     # Validate required attributes
                     if hasattr(obj, "name") and hasattr(obj, "description"):
-                        if obj.name and obj.description:
+                        if obj.name and obj.description and obj not in kpis:
                             kpis.append(obj)
         except Exception as e:
             # Log but don't fail on import errors
@@ -50,4 +51,4 @@ def discover_kpis() -> List[Type[BaseKPI]]:
 
 
 # Re-export base classes for convenience
-from src.kpis.base import BaseKPI, Parameter, ParameterType  # noqa: E402, F401
+from src.kpis.base import BaseKPI, Parameter, ParameterType, SourceTable  # noqa: E402, F401
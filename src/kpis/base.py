@@ -2,8 +2,9 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from sqlalchemy.engine import Engine
 
@@ -29,6 +30,39 @@ class Parameter:
     description: str
 
 
+def parse_date(value: Any) -> Any:
+    """Parse a date parameter from a date, datetime or YYYY-MM-DD string."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if hasattr(value, "date"):  # date object
+        return value
+    if isinstance(value, str) and value.strip():
+        try:
+            return datetime.strptime(value.strip(), "%Y-%m-%d").date()
+        except ValueError:
+            pass
+    return value
+
+
+@dataclass
+class SourceTable:
+    """
+    A database table a KPI reads from, used to build local mirrors.
+
+    The mirror extracts rows where date_column falls in the requested range and,
+    when a shop filter is given, shop_column matches it. Either column can be
+    None to skip that filter. `where` is an extra SQL predicate that may use the
+    :start_date, :end_date and :shop_id bind parameters.
+    """
+
+    name: str
+    date_column: Optional[str] = "creation_date"
+    shop_column: Optional[str] = "shop_id"
+    where: Optional[str] = None
+
+
 class BaseKPI(ABC):
     """
     Abstract base class for all KPIs.
@@ -38,10 +72,45 @@ class BaseKPI(ABC):
     2. Define a class that extends BaseKPI
     3. Implement all abstract methods
     4. The KPI will be auto-discovered on next launch
+
+    Set `source_tables` to the tables the KPI reads so `mirror` can extract
+    them for offline development.
+
+    Set `bucket_column` for KPIs that return one row per day for a
+    start_date/end_date range. Dev mode then caches results per day and only
+    queries the database for days that are missing from the cache.
+
+    Set `supports_preview` for KPIs that can run on a TABLESAMPLE of their
+    main table when params request a preview (see src.kpis.sampling). Preview
+    results scale counts up and set KPIResult.approximate.
+
+    KPIs computed from other KPIs' results extend DerivedKPI
+    (src.kpis.derived) and name those KPIs in `depends_on`.
+
+    Detail-level KPIs that can return millions of rows override
+    drilldown_query(); single runs then page through the result by
+    `drilldown_key` instead of materializing it (see src.database.keyset).
+
+    Set `max_replica_lag` to the seconds of replication lag the KPI tolerates
+    when read-replica routing is on (None uses config.replica_max_lag). KPIs
+    reading the current day should set it low; 0 only accepts a caught-up
+    replica.
+
+    Set `cost_weight` to declare how much database load one execution puts on
+    the load governor's budget (src.runner.governor); by default it is learned
+    from the run history or from EXPLAIN of cost_query().
     """
 
     name: str = ""
     description: str = ""
+    source_tables: List[SourceTable] = []
+    bucket_column: Optional[str] = None
+    default_range_days: int = 14
+    supports_preview: bool = False
+    depends_on: List[str] = []
+    drilldown_key: Tuple[str, ...] = ("creation_date", "id")
+    max_replica_lag: Optional[float] = None
+    cost_weight: Optional[float] = None
 
     @abstractmethod
     def get_parameters(self) -> List[Parameter]:
@@ -70,6 +139,73 @@ class BaseKPI(ABC):
         """
         pass
 
+    def resolve_date_range(self, params: Dict[str, Any]) -> Tuple[date, date]:
+        """
+        Resolve the start_date/end_date parameters of a date-range KPI.
+
+        Defaults to the last `default_range_days` days ending today (UTC).
+
+        Returns:
+            Tuple of (start_date, end_date), both inclusive.
+        """
+        end_date = parse_date(params.get("end_date")) or datetime.now(timezone.utc).date()
+        start_date = parse_date(params.get("start_date")) or (
+            end_date - timedelta(days=self.default_range_days - 1)
+        )
+        return start_date, end_date
+
+    def bulk_query(self, params: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Return the KPI's result query for the bulk COPY fetch path.
+
+        KPIs that can return very large result sets override this so that, when
+        bulk fetch is enabled and the export format is CSV, the executor streams
+        `COPY (query) TO STDOUT` straight into the export file instead of calling
+        execute(). The query's column names become the CSV header.
+
+        Args:
+            params: Dictionary of parameter values provided by the user
+
+        Returns:
+            Tuple of (SQL with :name placeholders, bind parameters), or None if
+            the KPI has no bulk path (the default).
+        """
+        return None
+
+    def cost_query(self, params: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Return the query the load governor EXPLAINs to estimate the KPI's cost.
+
+        Used when neither `cost_weight` nor a run history is available. Defaults
+        to the bulk or drill-down query; KPIs dominated by one large query
+        override it.
+
+        Args:
+            params: Dictionary of parameter values provided by the user
+
+        Returns:
+            Tuple of (SQL with :name placeholders, bind parameters), or None if
+            the KPI has no query to EXPLAIN.
+        """
+        return self.bulk_query(params) or self.drilldown_query(params)
+
+    def drilldown_query(self, params: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Return the KPI's detail query for keyset-paginated drill-down.
+
+        The query must be a plain SELECT whose output includes the
+        `drilldown_key` columns (non-NULL and unique together) and must not
+        have its own ORDER BY or LIMIT; pages are ordered by the key.
+
+        Args:
+            params: Dictionary of parameter values provided by the user
+
+        Returns:
+            Tuple of (SQL with :name placeholders, bind parameters), or None if
+            the KPI has no drill-down (the default).
+        """
+        return None
+
 
 # Import KPIResult here to avoid circular imports
 from src.models.result import KPIResult  # noqa: E402, F401
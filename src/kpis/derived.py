@@ -0,0 +1,77 @@
+"""Derived KPIs: KPIs computed from other KPIs' results."""
+
+from abc import abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List
+
+from sqlalchemy.engine import Engine
+
+from src.kpis.base import BaseKPI, Parameter
+from src.models.result import KPIResult
+
+
+class DerivedKPI(BaseKPI):
+    """
+    Base class for KPIs computed from the results of other KPIs.
+
+    List the names of the upstream KPIs in `depends_on` and implement
+    compute(). Run All executes the upstream KPIs first (once per report) and
+    passes their results in memory, so a derived KPI never repeats their
+    database scans. Run individually, execute() runs the upstream KPIs with
+    their default parameters first.
+    """
+
+    def get_parameters(self) -> List[Parameter]:
+        """Derived KPIs use their upstream KPIs' default parameters."""
+        return []
+
+    @abstractmethod
+    def compute(self, upstream: Dict[str, KPIResult], params: Dict[str, Any]) -> KPIResult:
+        """
+        Compute the KPI from upstream results.
+
+        Args:
+            upstream: Successful results of the KPIs in depends_on, by name
+            params: Dictionary of parameter values provided by the user
+
+        Returns:
+            KPIResult containing the derived rows.
+        """
+        pass
+
+    def compute_from(self, upstream: Dict[str, KPIResult], params: Dict[str, Any]) -> KPIResult:
+        """
+        Run compute() with timing, failing if an upstream KPI failed.
+
+        Never raises; errors are returned in KPIResult.error.
+        """
+        start_time = datetime.now()
+        failed = [name for name in self.depends_on if not upstream[name].success]
+        try:
+            if failed:
+                raise RuntimeError(f"Upstream KPI failed: {', '.join(failed)}")
+            result = self.compute(upstream, params)
+        except Exception as e:
+            result = KPIResult(
+                kpi_name=self.name, columns=[], rows=[], parameters=params, error=str(e)
+            )
+        result.duration_seconds = (datetime.now() - start_time).total_seconds()
+        result.metadata.setdefault("depends_on", list(self.depends_on))
+        return result
+
+    def execute(self, engine: Engine, params: Dict[str, Any]) -> KPIResult:
+        """Run the upstream KPIs, then compute this KPI from their results."""
+        from src.kpis import discover_kpis
+
+        registry = {kpi_class.name: kpi_class for kpi_class in discover_kpis()}
+        upstream: Dict[str, KPIResult] = {}
+        for name in self.depends_on:
+            if name not in registry:
+                return KPIResult(
+                    kpi_name=self.name, columns=[], rows=[], parameters=params,
+                    error=f"Unknown upstream KPI: {name}",
+                )
+            kpi = registry[name]()
+            defaults = {p.name: p.default for p in kpi.get_parameters()}
+            upstream[name] = kpi.execute(engine, defaults)
+        return self.compute_from(upstream, params)
@@ -0,0 +1,238 @@
+"""Export Error Clusters KPI - Top export error signatures from error_log."""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from src.kpis.base import BaseKPI, Parameter, ParameterType, SourceTable
+from src.models.result import KPIResult
+
+COLUMNS = [
+    "fingerprint", "error_code", "signature", "occurrences", "share",
+    "first_seen", "last_seen", "sample_message",
+]
+DEFAULT_TOP_N = 20
+SIGNATURE_LENGTH = 200
+SAMPLE_LENGTH = 500
+
+# Replacement patterns applied in order: identifiers first, then any digits
+# left over, then whitespace runs. Passed as bind parameters.
+UUID_PATTERN = r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+HEX_PATTERN = r"\m[0-9a-f]{16,}\M"
+NUMBER_PATTERN = r"[0-9]+"
+SPACE_PATTERN = r"\s+"
+
+# Messages are normalized and grouped in the database, so only the top-N
+# clusters travel to the client. The date range is read from the partial
+# index error_log_export_idx (creation_date DESC, from_service) WHERE
+# entity_type = 'export'; a search term adds an ILIKE that
+# error_log_search_gin (trigram) can answer. The share is computed over all
+# clusters before LIMIT. The fingerprint hashes the whole cluster key, error
+# code and signature (separated by a unit separator, chr(31)), so clusters
+# sharing a signature under different codes get different fingerprints.
+CLUSTER_QUERY = """
+    WITH normalized AS (
+        SELECT
+            array_to_string(e.error_code, ',') AS error_code,
+            left(
+                regexp_replace(
+                    regexp_replace(
+                        regexp_replace(
+                            regexp_replace(lower(coalesce(e.error_message, '')), :uuid_pattern, '<id>', 'g'),
+                            :hex_pattern, '<hex>', 'g'),
+                        :number_pattern, '<n>', 'g'),
+                    :space_pattern, ' ', 'g'),
+                :signature_length
+            ) AS signature,
+            e.error_message,
+            e.creation_date
+        FROM error_log e
+        WHERE e.entity_type = 'export'
+          AND e.creation_date >= :start_date
+          AND e.creation_date < :end_date + INTERVAL '1 day'
+          {filters}
+    )
+    SELECT
+        left(md5(coalesce(error_code, '') || chr(31) || signature), 12) AS fingerprint,
+        error_code,
+        signature,
+        COUNT(*) AS occurrences,
+        SUM(COUNT(*)) OVER () AS total_errors,
+        MIN(creation_date) AS first_seen,
+        MAX(creation_date) AS last_seen,
+        left(MIN(error_message), :sample_length) AS sample_message
+    FROM normalized
+    GROUP BY error_code, signature
+    ORDER BY occurrences DESC, fingerprint
+    LIMIT :top_n
+"""
+
+
+def like_pattern(term: str) -> str:
+    """Return an ILIKE pattern matching term anywhere, with wildcards escaped."""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class ErrorClustersKPI(BaseKPI):
+    """
+    KPI: Most frequent export error signatures.
+
+    Normalizes error_log messages of exports server-side (lower case, UUIDs,
+    long hex tokens and numbers replaced by placeholders, whitespace
+    collapsed), groups them by error_code and signature, and returns the top-N
+    clusters with their count, share of all export errors, first/last
+    occurrence and one sample message. A search term drills down to messages
+    containing it.
+    """
+
+    name = "Export Error Clusters"
+    description = "Top export error signatures by error code"
+    source_tables = [
+        SourceTable("error_log", shop_column=None, where="entity_type = 'export'"),
+    ]
+    default_range_days = 7
+
+    def get_parameters(self) -> List[Parameter]:
+        """Return configurable parameters for this KPI."""
+        return [
+            Parameter(
+                name="start_date",
+                display_name="Start Date",
+                type=ParameterType.DATE,
+                required=False,
+                default=None,
+                description="Start of date range, format: YYYY-MM-DD (defaults to 6 days before end date)",
+            ),
+            Parameter(
+                name="end_date",
+                display_name="End Date",
+                type=ParameterType.DATE,
+                required=False,
+                default=None,
+                description="End of date range, format: YYYY-MM-DD (defaults to today)",
+            ),
+            Parameter(
+                name="top_n",
+                display_name="Top N",
+                type=ParameterType.INTEGER,
+                required=False,
+                default=DEFAULT_TOP_N,
+                description=f"Number of clusters to return (default {DEFAULT_TOP_N})",
+            ),
+            Parameter(
+                name="from_service",
+                display_name="From Service",
+                type=ParameterType.STRING,
+                required=False,
+                default=None,
+                description="Filter by reporting service (leave empty for all services)",
+            ),
+            Parameter(
+                name="search",
+                display_name="Search",
+                type=ParameterType.STRING,
+                required=False,
+                default=None,
+                description="Only messages containing this text (leave empty for all)",
+            ),
+        ]
+
+    def cluster_query(
+        self, params: Dict[str, Any], top_n: int = DEFAULT_TOP_N
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Return the clustering query and its bind parameters."""
+        start_date, end_date = self.resolve_date_range(params)
+        query_params: Dict[str, Any] = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "top_n": top_n,
+            "uuid_pattern": UUID_PATTERN,
+            "hex_pattern": HEX_PATTERN,
+            "number_pattern": NUMBER_PATTERN,
+            "space_pattern": SPACE_PATTERN,
+            "signature_length": SIGNATURE_LENGTH,
+            "sample_length": SAMPLE_LENGTH,
+        }
+        filters = []
+        if params.get("from_service"):
+            filters.append("AND e.from_service = :from_service")
+            query_params["from_service"] = params["from_service"]
+        if params.get("search"):
+            filters.append("AND e.error_message ILIKE :search")
+            query_params["search"] = like_pattern(str(params["search"]))
+        return CLUSTER_QUERY.format(filters=" ".join(filters)), query_params
+
+    def cost_query(self, params: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Return the clustering query for the load governor's EXPLAIN estimate."""
+        return self.cluster_query(params)
+
+    def execute(self, engine: Engine, params: Dict[str, Any]) -> KPIResult:
+        """Execute the error clustering query."""
+        start_time = datetime.now()
+
+        try:
+            start_date, end_date = self.resolve_date_range(params)
+            if start_date > end_date:
+                return KPIResult(
+                    kpi_name=self.name,
+                    columns=COLUMNS,
+                    rows=[],
+                    duration_seconds=(datetime.now() - start_time).total_seconds(),
+                    parameters=params,
+                    error="Invalid date range: start_date must be before or equal to end_date",
+                )
+
+            raw_top_n = params.get("top_n")
+            top_n = int(raw_top_n) if raw_top_n not in (None, "") else DEFAULT_TOP_N
+            if top_n < 1:
+                return KPIResult(
+                    kpi_name=self.name,
+                    columns=COLUMNS,
+                    rows=[],
+                    duration_seconds=(datetime.now() - start_time).total_seconds(),
+                    parameters=params,
+                    error="top_n must be at least 1",
+                )
+
+            query, query_params = self.cluster_query(params, top_n)
+            with engine.connect() as conn:
+                result = conn.execute(text(query), query_params)
+                clusters = [tuple(row) for row in result]
+
+            total_errors = int(clusters[0][4]) if clusters else 0
+            rows = [
+                {
+                    "fingerprint": fingerprint,
+                    "error_code": error_code,
+                    "signature": signature,
+                    "occurrences": occurrences,
+                    "share": round(occurrences / total_errors * 100, 2) if total_errors else 0.0,
+                    "first_seen": first_seen,
+                    "last_seen": last_seen,
+                    "sample_message": sample,
+                }
+                for fingerprint, error_code, signature, occurrences, _, first_seen, last_seen, sample
+                in clusters
+            ]
+
+            return KPIResult(
+                kpi_name=self.name,
+                columns=COLUMNS,
+                rows=rows,
+                duration_seconds=(datetime.now() - start_time).total_seconds(),
+                parameters=params,
+                metadata={"total_errors": total_errors},
+            )
+
+        except Exception as e:
+            return KPIResult(
+                kpi_name=self.name,
+                columns=COLUMNS,
+                rows=[],
+                duration_seconds=(datetime.now() - start_time).total_seconds(),
+                parameters=params,
+                error=str(e),
+            )
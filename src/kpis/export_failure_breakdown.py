@@ -0,0 +1,46 @@
+"""Export Failure Breakdown KPI - Failure rates and shares derived from First Time Right."""
+
+from typing import Any, Dict, List
+
+from src.kpis.derived import DerivedKPI
+from src.models.result import KPIResult
+
+UPSTREAM_KPI = "First Time Right (Exports)"
+
+
+class ExportFailureBreakdownKPI(DerivedKPI):
+    """
+    KPI: Export failure rate and share of all failures by action type.
+
+    Derived from the First Time Right (Exports) result, so Run All does not
+    scan the export and error log tables a second time.
+    """
+
+    name = "Export Failure Breakdown"
+    description = "Failure rate and share of failed exports by action type"
+    depends_on = [UPSTREAM_KPI]
+
+    def compute(self, upstream: Dict[str, KPIResult], params: Dict[str, Any]) -> KPIResult:
+        """Compute failure rates and shares from the First Time Right rows."""
+        source = upstream[UPSTREAM_KPI]
+        total_failed = sum(row["failed_exports"] or 0 for row in source.rows)
+
+        rows: List[Dict[str, Any]] = []
+        for row in source.rows:
+            total = row["total_exports"] or 0
+            failed = row["failed_exports"] or 0
+            rows.append({
+                "action_type": row["action_type"],
+                "failed_exports": failed,
+                "failure_rate": round(failed / total * 100, 2) if total else 0.0,
+                "failure_share": round(failed / total_failed * 100, 2) if total_failed else 0.0,
+            })
+        rows.sort(key=lambda r: r["failed_exports"], reverse=True)
+
+        return KPIResult(
+            kpi_name=self.name,
+            columns=["action_type", "failed_exports", "failure_rate", "failure_share"],
+            rows=rows,
+            parameters=source.parameters,
+            approximate=source.approximate,
+        )
@@ -0,0 +1,168 @@
+"""Failed Exports KPI - Exports with error logs and their latest error message."""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.engine import Engine
+
+from src.database.keyset import DEFAULT_PAGE_SIZE, KeysetPager
+from src.kpis.base import BaseKPI, Parameter, ParameterType, SourceTable
+from src.models.result import KPIResult
+
+COLUMNS = [
+    "creation_date", "id", "action_type", "state", "response_code",
+    "error_code", "error_message",
+]
+
+# Plain SELECT without ORDER BY/LIMIT: the keyset pager adds
+# (creation_date, id) > (...) ORDER BY creation_date, id LIMIT n, which walks
+# everstox_qm__export_http_i_tags_return_reference (creation_date, id, ...).
+# The latest error per export is read from ix_error_log_export_id.
+DETAIL_QUERY = """
+    SELECT
+        x.creation_date,
+        x.id,
+        x.tags -> 'action_type' AS action_type,
+        x.state,
+        x.response_code,
+        err.error_code,
+        err.error_message
+    FROM everstox_qm__export_http x
+    CROSS JOIN LATERAL (
+        SELECT array_to_string(e.error_code, ',') AS error_code, e.error_message
+        FROM error_log e
+        WHERE e.export_id = x.id
+        ORDER BY e.creation_date DESC
+        LIMIT 1
+    ) err
+    WHERE x.creation_date >= :start_date
+      AND x.creation_date < :end_date + INTERVAL '1 day'
+      {filters}
+"""
+
+
+class FailedExportsKPI(BaseKPI):
+    """
+    KPI: Exports that produced error logs, one row per export.
+
+    Lists every export in the date range with at least one error_log entry,
+    with its action type, state, response code and latest error. The result
+    can have millions of rows, so it is a drill-down KPI: a single run pages
+    through it with keyset pagination on (creation_date, id) and exports it
+    page by page. With bulk fetch on and CSV export, a single run instead
+    streams the whole result into the export file with COPY (bulk_query).
+    execute() (used by Run All and the service) returns only the first page
+    and sets metadata["has_more"].
+    """
+
+    name = "Failed Exports"
+    description = "Exports with error logs and their latest error (paged drill-down)"
+    source_tables = [
+        SourceTable("everstox_qm__export_http"),
+        SourceTable(
+            "error_log",
+            date_column=None,
+            shop_column=None,
+            where=(
+                "export_id IN (SELECT id FROM everstox_qm__export_http"
+                " WHERE creation_date >= :start_date"
+                " AND creation_date < :end_date + INTERVAL '1 day')"
+            ),
+        ),
+    ]
+    default_range_days = 7
+    page_size = DEFAULT_PAGE_SIZE
+
+    def get_parameters(self) -> List[Parameter]:
+        """Return configurable parameters for this KPI."""
+        return [
+            Parameter(
+                name="start_date",
+                display_name="Start Date",
+                type=ParameterType.DATE,
+                required=False,
+                default=None,
+                description="Start of date range, format: YYYY-MM-DD (defaults to 6 days before end date)",
+            ),
+            Parameter(
+                name="end_date",
+                display_name="End Date",
+                type=ParameterType.DATE,
+                required=False,
+                default=None,
+                description="End of date range, format: YYYY-MM-DD (defaults to today)",
+            ),
+            Parameter(
+                name="shop_id",
+                display_name="Shop ID",
+                type=ParameterType.STRING,
+                required=False,
+                default=None,
+                description="Filter by shop ID (leave empty for all shops)",
+            ),
+            Parameter(
+                name="action_type",
+                display_name="Action Type",
+                type=ParameterType.STRING,
+                required=False,
+                default=None,
+                description="Filter by export action type (leave empty for all)",
+            ),
+        ]
+
+    def drilldown_query(self, params: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Return the failed-export detail query for keyset pagination."""
+        start_date, end_date = self.resolve_date_range(params)
+        query_params: Dict[str, Any] = {"start_date": start_date, "end_date": end_date}
+        filters = []
+        if params.get("shop_id"):
+            filters.append("AND x.shop_id = :shop_id")
+            query_params["shop_id"] = params["shop_id"]
+        if params.get("action_type"):
+            filters.append("AND x.tags -> 'action_type' = :action_type")
+            query_params["action_type"] = params["action_type"]
+        return DETAIL_QUERY.format(filters=" ".join(filters)), query_params
+
+    def bulk_query(self, params: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Return the full detail query, in key order, for the bulk COPY export."""
+        query, query_params = self.drilldown_query(params)
+        return query + "    ORDER BY x.creation_date, x.id\n", query_params
+
+    def execute(self, engine: Engine, params: Dict[str, Any]) -> KPIResult:
+        """Return the first page of failed exports."""
+        start_time = datetime.now()
+
+        try:
+            start_date, end_date = self.resolve_date_range(params)
+            if start_date > end_date:
+                return KPIResult(
+                    kpi_name=self.name,
+                    columns=COLUMNS,
+                    rows=[],
+                    duration_seconds=(datetime.now() - start_time).total_seconds(),
+                    parameters=params,
+                    error="Invalid date range: start_date must be before or equal to end_date",
+                )
+
+            query, query_params = self.drilldown_query(params)
+            pager = KeysetPager(engine, query, query_params, self.drilldown_key, self.page_size)
+            page = pager.fetch()
+
+            return KPIResult(
+                kpi_name=self.name,
+                columns=COLUMNS,
+                rows=page.rows,
+                duration_seconds=(datetime.now() - start_time).total_seconds(),
+                parameters=params,
+                metadata={"has_more": page.has_more, "page_size": self.page_size},
+            )
+
+        except Exception as e:
+            return KPIResult(
+                kpi_name=self.name,
+                columns=COLUMNS,
+                rows=[],
+                duration_seconds=(datetime.now() - start_time).total_seconds(),
+                parameters=params,
+                error=str(e),
+            )
@@ -3,17 +3,82 @@
 import json
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
-from src.kpis.base import BaseKPI, Parameter, ParameterType
+from src.database.introspection import IndexInfo, list_indexes
+from src.events import QUERY_ISSUED, ROWS_FETCHED, emit
+from src.kpis.base import BaseKPI, Parameter, ParameterType, SourceTable, parse_date
+from src.kpis.sampling import (
+    count_estimate,
+    proportion_interval,
+    sample_settings,
+    tablesample_clause,
+)
 from src.models.result import KPIResult
 
 # Load action types from config file (in same directory)
 CONFIG_PATH = Path(__file__).parent / "config.json"
 
+EXPORT_TABLE = "everstox_qm__export_http"
+# Normalized index key for the hstore tag (see src.database.introspection)
+ACTION_TYPE_KEY = "tags->'action_type'"
+
+STRATEGY_ACTION_TYPE_LED = "action_type_led"
+STRATEGY_CREATION_DATE_LED = "creation_date_led"
+STRATEGY_SAMPLED = "sampled"
+
+COLUMNS = ["action_type", "total_exports", "successful_exports", "failed_exports", "success_rate"]
+PREVIEW_COLUMNS = COLUMNS + [
+    "total_exports_low", "total_exports_high", "success_rate_low", "success_rate_high",
+]
+
+# One query per action type: efficient when an index leads with
+# (tags -> 'action_type', creation_date), so each query is a single range scan.
+PER_ACTION_TYPE_QUERY = text("""
+    WITH matching_exports AS (
+        SELECT id
+        FROM everstox_qm__export_http
+        WHERE tags -> 'action_type' = :action_type
+          AND creation_date >= :start_date
+          AND creation_date < :end_date + INTERVAL '1 day'
+    ),
+    exports_with_errors AS (
+        SELECT DISTINCT export_id
+        FROM error_log
+        WHERE export_id IN (SELECT id FROM matching_exports)
+    )
+    SELECT
+        (SELECT COUNT(*) FROM matching_exports) as total_exports,
+        (SELECT COUNT(*) FROM matching_exports
+         WHERE id NOT IN (SELECT export_id FROM exports_with_errors)) as successful_exports
+""")
+
+# One pass over the creation_date range for all action types. The hstore tag
+# is extracted once per row and grouped, instead of re-scanning per type.
+# Preview runs add a TABLESAMPLE clause to the export table; error_log is
+# still checked exactly for every sampled export.
+GROUPED_QUERY_TEMPLATE = """
+    WITH matching_exports AS (
+        SELECT id, tags -> 'action_type' AS action_type
+        FROM everstox_qm__export_http {sample_clause}
+        WHERE creation_date >= :start_date
+          AND creation_date < :end_date + INTERVAL '1 day'
+    )
+    SELECT
+        m.action_type,
+        COUNT(*) AS total_exports,
+        COUNT(*) FILTER (
+            WHERE NOT EXISTS (SELECT 1 FROM error_log e WHERE e.export_id = m.id)
+        ) AS successful_exports
+    FROM matching_exports m
+    WHERE m.action_type = ANY(:action_types)
+    GROUP BY m.action_type
+"""
+GROUPED_QUERY = text(GROUPED_QUERY_TEMPLATE.format(sample_clause=""))
+
 
 def load_action_types() -> List[str]:
     """Load action types from config file."""
@@ -24,6 +89,39 @@ def load_action_types() -> List[str]:
     return ["export_fulfillment_create"]  # Default fallback
 
 
+def choose_query_strategy(indexes: List[IndexInfo]) -> Tuple[str, str]:
+    """
+    Choose between action_type-led and creation_date-led querying.
+
+    - An unconditional index on (action_type, creation_date, ...) makes each
+      per-type query a narrow range scan: action_type_led.
+    - Otherwise an index leading with creation_date bounds the scan to the
+      date range, and grouping all types in that one scan is cheaper than
+      per-type lookups that can only seek on action_type (e.g. the
+      (action_type, gdpr_request_id, url) index): creation_date_led.
+    - Without either, fall back to the per-type queries.
+
+    Returns:
+        Tuple of (strategy, human-readable reason).
+    """
+    unconditional = [idx for idx in indexes if idx.predicate is None]
+
+    for idx in unconditional:
+        if idx.keys[:2] == [ACTION_TYPE_KEY, "creation_date"]:
+            return STRATEGY_ACTION_TYPE_LED, f"{idx.name} covers action_type and creation_date"
+
+    for idx in unconditional:
+        if idx.leading_key == "creation_date":
+            return STRATEGY_CREATION_DATE_LED, f"{idx.name} bounds the date range"
+
+    leading: Optional[IndexInfo] = next(
+        (idx for idx in unconditional if idx.leading_key == ACTION_TYPE_KEY), None
+    )
+    if leading is not None:
+        return STRATEGY_ACTION_TYPE_LED, f"{leading.name} leads with action_type"
+    return STRATEGY_ACTION_TYPE_LED, "no matching index found"
+
+
 class FirstTimeRightExportsKPI(BaseKPI):
     """
     KPI: First Time Right for exports by action type.
@@ -32,11 +130,30 @@ class FirstTimeRightExportsKPI(BaseKPI):
     (no associated error logs). Uses the everstox_qm__export_http table filtered
     by tags -> 'action_type' and checks for absence of error_log records.
 
-    Action types are configured in config.json
+    Action types are configured in config.json. The query shape is chosen from
+    the table's indexes on first use (see choose_query_strategy) and reported
+    in KPIResult.metadata["query_strategy"].
+
+    Preview runs sample the export table with TABLESAMPLE, scale the export
+    counts up and report 95% confidence intervals for totals and success rates.
     """
 
     name = "First Time Right (Exports)"
     description = "Success rate for exports by action type (no error logs)"
+    supports_preview = True
+    source_tables = [
+        SourceTable("everstox_qm__export_http"),
+        SourceTable(
+            "error_log",
+            date_column=None,
+            shop_column=None,
+            where=(
+                "export_id IN (SELECT id FROM everstox_qm__export_http"
+                " WHERE creation_date >= :start_date"
+                " AND creation_date < :end_date + INTERVAL '1 day')"
+            ),
+        ),
+    ]
 
     def get_parameters(self) -> List[Parameter]:
         """Return configurable parameters for this KPI."""
@@ -95,35 +212,31 @@ class FirstTimeRightExportsKPI(BaseKPI):
 
             rows: List[Dict[str, Any]] = []
 
+            emit(
+                QUERY_ISSUED, self.name,
+                query="discover_action_types", start_date=start_date, end_date=end_date,
+            )
             with engine.connect() as conn:
                 result = conn.execute(text(query), {
                     "start_date": start_date,
                     "end_date": end_date,
                 })
 
-                print(f"\n      Available action_types in date range:")
-                print("-" * 60)
                 for row in result:
-                    action_type = row[0]
-                    count = row[1]
-                    print(f"        {action_type}: {count} records")
                     rows.append({
-                        "action_type": action_type,
-                        "total_exports": count,
+                        "action_type": row[0],
+                        "total_exports": row[1],
                         "successful_exports": None,
                         "failed_exports": None,
                         "success_rate": None,
                     })
-                print("-" * 60)
 
             duration = (datetime.now() - start_time).total_seconds()
-            print(f"\n      Discovery completed in {duration:.2f}s")
-            print(f"      Found {len(rows)} action_types")
-            print("=" * 60 + "\n")
+            emit(ROWS_FETCHED, self.name, rows=len(rows), duration_seconds=round(duration, 3))
 
             return KPIResult(
                 kpi_name=self.name + " (Discovery)",
-                columns=["action_type", "total_exports", "successful_exports", "failed_exports", "success_rate"],
+                columns=COLUMNS,
                 rows=rows,
                 duration_seconds=duration,
                 parameters={
@@ -135,71 +248,112 @@ class FirstTimeRightExportsKPI(BaseKPI):
 
         except Exception as e:
             duration = (datetime.now() - start_time).total_seconds()
-            print(f"\n[ERROR] Discovery failed: {e}")
-            print("=" * 60 + "\n")
             return KPIResult(
                 kpi_name=self.name + " (Discovery)",
-                columns=["action_type", "total_exports", "successful_exports", "failed_exports", "success_rate"],
+                columns=COLUMNS,
                 rows=[],
                 duration_seconds=duration,
                 parameters=params,
                 error=str(e),
             )
 
+    def _query_strategy(self, engine: Engine) -> Tuple[str, str]:
+        """Choose the query strategy from the export table's indexes."""
+        try:
+            indexes = list_indexes(engine, EXPORT_TABLE)
+        except Exception as e:
+            return STRATEGY_ACTION_TYPE_LED, f"index introspection failed: {e}"
+        return choose_query_strategy(indexes)
+
+    def _counts_per_action_type(
+        self, conn: Any, action_types: List[str], start_date: Any, end_date: Any
+    ) -> Dict[str, Tuple[int, int]]:
+        """Run one (action_type, date range) query per action type."""
+        counts: Dict[str, Tuple[int, int]] = {}
+        for action_type in action_types:
+            result = conn.execute(PER_ACTION_TYPE_QUERY, {
+                "action_type": action_type,
+                "start_date": start_date,
+                "end_date": end_date,
+            })
+            row = result.fetchone()
+            counts[action_type] = (row[0], row[1]) if row else (0, 0)
+        return counts
+
+    def _counts_grouped(
+        self, conn: Any, action_types: List[str], start_date: Any, end_date: Any
+    ) -> Dict[str, Tuple[int, int]]:
+        """Scan the date range once and group by action type."""
+        result = conn.execute(GROUPED_QUERY, {
+            "action_types": list(action_types),
+            "start_date": start_date,
+            "end_date": end_date,
+        })
+        return {row[0]: (row[1], row[2]) for row in result}
+
+    def _counts_sampled(
+        self,
+        conn: Any,
+        action_types: List[str],
+        start_date: Any,
+        end_date: Any,
+        percent: float,
+        method: str,
+    ) -> Dict[str, Tuple[int, int]]:
+        """Group a TABLESAMPLE of the date range by action type (unscaled counts)."""
+        query = text(GROUPED_QUERY_TEMPLATE.format(sample_clause=tablesample_clause(method)))
+        result = conn.execute(query, {
+            "action_types": list(action_types),
+            "start_date": start_date,
+            "end_date": end_date,
+            "sample_percent": percent,
+        })
+        return {row[0]: (row[1], row[2]) for row in result}
+
+    def _preview_row(
+        self, action_type: str, sampled_total: int, sampled_successful: int, percent: float
+    ) -> Dict[str, Any]:
+        """Scale sampled counts up and attach confidence intervals."""
+        total, total_low, total_high = count_estimate(sampled_total, percent)
+        successful = round(sampled_successful * 100.0 / percent)
+        rate, rate_low, rate_high = proportion_interval(sampled_successful, sampled_total)
+        return {
+            "action_type": action_type,
+            "total_exports": total,
+            "successful_exports": successful,
+            "failed_exports": total - successful,
+            "success_rate": rate,
+            "total_exports_low": total_low,
+            "total_exports_high": total_high,
+            "success_rate_low": rate_low,
+            "success_rate_high": rate_high,
+        }
+
     def _parse_date(self, value: Any) -> Any:
         """Parse date from various input formats."""
-        if value is None:
-            return None
-        if isinstance(value, datetime):
-            return value.date()
-        if hasattr(value, 'date'):  # date object
-            return value
-        if isinstance(value, str) and value.strip():
-            # Try parsing YYYY-MM-DD format
-            try:
-                return datetime.strptime(value.strip(), "%Y-%m-%d").date()
-            except ValueError:
-                pass
-        return value
+        return parse_date(value)
 
     def execute(self, engine: Engine, params: Dict[str, Any]) -> KPIResult:
         """Execute the First Time Right query for all configured action types."""
         start_time = datetime.now()
 
-        print("\n" + "=" * 60)
-        print("First Time Right KPI - Execution Log")
-        print("=" * 60)
-
         try:
             # Parse date parameters
-            raw_end = params.get("end_date")
-            raw_start = params.get("start_date")
-            print(f"\n[1/4] Parsing parameters...")
-            print(f"      Raw start_date: {raw_start!r}")
-            print(f"      Raw end_date: {raw_end!r}")
-
-            end_date = self._parse_date(raw_end)
-            start_date = self._parse_date(raw_start)
+            end_date = self._parse_date(params.get("end_date"))
+            start_date = self._parse_date(params.get("start_date"))
 
             if end_date is None:
                 end_date = datetime.now(timezone.utc).date()
-                print(f"      end_date defaulted to: {end_date}")
 
             if start_date is None:
                 start_date = end_date - timedelta(days=13)
-                print(f"      start_date defaulted to: {start_date}")
-
-            print(f"      Parsed start_date: {start_date}")
-            print(f"      Parsed end_date: {end_date}")
 
             # Date range validation
-            print(f"\n[2/4] Validating date range...")
             if start_date > end_date:
-                print(f"      ERROR: start_date ({start_date}) > end_date ({end_date})")
                 duration = (datetime.now() - start_time).total_seconds()
                 return KPIResult(
                     kpi_name=self.name,
-                    columns=["action_type", "total_exports", "successful_exports", "failed_exports", "success_rate"],
+                    columns=COLUMNS,
                     rows=[],
                     duration_seconds=duration,
                     parameters=params,
@@ -208,87 +362,75 @@ class FirstTimeRightExportsKPI(BaseKPI):
 
             shop_id = params.get("shop_id")
             discover_mode = str(params.get("discover_action_types", "")).lower() in ("true", "1", "yes")
-            print(f"      Date range valid: {start_date} to {end_date}")
-            print(f"      Shop filter: {shop_id or '(all shops)'}")
-            print(f"      Discover mode: {discover_mode}")
 
             # Discovery mode: list all available action_types from DB
             if discover_mode:
-                print(f"\n[3/3] Discovering action_types from database...")
                 return self._discover_action_types(engine, start_date, end_date, start_time, params)
 
             # Load action types from config
             action_types = load_action_types()
-            print(f"\n[3/4] Loading action types from config...")
-            print(f"      Config file: {CONFIG_PATH}")
-            print(f"      Action types: {action_types}")
 
-            # Query for each action type
-            print(f"\n[4/4] Executing queries for each action type...")
-            print("-" * 60)
+            # Pick the query shape that matches the available indexes
+            sample = sample_settings(params)
+            if sample:
+                strategy = STRATEGY_SAMPLED
+                strategy_reason = f"preview on TABLESAMPLE {sample[1]} ({sample[0]}%)"
+            else:
+                strategy, strategy_reason = self._query_strategy(engine)
+            emit(
+                QUERY_ISSUED, self.name,
+                strategy=strategy, reason=strategy_reason, action_types=len(action_types),
+                start_date=start_date, end_date=end_date, shop_id=shop_id,
+            )
 
             rows: List[Dict[str, Any]] = []
 
-            query = """
-            WITH matching_exports AS (
-                SELECT id
-                FROM everstox_qm__export_http
-                WHERE tags -> 'action_type' = :action_type
-                  AND creation_date >= :start_date
-                  AND creation_date < :end_date + INTERVAL '1 day'
-            ),
-            exports_with_errors AS (
-                SELECT DISTINCT export_id
-                FROM error_log
-                WHERE export_id IN (SELECT id FROM matching_exports)
-            )
-            SELECT
-                (SELECT COUNT(*) FROM matching_exports) as total_exports,
-                (SELECT COUNT(*) FROM matching_exports
-                 WHERE id NOT IN (SELECT export_id FROM exports_with_errors)) as successful_exports
-            """
-
             with engine.connect() as conn:
-                for action_type in action_types:
-                    print(f"\n      [{action_type}]")
-
-                    query_params: Dict[str, Any] = {
-                        "action_type": action_type,
-                        "start_date": start_date,
-                        "end_date": end_date,
-                    }
-
-                    result = conn.execute(text(query), query_params)
-                    row = result.fetchone()
-
-                    total_exports = row[0] if row else 0
-                    successful_exports = row[1] if row else 0
-                    failed_exports = total_exports - successful_exports
-
-                    if total_exports > 0:
-                        success_rate = round((successful_exports / total_exports) * 100, 2)
-                    else:
-                        success_rate = 0.0
-
-                    print(f"        Total: {total_exports} | Success: {successful_exports} | Failed: {failed_exports} | Rate: {success_rate}%")
-
-                    rows.append({
-                        "action_type": action_type,
-                        "total_exports": total_exports,
-                        "successful_exports": successful_exports,
-                        "failed_exports": failed_exports,
-                        "success_rate": success_rate,
-                    })
+                if sample:
+                    counts = self._counts_sampled(
+                        conn, action_types, start_date, end_date, sample[0], sample[1]
+                    )
+                elif strategy == STRATEGY_CREATION_DATE_LED:
+                    counts = self._counts_grouped(conn, action_types, start_date, end_date)
+                else:
+                    counts = self._counts_per_action_type(conn, action_types, start_date, end_date)
+
+            for action_type in action_types:
+                total_exports, successful_exports = counts.get(action_type, (0, 0))
+                if sample:
+                    rows.append(
+                        self._preview_row(action_type, total_exports, successful_exports, sample[0])
+                    )
+                    continue
+
+                failed_exports = total_exports - successful_exports
+
+                if total_exports > 0:
+                    success_rate = round((successful_exports / total_exports) * 100, 2)
+                else:
+                    success_rate = 0.0
+
+                rows.append({
+                    "action_type": action_type,
+                    "total_exports": total_exports,
+                    "successful_exports": successful_exports,
+                    "failed_exports": failed_exports,
+                    "success_rate": success_rate,
+                })
 
             duration = (datetime.now() - start_time).total_seconds()
+            emit(ROWS_FETCHED, self.name, rows=len(rows), duration_seconds=round(duration, 3))
 
-            print("-" * 60)
-            print(f"\n      Total query duration: {duration:.2f}s")
-            print("=" * 60 + "\n")
+            metadata: Dict[str, Any] = {
+                "query_strategy": strategy,
+                "query_strategy_reason": strategy_reason,
+            }
+            if sample:
+                metadata["sample_percent"], metadata["sample_method"] = sample
 
             return KPIResult(
                 kpi_name=self.name,
-                columns=["action_type", "total_exports", "successful_exports", "failed_exports", "success_rate"],
+                columns=PREVIEW_COLUMNS if sample else COLUMNS,
                 rows=rows,
                 duration_seconds=duration,
                 parameters={
@@ -296,15 +438,15 @@ class FirstTimeRightExportsKPI(BaseKPI):
                     "end_date": end_date,
                     "shop_id": shop_id,
                 },
+                metadata=metadata,
+                approximate=sample is not None,
             )
 
         except Exception as e:
             duration = (datetime.now() - start_time).total_seconds()
-            print(f"\n[ERROR] Query failed: {e}")
-            print("=" * 60 + "\n")
             return KPIResult(
                 kpi_name=self.name,
-                columns=["action_type", "total_exports", "successful_exports", "failed_exports", "success_rate"],
+                columns=COLUMNS,
                 rows=[],
                 duration_seconds=duration,
                 parameters=params,
@@ -0,0 +1,249 @@
+"""Fulfillment Lateness KPI - p50/p90/p99 lateness per warehouse from mergeable sketches."""
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from src.cache.range_cache import find_gaps
+from src.cache.sketch_cache import database_key, load_day, save_day, sketch_dir
+from src.config import get_config
+from src.kpis.base import BaseKPI, Parameter, ParameterType, SourceTable
+from src.kpis.sketches import DEFAULT_RELATIVE_ACCURACY, QuantileSketch, bucket_key_sql
+from src.models.result import KPIResult
+
+METRICS = ("hours_late", "warehouse_late_hours")
+QUANTILES = (("p50", 0.5), ("p90", 0.9), ("p99", 0.99))
+COLUMNS = ["date", "warehouse_id", "fulfillments"] + [
+    f"{metric}_{label}" for metric in METRICS for label, _ in QUANTILES
+]
+UNKNOWN_WAREHOUSE = "unknown"
+
+# One scan of the completed_date range returns bucket counts per day,
+# warehouse and metric. With a shop filter the range is read from
+# fulfillment_shop_id_completed_date_idx (shop_id, completed_date), otherwise
+# from ix_fulfillment_completed_date. completed_date is stored in UTC.
+SKETCH_QUERY = f"""
+    SELECT
+        f.completed_date::date AS day,
+        f.warehouse_id,
+        m.metric,
+        {bucket_key_sql("m.value")} AS bucket,
+        COUNT(*) AS n
+    FROM fulfillment f
+    CROSS JOIN LATERAL (
+        VALUES ('hours_late', f.hours_late), ('warehouse_late_hours', f.warehouse_late_hours)
+    ) AS m(metric, value)
+    WHERE f.completed_date >= :start_date
+      AND f.completed_date < :end_date + INTERVAL '1 day'
+      {{shop_filter}}
+    GROUP BY 1, 2, 3, 4
+"""
+
+# Day -> warehouse -> metric -> sketch
+DaySketches = Dict[str, Dict[str, QuantileSketch]]
+
+
+class FulfillmentLatenessKPI(BaseKPI):
+    """
+    KPI: Lateness percentiles of completed fulfillments per warehouse.
+
+    Reports p50/p90/p99 of hours_late and warehouse_late_hours per warehouse,
+    per completion day or merged over the whole range. Instead of running
+    percentile_cont over every row, the database returns log-bucket counts
+    (see src.kpis.sketches), which are merged in Python within 1% relative
+    accuracy.
+
+    In dev mode, sketches of completed days (before today, UTC) are cached per
+    database, day and shop filter, so later runs over overlapping ranges only
+    scan new days. Clearing the cache (Settings) removes them. In production
+    the whole range is scanned, like every other KPI fetches live data.
+    """
+
+    name = "Fulfillment Lateness"
+    description = "p50/p90/p99 of fulfillment lateness hours per warehouse"
+    source_tables = [SourceTable("fulfillment", date_column="completed_date")]
+    relative_accuracy = DEFAULT_RELATIVE_ACCURACY
+
+    def get_parameters(self) -> List[Parameter]:
+        """Return configurable parameters for this KPI."""
+        return [
+            Parameter(
+                name="start_date",
+                display_name="Start Date",
+                type=ParameterType.DATE,
+                required=False,
+                default=None,
+                description="First completion day, format: YYYY-MM-DD (defaults to 13 days before end date)",
+            ),
+            Parameter(
+                name="end_date",
+                display_name="End Date",
+                type=ParameterType.DATE,
+                required=False,
+                default=None,
+                description="Last completion day, format: YYYY-MM-DD (defaults to today)",
+            ),
+            Parameter(
+                name="shop_id",
+                display_name="Shop ID",
+                type=ParameterType.STRING,
+                required=False,
+                default=None,
+                description="Filter by shop ID (leave empty for all shops)",
+            ),
+            Parameter(
+                name="per_day",
+                display_name="Per Day",
+                type=ParameterType.BOOLEAN,
+                required=False,
+                default=True,
+                description="One row per day and warehouse; 'false' merges the whole range per warehouse",
+            ),
+        ]
+
+    def _new_sketch(self) -> QuantileSketch:
+        return QuantileSketch(self.relative_accuracy)
+
+    def _scan(
+        self, engine: Engine, start_date: date, end_date: date, shop_id: Optional[str]
+    ) -> Dict[str, DaySketches]:
+        """Build sketches for every day, warehouse and metric in a range."""
+        query_params: Dict[str, Any] = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "gamma": self._new_sketch().gamma,
+        }
+        shop_filter = ""
+        if shop_id:
+            shop_filter = "AND f.shop_id = :shop_id"
+            query_params["shop_id"] = shop_id
+
+        days: Dict[str, DaySketches] = {}
+        with engine.connect() as conn:
+            result = conn.execute(text(SKETCH_QUERY.format(shop_filter=shop_filter)), query_params)
+            for day, warehouse_id, metric, bucket, count in result:
+                day_key = day.isoformat() if hasattr(day, "isoformat") else str(day)[:10]
+                warehouse = str(warehouse_id) if warehouse_id is not None else UNKNOWN_WAREHOUSE
+                sketches = days.setdefault(day_key, {}).setdefault(warehouse, {})
+                sketch = sketches.setdefault(metric, self._new_sketch())
+                sketch.add_bucket(bucket, count)
+        return days
+
+    def _load_range(
+        self, engine: Engine, start_date: date, end_date: date, shop_id: Optional[str], today: date
+    ) -> Tuple[Dict[str, DaySketches], int]:
+        """
+        Load sketches for a range from the daily cache, scanning only gaps.
+
+        Outside dev mode the cache is neither read nor written.
+
+        Returns:
+            Tuple of (sketches by ISO day, number of days scanned).
+        """
+        use_cache = get_config().dev_mode
+        directory = sketch_dir(
+            self.name,
+            database_key(engine),
+            {"shop_id": shop_id, "accuracy": self.relative_accuracy},
+        )
+        days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+
+        by_day: Dict[str, DaySketches] = {}
+        for day in days:
+            if day >= today or not use_cache:
+                continue
+            cached = load_day(directory, day)
+            if cached is not None:
+                by_day[day.isoformat()] = {
+                    warehouse: {m: QuantileSketch.from_dict(s) for m, s in metrics.items()}
+                    for warehouse, metrics in cached.items()
+                }
+
+        missing = [day for day in days if day.isoformat() not in by_day]
+        for gap_start, gap_end in find_gaps(missing):
+            scanned = self._scan(engine, gap_start, gap_end, shop_id)
+            day = gap_start
+            while day <= gap_end:
+                day_sketches = scanned.get(day.isoformat(), {})
+                by_day[day.isoformat()] = day_sketches
+                if use_cache and day < today:
+                    save_day(directory, day, {
+                        warehouse: {m: s.to_dict() for m, s in metrics.items()}
+                        for warehouse, metrics in day_sketches.items()
+                    })
+                day += timedelta(days=1)
+
+        return by_day, len(missing)
+
+    def _row(self, label: str, warehouse: str, sketches: Dict[str, QuantileSketch]) -> Dict[str, Any]:
+        """Build an output row from a warehouse's metric sketches."""
+        first = sketches.get(METRICS[0]) or self._new_sketch()
+        row: Dict[str, Any] = {"date": label, "warehouse_id": warehouse, "fulfillments": first.count}
+        for metric in METRICS:
+            sketch = sketches.get(metric) or self._new_sketch()
+            for quantile_label, q in QUANTILES:
+                value = sketch.quantile(q)
+                row[f"{metric}_{quantile_label}"] = round(value, 1) if value is not None else None
+        return row
+
+    def execute(self, engine: Engine, params: Dict[str, Any], today: Optional[date] = None) -> KPIResult:
+        """Execute the lateness percentile KPI."""
+        start_time = datetime.now()
+        today = today or datetime.now(timezone.utc).date()
+
+        try:
+            start_date, end_date = self.resolve_date_range(params)
+            if start_date > end_date:
+                return KPIResult(
+                    kpi_name=self.name,
+                    columns=COLUMNS,
+                    rows=[],
+                    duration_seconds=(datetime.now() - start_time).total_seconds(),
+                    parameters=params,
+                    error="Invalid date range: start_date must be before or equal to end_date",
+                )
+
+            shop_id = params.get("shop_id") or None
+            per_day = str(params.get("per_day", True)).lower() not in ("false", "0", "no")
+
+            by_day, scanned_days = self._load_range(engine, start_date, end_date, shop_id, today)
+
+            rows: List[Dict[str, Any]] = []
+            if per_day:
+                for day in sorted(by_day):
+                    for warehouse in sorted(by_day[day]):
+                        rows.append(self._row(day, warehouse, by_day[day][warehouse]))
+            else:
+                merged: Dict[str, Dict[str, QuantileSketch]] = {}
+                for day_sketches in by_day.values():
+                    for warehouse, metrics in day_sketches.items():
+                        target = merged.setdefault(warehouse, {})
+                        for metric, sketch in metrics.items():
+                            target.setdefault(metric, self._new_sketch()).merge(sketch)
+                label = f"{start_date.isoformat()}..{end_date.isoformat()}"
+                rows = [self._row(label, warehouse, merged[warehouse]) for warehouse in sorted(merged)]
+
+            return KPIResult(
+                kpi_name=self.name,
+                columns=COLUMNS,
+                rows=rows,
+                duration_seconds=(datetime.now() - start_time).total_seconds(),
+                parameters=params,
+                metadata={
+                    "days_scanned": scanned_days,
+                    "days_from_sketch_cache": len(by_day) - scanned_days,
+                    "relative_accuracy": self.relative_accuracy,
+                },
+            )
+
+        except Exception as e:
+            return KPIResult(
+                kpi_name=self.name,
+                columns=COLUMNS,
+                rows=[],
+                duration_seconds=(datetime.now() - start_time).total_seconds(),
+                parameters=params,
+                error=str(e),
+            )
@@ -0,0 +1,208 @@
+"""Import Health KPI - First-time-right and open-error rates of imports per day."""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from src.kpis.base import BaseKPI, Parameter, ParameterType, SourceTable
+from src.models.result import KPIResult
+
+COLUMNS = [
+    "date", "item_type", "logistics_partner_id", "total_imports",
+    "first_time_right", "open_errors", "first_time_right_rate", "open_error_rate",
+]
+
+# One grouped pass per chunk. The predicates repeat those of the partial index
+# everstox_qm__import__partial_lp_id_closed (logistics_partner_id, item_type,
+# creation_date) WHERE logistics_partner_id IS NOT NULL AND parent_id IS NULL,
+# so the scan never leaves it for the table's unindexed bulk (retries with a
+# parent_id, imports without a logistics partner). Error logs are probed per
+# import through ix_error_log_import_id.
+#
+# Open errors are deliberately a FILTER over the same scan rather than a read
+# of everstox_qm__import__partial_lp_id_error_open (logistics_partner_id,
+# state, creation_date). total_imports already has to visit every row of the
+# window, and the open-error rows are a subset of those, so the FILTER costs
+# no extra page reads. A separate pass over the error_open index would read
+# those rows a second time and give up the single GROUP BY; that index pays
+# off for queries that count open errors alone.
+GROUPED_QUERY = """
+    SELECT
+        i.creation_date::date AS day,
+        i.item_type,
+        i.logistics_partner_id,
+        COUNT(*) AS total_imports,
+        COUNT(*) FILTER (
+            WHERE i.state IN ('imported', 'async_imported')
+              AND NOT EXISTS (SELECT 1 FROM error_log e WHERE e.import_id = i.id)
+        ) AS first_time_right,
+        COUNT(*) FILTER (
+            WHERE i.state IN ('error', 'async_error')
+              AND i.resolved IS NOT TRUE
+        ) AS open_errors
+    FROM everstox_qm__import i
+    WHERE i.logistics_partner_id IS NOT NULL
+      AND i.parent_id IS NULL
+      AND i.creation_date >= :start_date
+      AND i.creation_date < :end_date + INTERVAL '1 day'
+      {filters}
+    GROUP BY 1, 2, 3
+"""
+
+
+def rate(part: int, total: int) -> float:
+    """Return part/total as a percentage rounded to 2 decimals (0.0 if empty)."""
+    return round(part / total * 100, 2) if total else 0.0
+
+
+class ImportHealthKPI(BaseKPI):
+    """
+    KPI: Import pipeline health per day, item type and logistics partner.
+
+    For top-level imports (no parent_id) with a logistics partner, counts
+    imports that were imported without any error log (first time right) and
+    imports still in an error state that nobody resolved (open errors), in one
+    grouped pass that stays on the everstox_qm__import__partial_lp_id_closed
+    partial index.
+
+    Long ranges are queried in chunks of `chunk_days` days, so each statement
+    stays short on a table with autovacuum disabled. Rows are per-day buckets,
+    so dev mode caches them per day.
+    """
+
+    name = "Import Health"
+    description = "First-time-right and open-error rates of imports per item type and partner"
+    source_tables = [
+        SourceTable("everstox_qm__import"),
+        SourceTable(
+            "error_log",
+            date_column=None,
+            shop_column=None,
+            where=(
+                "import_id IN (SELECT id FROM everstox_qm__import"
+                " WHERE creation_date >= :start_date"
+                " AND creation_date < :end_date + INTERVAL '1 day')"
+            ),
+        ),
+    ]
+    bucket_column = "date"
+    chunk_days = 7
+
+    def get_parameters(self) -> List[Parameter]:
+        """Return configurable parameters for this KPI."""
+        return [
+            Parameter(
+                name="start_date",
+                display_name="Start Date",
+                type=ParameterType.DATE,
+                required=False,
+                default=None,
+                description="Start of date range, format: YYYY-MM-DD (defaults to 13 days before end date)",
+            ),
+            Parameter(
+                name="end_date",
+                display_name="End Date",
+                type=ParameterType.DATE,
+                required=False,
+                default=None,
+                description="End of date range, format: YYYY-MM-DD (defaults to today)",
+            ),
+            Parameter(
+                name="item_type",
+                display_name="Item Type",
+                type=ParameterType.STRING,
+                required=False,
+                default=None,
+                description="Filter by item type (leave empty for all item types)",
+            ),
+            Parameter(
+                name="logistics_partner_id",
+                display_name="Logistics Partner ID",
+                type=ParameterType.STRING,
+                required=False,
+                default=None,
+                description="Filter by logistics partner ID (leave empty for all partners)",
+            ),
+        ]
+
+    def chunks(self, start_date: date, end_date: date) -> List[Tuple[date, date]]:
+        """Split an inclusive date range into chunks of at most chunk_days days."""
+        chunks: List[Tuple[date, date]] = []
+        chunk_start = start_date
+        while chunk_start <= end_date:
+            chunk_end = min(chunk_start + timedelta(days=self.chunk_days - 1), end_date)
+            chunks.append((chunk_start, chunk_end))
+            chunk_start = chunk_end + timedelta(days=1)
+        return chunks
+
+    def _row(self, db_row: Tuple[Any, ...]) -> Dict[str, Any]:
+        """Build an output row from a (day, item_type, partner, counts...) result row."""
+        day, item_type, partner, total, first_time_right, open_errors = db_row
+        return {
+            "date": day.isoformat() if hasattr(day, "isoformat") else str(day)[:10],
+            "item_type": item_type,
+            "logistics_partner_id": str(partner) if partner is not None else None,
+            "total_imports": total,
+            "first_time_right": first_time_right,
+            "open_errors": open_errors,
+            "first_time_right_rate": rate(first_time_right, total),
+            "open_error_rate": rate(open_errors, total),
+        }
+
+    def execute(self, engine: Engine, params: Dict[str, Any]) -> KPIResult:
+        """Execute the import health query chunk by chunk."""
+        start_time = datetime.now()
+
+        try:
+            start_date, end_date = self.resolve_date_range(params)
+            if start_date > end_date:
+                return KPIResult(
+                    kpi_name=self.name,
+                    columns=COLUMNS,
+                    rows=[],
+                    duration_seconds=(datetime.now() - start_time).total_seconds(),
+                    parameters=params,
+                    error="Invalid date range: start_date must be before or equal to end_date",
+                )
+
+            filters = []
+            filter_params: Dict[str, Any] = {}
+            if params.get("item_type"):
+                filters.append("AND i.item_type = :item_type")
+                filter_params["item_type"] = params["item_type"]
+            if params.get("logistics_partner_id"):
+                filters.append("AND i.logistics_partner_id = :logistics_partner_id")
+                filter_params["logistics_partner_id"] = params["logistics_partner_id"]
+            query = text(GROUPED_QUERY.format(filters=" ".join(filters)))
+
+            chunks = self.chunks(start_date, end_date)
+            rows: List[Dict[str, Any]] = []
+            with engine.connect() as conn:
+                for chunk_start, chunk_end in chunks:
+                    result = conn.execute(
+                        query, {**filter_params, "start_date": chunk_start, "end_date": chunk_end}
+                    )
+                    rows.extend(self._row(tuple(db_row)) for db_row in result)
+
+            rows.sort(key=lambda r: (r["date"], r["item_type"] or "", r["logistics_partner_id"] or ""))
+
+            return KPIResult(
+                kpi_name=self.name,
+                columns=COLUMNS,
+                rows=rows,
+                duration_seconds=(datetime.now() - start_time).total_seconds(),
+                parameters=params,
+                metadata={"chunks": len(chunks), "chunk_days": self.chunk_days},
+            )
+
+        except Exception as e:
+            return KPIResult(
+                kpi_name=self.name,
+                columns=COLUMNS,
+                rows=[],
+                duration_seconds=(datetime.now() - start_time).total_seconds(),
+                parameters=params,
+                error=str(e),
+            )
@@ -0,0 +1,161 @@
+"""Latest Parcel Status KPI - Current carrier phase distribution of recent shipments."""
+
+from datetime import datetime
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from src.kpis.base import BaseKPI, Parameter, ParameterType, SourceTable
+from src.models.result import KPIResult
+
+COLUMNS = ["phase", "shipments", "share"]
+NO_EVENTS_PHASE = "no_events"
+
+# Shipments in the window come from shipment_shop_id_shipment_date_id_idx
+# (shop_id, shipment_date, id) when a shop is given, otherwise from
+# ix_shipment_shipment_date. For each of them the lateral subquery reads the
+# first entry of ix_parcel_event_shipment_id_event_time_desc
+# (shipment_id, event_time DESC), so older events are never touched.
+# event_time IS NOT NULL skips NULL times, which sort first in that index.
+# A shipment without events has no lateral row (latest.shipment_id IS NULL);
+# one whose latest event has no phase keeps a NULL phase.
+LATEST_PHASE_QUERY = """
+    SELECT
+        CASE WHEN latest.shipment_id IS NULL THEN :no_events ELSE latest.phase END AS phase,
+        COUNT(*) AS shipments
+    FROM shipment s
+    LEFT JOIN LATERAL (
+        SELECT pe.shipment_id, pe.phase
+        FROM parcel_event pe
+        WHERE pe.shipment_id = s.id
+          AND pe.event_time IS NOT NULL
+        ORDER BY pe.event_time DESC
+        LIMIT 1
+    ) latest ON true
+    WHERE s.shipment_date >= :start_date
+      AND s.shipment_date < :end_date + INTERVAL '1 day'
+      {shop_filter}
+    GROUP BY 1
+    ORDER BY shipments DESC, phase
+"""
+
+
+class LatestParcelStatusKPI(BaseKPI):
+    """
+    KPI: Distribution of the latest carrier phase per shipment.
+
+    For shipments created in the date window (optionally for one shop), looks
+    up each shipment's most recent parcel event with an index-driven lateral
+    LIMIT 1 and counts shipments per phase. Shipments without events are
+    reported as "no_events"; those whose latest event has no phase are
+    counted under phase None. The cost grows with the number of shipments in
+    the window, not with the size of parcel_event.
+    """
+
+    name = "Latest Parcel Status"
+    description = "Current carrier phase of shipments in a date range"
+    source_tables = [
+        SourceTable("shipment", date_column="shipment_date"),
+        SourceTable(
+            "parcel_event",
+            date_column=None,
+            shop_column=None,
+            where=(
+                "shipment_id IN (SELECT id FROM shipment"
+                " WHERE shipment_date >= :start_date"
+                " AND shipment_date < :end_date + INTERVAL '1 day')"
+            ),
+        ),
+    ]
+    default_range_days = 7
+
+    def get_parameters(self) -> List[Parameter]:
+        """Return configurable parameters for this KPI."""
+        return [
+            Parameter(
+                name="start_date",
+                display_name="Start Date",
+                type=ParameterType.DATE,
+                required=False,
+                default=None,
+                description="First shipment day, format: YYYY-MM-DD (defaults to 6 days before end date)",
+            ),
+            Parameter(
+                name="end_date",
+                display_name="End Date",
+                type=ParameterType.DATE,
+                required=False,
+                default=None,
+                description="Last shipment day, format: YYYY-MM-DD (defaults to today)",
+            ),
+            Parameter(
+                name="shop_id",
+                display_name="Shop ID",
+                type=ParameterType.STRING,
+                required=False,
+                default=None,
+                description="Filter by shop ID (recommended: uses the shop/date index)",
+            ),
+        ]
+
+    def execute(self, engine: Engine, params: Dict[str, Any]) -> KPIResult:
+        """Execute the latest-phase distribution query."""
+        start_time = datetime.now()
+
+        try:
+            start_date, end_date = self.resolve_date_range(params)
+            if start_date > end_date:
+                return KPIResult(
+                    kpi_name=self.name,
+                    columns=COLUMNS,
+                    rows=[],
+                    duration_seconds=(datetime.now() - start_time).total_seconds(),
+                    parameters=params,
+                    error="Invalid date range: start_date must be before or equal to end_date",
+                )
+
+            query_params: Dict[str, Any] = {
+                "start_date": start_date,
+                "end_date": end_date,
+                "no_events": NO_EVENTS_PHASE,
+            }
+            shop_filter = ""
+            shop_id = params.get("shop_id")
+            if shop_id:
+                shop_filter = "AND s.shop_id = :shop_id"
+                query_params["shop_id"] = shop_id
+
+            with engine.connect() as conn:
+                result = conn.execute(
+                    text(LATEST_PHASE_QUERY.format(shop_filter=shop_filter)), query_params
+                )
+                counts = [(row[0], row[1]) for row in result]
+
+            total = sum(count for _, count in counts)
+            rows = [
+                {
+                    "phase": phase,
+                    "shipments": count,
+                    "share": round(count / total * 100, 2) if total else 0.0,
+                }
+                for phase, count in counts
+            ]
+
+            return KPIResult(
+                kpi_name=self.name,
+                columns=COLUMNS,
+                rows=rows,
+                duration_seconds=(datetime.now() - start_time).total_seconds(),
+                parameters=params,
+            )
+
+        except Exception as e:
+            return KPIResult(
+                kpi_name=self.name,
+                columns=COLUMNS,
+                rows=[],
+                duration_seconds=(datetime.now() - start_time).total_seconds(),
+                parameters=params,
+                error=str(e),
+            )
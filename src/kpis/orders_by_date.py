@@ -1,4 +1,4 @@
-"""Orders by Date KPI - Shows order counts for the last 14 days."""
+"""Orders by Date KPI - Shows order counts per day (last 14 days by default)."""
 
 from datetime import datetime, timedelta
 from typing import Any, Dict, List
@@ -6,9 +6,13 @@ from typing import Any, Dict, List
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
-from src.kpis.base import BaseKPI, Parameter, ParameterType
+from src.kpis.base import BaseKPI, Parameter, ParameterType, SourceTable
+from src.kpis.sampling import count_estimate, sample_settings, tablesample_clause
 from src.models.result import KPIResult
 
+COLUMNS = ["date", "orders_count"]
+PREVIEW_COLUMNS = ["date", "orders_count", "orders_count_low", "orders_count_high"]
+
 
 class OrdersByDateKPI(BaseKPI):
     """
@@ -16,15 +20,39 @@ class OrdersByDateKPI(BaseKPI):
 
     Queries the order table, groups by calendar date, and returns one row per day
     with the count of orders created on that day. Days with zero orders are
-    included so the result always has exactly 14 entries.
+    included so the result always has one entry per day in the range (14 by
+    default). Rows are per-day buckets, so dev mode caches them per day.
+
+    Supports preview runs: the order table is read with TABLESAMPLE and each
+    day's count is scaled up, with a 95% confidence interval in
+    orders_count_low/orders_count_high.
     """
 
     name = "Orders by Date"
     description = "Order counts for the last 14 days, optionally filtered by shop"
+    source_tables = [SourceTable("order")]
+    bucket_column = "date"
+    supports_preview = True
 
     def get_parameters(self) -> List[Parameter]:
         """Return configurable parameters for this KPI."""
         return [
+            Parameter(
+                name="start_date",
+                display_name="Start Date",
+                type=ParameterType.DATE,
+                required=False,
+                default=None,
+                description="Start of date range, format: YYYY-MM-DD (defaults to 13 days before end date)",
+            ),
+            Parameter(
+                name="end_date",
+                display_name="End Date",
+                type=ParameterType.DATE,
+                required=False,
+                default=None,
+                description="End of date range, format: YYYY-MM-DD (defaults to today)",
+            ),
             Parameter(
                 name="shop_id",
                 display_name="Shop ID",
@@ -40,17 +68,27 @@ class OrdersByDateKPI(BaseKPI):
         start_time = datetime.now()
 
         try:
-            end_date = datetime.utcnow().date()
-            start_date = end_date - timedelta(days=13)
-            date_range_days = 14
+            sample = sample_settings(params)
+            start_date, end_date = self.resolve_date_range(params)
+            if start_date > end_date:
+                return KPIResult(
+                    kpi_name=self.name,
+                    columns=COLUMNS,
+                    rows=[],
+                    duration_seconds=(datetime.now() - start_time).total_seconds(),
+                    parameters=params,
+                    error="Invalid date range: start_date must be before or equal to end_date",
+                )
+            date_range_days = (end_date - start_date).days + 1
 
             shop_id = params.get("shop_id")
 
-            query = """
+            sample_clause = tablesample_clause(sample[1]) if sample else ""
+            query = f"""
             SELECT
                 (creation_date AT TIME ZONE 'UTC')::date AS order_date,
                 COUNT(*) AS orders_count
-            FROM "order"
+            FROM "order" {sample_clause}
             WHERE
                 creation_date >= :start_date
                 AND creation_date < :end_date + INTERVAL '1 day'
@@ -61,6 +99,9 @@ class OrdersByDateKPI(BaseKPI):
                 "end_date": end_date,
             }
 
+            if sample:
+                query_params["sample_percent"] = sample[0]
+
             if shop_id:
                 query += " AND shop_id = :shop_id"
                 query_params["shop_id"] = shop_id
@@ -80,31 +121,42 @@ class OrdersByDateKPI(BaseKPI):
                 for row in rows
             }
 
-            # Build output with all 14 days (including zeros)
+            # Build output with every day in the range (including zeros)
             output_rows: List[Dict[str, Any]] = []
             for i in range(date_range_days):
                 d = start_date + timedelta(days=i)
                 date_str = d.isoformat()
-                output_rows.append({
-                    "date": date_str,
-                    "orders_count": count_by_date.get(date_str, 0),
-                })
+                count = count_by_date.get(date_str, 0)
+                if sample:
+                    estimate, low, high = count_estimate(count, sample[0])
+                    output_rows.append({
+                        "date": date_str,
+                        "orders_count": estimate,
+                        "orders_count_low": low,
+                        "orders_count_high": high,
+                    })
+                else:
+                    output_rows.append({"date": date_str, "orders_count": count})
 
             duration = (datetime.now() - start_time).total_seconds()
 
             return KPIResult(
                 kpi_name=self.name,
-                columns=["date", "orders_count"],
+                columns=PREVIEW_COLUMNS if sample else COLUMNS,
                 rows=output_rows,
                 duration_seconds=duration,
                 parameters=params,
+                approximate=sample is not None,
+                metadata=(
+                    {"sample_percent": sample[0], "sample_method": sample[1]} if sample else {}
+                ),
             )
 
         except Exception as e:
             duration = (datetime.now() - start_time).total_seconds()
             return KPIResult(
                 kpi_name=self.name,
-                columns=["date", "orders_count"],
+                columns=COLUMNS,
                 rows=[],
                 duration_seconds=duration,
                 parameters=params,
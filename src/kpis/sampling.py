@@ -0,0 +1,177 @@
+"""
+Helpers for approximate fast-preview execution with TABLESAMPLE.
+
+A preview run reads a random sample of a KPI's main table and scales the
+counts back up. KPIs that set `supports_preview = True` read the
+PREVIEW_PERCENT_PARAM / PREVIEW_METHOD_PARAM entries of their params (added by
+preview_params()) and flag their result as approximate.
+
+Sampling methods:
+    SYSTEM     Samples whole table blocks. Fastest, since unsampled blocks are
+               never read, but rows stored together are sampled together, so
+               the confidence intervals below are optimistic for clustered data.
+    BERNOULLI  Samples individual rows. Reads the whole table but skips most
+               of the per-row work; the intervals are accurate.
+"""
+
+import math
+from typing import Any, Dict, Optional, Tuple
+
+PREVIEW_PERCENT_PARAM = "sample_percent"
+PREVIEW_METHOD_PARAM = "sample_method"
+PREVIEW_PARAMS = (PREVIEW_PERCENT_PARAM, PREVIEW_METHOD_PARAM)
+
+SAMPLE_METHODS = ("SYSTEM", "BERNOULLI")
+DEFAULT_SAMPLE_PERCENT = 1.0
+DEFAULT_SAMPLE_METHOD = "SYSTEM"
+
+# z-score of the two-sided 95% confidence intervals
+Z_95 = 1.96
+
+# Sampled counts below this get an exact upper bound instead of the normal
+# approximation, which collapses to [0, 0] for a count of 0.
+EXACT_COUNT_LIMIT = 100
+
+
+def preview_params(
+    params: Dict[str, Any],
+    percent: float = DEFAULT_SAMPLE_PERCENT,
+    method: str = DEFAULT_SAMPLE_METHOD,
+) -> Dict[str, Any]:
+    """
+    Return a copy of params that requests a sampled preview run.
+
+    Raises:
+        ValueError: If percent or method is invalid.
+    """
+    validate_sample(percent, method)
+    return {**params, PREVIEW_PERCENT_PARAM: float(percent), PREVIEW_METHOD_PARAM: method.upper()}
+
+
+def is_preview(params: Dict[str, Any]) -> bool:
+    """Whether params request a sampled preview run."""
+    return params.get(PREVIEW_PERCENT_PARAM) is not None
+
+
+def validate_sample(percent: float, method: str) -> None:
+    """
+    Check a sample percentage and method.
+
+    Raises:
+        ValueError: If percent is not in (0, 100] or method is unknown.
+    """
+    if not 0 < float(percent) <= 100:
+        raise ValueError(f"Sample percent must be in (0, 100], got {percent}")
+    if method.upper() not in SAMPLE_METHODS:
+        raise ValueError(f"Sample method must be one of {', '.join(SAMPLE_METHODS)}")
+
+
+def sample_settings(params: Dict[str, Any]) -> Optional[Tuple[float, str]]:
+    """
+    Return (percent, method) of a preview run, or None for exact runs.
+
+    Raises:
+        ValueError: If the requested sample is invalid.
+    """
+    if not is_preview(params):
+        return None
+    percent = float(params[PREVIEW_PERCENT_PARAM])
+    method = str(params.get(PREVIEW_METHOD_PARAM) or DEFAULT_SAMPLE_METHOD).upper()
+    validate_sample(percent, method)
+    return percent, method
+
+
+def tablesample_clause(method: str) -> str:
+    """
+    Return a TABLESAMPLE clause binding the percentage as :sample_percent.
+
+    The method is a keyword and cannot be a bind parameter, so it is checked
+    against SAMPLE_METHODS.
+    """
+    method = method.upper()
+    if method not in SAMPLE_METHODS:
+        raise ValueError(f"Sample method must be one of {', '.join(SAMPLE_METHODS)}")
+    return f"TABLESAMPLE {method} (:sample_percent)"
+
+
+def count_estimate(sample_count: int, percent: float, z: float = Z_95) -> Tuple[int, int, int]:
+    """
+    Scale a sampled row count to the full table, with a confidence interval.
+
+    Each row is in the sample with probability p = percent / 100, so the
+    sampled count is Binomial(N, p). The estimate is count / p with standard
+    error sqrt(count * (1 - p)) / p. The lower bound never goes below the
+    sampled count, since those rows exist. Below EXACT_COUNT_LIMIT the upper
+    bound is the exact binomial one (see _binomial_upper_bound); for a count of
+    0 that is about 3.7 / p, the two-sided form of the rule of three.
+
+    Returns:
+        Tuple of (estimate, low, high), rounded to whole rows.
+    """
+    p = percent / 100.0
+    estimate = sample_count / p
+    margin = z * math.sqrt(sample_count * (1 - p)) / p
+    low = max(float(sample_count), estimate - margin)
+    if sample_count < EXACT_COUNT_LIMIT:
+        high = float(_binomial_upper_bound(sample_count, p, z))
+    else:
+        high = estimate + margin
+    return round(estimate), round(low), round(high)
+
+
+def _binomial_cdf(k: int, n: int, p: float) -> float:
+    """P(X <= k) for X ~ Binomial(n, p), with 0 < p < 1."""
+    log_p, log_q = math.log(p), math.log1p(-p)
+    return sum(
+        math.exp(
+            math.lgamma(n + 1) - math.lgamma(i + 1) - math.lgamma(n - i + 1)
+            + i * log_p + (n - i) * log_q
+        )
+        for i in range(min(k, n) + 1)
+    )
+
+
+def _binomial_upper_bound(sample_count: int, p: float, z: float) -> int:
+    """
+    Largest table size N that could still give sample_count sampled rows.
+
+    That is the largest N with P(X <= sample_count) above the upper tail of
+    the interval (2.5% for z = 1.96), found by bisection; the cumulative
+    probability falls as N grows.
+    """
+    if p >= 1:
+        return sample_count
+    tail = 0.5 * math.erfc(z / math.sqrt(2))
+    low, high = sample_count, max(sample_count, 1) * 2
+    while _binomial_cdf(sample_count, high, p) > tail:
+        low, high = high, high * 2
+    while high - low > 1:
+        middle = (low + high) // 2
+        if _binomial_cdf(sample_count, middle, p) > tail:
+            low = middle
+        else:
+            high = middle
+    return low
+
+
+def proportion_interval(
+    successes: int, total: int, z: float = Z_95
+) -> Tuple[float, float, float]:
+    """
+    Wilson score interval of a sampled success rate, in percent.
+
+    Returns:
+        Tuple of (rate, low, high) rounded to two decimals; all 0.0 when total
+        is 0.
+    """
+    if total <= 0:
+        return 0.0, 0.0, 0.0
+    phat = successes / total
+    denominator = 1 + z * z / total
+    center = (phat + z * z / (2 * total)) / denominator
+    margin = z * math.sqrt(phat * (1 - phat) / total + z * z / (4 * total * total)) / denominator
+    return (
+        round(phat * 100, 2),
+        round(max(0.0, center - margin) * 100, 2),
+        round(min(1.0, center + margin) * 100, 2),
+    )
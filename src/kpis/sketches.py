@@ -0,0 +1,124 @@
+"""
+Mergeable quantile sketches for percentile KPIs.
+
+QuantileSketch is a DDSketch-style log-bucketed histogram: a positive value v
+falls into bucket ceil(log(v) / log(gamma)) with gamma = (1 + a) / (1 - a),
+so every quantile is returned within relative accuracy a. Bucket counts add
+up, so sketches of days, warehouses or shops merge into sketches of any
+combination of them without rescanning rows.
+
+Bucket keys are simple enough to compute in SQL (see bucket_key_sql), so the
+database returns one row per (group, bucket) instead of one row per value.
+"""
+
+import math
+from typing import Any, Dict, Iterable, Optional
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+
+def bucket_key_sql(column: str, gamma_param: str = ":gamma") -> str:
+    """
+    Return a SQL expression computing a value's sketch bucket key.
+
+    Values <= 0 map to NULL, which QuantileSketch counts in its zero bucket.
+    """
+    return (
+        f"CASE WHEN {column} > 0 "
+        f"THEN CEIL(LN({column}) / LN({gamma_param}))::int END"
+    )
+
+
+class QuantileSketch:
+    """Log-bucketed quantile sketch with a fixed relative accuracy."""
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.bins: Dict[int, int] = {}
+        # Values <= 0 (e.g. fulfillments that were not late)
+        self.zero_count = 0
+
+    @property
+    def count(self) -> int:
+        """Number of values added."""
+        return self.zero_count + sum(self.bins.values())
+
+    def key(self, value: float) -> Optional[int]:
+        """Bucket key of a value (None for the zero bucket)."""
+        if value <= 0:
+            return None
+        return math.ceil(math.log(value) / math.log(self.gamma))
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Add a value `count` times."""
+        self.add_bucket(self.key(value), count)
+
+    def add_bucket(self, key: Optional[int], count: int) -> None:
+        """Add `count` values to a bucket (None is the zero bucket)."""
+        if key is None:
+            self.zero_count += count
+        else:
+            self.bins[key] = self.bins.get(key, 0) + count
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Add another sketch's counts to this one (in place). Returns self."""
+        if not math.isclose(other.gamma, self.gamma):
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        self.zero_count += other.zero_count
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate the q-quantile (0 <= q <= 1).
+
+        Returns:
+            The estimate, 0.0 if it falls in the zero bucket, or None if the
+            sketch is empty.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be in [0, 1]")
+        total = self.count
+        if total == 0:
+            return None
+
+        rank = q * (total - 1)
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                # Midpoint of the bucket (gamma^(k-1), gamma^k] in relative terms
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for caching."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "zero_count": self.zero_count,
+            "bins": {str(key): count for key, count in self.bins.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        """Rebuild a sketch from to_dict() output."""
+        sketch = cls(data["relative_accuracy"])
+        sketch.zero_count = data["zero_count"]
+        sketch.bins = {int(key): count for key, count in data["bins"].items()}
+        return sketch
+
+    @classmethod
+    def merged(
+        cls, sketches: Iterable["QuantileSketch"], relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY
+    ) -> "QuantileSketch":
+        """Merge sketches into a new sketch."""
+        result = cls(relative_accuracy)
+        for sketch in sketches:
+            result.merge(sketch)
+        return result
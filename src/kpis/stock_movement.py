@@ -0,0 +1,286 @@
+"""Stock Movement KPI - Daily stock level and change per SKU and warehouse."""
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from src.kpis.base import BaseKPI, Parameter, ParameterType, SourceTable
+from src.models.result import KPIResult
+
+COLUMNS = ["date", "sku", "warehouse_id", "quantity", "change"]
+
+# Without a shop filter (e.g. in Run All) only the first stocks by SKU are
+# returned, so the curves stay a bounded set instead of the whole platform.
+MAX_STOCKS_WITHOUT_SHOP = 500
+
+# Stocks of the shop (and SKU) are resolved through unique_shop_id_sku /
+# idx_product_shop_composite and ix_stock_product_id.
+STOCKS_CTE = """
+    WITH stocks AS (
+        SELECT st.id AS stock_id, p.sku, st.warehouse_id
+        FROM product p
+        JOIN stock st ON st.product_id = p.id
+        WHERE true {filters}
+        {stock_limit}
+    )
+"""
+
+# Closed days come from the daily rollup. Both parts are range reads on
+# pk_stock_update_rollup (stock_id, update_date): the days in the window, plus
+# the last rollup row before the window so each curve starts with a level.
+HISTORY_QUERY = STOCKS_CTE + """
+    SELECT s.stock_id, s.sku, s.warehouse_id, r.update_date, r.new_quantity
+    FROM stocks s
+    JOIN stock_update_rollup r ON r.stock_id = s.stock_id
+    WHERE r.update_date >= :start_date
+      AND r.update_date <= :end_date
+    UNION ALL
+    SELECT s.stock_id, s.sku, s.warehouse_id, seed.update_date, seed.new_quantity
+    FROM stocks s
+    CROSS JOIN LATERAL (
+        SELECT r.update_date, r.new_quantity
+        FROM stock_update_rollup r
+        WHERE r.stock_id = s.stock_id
+          AND r.update_date < :start_date
+        ORDER BY r.update_date DESC
+        LIMIT 1
+    ) seed
+"""
+
+# The open day is not rolled up yet. With a shop filter its predicates repeat
+# those of the partial index idx_stock_update_shop_creation_date_rollup
+# (shop_id, creation_date), so only today's successful updates are read. That
+# index leads with shop_id, so without a shop the open day is bounded by
+# update_datetime instead, which idx_stock_update_datetime_desc serves; updates
+# recorded today carry today's update_datetime.
+OPEN_DAY_QUERY = STOCKS_CTE + """
+    SELECT DISTINCT ON (su.stock_id)
+        su.stock_id, s.sku, s.warehouse_id, su.new_quantity
+    FROM stock_update su
+    JOIN stocks s ON s.stock_id = su.stock_id
+    WHERE su.creation_date >= :today
+      AND su.stock_id IS NOT NULL
+      AND su.processing_state IN ('updated', 'unchanged')
+      AND su.errors IS NULL
+      AND su.new_quantity IS NOT NULL
+      {open_day_filter}
+    ORDER BY su.stock_id, su.creation_date DESC
+"""
+
+# stock_id -> (sku, warehouse_id)
+StockKeys = Dict[Any, Tuple[str, Optional[str]]]
+# stock_id -> day -> end-of-day quantity
+StockLevels = Dict[Any, Dict[date, int]]
+
+
+class StockMovementKPI(BaseKPI):
+    """
+    KPI: Daily stock level and change per SKU and warehouse.
+
+    Returns one row per day and stock (SKU in a warehouse) with the end-of-day
+    quantity and its change from the previous day. Days before today (UTC) are
+    read from stock_update_rollup; the last rollup row before start_date seeds
+    each curve, and days without updates carry the previous level forward.
+    Only the open day reads stock_update, through the partial index
+    idx_stock_update_shop_creation_date_rollup. With a shop filter, a
+    multi-month curve for one SKU therefore costs a few index lookups instead
+    of a scan of stock_update. Without one, the open day is read through
+    idx_stock_update_datetime_desc and only the first MAX_STOCKS_WITHOUT_SHOP
+    stocks by SKU are returned (metadata["stock_limit"]).
+
+    Rows are per-day buckets, so dev mode caches them per day. The open day
+    is live data, so the KPI only runs on a read replica that is at most a
+    minute behind.
+    """
+
+    name = "Stock Movement"
+    description = "Daily stock level and change per SKU and warehouse"
+    source_tables = [
+        SourceTable("product", date_column=None),
+        SourceTable("stock", date_column=None, shop_column=None),
+        SourceTable("stock_update_rollup", date_column="update_date", shop_column=None),
+        SourceTable("stock_update"),
+    ]
+    bucket_column = "date"
+    max_replica_lag = 60.0
+
+    def get_parameters(self) -> List[Parameter]:
+        """Return configurable parameters for this KPI."""
+        return [
+            Parameter(
+                name="start_date",
+                display_name="Start Date",
+                type=ParameterType.DATE,
+                required=False,
+                default=None,
+                description="First day, format: YYYY-MM-DD (defaults to 13 days before end date)",
+            ),
+            Parameter(
+                name="end_date",
+                display_name="End Date",
+                type=ParameterType.DATE,
+                required=False,
+                default=None,
+                description="Last day, format: YYYY-MM-DD (defaults to today)",
+            ),
+            Parameter(
+                name="shop_id",
+                display_name="Shop ID",
+                type=ParameterType.STRING,
+                required=False,
+                default=None,
+                description=(
+                    "Filter by shop ID (recommended; without it only the first "
+                    f"{MAX_STOCKS_WITHOUT_SHOP} stocks of all shops are returned)"
+                ),
+            ),
+            Parameter(
+                name="sku",
+                display_name="SKU",
+                type=ParameterType.STRING,
+                required=False,
+                default=None,
+                description="Filter by SKU (leave empty for all SKUs)",
+            ),
+        ]
+
+    def _filters(self, params: Dict[str, Any]) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """
+        Build the stock filters shared by both queries.
+
+        Returns:
+            Tuple of (SQL fragments for the query placeholders, bind parameters).
+        """
+        filters = []
+        query_params: Dict[str, Any] = {}
+        shop_id = params.get("shop_id")
+        if shop_id:
+            filters.append("AND p.shop_id = :shop_id")
+            open_day_filter = "AND su.shop_id = :shop_id"
+            stock_limit = ""
+            query_params["shop_id"] = shop_id
+        else:
+            open_day_filter = "AND su.update_datetime >= :today"
+            stock_limit = "ORDER BY p.sku, st.id LIMIT :stock_limit"
+            query_params["stock_limit"] = MAX_STOCKS_WITHOUT_SHOP
+        sku = params.get("sku")
+        if sku:
+            filters.append("AND p.sku = :sku")
+            query_params["sku"] = sku
+        fragments = {
+            "filters": " ".join(filters),
+            "open_day_filter": open_day_filter,
+            "stock_limit": stock_limit,
+        }
+        return fragments, query_params
+
+    def _load_levels(
+        self, engine: Engine, start_date: date, end_date: date, today: date, params: Dict[str, Any]
+    ) -> Tuple[StockKeys, StockLevels, Dict[Any, int]]:
+        """
+        Load end-of-day levels from the rollup and the open day.
+
+        Returns:
+            Tuple of (stock keys, levels inside the window, seed level before
+            the window per stock).
+        """
+        fragments, query_params = self._filters(params)
+        keys: StockKeys = {}
+        levels: StockLevels = {}
+        seeds: Dict[Any, int] = {}
+
+        with engine.connect() as conn:
+            history_end = min(end_date, today - timedelta(days=1))
+            if start_date <= history_end:
+                result = conn.execute(
+                    text(HISTORY_QUERY.format(**fragments)),
+                    {**query_params, "start_date": start_date, "end_date": history_end},
+                )
+                for stock_id, sku, warehouse_id, day, quantity in result:
+                    keys[stock_id] = (sku, warehouse_id)
+                    if quantity is None:
+                        continue
+                    if day < start_date:
+                        seeds[stock_id] = quantity
+                    else:
+                        levels.setdefault(stock_id, {})[day] = quantity
+
+            if start_date <= today <= end_date:
+                result = conn.execute(
+                    text(OPEN_DAY_QUERY.format(**fragments)),
+                    {**query_params, "today": today},
+                )
+                for stock_id, sku, warehouse_id, quantity in result:
+                    keys[stock_id] = (sku, warehouse_id)
+                    levels.setdefault(stock_id, {})[today] = quantity
+
+        return keys, levels, seeds
+
+    def execute(self, engine: Engine, params: Dict[str, Any], today: Optional[date] = None) -> KPIResult:
+        """Execute the stock movement KPI."""
+        start_time = datetime.now()
+        today = today or datetime.now(timezone.utc).date()
+
+        try:
+            start_date, end_date = self.resolve_date_range(params)
+            if start_date > end_date:
+                return KPIResult(
+                    kpi_name=self.name,
+                    columns=COLUMNS,
+                    rows=[],
+                    duration_seconds=(datetime.now() - start_time).total_seconds(),
+                    parameters=params,
+                    error="Invalid date range: start_date must be before or equal to end_date",
+                )
+
+            keys, levels, seeds = self._load_levels(engine, start_date, end_date, today, params)
+
+            last_day = min(end_date, today)
+            days = [start_date + timedelta(days=i) for i in range((last_day - start_date).days + 1)]
+            ordered = sorted(keys, key=lambda s: (keys[s][0] or "", str(keys[s][1] or "")))
+
+            metadata: Dict[str, Any] = {
+                "stocks": len(keys),
+                "open_day_included": start_date <= today <= end_date,
+            }
+            if not params.get("shop_id"):
+                metadata["stock_limit"] = MAX_STOCKS_WITHOUT_SHOP
+
+            current = dict(seeds)
+            rows: List[Dict[str, Any]] = []
+            for day in days:
+                for stock_id in ordered:
+                    previous = current.get(stock_id)
+                    quantity = levels.get(stock_id, {}).get(day, previous)
+                    if quantity is None:
+                        continue
+                    sku, warehouse_id = keys[stock_id]
+                    rows.append({
+                        "date": day.isoformat(),
+                        "sku": sku,
+                        "warehouse_id": str(warehouse_id) if warehouse_id is not None else None,
+                        "quantity": quantity,
+                        "change": quantity - previous if previous is not None else None,
+                    })
+                    current[stock_id] = quantity
+
+            return KPIResult(
+                kpi_name=self.name,
+                columns=COLUMNS,
+                rows=rows,
+                duration_seconds=(datetime.now() - start_time).total_seconds(),
+                parameters=params,
+                metadata=metadata,
+            )
+
+        except Exception as e:
+            return KPIResult(
+                kpi_name=self.name,
+                columns=COLUMNS,
+                rows=[],
+                duration_seconds=(datetime.now() - start_time).total_seconds(),
+                parameters=params,
+                error=str(e),
+            )
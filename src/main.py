@@ -3,29 +3,256 @@
 Product KPIs - Main entry point.
 
 Run with: python -m src.main
+
+Commands:
+    python -m src.main                      Interactive menu
+    python -m src.main --mirror URL         Interactive menu against a local mirror
+    python -m src.main --warmup             Interactive menu, connecting in the background
+    python -m src.main --profiles eu,us     Interactive menu, Run All fans out to profiles
+    python -m src.main mirror TARGET ...    Extract KPI source tables into a local mirror
+    python -m src.main resume [RUN_ID]      Finish an interrupted Run All
+    python -m src.main serve [--port N]     Serve KPIs over a local HTTP/JSON API
 """
 
-from src.config import reset_config
-from src.menu.console import Menu
+import argparse
+import sys
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+from src.config import ExportFormat, get_config, reset_config
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="product-kpis",
+        description="A modular CLI tool for generating product KPI reports",
+    )
+    parser.add_argument(
+        "--mirror",
+        metavar="URL",
+        help="Run KPIs against a local mirror instead of the stored database URL",
+    )
+
+    parser.add_argument(
+        "--warmup",
+        action="store_true",
+        help="Connect to the database in the background while the menu is idle",
+    )
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        default=0,
+        metavar="N",
+        help="With --warmup, prefetch results of the N most frequently run KPIs",
+    )
+
+    parser.add_argument(
+        "--profiles",
+        metavar="NAMES",
+        default="",
+        help="Comma-separated connection profiles Run All executes against concurrently",
+    )
+
+    parser.add_argument(
+        "--replica",
+        action="store_true",
+        help="Run KPIs on the stored read replica while its replication lag allows",
+    )
+    parser.add_argument(
+        "--max-replica-lag",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Replication lag KPIs tolerate on the replica by default (default: 300)",
+    )
+    parser.add_argument(
+        "--load-budget",
+        type=float,
+        default=None,
+        metavar="WEIGHT",
+        help="Total cost weight of KPIs allowed to query the database at once",
+    )
+    parser.add_argument(
+        "--events",
+        choices=["console", "jsonl", "off"],
+        default="console",
+        help="Where execution events go: console, events.jsonl in the output directory, or off",
+    )
+    parser.add_argument(
+        "--event-level",
+        choices=["debug", "info", "warning"],
+        default="info",
+        help="Lowest event level shown on the console (debug shows every KPI, query and fetch)",
+    )
+    parser.add_argument(
+        "--profiling",
+        action="store_true",
+        help="Write cProfile/tracemalloc artifacts for every KPI execution and export",
+    )
+    parser.add_argument(
+        "--telemetry",
+        type=Path,
+        default=None,
+        metavar="DIR",
+        help="Write Prometheus textfile metrics and OTLP JSON traces of each run to DIR",
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+
+    mirror = subparsers.add_parser(
+        "mirror",
+        help="Extract the tables KPIs read into a local PostgreSQL or DuckDB mirror",
+    )
+    mirror.add_argument(
+        "target",
+        help=(
+            "PostgreSQL URL (schema from ddl.sql must exist) or DuckDB file path. "
+            "A PostgreSQL mirror is loaded in one transaction with "
+            "session_replication_role = replica (needs a superuser), so foreign keys "
+            "to tables that are not mirrored are not checked; mirrored tables are "
+            "emptied with TRUNCATE ... CASCADE, which also empties tables referencing them"
+        ),
+    )
+    mirror.add_argument(
+        "--start", type=date.fromisoformat, required=True, help="First day, YYYY-MM-DD"
+    )
+    mirror.add_argument(
+        "--end", type=date.fromisoformat, default=None, help="Last day, YYYY-MM-DD (defaults to today)"
+    )
+    mirror.add_argument("--shop-id", default=None, help="Only mirror rows for this shop")
+    mirror.add_argument(
+        "--kpi",
+        action="append",
+        default=None,
+        help="KPI name to mirror tables for (repeatable, defaults to all KPIs)",
+    )
+
+    resume = subparsers.add_parser(
+        "resume",
+        help="Finish an interrupted Run All, re-running only failed or missing KPIs",
+    )
+    resume.add_argument(
+        "run_id", nargs="?", default=None, help="Run to resume (defaults to the most recent)"
+    )
+    resume.add_argument(
+        "--format", choices=[f.value for f in ExportFormat], default=ExportFormat.CSV.value,
+        help="Report export format",
+    )
+
+    serve = subparsers.add_parser(
+        "serve",
+        help="Keep KPIs, the connection pool and results warm behind a local HTTP/JSON API",
+    )
+    serve.add_argument("--host", default="127.0.0.1", help="Host to bind (default: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=8765, help="Port to bind (default: 8765)")
+    serve.add_argument(
+        "--socket", type=Path, default=None, help="Serve on a Unix domain socket instead of TCP"
+    )
+    serve.add_argument(
+        "--ttl", type=float, default=300.0,
+        help="Seconds successful results are served from memory (default: 300)",
+    )
+    serve.add_argument("--dev", action="store_true", help="Enable dev mode caching")
+    serve.add_argument("--verbose", action="store_true", help="Log every request")
+
+    return parser
+
+
+def run_serve(args: argparse.Namespace) -> int:
+    """Run the serve command until interrupted."""
+    from src.service import serve
+
+    get_config().dev_mode = args.dev
+    serve(args.host, args.port, args.socket, args.ttl, args.verbose)
+    return 0
+
 
+def run_resume(args: argparse.Namespace) -> int:
+    """Run the resume command."""
+    from src.runner.executor import KPIExecutor
 
-def main() -> None:
+    get_config().export_format = ExportFormat(args.format)
+    report = KPIExecutor().resume(args.run_id)
+    if report is None:
+        return 1
+    return 0 if report.failure_count == 0 else 1
+
+
+def run_mirror(args: argparse.Namespace) -> int:
+    """Run the mirror command and print per-table statistics."""
+    from src.credentials.keychain import get_db_url
+    from src.database.connection import init_db_engine
+    from src.database.mirror import mirror_kpis
+    from src.kpis import discover_kpis
+
+    kpis = discover_kpis()
+    if args.kpi:
+        kpis = [k for k in kpis if k.name in args.kpi]
+        if not kpis:
+            print(f"No KPIs named: {', '.join(args.kpi)}")
+            return 1
+
+    end_date = args.end or datetime.now(timezone.utc).date()
+
+    print(f"Mirroring {args.start} to {end_date} into {args.target}...")
+    print("-" * 40)
+
+    source_engine = init_db_engine(get_db_url())
+    try:
+        stats = mirror_kpis(
+            source_engine, kpis, args.target, args.start, end_date, args.shop_id
+        )
+    except Exception as e:
+        print(f"Mirror failed: {e}")
+        return 1
+    finally:
+        source_engine.dispose()
+
+    for table in stats:
+        print(f"  {table.table}: {table.rows} rows ({table.duration_seconds:.1f}s)")
+    print("-" * 40)
+    print(f"Complete: {len(stats)} tables mirrored")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> None:
     """Main entry point for Product KPIs tool."""
+    args = build_parser().parse_args(argv)
+
     # Reset config to defaults on each launch (dev_mode = False)
     reset_config()
+    config = get_config()
+    config.mirror_url = args.mirror
+    config.warmup = args.warmup
+    config.prefetch_count = max(0, args.prefetch)
+    config.profiles = [name.strip() for name in args.profiles.split(",") if name.strip()]
+    config.use_replica = args.replica
+    if args.max_replica_lag is not None:
+        config.replica_max_lag = max(0.0, args.max_replica_lag)
+    if args.load_budget and args.load_budget > 0:
+        config.load_budget = args.load_budget
+    config.event_sink = args.events
+    config.event_level = args.event_level
+    config.profiling = args.profiling
+    config.telemetry_directory = args.telemetry
 
-    # Create menu
-    menu = Menu()
+    if args.command == "mirror":
+        sys.exit(run_mirror(args))
+    if args.command == "resume":
+        sys.exit(run_resume(args))
+    if args.command == "serve":
+        sys.exit(run_serve(args))
 
-    # Import and set up executor (done here to avoid circular imports)
-    try:
-        from src.runner.executor import KPIExecutor
+    from src.menu.console import Menu
+
+    # Create menu; it imports the executor (SQLAlchemy, keyring, KPIs) on first
+    # use so the menu renders without waiting for them
+    menu = Menu()
 
-        executor = KPIExecutor()
-        menu.set_executor(executor)
-    except ImportError:
-        # Executor not yet implemented - menu will show error if KPIs are run
-        pass
+    if config.warmup:
+        menu.start_warmup()
 
     # Run the menu
     menu.run_main_menu()
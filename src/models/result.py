@@ -17,10 +17,18 @@ class KPIResult:
     parameters: Dict[str, Any] = field(default_factory=dict)
     from_cache: bool = False
     error: Optional[str] = None
+    # Set when rows were streamed straight to an export file (bulk COPY fetch)
+    streamed_row_count: Optional[int] = None
+    # Execution instrumentation (e.g. query strategy chosen by the KPI)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    # Set for sampled preview runs: counts are estimates, not exact values
+    approximate: bool = False
 
     @property
     def row_count(self) -> int:
         """Number of rows in the result."""
+        if self.streamed_row_count is not None:
+            return self.streamed_row_count
         return len(self.rows)
 
     @property
@@ -37,6 +45,7 @@ class KPIReport:
     results: List[KPIResult] = field(default_factory=list)
     total_duration_seconds: float = 0.0
     dev_mode: bool = False
+    run_id: Optional[str] = None
 
     @property
     def success_count(self) -> int:
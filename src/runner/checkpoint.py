@@ -0,0 +1,113 @@
+"""
+Per-KPI checkpoints of a Run All, so interrupted runs can be resumed.
+
+Each successful KPI result is written to history/runs/{run_id}/ as soon as it
+completes. Resuming a run loads those results and re-executes only the KPIs
+that failed or never ran.
+"""
+
+import json
+import re
+import secrets
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.models.result import KPIResult
+
+CHECKPOINT_DIR = Path("history") / "runs"
+
+
+def new_run_id() -> str:
+    """
+    Return a new run ID: the start time to the microsecond and a random suffix.
+
+    IDs sort by start time (see CheckpointStore.latest); the suffix keeps runs
+    started at the same moment, e.g. by two processes, apart.
+    """
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{secrets.token_hex(3)}"
+
+
+def _file_name(kpi_name: str) -> str:
+    """Return a filesystem-safe checkpoint file name for a KPI."""
+    return re.sub(r"[^0-9a-zA-Z]+", "_", kpi_name).strip("_").lower() + ".json"
+
+
+def result_to_dict(result: KPIResult) -> Dict[str, Any]:
+    """Serialize a KPIResult for checkpointing."""
+    return {
+        "kpi_name": result.kpi_name,
+        "columns": result.columns,
+        "rows": result.rows,
+        "executed_at": result.executed_at.isoformat(),
+        "duration_seconds": result.duration_seconds,
+        "parameters": result.parameters,
+        "from_cache": result.from_cache,
+        "error": result.error,
+        "metadata": result.metadata,
+        "approximate": result.approximate,
+    }
+
+
+def result_from_dict(data: Dict[str, Any]) -> KPIResult:
+    """Rebuild a KPIResult from result_to_dict() output."""
+    return KPIResult(
+        kpi_name=data["kpi_name"],
+        columns=data["columns"],
+        rows=data["rows"],
+        executed_at=datetime.fromisoformat(data["executed_at"]),
+        duration_seconds=data["duration_seconds"],
+        parameters=data.get("parameters", {}),
+        from_cache=data.get("from_cache", False),
+        error=data.get("error"),
+        metadata=data.get("metadata", {}),
+        approximate=data.get("approximate", False),
+    )
+
+
+class CheckpointStore:
+    """Checkpointed results of one Run All, identified by its run ID."""
+
+    def __init__(self, run_id: str, root: Optional[Path] = None):
+        self.run_id = run_id
+        self.directory = (root or CHECKPOINT_DIR) / run_id
+
+    def save(self, result: KPIResult) -> None:
+        """Checkpoint a successful result (failed results are not stored)."""
+        if not result.success:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / _file_name(result.kpi_name)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(result_to_dict(result), f, default=str)
+        # Rename so a crash mid-write never leaves a truncated checkpoint
+        tmp_path.replace(path)
+
+    def load(self) -> Dict[str, KPIResult]:
+        """Return checkpointed results keyed by KPI name."""
+        results: Dict[str, KPIResult] = {}
+        if not self.directory.exists():
+            return results
+        for path in sorted(self.directory.glob("*.json")):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    result = result_from_dict(json.load(f))
+            except (OSError, ValueError, KeyError):
+                continue
+            results[result.kpi_name] = result
+        return results
+
+    @staticmethod
+    def list_runs(root: Optional[Path] = None) -> List[str]:
+        """Return run IDs with checkpoints, oldest first."""
+        root = root or CHECKPOINT_DIR
+        if not root.exists():
+            return []
+        return sorted(p.name for p in root.iterdir() if p.is_dir())
+
+    @classmethod
+    def latest(cls, root: Optional[Path] = None) -> Optional["CheckpointStore"]:
+        """Return the store of the most recent run, or None if there is none."""
+        runs = cls.list_runs(root)
+        return cls(runs[-1], root) if runs else None
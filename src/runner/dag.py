@@ -0,0 +1,108 @@
+"""
+Dependency graph of KPIs and a parallel scheduler for it.
+
+KPIs declare the KPIs whose results they consume in `depends_on` (see
+src.kpis.derived). Run All executes a KPI as soon as everything it depends on
+has finished, running independent KPIs in parallel, so each upstream KPI runs
+once per report and its result is passed to dependents in memory.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar
+
+R = TypeVar("R")
+
+
+class DependencyError(Exception):
+    """A KPI depends on an unknown KPI, or dependencies form a cycle."""
+
+
+def build_graph(kpis: Sequence[Any]) -> Dict[str, List[str]]:
+    """
+    Map each KPI name to the names of the KPIs it depends on.
+
+    Raises:
+        DependencyError: If a dependency is unknown or there is a cycle.
+    """
+    graph = {kpi.name: list(getattr(kpi, "depends_on", [])) for kpi in kpis}
+    for name, deps in graph.items():
+        missing = [dep for dep in deps if dep not in graph]
+        if missing:
+            raise DependencyError(f"{name} depends on unknown KPI(s): {', '.join(missing)}")
+    topological_order(graph)
+    return graph
+
+
+def topological_order(graph: Dict[str, List[str]]) -> List[str]:
+    """
+    Order KPI names so every KPI comes after its dependencies.
+
+    Ties keep the graph's insertion order.
+
+    Raises:
+        DependencyError: If the dependencies form a cycle.
+    """
+    remaining = {name: set(deps) for name, deps in graph.items()}
+    order: List[str] = []
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise DependencyError(f"Dependency cycle between: {', '.join(sorted(remaining))}")
+        for name in ready:
+            order.append(name)
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return order
+
+
+def execute_graph(
+    graph: Dict[str, List[str]],
+    run: Callable[[str, Dict[str, R]], R],
+    max_workers: int = 1,
+    completed: Optional[Dict[str, R]] = None,
+    priority: Optional[Sequence[str]] = None,
+    on_result: Optional[Callable[[str, R], None]] = None,
+) -> Dict[str, R]:
+    """
+    Run every node of a dependency graph, each once its dependencies finished.
+
+    Args:
+        graph: Node name -> names of the nodes it depends on (see build_graph)
+        run: Called as run(name, upstream) on a worker thread, where upstream
+            maps each dependency's name to its result
+        max_workers: Number of nodes run concurrently
+        completed: Results of nodes that already ran (they are not run again)
+        priority: Preferred start order of nodes that are ready at the same
+            time (e.g. longest first); defaults to the graph order
+        on_result: Called on the scheduling thread as each node finishes
+
+    Returns:
+        Results of all nodes, including `completed`.
+    """
+    results: Dict[str, R] = dict(completed or {})
+    rank = {name: i for i, name in enumerate(priority or graph)}
+    pending = sorted(
+        (name for name in graph if name not in results),
+        key=lambda name: rank.get(name, len(rank)),
+    )
+    running: Dict[Future, str] = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        while pending or running:
+            for name in [n for n in pending if all(dep in results for dep in graph[n])]:
+                pending.remove(name)
+                upstream = {dep: results[dep] for dep in graph[name]}
+                running[pool.submit(run, name, upstream)] = name
+
+            if not running:
+                raise DependencyError(f"Unresolvable dependencies: {', '.join(pending)}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name] = future.result()
+                if on_result is not None:
+                    on_result(name, results[name])
+
+    return results
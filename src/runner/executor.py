@@ -1,52 +1,319 @@
 """KPI execution with progress tracking."""
 
-import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import replace
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
-from src.cache import load_from_cache, save_to_cache
+from src.cache import (
+    execute_with_range_cache,
+    load_from_cache,
+    make_query_id,
+    save_to_cache,
+)
 from src.config import get_config
-from src.credentials.keychain import get_db_url
+from src.credentials.keychain import get_db_url, get_profile_url, get_replica_url
 from src.database.connection import init_db_engine
+from src.database.keyset import KeysetPager, Page
+from src.database.replica import ReplicaRouter
+from src.events import (
+    INFO,
+    KPI_FINISHED,
+    KPI_RETRY,
+    KPI_STARTED,
+    WARNING,
+    WARNING_RAISED,
+    emit,
+    flush as flush_events,
+)
 from src.export import get_exporter
 from src.kpis import discover_kpis, BaseKPI
+from src.kpis.derived import DerivedKPI
+from src.kpis.sampling import is_preview
 from src.models.result import KPIResult, KPIReport
+from src.runner.checkpoint import CheckpointStore, new_run_id
+from src.runner.dag import DependencyError, build_graph, execute_graph
+from src.runner.governor import LoadGovernor, estimate_weight
+from src.runner.history import HISTORY_PATH, RunHistory
+from src.runner.retry import backoff_delay, is_transient_error
+from src.runner.singleflight import SingleFlight
+from src.telemetry import get_telemetry
+
+if TYPE_CHECKING:
+    # cProfile, pstats and tracemalloc are only imported when profiling is on
+    from src.runner.profiling import ProfileRecord, Profiler
+
+# Shared by all executors in the process, so Run All workers, service
+# requests and menu runs coalesce identical in-flight executions
+_flights: SingleFlight[KPIResult] = SingleFlight()
+
+# Seconds a prefetched result may be handed to the first matching run
+PREFETCH_MAX_AGE = 600.0
+
+# Rows shown per page when printing a result to the console
+DISPLAY_PAGE_ROWS = 20
 
 
 class KPIExecutor:
-    """Execute KPIs with progress display and error handling."""
+    """
+    Execute KPIs with progress display and error handling.
+
+    An executor bound to a connection `profile` runs against that profile's
+    database with its own engine and pool, keeps its own run history, and
+    bypasses the executor's dev mode result caches (which are not keyed by
+    environment). Caches KPIs keep themselves, like the sketch cache of
+    FulfillmentLatenessKPI, are keyed by the engine's database instead.
 
-    def __init__(self):
+    With config.use_replica, KPIs run on the database's read replica while its
+    replication lag is within the KPI's tolerance, and on the primary
+    otherwise; result.metadata["db_route"] records which one served them.
+
+    With config.load_budget, database work is admitted by a LoadGovernor
+    (src.runner.governor): KPIs whose cost weights would exceed the budget
+    queue, and result.metadata["queue_wait_seconds"] records the wait.
+
+    With config.profiling, menu runs and Run All profile every KPI execution
+    and export (src.runner.profiling) into a profile_<timestamp> directory
+    next to the report; Run All then executes one KPI at a time.
+
+    With config.telemetry_directory, runs write Prometheus textfile metrics and
+    OTLP JSON spans of the run, its KPIs, queries and exports (src.telemetry).
+    """
+
+    def __init__(self, history: Optional[RunHistory] = None, profile: Optional[str] = None):
+        self.profile = profile
         self._engine = None
+        self._engine_url: Optional[str] = None
+        self._engine_lock = threading.Lock()
+        self._replica: Optional[ReplicaRouter] = None
+        self._replica_url: Optional[str] = None
+        self._governor: Optional[LoadGovernor] = None
+        self._weights: Dict[str, float] = {}
+        self._profiler: Optional["Profiler"] = None
+        self._history = history
+        self._prefetched: Dict[Tuple[str, str], Tuple[float, KPIResult]] = {}
+        self._prefetch_lock = threading.Lock()
 
     def _get_engine(self):
-        """Get or create the database engine."""
-        if self._engine is None:
-            db_url = get_db_url()
-            self._engine = init_db_engine(db_url)
-        return self._engine
+        """
+        Get or create the database engine.
+
+        Uses the executor's connection profile when set. Otherwise uses the
+        local mirror when config.mirror_url is set, or else the database URL
+        stored in the keychain.
+        """
+        if self.profile is not None:
+            db_url = get_profile_url(self.profile)
+        else:
+            db_url = get_config().mirror_url or get_db_url()
+        with self._engine_lock:
+            if self._engine is None or db_url != self._engine_url:
+                if self._engine is not None:
+                    self._engine.dispose()
+                self._engine = init_db_engine(db_url)
+                self._engine_url = db_url
+            return self._engine
+
+    def _get_replica(self) -> Optional[ReplicaRouter]:
+        """
+        Get or create the router for the read replica, if routing applies.
+
+        Returns None when config.use_replica is off, KPIs run against a local
+        mirror, or no replica URL is stored for the executor's database.
+        """
+        config = get_config()
+        if not config.use_replica or (self.profile is None and config.mirror_url):
+            return None
+        replica_url = get_replica_url(self.profile)
+        with self._engine_lock:
+            if replica_url != self._replica_url:
+                if self._replica is not None:
+                    self._replica.dispose()
+                self._replica = ReplicaRouter(init_db_engine(replica_url)) if replica_url else None
+                self._replica_url = replica_url
+            return self._replica
+
+    def _engine_for(self, kpi: BaseKPI) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Pick the engine a KPI runs on: the replica if fresh enough, else the primary.
+
+        Returns:
+            Tuple of (engine, routing metadata for the result). The metadata is
+            empty when no replica is configured.
+        """
+        replica = self._get_replica()
+        if replica is None:
+            return self._instrumented(self._get_engine()), {}
+
+        max_lag = kpi.max_replica_lag
+        if max_lag is None:
+            max_lag = get_config().replica_max_lag
+        lag = replica.lag()
+        use_replica = lag is not None and lag <= max_lag
+        route = {"db_route": "replica" if use_replica else "primary", "replica_lag_seconds": lag}
+        engine = replica.engine if use_replica else self._get_engine()
+        return self._instrumented(engine), route
+
+    def _instrumented(self, engine: Any) -> Any:
+        """Trace the engine's statements when telemetry is on; return the engine."""
+        telemetry = get_telemetry()
+        if telemetry is not None:
+            telemetry.instrument(engine)
+        return engine
 
     def _execute_with_cache(
         self, kpi: BaseKPI, engine: Any, params: Dict[str, Any]
+    ) -> KPIResult:
+        """
+        Execute KPI, coalescing identical concurrent executions.
+
+        Executions are keyed on the KPI name and canonicalized parameters (the
+        cache key). A request arriving while an identical one is running waits
+        for it and gets a copy of its result with metadata["coalesced"] set,
+        so duplicate queries never reach the database.
+        """
+        query_id = make_query_id(kpi.name, params)
+        prefetched = self._take_prefetched(engine, query_id)
+        if prefetched is not None:
+            return prefetched
+
+        flight_key = f"{self.profile}:{query_id}" if self.profile is not None else query_id
+        result, shared = _flights.do(
+            flight_key, lambda: self._execute_cached_or_live(kpi, engine, params)
+        )
+        if shared:
+            result = replace(result, metadata={**result.metadata, "coalesced": True})
+        return result
+
+    def prefetch(self, kpi: BaseKPI) -> bool:
+        """
+        Execute a KPI with default parameters ahead of time.
+
+        The result is handed (once) to the first run of the KPI with the same
+        parameters on the same database (engine URL, so a changed database,
+        mirror or replica route is a miss) within PREFETCH_MAX_AGE seconds,
+        flagged with metadata["prefetched"]. A run started while the prefetch
+        is still in flight joins it through single-flight coalescing.
+
+        Returns:
+            True if a successful result was prefetched.
+        """
+        params = {p.name: p.default for p in kpi.get_parameters()}
+        engines: List[Any] = []
+
+        def execute(engine: Any) -> KPIResult:
+            engines.append(engine)
+            return self._execute_with_cache(kpi, engine, params)
+
+        try:
+            result = self._execute_with_retry(kpi, params, execute=execute)
+        except Exception:
+            return False
+        if not result.success:
+            return False
+
+        key = self._prefetch_key(engines[-1], make_query_id(kpi.name, params))
+        with self._prefetch_lock:
+            self._prefetched[key] = (time.monotonic(), result)
+        return True
+
+    def prefetch_frequent(self, kpis: List[Any], count: int) -> List[str]:
+        """
+        Prefetch the `count` KPIs run most often according to the run history.
+
+        Args:
+            kpis: Discovered KPI classes
+            count: Number of KPIs to prefetch
+
+        Returns:
+            Names of the KPIs whose results were prefetched.
+        """
+        by_name = {kpi_class.name: kpi_class for kpi_class in kpis}
+        try:
+            names = self._get_history().most_frequent(count)
+        except Exception:
+            return []
+        return [
+            name for name in names
+            if name in by_name and self.prefetch(by_name[name]())
+        ]
+
+    @staticmethod
+    def _prefetch_key(engine: Any, query_id: str) -> Tuple[str, str]:
+        """Key a prefetched result by the database it was read from and its query."""
+        return str(getattr(engine, "url", None)), query_id
+
+    def _take_prefetched(self, engine: Any, query_id: str) -> Optional[KPIResult]:
+        """Pop a fresh prefetched result for query_id read from engine, if there is one."""
+        with self._prefetch_lock:
+            entry = self._prefetched.pop(self._prefetch_key(engine, query_id), None)
+        if entry is None or time.monotonic() - entry[0] > PREFETCH_MAX_AGE:
+            return None
+        result = entry[1]
+        return replace(result, metadata={**result.metadata, "prefetched": True})
+
+    def _execute_cached_or_live(
+        self, kpi: BaseKPI, engine: Any, params: Dict[str, Any]
     ) -> KPIResult:
         """
         Execute KPI with cache support for dev mode.
 
-        In dev mode, checks cache first and saves results to cache.
-        In production mode, always fetches live data.
+        In dev mode, checks cache first and saves results to cache. KPIs with a
+        bucket_column are cached per day, so only uncached days are queried.
+        In production mode, always fetches live data. Profile-bound executors
+        skip these caches; KPI-level caches are keyed by database and still
+        apply (see src.cache.sketch_cache).
         """
         config = get_config()
+        if self.profile is not None:
+            return self._execute_governed(kpi, engine, params, lambda: kpi.execute(engine, params))
+
+        # Sampled previews are not split into (exact) per-day cache buckets.
+        # Only the days missing from the cache are governed, so a fully
+        # cached range never queues.
+        if config.dev_mode and kpi.bucket_column and not is_preview(params):
+            governed: Dict[str, Any] = {}
+
+            def execute_gap(gap_params: Dict[str, Any]) -> KPIResult:
+                # Profiled inside the admission, like _execute_governed.
+                with self._admission(kpi, engine, params, governed):
+                    gap_result = self._execute_profiled(
+                        kpi, lambda: kpi.execute(engine, gap_params)
+                    )
+                if "profile" in gap_result.metadata:
+                    governed["profile"] = gap_result.metadata["profile"]
+                    governed["peak_memory_bytes"] = max(
+                        governed.get("peak_memory_bytes", 0),
+                        gap_result.metadata["peak_memory_bytes"],
+                    )
+                return gap_result
+
+            result = execute_with_range_cache(kpi, engine, params, execute=execute_gap)
+            result.metadata.update(governed)
+            return result
 
         # In dev mode, try to load from cache
         if config.dev_mode:
-            # Create a simple query identifier for caching
-            query_id = f"{kpi.name}:{json.dumps(params, sort_keys=True, default=str)}"
+            query_id = make_query_id(kpi.name, params)
             cached = load_from_cache(kpi.name, query_id, params)
 
             if cached:
                 columns, rows, metadata = cached
-                print("[cached] ", end="")
                 return KPIResult(
                     kpi_name=kpi.name,
                     columns=columns,
@@ -57,11 +324,11 @@ class KPIExecutor:
                 )
 
         # Execute the KPI
-        result = kpi.execute(engine, params)
+        result = self._execute_governed(kpi, engine, params, lambda: kpi.execute(engine, params))
 
         # In dev mode, save to cache on success
         if config.dev_mode and result.success:
-            query_id = f"{kpi.name}:{json.dumps(params, sort_keys=True, default=str)}"
+            query_id = make_query_id(kpi.name, params)
             save_to_cache(
                 kpi.name,
                 query_id,
@@ -73,13 +340,375 @@ class KPIExecutor:
 
         return result
 
+    def _get_governor(self) -> Optional[LoadGovernor]:
+        """Get the load governor for config.load_budget, or None if unlimited."""
+        budget = get_config().load_budget
+        if not budget:
+            return None
+        with self._engine_lock:
+            if self._governor is None or self._governor.budget != budget:
+                self._governor = LoadGovernor(budget)
+            return self._governor
+
+    def _cost_weight(self, kpi: BaseKPI, engine: Any, params: Dict[str, Any]) -> float:
+        """Return a KPI's cost weight for params, resolved once per executor."""
+        key = make_query_id(kpi.name, params)
+        weight = self._weights.get(key)
+        if weight is None:
+            try:
+                history: Optional[RunHistory] = self._get_history()
+            except Exception:
+                history = None
+            weight = estimate_weight(kpi, params, engine, history)
+            self._weights[key] = weight
+        return weight
+
+    @contextmanager
+    def _admission(
+        self, kpi: BaseKPI, engine: Any, params: Dict[str, Any], metadata: Dict[str, Any]
+    ) -> Iterator[None]:
+        """
+        Hold the load governor's admission for a block of a KPI's database work.
+
+        Sets metadata["cost_weight"] and adds the time queued to
+        metadata["queue_wait_seconds"]; a no-op without a load budget.
+        """
+        governor = self._get_governor()
+        if governor is None:
+            yield
+            return
+
+        weight = self._cost_weight(kpi, engine, params)
+        with governor.admit(weight) as wait:
+            metadata["cost_weight"] = round(weight, 2)
+            metadata["queue_wait_seconds"] = round(
+                metadata.get("queue_wait_seconds", 0.0) + wait, 3
+            )
+            yield
+
+    def _execute_governed(
+        self,
+        kpi: BaseKPI,
+        engine: Any,
+        params: Dict[str, Any],
+        execute: Callable[[], KPIResult],
+    ) -> KPIResult:
+        """
+        Run a KPI's database work once the load governor admits it.
+
+        Records the KPI's cost weight and its time in the queue in
+        result.metadata["cost_weight"] and ["queue_wait_seconds"]. Admission is
+        always taken before the profiler's lock, never the other way round, so
+        concurrent KPIs cannot deadlock on the two.
+        """
+        governed: Dict[str, Any] = {}
+        with self._admission(kpi, engine, params, governed):
+            result = self._execute_profiled(kpi, execute)
+        result.metadata.update(governed)
+        return result
+
+    def _start_profiling(self) -> None:
+        """Start a new profile directory for a run if config.profiling is on."""
+        config = get_config()
+        if config.profiling:
+            from src.runner.profiling import Profiler
+
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            self._profiler = Profiler(config.output_directory / f"profile_{timestamp}")
+        else:
+            self._profiler = None
+
+    @contextmanager
+    def _profile(self, name: str, phase: str) -> Iterator[List["ProfileRecord"]]:
+        """Profile the block when a run started profiling; a no-op otherwise."""
+        profiler = self._profiler
+        if profiler is None:
+            yield []
+            return
+        with profiler.profile(name, phase) as records:
+            yield records
+
+    def _execute_profiled(self, kpi: BaseKPI, execute: Callable[[], KPIResult]) -> KPIResult:
+        """Run a KPI execution, recording its profile and peak memory in metadata."""
+        with self._profile(kpi.name, "execute") as records:
+            result = execute()
+        if records:
+            result.metadata["profile"] = str(records[0].pstats_path)
+            result.metadata["peak_memory_bytes"] = records[0].peak_memory_bytes
+        return result
+
+    def _execute_traced(self, kpi: BaseKPI, execute: Callable[[], KPIResult]) -> KPIResult:
+        """Run a KPI execution in a telemetry span and record its metrics."""
+        telemetry = get_telemetry()
+        if telemetry is None:
+            return execute()
+
+        with telemetry.kpi_span(kpi.name, environment=self.profile) as span:
+            try:
+                result = execute()
+            except Exception as e:
+                telemetry.record_kpi(
+                    KPIResult(
+                        kpi_name=kpi.name,
+                        columns=[],
+                        rows=[],
+                        duration_seconds=span.duration_seconds,
+                        error=str(e),
+                    ),
+                    span,
+                )
+                raise
+            telemetry.record_kpi(result, span)
+        return result
+
+    @contextmanager
+    def _run_span(self, name: str, **attributes: Any) -> Iterator[None]:
+        """Trace a run when telemetry is on, writing metrics and spans at the end."""
+        telemetry = get_telemetry()
+        if telemetry is None:
+            yield
+            return
+        with telemetry.run_span(name, environment=self.profile, **attributes):
+            yield
+
+    @contextmanager
+    def _exporting(self, name: str, output_path: Path) -> Iterator[None]:
+        """Profile and trace writing an export file."""
+        telemetry = get_telemetry()
+        with self._profile(name, "export"):
+            if telemetry is None:
+                yield
+                return
+            with telemetry.export_span(name, output_path, get_config().export_format.value):
+                yield
+
+    def _get_history(self) -> RunHistory:
+        """Get or open the local run history store."""
+        if self._history is None:
+            if self.profile is not None:
+                safe_name = re.sub(r"[^0-9a-zA-Z]+", "_", self.profile).strip("_").lower()
+                self._history = RunHistory(HISTORY_PATH.with_name(f"run_history_{safe_name}.sqlite3"))
+            else:
+                self._history = RunHistory()
+        return self._history
+
+    def _record_history(
+        self, result: KPIResult, params: Dict[str, Any], run_id: Optional[str] = None
+    ) -> None:
+        """Record an execution and flag latency regressions in result.metadata."""
+        try:
+            history = self._get_history()
+            history.record(result, params, run_id)
+            regression = history.check_regression(result, params)
+        except Exception as e:
+            emit(
+                WARNING_RAISED, result.kpi_name, WARNING,
+                message=f"Could not update run history: {e}",
+            )
+            return
+
+        if regression:
+            result.metadata["latency_regression"] = regression
+
+    def _execute_with_retry(
+        self,
+        kpi: BaseKPI,
+        params: Dict[str, Any],
+        execute: Optional[Callable[[Any], KPIResult]] = None,
+    ) -> KPIResult:
+        """Execute a KPI with connection retries, traced as one KPI span."""
+        return self._execute_traced(kpi, lambda: self._execute_attempts(kpi, params, execute))
+
+    def _execute_attempts(
+        self,
+        kpi: BaseKPI,
+        params: Dict[str, Any],
+        execute: Optional[Callable[[Any], KPIResult]] = None,
+    ) -> KPIResult:
+        """
+        Execute a KPI, retrying transient connection failures with backoff.
+
+        `execute` runs one attempt on the routed engine; it defaults to the
+        coalesced, cached and governed execution (_execute_with_cache).
+
+        Failures are retried up to config.max_retries times when they look like
+        dropped or unreachable connections (e.g. the VPN went down); other
+        errors are returned immediately. The number of retries is recorded in
+        result.metadata["retries"]. Each attempt is routed separately, so a
+        replica that dropped the connection is re-checked before reuse.
+        Emits KPI_STARTED, KPI_RETRY and KPI_FINISHED events.
+        """
+        config = get_config()
+        attempt = 0
+        route: Dict[str, Any] = {}
+        emit(KPI_STARTED, kpi.name, params=params)
+
+        while True:
+            try:
+                engine, route = self._engine_for(kpi)
+                if execute is not None:
+                    result = execute(engine)
+                else:
+                    result = self._execute_with_cache(kpi, engine, params)
+                transient = not result.success and is_transient_error(result.error)
+            except Exception as e:
+                if not is_transient_error(e) or attempt >= config.max_retries:
+                    emit(KPI_FINISHED, kpi.name, error=str(e), retries=attempt)
+                    raise
+                transient = True
+                result = None
+
+            if not transient or attempt >= config.max_retries:
+                break
+
+            delay = backoff_delay(attempt, config.retry_base_delay)
+            attempt += 1
+            emit(
+                KPI_RETRY, kpi.name, INFO,
+                message=f"Connection problem, retry {attempt}/{config.max_retries} in {delay:.1f}s",
+                attempt=attempt,
+                delay_seconds=round(delay, 2),
+            )
+            self._reset_engine()
+            time.sleep(delay)
+
+        if attempt:
+            result.metadata["retries"] = attempt
+        result.metadata.update(route)
+        emit(
+            KPI_FINISHED, kpi.name,
+            duration_seconds=round(result.duration_seconds, 3),
+            rows=result.row_count,
+            from_cache=result.from_cache,
+            retries=attempt,
+            error=result.error,
+        )
+        return result
+
+    def _reset_engine(self) -> None:
+        """Drop pooled connections so the next attempt reconnects."""
+        with self._engine_lock:
+            if self._engine is not None:
+                self._engine.dispose()
+            if self._replica is not None:
+                self._replica.dispose()
+                self._replica.invalidate()
+
+    def check_connection(self) -> Optional[str]:
+        """
+        Open (and return to the pool) one database connection.
+
+        Returns:
+            None if the connection succeeded, otherwise the error message.
+        """
+        try:
+            with self._get_engine().connect():
+                pass
+        except Exception as e:
+            return str(e)
+        return None
+
+    def run(self, kpi: BaseKPI, params: Dict[str, Any]) -> KPIResult:
+        """
+        Execute a KPI and record it in the run history, without report output.
+
+        Used by service mode; applies dev mode caching and connection retries
+        like the menu does.
+        """
+        try:
+            result = self._execute_with_retry(kpi, params)
+        finally:
+            telemetry = get_telemetry()
+            if telemetry is not None:
+                telemetry.write()
+        self._record_history(result, params)
+        return result
+
+    def _run_kpi(
+        self,
+        kpi: BaseKPI,
+        run_id: str,
+        checkpoints: Optional[CheckpointStore] = None,
+        upstream: Optional[Dict[str, KPIResult]] = None,
+    ) -> KPIResult:
+        """
+        Execute one KPI of a Run All with default parameters, never raising.
+
+        Derived KPIs are computed from `upstream` (the results of the KPIs they
+        depend on) instead of querying the database.
+        """
+        # Use default parameters for Run All
+        params: Dict[str, Any] = {}
+        try:
+            params = {p.name: p.default for p in kpi.get_parameters()}
+            if isinstance(kpi, DerivedKPI) and upstream is not None:
+                result = kpi.compute_from(upstream, params)
+            else:
+                result = self._execute_with_retry(kpi, params)
+        except Exception as e:
+            result = KPIResult(
+                kpi_name=kpi.name,
+                columns=[],
+                rows=[],
+                error=str(e),
+            )
+
+        self._record_history(result, params, run_id)
+        if checkpoints is not None:
+            try:
+                checkpoints.save(result)
+            except OSError as e:
+                emit(WARNING_RAISED, kpi.name, WARNING, message=f"Could not checkpoint: {e}")
+        return result
+
     def execute_all(self) -> Optional[KPIReport]:
         """
         Execute all discovered KPIs and export results.
 
+        KPIs run on config.max_workers threads, historically slowest first
+        (longest-processing-time ordering from the run history), so the longest
+        KPIs do not end up starting last. Derived KPIs start once the KPIs they
+        depend on have finished and reuse their results in memory. The report
+        keeps discovery order.
+        Each successful result is checkpointed under the report's run_id so an
+        interrupted run can be finished with resume().
+
         Returns:
             KPIReport with all results, or None if no KPIs found.
         """
+        run_id = new_run_id()
+        with self._run_span("run all", run_id=run_id):
+            return self._run_report(CheckpointStore(run_id), completed={})
+
+    def resume(self, run_id: Optional[str] = None) -> Optional[KPIReport]:
+        """
+        Finish an interrupted Run All and export its report.
+
+        Results checkpointed by the original run are reused; only KPIs that
+        failed or never ran are executed.
+
+        Args:
+            run_id: Run to resume (defaults to the most recent run)
+
+        Returns:
+            KPIReport with all results, or None if there is nothing to resume.
+        """
+        checkpoints = CheckpointStore(run_id) if run_id else CheckpointStore.latest()
+        if checkpoints is None or not checkpoints.directory.exists():
+            print()
+            print("No checkpointed run to resume.")
+            return None
+
+        completed = checkpoints.load()
+        print()
+        print(f"Resuming run {checkpoints.run_id} ({len(completed)} KPIs already complete)")
+        with self._run_span("resume", run_id=checkpoints.run_id):
+            return self._run_report(checkpoints, completed)
+
+    def _run_report(
+        self, checkpoints: CheckpointStore, completed: Dict[str, KPIResult]
+    ) -> Optional[KPIReport]:
+        """Run every KPI not in `completed`, then summarize and export the report."""
         config = get_config()
         kpis = discover_kpis()
 
@@ -92,35 +721,27 @@ class KPIExecutor:
         print("Running KPIs...")
         print("-" * 40)
 
-        results: List[KPIResult] = []
-        total_start = datetime.now()
-
-        for i, kpi_class in enumerate(kpis, 1):
-            kpi = kpi_class()
-            print(f"  [{i}/{len(kpis)}] {kpi.name}...", end=" ", flush=True)
+        run_id = checkpoints.run_id
+        checkpoints.directory.mkdir(parents=True, exist_ok=True)
+        self._start_profiling()
+        instances = {kpi_class.name: kpi_class() for kpi_class in kpis}
+        try:
+            graph = build_graph(list(instances.values()))
+        except DependencyError as e:
+            print(f"Invalid KPI dependencies: {e}")
+            return None
 
-            try:
-                engine = self._get_engine()
-                # Use default parameters for Run All
-                params = {p.name: p.default for p in kpi.get_parameters()}
-                result = self._execute_with_cache(kpi, engine, params)
-                results.append(result)
+        completed = {name: r for name, r in completed.items() if name in instances}
+        total_start = datetime.now()
 
-                if result.success:
-                    print(f"✓ ({result.duration_seconds:.1f}s)")
-                else:
-                    print(f"✗ ({result.error})")
+        for name in instances:
+            if name in completed:
+                print(f"  [checkpoint] {name}... ✓")
 
-            except Exception as e:
-                error_result = KPIResult(
-                    kpi_name=kpi.name,
-                    columns=[],
-                    rows=[],
-                    error=str(e),
-                )
-                results.append(error_result)
-                print(f"✗ ({e})")
+        results_by_name = self._run_suite(instances, graph, run_id, checkpoints, completed)
 
+        results = [results_by_name[name] for name in instances]
+        flush_events()
         total_duration = (datetime.now() - total_start).total_seconds()
 
         # Create report
@@ -128,20 +749,201 @@ class KPIExecutor:
             results=results,
             total_duration_seconds=total_duration,
             dev_mode=config.dev_mode,
+            run_id=run_id,
         )
 
         # Print summary
         print("-" * 40)
         print(f"Complete: {report.success_count}/{len(results)} KPIs succeeded")
         print(f"Total time: {total_duration:.1f}s")
+        if report.failure_count:
+            print(f"Resume with: python -m src.main resume {run_id}")
+        self._print_queue_waits(results)
+        self._print_regressions(results)
 
         # Export results
         self._export_report(results)
 
         return report
 
+    def _run_suite(
+        self,
+        instances: Dict[str, BaseKPI],
+        graph: Dict[str, List[str]],
+        run_id: str,
+        checkpoints: Optional[CheckpointStore],
+        completed: Dict[str, KPIResult],
+        label: str = "",
+    ) -> Dict[str, KPIResult]:
+        """
+        Run every KPI of a suite not in `completed`, printing progress.
+
+        Independent KPIs run in parallel on config.max_workers threads, longest
+        first; dependents start once their upstream results are available.
+
+        Returns:
+            Results by KPI name, including the `completed` ones.
+        """
+        pending = [kpi for name, kpi in instances.items() if name not in completed]
+        try:
+            priority = [kpi.name for kpi in self._get_history().order_longest_first(pending)]
+        except Exception:
+            priority = [kpi.name for kpi in pending]
+
+        finished = 0
+        progress_lock = threading.Lock()
+
+        def report_progress(name: str, result: KPIResult) -> None:
+            nonlocal finished
+            with progress_lock:
+                finished += 1
+                step = f"  {label}[{finished}/{len(pending)}] {name}..."
+                if result.success:
+                    cached = ", cached" if result.from_cache else ""
+                    print(f"{step} ✓ ({result.duration_seconds:.1f}s{cached})")
+                else:
+                    print(f"{step} ✗ ({result.error})")
+
+        # Profiles are only attributable to one KPI when KPIs run one at a time
+        max_workers = 1 if self._profiler is not None else get_config().max_workers
+        return execute_graph(
+            graph,
+            lambda name, upstream: self._run_kpi(instances[name], run_id, checkpoints, upstream),
+            max_workers=max_workers,
+            completed=completed,
+            priority=priority,
+            on_result=report_progress,
+        )
+
+    def execute_all_profiles(self, profiles: List[str]) -> Optional[KPIReport]:
+        """
+        Execute all KPIs against several connection profiles concurrently.
+
+        Each profile gets its own executor (engine, connection pool and run
+        history), and the suites run side by side, each on config.max_workers
+        threads. Results are tagged with metadata["environment"] and combined
+        into one report, grouped by profile. Fan-out runs are not checkpointed.
+
+        Args:
+            profiles: Connection profile names (see src.credentials.keychain)
+
+        Returns:
+            Combined KPIReport, or None if no KPIs or profiles were given.
+        """
+        config = get_config()
+        kpis = discover_kpis()
+
+        if not kpis or not profiles:
+            print()
+            print("No KPIs or connection profiles to run.")
+            return None
+
+        instances = {kpi_class.name: kpi_class() for kpi_class in kpis}
+        try:
+            graph = build_graph(list(instances.values()))
+        except DependencyError as e:
+            print(f"Invalid KPI dependencies: {e}")
+            return None
+
+        print()
+        print(f"Running KPIs against {len(profiles)} environments: {', '.join(profiles)}")
+        print("-" * 40)
+
+        run_id = new_run_id()
+        executors = {profile: KPIExecutor(profile=profile) for profile in profiles}
+        environments = ",".join(profiles)
+        with self._run_span("run all profiles", run_id=run_id, environments=environments):
+            total_start = datetime.now()
+
+            def run_profile(profile: str) -> Dict[str, KPIResult]:
+                return executors[profile]._run_suite(
+                    instances, graph, run_id, None, {}, label=f"[{profile}] "
+                )
+
+            try:
+                with ThreadPoolExecutor(max_workers=len(profiles)) as pool:
+                    futures = {profile: pool.submit(run_profile, profile) for profile in profiles}
+                results: List[KPIResult] = []
+                for profile in profiles:
+                    try:
+                        by_name = futures[profile].result()
+                    except Exception as e:
+                        by_name = {
+                            name: KPIResult(kpi_name=name, columns=[], rows=[], error=str(e))
+                            for name in instances
+                        }
+                    for name in instances:
+                        result = by_name[name]
+                        result.metadata["environment"] = profile
+                        results.append(result)
+            finally:
+                for executor in executors.values():
+                    executor.close()
+
+            flush_events()
+            total_duration = (datetime.now() - total_start).total_seconds()
+            report = KPIReport(
+                results=results,
+                total_duration_seconds=total_duration,
+                dev_mode=config.dev_mode,
+                run_id=run_id,
+            )
+
+            print("-" * 40)
+            for profile in profiles:
+                tagged = [r for r in results if r.metadata["environment"] == profile]
+                succeeded = sum(1 for r in tagged if r.success)
+                print(f"{profile}: {succeeded}/{len(tagged)} KPIs succeeded")
+            print(f"Total time: {total_duration:.1f}s")
+            self._print_queue_waits(results)
+            self._print_regressions(results)
+
+            self._export_report(results)
+        return report
+
+    def close(self) -> None:
+        """Dispose of the executor's engines and their connection pools."""
+        with self._engine_lock:
+            if self._engine is not None:
+                self._engine.dispose()
+                self._engine = None
+                self._engine_url = None
+            if self._replica is not None:
+                self._replica.dispose()
+                self._replica = None
+                self._replica_url = None
+
+    def _print_queue_waits(self, results: List[KPIResult]) -> None:
+        """Print how long KPIs waited for the load governor, if at all."""
+        waits = [r for r in results if r.metadata.get("queue_wait_seconds")]
+        if not waits:
+            return
+
+        longest = max(waits, key=lambda r: r.metadata["queue_wait_seconds"])
+        total = sum(r.metadata["queue_wait_seconds"] for r in waits)
+        print(
+            f"Load governor: {len(waits)} KPIs queued for {total:.1f}s in total "
+            f"(longest: {longest.kpi_name}, {longest.metadata['queue_wait_seconds']:.1f}s)"
+        )
+
+    def _print_regressions(self, results: List[KPIResult]) -> None:
+        """Print KPIs whose latency regressed against their baseline."""
+        regressions = [r for r in results if "latency_regression" in r.metadata]
+        if not regressions:
+            return
+
+        print()
+        print("Latency regressions:")
+        for result in regressions:
+            environment = result.metadata.get("environment")
+            name = f"{result.kpi_name} [{environment}]" if environment else result.kpi_name
+            print(f"  ⚠ {name}: {result.metadata['latency_regression']}")
+
     def execute_single(
-        self, kpi: BaseKPI, params: Dict[str, Any]
+        self,
+        kpi: BaseKPI,
+        params: Dict[str, Any],
+        browse: Optional[Callable[[Page], bool]] = None,
     ) -> Optional[KPIResult]:
         """
         Execute a single KPI with specified parameters.
@@ -149,6 +951,8 @@ class KPIExecutor:
         Args:
             kpi: The KPI instance to execute
             params: Parameters for the KPI
+            browse: For drill-down KPIs, called after each displayed page that
+                has more rows; returning True fetches and shows the next page
 
         Returns:
             KPIResult with the execution result.
@@ -156,52 +960,185 @@ class KPIExecutor:
         print()
         print(f"Running {kpi.name}...")
         print("-" * 40)
+        self._start_profiling()
 
-        try:
-            engine = self._get_engine()
-            result = self._execute_with_cache(kpi, engine, params)
+        with self._run_span("run", kpi=kpi.name):
+            try:
+                # Large results can be streamed straight to the export file
+                bulk = self._execute_bulk(kpi, params)
+                if bulk is not None:
+                    result, output_path = bulk
+                    self._record_history(result, params)
+                    flush_events()
+                    if result.success:
+                        print(f"Status: Success")
+                        print(f"Duration: {result.duration_seconds:.2f}s")
+                        print(f"Rows streamed: {result.row_count}")
+                        print()
+                        print(f"Output saved to: {output_path}")
+                        self._print_profile_location()
+                    else:
+                        print(f"Status: Failed")
+                        print(f"Error: {result.error}")
+                    return result
 
-            if result.success:
-                print(f"Status: Success")
-                print(f"Duration: {result.duration_seconds:.2f}s")
-                print(f"Rows returned: {result.row_count}")
+                drilldown = kpi.drilldown_query(params)
+                if drilldown is not None:
+                    return self._execute_drilldown(kpi, params, drilldown, browse)
 
-                # Show detailed results
-                if result.rows:
-                    print()
-                    print("Results:")
-                    print("-" * 40)
+                result = self._execute_with_retry(kpi, params)
+                self._record_history(result, params)
+                flush_events()
 
-                    # Print header
-                    header = " | ".join(result.columns)
-                    print(header)
-                    print("-" * len(header))
+                if result.success:
+                    print("Status: Success" + (" [cached]" if result.from_cache else ""))
+                    print(f"Duration: {result.duration_seconds:.2f}s")
+                    print(f"Rows returned: {result.row_count}")
+                    if result.approximate:
+                        print(
+                            f"APPROXIMATE: preview on a {result.metadata.get('sample_percent')}% "
+                            f"{result.metadata.get('sample_method')} sample (95% confidence intervals)"
+                        )
+                    if "latency_regression" in result.metadata:
+                        print(f"Latency regression: {result.metadata['latency_regression']}")
 
-                    # Print rows (limit to 20 for display)
-                    for row in result.rows[:20]:
-                        values = [str(row.get(col, "")) for col in result.columns]
-                        print(" | ".join(values))
+                    # Show detailed results
+                    if result.rows:
+                        self._print_rows(result.columns, result.rows[:DISPLAY_PAGE_ROWS])
 
-                    if result.row_count > 20:
-                        print(f"... and {result.row_count - 20} more rows")
+                        if result.row_count > DISPLAY_PAGE_ROWS:
+                            print(f"... and {result.row_count - DISPLAY_PAGE_ROWS} more rows")
 
-            else:
-                print(f"Status: Failed")
-                print(f"Error: {result.error}")
+                else:
+                    print(f"Status: Failed")
+                    print(f"Error: {result.error}")
 
-            # Export result
-            self._export_single(result)
+                # Export result
+                self._export_single(result)
 
-            return result
+                return result
 
-        except Exception as e:
-            print(f"Error: {e}")
-            return KPIResult(
-                kpi_name=kpi.name,
-                columns=[],
-                rows=[],
-                error=str(e),
+            except Exception as e:
+                print(f"Error: {e}")
+                return KPIResult(
+                    kpi_name=kpi.name,
+                    columns=[],
+                    rows=[],
+                    error=str(e),
+                )
+
+    def _print_rows(
+        self, columns: List[str], rows: List[Dict[str, Any]], title: str = "Results:"
+    ) -> None:
+        """Print rows as a simple table."""
+        print()
+        print(title)
+        print("-" * 40)
+
+        header = " | ".join(columns)
+        print(header)
+        print("-" * len(header))
+
+        for row in rows:
+            values = [str(row.get(col, "")) for col in columns]
+            print(" | ".join(values))
+
+    def _execute_drilldown(
+        self,
+        kpi: BaseKPI,
+        params: Dict[str, Any],
+        drilldown: Tuple[str, Dict[str, Any]],
+        browse: Optional[Callable[[Page], bool]],
+    ) -> KPIResult:
+        """
+        Page through a drill-down KPI and export it page by page.
+
+        Runs through the retried path like any KPI execution (events, KPI
+        span, replica routing), so a transient failure starts the drill-down
+        again from the first page.
+
+        Returns:
+            KPIResult holding the first displayed page, with the exported row
+            count in streamed_row_count.
+        """
+        exporter = get_exporter(get_config().export_format)
+        output_path = self._single_output_path(kpi.name, exporter)
+        result = self._execute_with_retry(
+            kpi,
+            params,
+            lambda engine: self._page_drilldown(
+                kpi, engine, params, drilldown, browse, exporter, output_path
+            ),
+        )
+        self._record_history(result, params)
+        flush_events()
+
+        print()
+        if result.success:
+            print(f"Status: Success")
+            print(f"Duration: {result.duration_seconds:.2f}s")
+            print(f"Rows exported: {result.row_count}")
+            print(f"Output saved to: {output_path}")
+            self._print_profile_location()
+        else:
+            print(f"Status: Failed")
+            print(f"Error: {result.error}")
+        return result
+
+    def _page_drilldown(
+        self,
+        kpi: BaseKPI,
+        engine: Any,
+        params: Dict[str, Any],
+        drilldown: Tuple[str, Dict[str, Any]],
+        browse: Optional[Callable[[Page], bool]],
+        exporter: Any,
+        output_path: Path,
+    ) -> KPIResult:
+        """
+        Show and export the pages of a drill-down KPI on one engine.
+
+        Pages of DISPLAY_PAGE_ROWS rows are shown while `browse` asks for more.
+        The export then pulls the full result in key order with a second pager,
+        so at no point is more than one page held in memory. Every page query
+        is admitted by the load governor separately, so no budget is held while
+        `browse` waits for the user; the waits add up in
+        result.metadata["queue_wait_seconds"].
+        """
+        query, query_params = drilldown
+        start_time = datetime.now()
+        result = KPIResult(kpi_name=kpi.name, columns=[], rows=[], parameters=params)
+
+        def admit() -> ContextManager[None]:
+            return self._admission(kpi, engine, params, result.metadata)
+
+        try:
+            pager = KeysetPager(
+                engine, query, query_params, kpi.drilldown_key, DISPLAY_PAGE_ROWS, admit
             )
+            page = pager.fetch()
+            result.columns = pager.columns
+            result.rows = page.rows
+
+            if page.rows:
+                self._print_rows(pager.columns, page.rows, f"Results (page {page.number}):")
+            while page.has_more and browse is not None and browse(page):
+                page = pager.fetch(page.last_key, page.number + 1)
+                self._print_rows(pager.columns, page.rows, f"Results (page {page.number}):")
+
+            export_pager = KeysetPager(
+                engine, query, query_params, kpi.drilldown_key, admit=admit
+            )
+            with self._exporting(kpi.name, output_path):
+                result.streamed_row_count = exporter.export_pages(
+                    result, (p.rows for p in export_pager.pages()), output_path
+                )
+            result.metadata["drilldown"] = True
+        except Exception as e:
+            result.error = str(e)
+
+        result.duration_seconds = (datetime.now() - start_time).total_seconds()
+        return result
 
     def _export_report(self, results: List[KPIResult]) -> None:
         """Export all results to a report file."""
@@ -212,20 +1149,87 @@ class KPIExecutor:
         filename = f"kpi_report_{timestamp}.{exporter.file_extension}"
         output_path = config.output_directory / filename
 
-        exporter.export_report(results, output_path)
+        with self._exporting("kpi_report", output_path):
+            exporter.export_report(results, output_path)
         print()
         print(f"Output saved to: {output_path}")
+        self._print_profile_location()
 
-    def _export_single(self, result: KPIResult) -> None:
-        """Export a single KPI result to a file."""
+    def _execute_bulk(
+        self, kpi: BaseKPI, params: Dict[str, Any]
+    ) -> Optional[Tuple[KPIResult, Path]]:
+        """
+        Stream a KPI's result straight to a CSV export with COPY.
+
+        Only used when bulk fetch is enabled, the KPI defines bulk_query() and
+        the exporter supports COPY output; otherwise returns None and the
+        regular execute() path is used. The COPY is routed, retried, traced and
+        admitted by the load governor like any other KPI execution.
+
+        Returns:
+            Tuple of (KPIResult without in-memory rows, export path), or None.
+        """
         config = get_config()
+        if not config.bulk_fetch:
+            return None
+
+        bulk = kpi.bulk_query(params)
         exporter = get_exporter(config.export_format)
+        if bulk is None or not exporter.supports_copy:
+            return None
+
+        query, query_params = bulk
+        output_path = self._single_output_path(kpi.name, exporter)
 
+        def export_copy(engine: Any) -> KPIResult:
+            governed: Dict[str, Any] = {}
+            start_time = datetime.now()
+            try:
+                with self._admission(kpi, engine, params, governed):
+                    with self._exporting(kpi.name, output_path):
+                        row_count = exporter.export_copy(
+                            engine, query, query_params, output_path
+                        )
+                error = None
+            except Exception as e:
+                row_count = 0
+                error = str(e)
+
+            return KPIResult(
+                kpi_name=kpi.name,
+                columns=[],
+                rows=[],
+                duration_seconds=(datetime.now() - start_time).total_seconds(),
+                parameters=params,
+                error=error,
+                streamed_row_count=row_count,
+                metadata=governed,
+            )
+
+        return self._execute_with_retry(kpi, params, execute=export_copy), output_path
+
+    def _single_output_path(self, kpi_name: str, exporter: Any) -> Path:
+        """Build the timestamped output path for a single KPI export."""
+        config = get_config()
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_name = result.kpi_name.lower().replace(" ", "_")
+        safe_name = kpi_name.lower().replace(" ", "_")
         filename = f"{safe_name}_{timestamp}.{exporter.file_extension}"
-        output_path = config.output_directory / filename
+        return config.output_directory / filename
 
-        exporter.export(result, output_path)
+    def _export_single(self, result: KPIResult) -> None:
+        """Export a single KPI result to a file."""
+        config = get_config()
+        exporter = get_exporter(config.export_format)
+
+        output_path = self._single_output_path(result.kpi_name, exporter)
+
+        with self._exporting(result.kpi_name, output_path):
+            exporter.export(result, output_path)
         print()
         print(f"Output saved to: {output_path}")
+        self._print_profile_location()
+
+    def _print_profile_location(self) -> None:
+        """Print where the current run's profiles were written."""
+        if self._profiler is not None and self._profiler.directory.exists():
+            print(f"Profiles saved to: {self._profiler.directory}")
@@ -0,0 +1,134 @@
+"""
+Database load governor for parallel KPI execution.
+
+max_workers bounds how many KPIs run at once, but not how much load they put on
+the database: four cheap lookups are harmless, four full scans of error_log are
+not. The governor admits database work under a weighted budget instead. Each
+execution carries a cost weight and starts only while the weights of running
+executions plus its own fit into the budget; the rest waits in arrival order,
+so a heavy KPI is not starved by a stream of light ones.
+
+Weights are resolved in this order:
+1. the KPI's declared `cost_weight`
+2. its median live duration with the same parameters in the run history
+   (one unit per SECONDS_PER_WEIGHT seconds)
+3. the planner's EXPLAIN estimate of its cost_query() (by default its bulk or
+   drill-down query; one unit per EXPLAIN_COST_PER_WEIGHT cost units,
+   PostgreSQL only)
+4. DEFAULT_WEIGHT
+Learned weights are never below DEFAULT_WEIGHT, so a budget of N admits at
+least N light KPIs at once.
+"""
+
+import itertools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from sqlalchemy import text
+
+DEFAULT_WEIGHT = 1.0
+SECONDS_PER_WEIGHT = 30.0
+EXPLAIN_COST_PER_WEIGHT = 100_000.0
+
+
+class LoadGovernor:
+    """Weighted, first-come-first-served admission of database work."""
+
+    def __init__(self, budget: float):
+        if budget <= 0:
+            raise ValueError("budget must be positive")
+        self.budget = budget
+        self._cond = threading.Condition()
+        self._in_use = 0.0
+        self._tickets = itertools.count()
+        self._serving = 0
+
+    @property
+    def in_use(self) -> float:
+        """Total weight of the work currently admitted."""
+        with self._cond:
+            return self._in_use
+
+    @contextmanager
+    def admit(self, weight: float) -> Iterator[float]:
+        """
+        Wait until `weight` fits into the budget, and hold it for the block.
+
+        Weights above the budget are capped at it, so such work runs alone
+        instead of waiting forever.
+
+        Yields:
+            Seconds spent waiting in the queue.
+        """
+        weight = min(max(weight, 0.0), self.budget)
+        queued_at = time.monotonic()
+        with self._cond:
+            ticket = next(self._tickets)
+            while ticket != self._serving or self._in_use + weight > self.budget:
+                self._cond.wait()
+            self._serving += 1
+            self._in_use += weight
+            # The next ticket may fit as well
+            self._cond.notify_all()
+        wait = time.monotonic() - queued_at
+
+        try:
+            yield wait
+        finally:
+            with self._cond:
+                self._in_use -= weight
+                self._cond.notify_all()
+
+
+def explain_cost(engine: Any, query: str, params: Dict[str, Any]) -> Optional[float]:
+    """
+    Return the planner's total cost estimate for a query.
+
+    Returns:
+        The EXPLAIN total cost, or None if the engine is not PostgreSQL.
+    """
+    if engine.dialect.name != "postgresql":
+        return None
+    with engine.connect() as conn:
+        plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {query}"), params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return float(plan[0]["Plan"]["Total Cost"])
+
+
+def estimate_weight(
+    kpi: Any, params: Dict[str, Any], engine: Any = None, history: Any = None
+) -> float:
+    """
+    Resolve the cost weight of executing a KPI (see module docstring).
+
+    Args:
+        kpi: The KPI instance
+        params: Parameters it will be executed with
+        engine: Engine to EXPLAIN the KPI's query on (skipped if None)
+        history: RunHistory with previous durations (skipped if None)
+    """
+    if kpi.cost_weight is not None:
+        return float(kpi.cost_weight)
+
+    if history is not None:
+        try:
+            expected = history.expected_duration(kpi.name, params)
+        except Exception:
+            expected = None
+        if expected is not None:
+            return max(DEFAULT_WEIGHT, expected / SECONDS_PER_WEIGHT)
+
+    if engine is not None:
+        try:
+            query = kpi.cost_query(params)
+            cost = explain_cost(engine, *query) if query is not None else None
+        except Exception:
+            cost = None
+        if cost is not None:
+            return max(DEFAULT_WEIGHT, cost / EXPLAIN_COST_PER_WEIGHT)
+
+    return DEFAULT_WEIGHT
@@ -0,0 +1,226 @@
+"""
+Local run history of KPI executions (SQLite).
+
+Every execution is recorded with its KPI, parameter hash, duration, row count,
+cache hit, error and whether it was a sampled (approximate) preview. Duration
+baselines only compare runs of a KPI with the same parameters (params_hash),
+and leave out previews and cache hits. The history drives longest-first scheduling of Run All
+and flags KPIs whose latency regressed against their rolling baseline.
+"""
+
+import hashlib
+import sqlite3
+import statistics
+import threading
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.cache import canonical_params
+from src.models.result import KPIResult
+
+HISTORY_PATH = Path("history") / "run_history.sqlite3"
+
+# Durations are compared against the median of this many previous live (exact,
+# non-cached) runs
+BASELINE_WINDOW = 10
+# A run is a regression when it is this many times slower than the baseline...
+REGRESSION_FACTOR = 1.5
+# ...and the baseline has at least this many samples
+MIN_BASELINE_SAMPLES = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kpi_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT,
+    kpi_name TEXT NOT NULL,
+    params_hash TEXT NOT NULL,
+    executed_at TEXT NOT NULL,
+    duration_seconds REAL NOT NULL,
+    row_count INTEGER NOT NULL,
+    from_cache INTEGER NOT NULL,
+    error TEXT,
+    approximate INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ix_kpi_runs_kpi_name_id ON kpi_runs (kpi_name, id);
+"""
+
+
+def params_hash(params: Dict[str, Any]) -> str:
+    """Return a short stable hash of a KPI's parameters."""
+    return hashlib.sha256(canonical_params(params).encode("utf-8")).hexdigest()[:16]
+
+
+class RunHistory:
+    """SQLite-backed store of KPI execution records."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or HISTORY_PATH
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(kpi_runs)")}
+            if "approximate" not in columns:
+                # History files written before previews were marked
+                conn.execute(
+                    "ALTER TABLE kpi_runs ADD COLUMN approximate INTEGER NOT NULL DEFAULT 0"
+                )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a short-lived connection (safe to use from worker threads)."""
+        return sqlite3.connect(self.path, timeout=10)
+
+    def record(
+        self, result: KPIResult, params: Dict[str, Any], run_id: Optional[str] = None
+    ) -> None:
+        """
+        Record one KPI execution.
+
+        Args:
+            result: The execution result
+            params: Parameters the KPI was executed with
+            run_id: Optional identifier grouping the executions of one Run All
+        """
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO kpi_runs (run_id, kpi_name, params_hash, executed_at, "
+                "duration_seconds, row_count, from_cache, error, approximate) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id,
+                    result.kpi_name,
+                    params_hash(params),
+                    result.executed_at.isoformat() if result.executed_at else datetime.now().isoformat(),
+                    result.duration_seconds,
+                    result.row_count,
+                    int(result.from_cache),
+                    result.error,
+                    int(result.approximate),
+                ),
+            )
+
+    def recent_durations(
+        self,
+        kpi_name: str,
+        limit: int = BASELINE_WINDOW,
+        before_id: Optional[int] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> List[float]:
+        """
+        Return durations of recent successful live executions.
+
+        Cache hits and sampled previews are excluded.
+
+        Args:
+            kpi_name: KPI to look up
+            limit: Maximum number of executions, newest first
+            before_id: Only consider records older than this record id
+            params: Only consider executions with these parameters
+        """
+        query = (
+            "SELECT duration_seconds FROM kpi_runs "
+            "WHERE kpi_name = ? AND error IS NULL AND from_cache = 0 AND approximate = 0"
+        )
+        args: List[Any] = [kpi_name]
+        if params is not None:
+            query += " AND params_hash = ?"
+            args.append(params_hash(params))
+        if before_id is not None:
+            query += " AND id < ?"
+            args.append(before_id)
+        query += " ORDER BY id DESC LIMIT ?"
+        args.append(limit)
+
+        with self._lock, closing(self._connect()) as conn:
+            return [row[0] for row in conn.execute(query, args)]
+
+    def expected_duration(
+        self, kpi_name: str, params: Optional[Dict[str, Any]] = None
+    ) -> Optional[float]:
+        """
+        Return the median of recent live durations, or None without history.
+
+        Args:
+            kpi_name: KPI to look up
+            params: Only consider executions with these parameters (any if None)
+        """
+        durations = self.recent_durations(kpi_name, params=params)
+        return statistics.median(durations) if durations else None
+
+    def order_longest_first(self, kpis: Sequence[Any]) -> List[Any]:
+        """
+        Order KPIs for longest-processing-time-first scheduling.
+
+        Durations are those of runs with the KPI's default parameters, as Run
+        All executes them. KPIs without history are started first, since their
+        duration is unknown and may be the longest. Ties keep their original
+        order.
+        """
+        def sort_key(kpi: Any) -> float:
+            defaults = {p.name: p.default for p in kpi.get_parameters()}
+            expected = self.expected_duration(kpi.name, defaults)
+            return float("inf") if expected is None else expected
+
+        return sorted(kpis, key=sort_key, reverse=True)
+
+    def most_frequent(self, limit: int, window: int = 200) -> List[str]:
+        """
+        Return the KPIs executed most often among the last `window` executions.
+
+        Args:
+            limit: Maximum number of KPI names
+            window: Number of recent executions to count
+
+        Returns:
+            KPI names, most frequent first (ties: most recently run first).
+        """
+        query = (
+            "SELECT kpi_name, COUNT(*) AS runs, MAX(id) AS last_id FROM "
+            "(SELECT id, kpi_name FROM kpi_runs ORDER BY id DESC LIMIT ?) "
+            "GROUP BY kpi_name ORDER BY runs DESC, last_id DESC LIMIT ?"
+        )
+        with self._lock, closing(self._connect()) as conn:
+            return [row[0] for row in conn.execute(query, (window, limit))]
+
+    def check_regression(
+        self, result: KPIResult, params: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """
+        Compare the latest recorded live execution of a KPI with its baseline.
+
+        The baseline only holds executions with the same parameters, so a run
+        over a longer date range is not compared with short ones. Call after
+        record(). Returns a description of the regression, or None if the
+        duration is within REGRESSION_FACTOR of the rolling median. Cache hits
+        and sampled previews are never checked.
+
+        Args:
+            result: The execution result
+            params: Parameters it was executed with (default: result.parameters)
+        """
+        if not result.success or result.from_cache or result.approximate:
+            return None
+
+        params = result.parameters if params is None else params
+        with self._lock, closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT MAX(id) FROM kpi_runs WHERE kpi_name = ? AND params_hash = ?",
+                (result.kpi_name, params_hash(params)),
+            ).fetchone()
+        latest_id = row[0] if row else None
+        if latest_id is None:
+            return None
+
+        baseline = self.recent_durations(result.kpi_name, before_id=latest_id, params=params)
+        if len(baseline) < MIN_BASELINE_SAMPLES:
+            return None
+
+        median = statistics.median(baseline)
+        if median > 0 and result.duration_seconds > median * REGRESSION_FACTOR:
+            return (
+                f"{result.duration_seconds:.1f}s vs baseline {median:.1f}s "
+                f"(median of last {len(baseline)} runs)"
+            )
+        return None
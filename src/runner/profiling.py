@@ -0,0 +1,173 @@
+"""
+On-demand CPU and memory profiling of KPI executions and exports.
+
+Profiler.profile() runs a block under cProfile and tracemalloc and writes three
+artifacts named after the KPI and phase ("execute" or "export"):
+
+    <name>.<phase>.pstats          cProfile stats (python -m pstats, snakeviz)
+    <name>.<phase>.collapsed       collapsed stacks for flamegraph.pl/speedscope
+    <name>.<phase>.allocations.txt peak traced memory and the top allocation sites
+
+The split between database round trips (cursor execute/fetch), row decoding,
+Python post-processing and the exporter shows up in the pstats and flame graph.
+cProfile only records the calling thread, but tracemalloc is process-wide, so
+profiled blocks run one at a time.
+"""
+
+import cProfile
+import pstats
+import re
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Allocation sites listed in the .allocations.txt artifact
+TOP_ALLOCATIONS = 25
+# Stack frames kept by tracemalloc per allocation
+TRACEMALLOC_FRAMES = 10
+# Collapsed stacks deeper than this are cut off
+MAX_STACK_DEPTH = 100
+
+FunctionKey = Tuple[str, int, str]
+
+
+@dataclass
+class ProfileRecord:
+    """Where a profiled block's artifacts were written, and its peak memory."""
+
+    pstats_path: Path
+    collapsed_path: Path
+    allocations_path: Path
+    peak_memory_bytes: int
+
+
+def _frame_name(func: FunctionKey) -> str:
+    """Render a pstats function key as a flame graph frame."""
+    filename, line, name = func
+    if filename == "~":  # built-in
+        return name.strip("<>").replace(";", ",")
+    return f"{name} ({Path(filename).name}:{line})".replace(";", ",")
+
+
+def collapsed_stacks(stats: pstats.Stats) -> List[str]:
+    """
+    Reconstruct collapsed stacks ("a;b;c <microseconds>") from cProfile stats.
+
+    cProfile records caller/callee edges rather than full stacks, so stacks are
+    rebuilt by walking the call graph from its roots and splitting each
+    function's time across its callers in proportion to the time spent under
+    each caller (the approximation flameprof and gprof2dot use as well).
+    """
+    entries: Dict[FunctionKey, tuple] = stats.stats  # type: ignore[attr-defined]
+    children: Dict[FunctionKey, List[Tuple[FunctionKey, float]]] = {}
+    for callee, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            children.setdefault(caller, []).append((callee, edge[3]))
+
+    totals: Dict[str, float] = {}
+
+    def walk(func: FunctionKey, path: List[FunctionKey], fraction: float) -> None:
+        _, _, tottime, cumtime, _ = entries[func]
+        frames = ";".join(_frame_name(f) for f in path)
+        totals[frames] = totals.get(frames, 0.0) + tottime * fraction
+        if len(path) >= MAX_STACK_DEPTH:
+            return
+        for callee, edge_cumtime in children.get(func, []):
+            callee_cumtime = entries[callee][3]
+            if callee in path or callee_cumtime <= 0:
+                continue
+            share = fraction * edge_cumtime / callee_cumtime
+            if share * callee_cumtime >= 1e-6:
+                walk(callee, path + [callee], share)
+
+    for func, (_, _, _, _, callers) in entries.items():
+        if not callers:
+            walk(func, [func], 1.0)
+
+    return [
+        f"{frames} {round(seconds * 1e6)}"
+        for frames, seconds in sorted(totals.items())
+        if round(seconds * 1e6) > 0
+    ]
+
+
+class Profiler:
+    """Profile blocks of KPI work and write their artifacts to a directory."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def _base_path(self, name: str, phase: str) -> Path:
+        """Return the artifact path prefix for a KPI and phase."""
+        safe_name = re.sub(r"[^0-9a-zA-Z]+", "_", name).strip("_").lower()
+        return self.directory / f"{safe_name}.{phase}"
+
+    @contextmanager
+    def profile(self, name: str, phase: str) -> Iterator[List[ProfileRecord]]:
+        """
+        Profile the block and write its artifacts when it exits.
+
+        Yields:
+            A list that holds the block's ProfileRecord once the block exits.
+        """
+        records: List[ProfileRecord] = []
+        with self._lock:
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+            tracemalloc.reset_peak()
+            profiler: Optional[cProfile.Profile] = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:  # another profiler is active on this thread
+                profiler = None
+
+            try:
+                yield records
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+                _, peak = tracemalloc.get_traced_memory()
+                snapshot = tracemalloc.take_snapshot()
+                if started_tracing:
+                    tracemalloc.stop()
+                records.append(self._write(name, phase, profiler, snapshot, peak))
+
+    def _write(
+        self,
+        name: str,
+        phase: str,
+        profiler: Optional[cProfile.Profile],
+        snapshot: tracemalloc.Snapshot,
+        peak: int,
+    ) -> ProfileRecord:
+        """Write the pstats, collapsed stacks and allocation artifacts."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        base = self._base_path(name, phase)
+        record = ProfileRecord(
+            pstats_path=base.with_name(base.name + ".pstats"),
+            collapsed_path=base.with_name(base.name + ".collapsed"),
+            allocations_path=base.with_name(base.name + ".allocations.txt"),
+            peak_memory_bytes=peak,
+        )
+
+        lines: List[str] = []
+        if profiler is not None:
+            profiler.dump_stats(str(record.pstats_path))
+            lines = collapsed_stacks(pstats.Stats(str(record.pstats_path)))
+        record.collapsed_path.write_text("".join(line + "\n" for line in lines))
+
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+        with open(record.allocations_path, "w") as f:
+            f.write(f"Peak traced memory: {peak / 1024:.1f} KiB\n\n")
+            f.write(f"Top {TOP_ALLOCATIONS} allocation sites still held at the end:\n")
+            for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+                f.write(f"{stat}\n")
+        return record
@@ -0,0 +1,55 @@
+"""Retry with exponential backoff for transient database failures."""
+
+import random
+from typing import Optional, Union
+
+from sqlalchemy.exc import DBAPIError, DisconnectionError, InterfaceError, OperationalError
+
+# Substrings of driver errors that indicate a dropped or unreachable connection.
+# KPIs report errors as strings in KPIResult.error, so both exceptions and
+# messages are classified.
+TRANSIENT_ERROR_MARKERS = (
+    "OperationalError",
+    "InterfaceError",
+    "server closed the connection",
+    "could not connect to server",
+    "connection refused",
+    "connection timed out",
+    "connection already closed",
+    "terminating connection",
+    "SSL connection has been closed",
+    "timeout expired",
+)
+
+
+def is_transient_error(error: Optional[Union[BaseException, str]]) -> bool:
+    """
+    Return True if an error looks like a transient connection failure.
+
+    Args:
+        error: An exception, or the error message of a failed KPIResult
+    """
+    if error is None:
+        return False
+    if isinstance(error, (OperationalError, InterfaceError, DisconnectionError)):
+        return True
+    if isinstance(error, DBAPIError) and error.connection_invalidated:
+        return True
+
+    message = str(error).lower()
+    return any(marker.lower() in message for marker in TRANSIENT_ERROR_MARKERS)
+
+
+def backoff_delay(
+    attempt: int, base_delay: float = 1.0, max_delay: float = 30.0, jitter: bool = True
+) -> float:
+    """
+    Return the delay before retry number `attempt` (0-based).
+
+    Delays double per attempt up to max_delay. With jitter, a random delay in
+    [delay/2, delay] is used so parallel KPIs do not reconnect in lockstep.
+    """
+    delay = min(max_delay, base_delay * (2 ** attempt))
+    if jitter:
+        delay = random.uniform(delay / 2, delay)
+    return delay
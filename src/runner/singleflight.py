@@ -0,0 +1,81 @@
+"""
+Single-flight coalescing of identical concurrent calls.
+
+When several threads request the same key at the same time, only the first
+(the leader) runs the call; the others wait for it and share its outcome.
+Nothing is cached: once the call finishes, the next request for the key runs
+again.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    """An in-flight call and its outcome."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[T] = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight(Generic[T]):
+    """Coalesce identical in-flight calls by key."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call[T]] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """
+        Run fn, or wait for an identical in-flight call to finish.
+
+        Args:
+            key: Identity of the call (e.g. KPI name plus canonical params)
+            fn: The call to run if none is in flight for key
+
+        Returns:
+            Tuple of (result, shared) where shared is True if the result came
+            from another thread's call. Exceptions raised by the leader are
+            raised in every waiting thread.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                call.waiters += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True  # type: ignore[return-value]
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        """Number of keys currently executing."""
+        with self._lock:
+            return len(self._calls)
+
+    def waiting(self, key: str) -> int:
+        """Number of threads waiting on the in-flight call for key."""
+        with self._lock:
+            call: Any = self._calls.get(key)
+            return call.waiters if call else 0
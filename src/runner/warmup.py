@@ -0,0 +1,72 @@
+"""
+Background warm-up while the interactive menu waits for input.
+
+Imports the KPI modules, resolves the database URL from the keychain and
+opens a pooled connection on a daemon thread, so the first run does not pay
+for them. Optionally prefetches default-parameter results of the KPIs run most
+often according to the run history.
+"""
+
+import threading
+from typing import Any, List, Optional
+
+from src.config import get_config
+from src.kpis import discover_kpis
+
+
+class BackgroundWarmup:
+    """Warm up a KPIExecutor on a background thread."""
+
+    def __init__(self, executor: Any, prefetch_count: int = 0):
+        """
+        Args:
+            executor: The KPIExecutor the menu runs KPIs with
+            prefetch_count: Number of most frequently run KPIs to prefetch
+        """
+        self.executor = executor
+        self.prefetch_count = prefetch_count
+        self.status = "idle"
+        self.error: Optional[str] = None
+        self.prefetched: List[str] = []
+        self._thread: Optional[threading.Thread] = None
+        self._done = threading.Event()
+
+    def start(self) -> None:
+        """Start warming up (no-op if already started)."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="kpi-warmup", daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the warm-up to finish. Returns False on timeout."""
+        return self._done.wait(timeout)
+
+    @property
+    def done(self) -> bool:
+        """Whether the warm-up has finished (successfully or not)."""
+        return self._done.is_set()
+
+    def _run(self) -> None:
+        """Warm-up steps; failures are kept in self.error, never raised."""
+        try:
+            self.status = "loading KPIs"
+            kpis = discover_kpis()
+
+            self.status = "connecting"
+            self.error = self.executor.check_connection()
+            if self.error:
+                self.status = "connection failed"
+                return
+
+            # Dev mode serves repeated runs from the disk cache already
+            if self.prefetch_count > 0 and not get_config().dev_mode:
+                self.status = "prefetching"
+                self.prefetched = self.executor.prefetch_frequent(kpis, self.prefetch_count)
+
+            self.status = "ready"
+        except Exception as e:
+            self.error = str(e)
+            self.status = "failed"
+        finally:
+            self._done.set()
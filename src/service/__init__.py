@@ -0,0 +1,17 @@
+"""Long-running KPI service mode with a local HTTP/JSON API."""
+
+from src.service.server import (
+    KPIService,
+    ServiceError,
+    create_server,
+    serve,
+    serialize_result,
+)
+
+__all__ = [
+    "KPIService",
+    "ServiceError",
+    "create_server",
+    "serve",
+    "serialize_result",
+]
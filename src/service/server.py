@@ -0,0 +1,442 @@
+"""
+Long-running KPI service with a local HTTP/JSON API.
+
+The service keeps one KPIExecutor (and with it the engine pool), the
+discovered KPI registry and recent results in memory, so repeated requests
+skip interpreter startup, keychain lookups, KPI discovery and connection setup.
+
+Endpoints:
+    GET  /health                 Service status
+    GET  /kpis                   KPI names, descriptions and parameters
+    POST /kpis/{name}/run        Execute a KPI; JSON body holds parameters.
+                                 Add ?async=1 to get a job ID back immediately.
+    GET  /jobs/{job_id}          Status and result of an execution
+"""
+
+import json
+import socket
+import socketserver
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+from src.cache import make_query_id
+from src.kpis import BaseKPI, ParameterType, discover_kpis
+from src.kpis.sampling import (
+    DEFAULT_SAMPLE_METHOD,
+    PREVIEW_METHOD_PARAM,
+    PREVIEW_PARAMS,
+    PREVIEW_PERCENT_PARAM,
+    preview_params,
+)
+from src.models.result import KPIResult
+from src.runner.executor import KPIExecutor
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Seconds a successful result is served from memory
+DEFAULT_RESULT_TTL = 300.0
+# Successful results kept in memory (least recently used are evicted first)
+MAX_CACHED_RESULTS = 256
+# Finished jobs kept for GET /jobs/{job_id}
+MAX_FINISHED_JOBS = 500
+
+
+class ServiceError(Exception):
+    """A request error reported to the client with an HTTP status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class Job:
+    """One KPI execution requested through the service."""
+
+    job_id: str
+    kpi_name: str
+    params: Dict[str, Any]
+    submitted_at: float = field(default_factory=time.time)
+    result: Optional[KPIResult] = None
+    # True when the result was served from the in-memory result cache
+    from_memory: bool = False
+    done: threading.Event = field(default_factory=threading.Event)
+
+    @property
+    def status(self) -> str:
+        """'running' until the result is available, then 'done'."""
+        return "done" if self.done.is_set() else "running"
+
+
+def serialize_result(result: KPIResult) -> Dict[str, Any]:
+    """Convert a KPIResult to a JSON-serializable dict."""
+    return {
+        "kpi_name": result.kpi_name,
+        "executed_at": result.executed_at.isoformat(),
+        "duration_seconds": result.duration_seconds,
+        "parameters": result.parameters,
+        "success": result.success,
+        "error": result.error,
+        "from_cache": result.from_cache,
+        "row_count": result.row_count,
+        "approximate": result.approximate,
+        "metadata": result.metadata,
+        "columns": result.columns,
+        "data": result.rows,
+    }
+
+
+def coerce_parameters(kpi: BaseKPI, raw: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fill defaults and convert request values to the KPI's parameter types.
+
+    KPIs with supports_preview also accept sample_percent (and optionally
+    sample_method) to run a sampled preview.
+
+    Raises:
+        ServiceError: If a parameter is unknown or cannot be converted.
+    """
+    parameters = {p.name: p for p in kpi.get_parameters()}
+    allowed = set(parameters) | (set(PREVIEW_PARAMS) if kpi.supports_preview else set())
+    unknown = sorted(set(raw) - allowed)
+    if unknown:
+        raise ServiceError(400, f"Unknown parameter(s) for {kpi.name}: {', '.join(unknown)}")
+
+    values: Dict[str, Any] = {}
+    for name, param in parameters.items():
+        value = raw.get(name, param.default)
+        if value == "":
+            value = None
+        if value is not None and param.type == ParameterType.INTEGER:
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                raise ServiceError(400, f"Parameter {name} must be an integer")
+        elif value is not None and param.type == ParameterType.DATE and not isinstance(value, date):
+            try:
+                value = date.fromisoformat(str(value).strip())
+            except ValueError:
+                raise ServiceError(400, f"Parameter {name} must be a date (YYYY-MM-DD)")
+        elif value is not None and param.type == ParameterType.BOOLEAN and isinstance(value, str):
+            value = value.lower() in ("true", "yes", "1", "y")
+        values[name] = value
+
+    if raw.get(PREVIEW_PERCENT_PARAM) is not None:
+        try:
+            values = preview_params(
+                values,
+                float(raw[PREVIEW_PERCENT_PARAM]),
+                str(raw.get(PREVIEW_METHOD_PARAM) or DEFAULT_SAMPLE_METHOD),
+            )
+        except (TypeError, ValueError) as e:
+            raise ServiceError(400, str(e))
+    return values
+
+
+class KPIService:
+    """
+    Warm KPI executor with an in-memory result cache.
+
+    Successful results are served from memory for result_ttl seconds; at most
+    max_results are kept, least recently used first out, and expired ones are
+    dropped whenever a result is stored. Identical requests that arrive while
+    an execution is running are coalesced by the executor's single-flight
+    (each request keeps its own job; see KPIExecutor._execute_with_cache).
+    """
+
+    def __init__(
+        self,
+        executor: Optional[KPIExecutor] = None,
+        result_ttl: float = DEFAULT_RESULT_TTL,
+        max_results: int = MAX_CACHED_RESULTS,
+    ):
+        self.executor = executor or KPIExecutor()
+        self.result_ttl = result_ttl
+        self.max_results = max_results
+        self.started_at = time.time()
+        self.kpis: Dict[str, BaseKPI] = {}
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Job] = {}
+        self._results: "OrderedDict[str, Tuple[float, KPIResult]]" = OrderedDict()
+        self.reload_kpis()
+
+    def reload_kpis(self) -> None:
+        """Discover KPIs and build the name -> instance registry."""
+        self.kpis = {kpi_class.name: kpi_class() for kpi_class in discover_kpis()}
+
+    def warm_up(self) -> Optional[str]:
+        """
+        Open a pooled connection so the first request does not pay for it.
+
+        Returns:
+            None on success, otherwise the connection error message.
+        """
+        return self.executor.check_connection()
+
+    def list_kpis(self) -> List[Dict[str, Any]]:
+        """Describe the registered KPIs and their parameters."""
+        return [
+            {
+                "name": kpi.name,
+                "description": kpi.description,
+                "supports_preview": kpi.supports_preview,
+                "parameters": [
+                    {
+                        "name": p.name,
+                        "display_name": p.display_name,
+                        "type": p.type.value,
+                        "required": p.required,
+                        "default": p.default,
+                        "description": p.description,
+                    }
+                    for p in kpi.get_parameters()
+                ],
+            }
+            for kpi in self.kpis.values()
+        ]
+
+    def submit(self, kpi_name: str, raw_params: Dict[str, Any]) -> Job:
+        """
+        Start an execution of a KPI.
+
+        Returns a finished job for fresh cached results, otherwise a newly
+        started job.
+
+        Raises:
+            ServiceError: If the KPI is unknown or parameters are invalid.
+        """
+        kpi = self.kpis.get(kpi_name)
+        if kpi is None:
+            raise ServiceError(404, f"Unknown KPI: {kpi_name}")
+        params = coerce_parameters(kpi, raw_params)
+        key = make_query_id(kpi.name, params)
+
+        with self._lock:
+            cached = self._results.get(key)
+            if cached and time.time() - cached[0] <= self.result_ttl:
+                self._results.move_to_end(key)
+                job = self._new_job(kpi.name, params)
+                job.result = cached[1]
+                job.from_memory = True
+                job.done.set()
+                return job
+
+            job = self._new_job(kpi.name, params)
+
+        thread = threading.Thread(
+            target=self._run, args=(kpi, params, key, job), name=f"kpi-{job.job_id}", daemon=True
+        )
+        thread.start()
+        return job
+
+    def get_job(self, job_id: str) -> Job:
+        """Look up a job by ID."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            raise ServiceError(404, f"Unknown job: {job_id}")
+        return job
+
+    def _new_job(self, kpi_name: str, params: Dict[str, Any]) -> Job:
+        """Create and register a job (caller holds the lock)."""
+        job = Job(job_id=uuid.uuid4().hex[:12], kpi_name=kpi_name, params=params)
+        self._jobs[job.job_id] = job
+        finished = [j for j in self._jobs.values() if j.done.is_set()]
+        for old in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[old.job_id]
+        return job
+
+    def _run(self, kpi: BaseKPI, params: Dict[str, Any], key: str, job: Job) -> None:
+        """Execute a job and publish its result."""
+        try:
+            result = self.executor.run(kpi, params)
+        except Exception as e:
+            result = KPIResult(kpi_name=kpi.name, columns=[], rows=[], parameters=params, error=str(e))
+
+        with self._lock:
+            if result.success:
+                self._store_result(key, result)
+            job.result = result
+        job.done.set()
+
+    def _store_result(self, key: str, result: KPIResult) -> None:
+        """Cache a result, evicting expired and least recently used ones (caller holds the lock)."""
+        now = time.time()
+        self._results[key] = (now, result)
+        self._results.move_to_end(key)
+        expired = [k for k, (stored_at, _) in self._results.items() if now - stored_at > self.result_ttl]
+        for expired_key in expired:
+            del self._results[expired_key]
+        while len(self._results) > self.max_results:
+            self._results.popitem(last=False)
+
+    def job_payload(self, job: Job) -> Dict[str, Any]:
+        """Build the JSON response body for a job."""
+        payload: Dict[str, Any] = {
+            "job_id": job.job_id,
+            "kpi_name": job.kpi_name,
+            "parameters": job.params,
+            "status": job.status,
+            "from_memory": job.from_memory,
+        }
+        if job.result is not None:
+            payload["result"] = serialize_result(job.result)
+        return payload
+
+    def health(self) -> Dict[str, Any]:
+        """Build the /health response body."""
+        with self._lock:
+            in_flight = sum(1 for job in self._jobs.values() if not job.done.is_set())
+            cached = len(self._results)
+        return {
+            "status": "ok",
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "kpis": len(self.kpis),
+            "in_flight": in_flight,
+            "cached_results": cached,
+        }
+
+
+class KPIRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler routing requests to the server's KPIService."""
+
+    server_version = "ProductKPIs/1.0"
+
+    @property
+    def service(self) -> KPIService:
+        return self.server.service  # type: ignore[attr-defined]
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str) -> None:
+        """Route a request and write a JSON response."""
+        url = urlparse(self.path)
+        parts = [unquote(p) for p in url.path.strip("/").split("/") if p]
+        query = parse_qs(url.query)
+
+        try:
+            if method == "GET" and parts == ["health"]:
+                self._send(200, self.service.health())
+            elif method == "GET" and parts == ["kpis"]:
+                self._send(200, {"kpis": self.service.list_kpis()})
+            elif method == "POST" and len(parts) == 3 and parts[0] == "kpis" and parts[2] == "run":
+                job = self.service.submit(parts[1], self._read_json())
+                if query.get("async", ["0"])[0] in ("1", "true"):
+                    self._send(202, self.service.job_payload(job))
+                else:
+                    job.done.wait()
+                    self._send(200, self.service.job_payload(job))
+            elif method == "GET" and len(parts) == 2 and parts[0] == "jobs":
+                self._send(200, self.service.job_payload(self.service.get_job(parts[1])))
+            else:
+                raise ServiceError(404, f"Not found: {method} {url.path}")
+        except ServiceError as e:
+            self._send(e.status, {"error": str(e)})
+
+    def _read_json(self) -> Dict[str, Any]:
+        """Read the request body as a JSON object (empty body -> {})."""
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            body = json.loads(self.rfile.read(length))
+        except ValueError:
+            raise ServiceError(400, "Request body must be JSON")
+        if not isinstance(body, dict):
+            raise ServiceError(400, "Request body must be a JSON object of parameters")
+        return body
+
+    def _send(self, status: int, payload: Dict[str, Any]) -> None:
+        """Write a JSON response."""
+        body = json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        # Unix socket clients have no (host, port) address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:  # type: ignore[attr-defined]
+            super().log_message(format, *args)
+
+
+class UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    """Threaded HTTP server listening on a Unix domain socket."""
+
+    daemon_threads = True
+
+    def get_request(self) -> Tuple[socket.socket, Tuple[str, int]]:
+        request, _ = super().get_request()
+        return request, ("unix", 0)
+
+
+def create_server(
+    service: KPIService,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    unix_socket: Optional[Path] = None,
+    verbose: bool = False,
+) -> socketserver.BaseServer:
+    """
+    Create the HTTP server for a service (not yet serving).
+
+    Args:
+        service: The service to expose
+        host: TCP host to bind (ignored with unix_socket)
+        port: TCP port to bind, 0 picks a free port (ignored with unix_socket)
+        unix_socket: Serve on this Unix domain socket path instead of TCP
+        verbose: Log each request to stderr
+    """
+    server: socketserver.BaseServer
+    if unix_socket is not None:
+        unix_socket.unlink(missing_ok=True)
+        server = UnixHTTPServer(str(unix_socket), KPIRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), KPIRequestHandler)
+        server.daemon_threads = True
+    server.service = service  # type: ignore[attr-defined]
+    server.verbose = verbose  # type: ignore[attr-defined]
+    return server
+
+
+def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    unix_socket: Optional[Path] = None,
+    result_ttl: float = DEFAULT_RESULT_TTL,
+    verbose: bool = False,
+) -> None:
+    """Start the service and serve until interrupted."""
+    service = KPIService(result_ttl=result_ttl)
+    error = service.warm_up()
+    if error:
+        print(f"Warning: Could not open a database connection yet: {error}")
+
+    server = create_server(service, host, port, unix_socket, verbose)
+    address = str(unix_socket) if unix_socket else f"http://{host}:{server.server_address[1]}"
+    print(f"Serving {len(service.kpis)} KPIs on {address} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print()
+        print("Stopping service...")
+    finally:
+        server.server_close()
+        if unix_socket is not None:
+            unix_socket.unlink(missing_ok=True)
@@ -0,0 +1,23 @@
+"""Prometheus textfile metrics and OTLP JSON traces of KPI runs."""
+
+from src.telemetry.metrics import Counter, Gauge, Histogram, MetricsRegistry
+from src.telemetry.recorder import (
+    METRICS_FILENAME,
+    TRACES_FILENAME,
+    Telemetry,
+    get_telemetry,
+)
+from src.telemetry.tracing import Span, Tracer
+
+__all__ = [
+    "METRICS_FILENAME",
+    "TRACES_FILENAME",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "Span",
+    "Telemetry",
+    "Tracer",
+    "get_telemetry",
+]
@@ -0,0 +1,211 @@
+"""
+Metrics and spans of KPI runs, written to a telemetry directory.
+
+With config.telemetry_directory set, the executor records:
+
+    product_kpis.prom   counters and histograms for node-exporter's textfile
+                        collector (rewritten after every run)
+    traces.jsonl        OTLP JSON spans per run, KPI, query and export
+                        (one request appended per run)
+
+Query spans and database wait come from SQLAlchemy cursor events on the
+executor's engines (see Telemetry.instrument).
+"""
+
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.config import get_config
+from src.models.result import KPIResult
+from src.telemetry.metrics import Counter, Gauge, Histogram, MetricsRegistry
+from src.telemetry.tracing import SPAN_KIND_CLIENT, Span, Tracer
+
+METRICS_FILENAME = "product_kpis.prom"
+TRACES_FILENAME = "traces.jsonl"
+
+# Statements longer than this are truncated in query spans
+MAX_STATEMENT_LENGTH = 2000
+
+SIZE_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7, 1e8, 1e9)
+ROW_BUCKETS = (1, 10, 100, 1e3, 1e4, 1e5, 1e6)
+
+
+class Telemetry:
+    """Metric families and a tracer for one telemetry directory."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.tracer = Tracer()
+        self.registry = MetricsRegistry()
+        register = self.registry.register
+        self.kpi_duration = register(Histogram(
+            "product_kpis_kpi_duration_seconds", "KPI execution time.", ("kpi", "status"),
+        ))
+        self.kpi_rows = register(Histogram(
+            "product_kpis_kpi_rows", "Rows returned per KPI execution.", ("kpi",), ROW_BUCKETS,
+        ))
+        self.cache_hits = register(Counter(
+            "product_kpis_cache_hits_total", "KPI executions served from the dev mode cache.",
+            ("kpi",),
+        ))
+        self.cache_misses = register(Counter(
+            "product_kpis_cache_misses_total", "Dev mode KPI executions that queried the database.",
+            ("kpi",),
+        ))
+        self.retries = register(Counter(
+            "product_kpis_retries_total", "Retries after transient connection failures.", ("kpi",),
+        ))
+        self.db_wait = register(Histogram(
+            "product_kpis_db_wait_seconds", "Time per KPI execution spent in database statements.",
+            ("kpi",),
+        ))
+        self.queue_wait = register(Histogram(
+            "product_kpis_queue_wait_seconds",
+            "Time per KPI execution queued by the load governor.",
+            ("kpi",),
+        ))
+        self.queries = register(Histogram(
+            "product_kpis_query_duration_seconds", "Database statement execution time.", ("kpi",),
+        ))
+        self.export_bytes = register(Counter(
+            "product_kpis_export_bytes_total", "Bytes written to export files.", ("format",),
+        ))
+        self.export_size = register(Histogram(
+            "product_kpis_export_size_bytes", "Size of export files.", ("format",), SIZE_BUCKETS,
+        ))
+        self.export_duration = register(Histogram(
+            "product_kpis_export_duration_seconds", "Export file write time.", ("format",),
+        ))
+        self.last_run = register(Gauge(
+            "product_kpis_last_run_timestamp_seconds", "Unix time the last run finished.",
+        ))
+        self._instrumented: "weakref.WeakSet[Any]" = weakref.WeakSet()
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+
+    @contextmanager
+    def run_span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Trace a run (Run All or a single KPI); write metrics and spans at the end."""
+        try:
+            with self.tracer.span(name, root=True, **attributes) as span:
+                yield span
+        finally:
+            self.write()
+
+    @contextmanager
+    def kpi_span(self, kpi_name: str, **attributes: Any) -> Iterator[Span]:
+        """Trace one KPI execution; statements on this thread count as its DB wait."""
+        previous = getattr(self._local, "kpi", None)
+        with self.tracer.span(f"kpi {kpi_name}", kpi=kpi_name, **attributes) as span:
+            span.attributes["db_wait_seconds"] = 0.0
+            self._local.kpi = span
+            try:
+                yield span
+            finally:
+                self._local.kpi = previous
+
+    def record_kpi(self, result: KPIResult, span: Span) -> None:
+        """Record the metrics of a finished KPI execution and annotate its span."""
+        kpi = result.kpi_name
+        status = "success" if result.success else "error"
+        db_wait = span.attributes["db_wait_seconds"]
+        self.kpi_duration.observe(result.duration_seconds, kpi=kpi, status=status)
+        self.kpi_rows.observe(result.row_count, kpi=kpi)
+        self.db_wait.observe(db_wait, kpi=kpi)
+        if result.from_cache:
+            self.cache_hits.inc(kpi=kpi)
+        elif get_config().dev_mode:
+            self.cache_misses.inc(kpi=kpi)
+        retries = result.metadata.get("retries", 0)
+        if retries:
+            self.retries.inc(retries, kpi=kpi)
+        if "queue_wait_seconds" in result.metadata:
+            self.queue_wait.observe(result.metadata["queue_wait_seconds"], kpi=kpi)
+
+        span.attributes.update({
+            "rows": result.row_count,
+            "from_cache": result.from_cache,
+            "retries": retries,
+            "db_wait_seconds": round(db_wait, 6),
+            "db_route": result.metadata.get("db_route"),
+        })
+        if result.error is not None:
+            span.error = result.error
+
+    @contextmanager
+    def export_span(self, name: str, output_path: Path, export_format: str) -> Iterator[Span]:
+        """Trace writing an export file and record its size and duration."""
+        start = time.monotonic()
+        with self.tracer.span(f"export {name}", format=export_format) as span:
+            yield span
+            size = output_path.stat().st_size if output_path.exists() else 0
+            span.attributes.update({"path": str(output_path), "bytes": size})
+        self.export_bytes.inc(size, format=export_format)
+        self.export_size.observe(size, format=export_format)
+        self.export_duration.observe(time.monotonic() - start, format=export_format)
+
+    def instrument(self, engine: Any) -> None:
+        """Trace the statements of a SQLAlchemy engine as query spans (once per engine)."""
+        if not isinstance(engine, Engine) or engine in self._instrumented:
+            return
+        self._instrumented.add(engine)
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+        event.listen(engine, "handle_error", self._on_error)
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        span = self.tracer.start_span(
+            "query",
+            kind=SPAN_KIND_CLIENT,
+            **{"db.system": conn.dialect.name, "db.statement": statement[:MAX_STATEMENT_LENGTH]},
+        )
+        conn.info.setdefault("telemetry_spans", []).append(span)
+
+    def _finish_query(self, conn: Any, error: Optional[str] = None) -> None:
+        spans = conn.info.get("telemetry_spans") if conn is not None else None
+        if not spans:
+            return
+        span = spans.pop()
+        self.tracer.end_span(span, error)
+        kpi_span = getattr(self._local, "kpi", None)
+        kpi = kpi_span.attributes.get("kpi", "") if kpi_span is not None else ""
+        self.queries.observe(span.duration_seconds, kpi=kpi)
+        if kpi_span is not None:
+            kpi_span.attributes["db_wait_seconds"] += span.duration_seconds
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self._finish_query(conn)
+
+    def _on_error(self, exception_context: Any) -> None:
+        self._finish_query(exception_context.connection, str(exception_context.original_exception))
+
+    def write(self) -> None:
+        """Rewrite the metrics textfile and append the finished spans."""
+        with self._write_lock:
+            self.last_run.set(time.time())
+            self.registry.write_textfile(self.directory / METRICS_FILENAME)
+            self.tracer.write(self.directory / TRACES_FILENAME)
+
+
+_telemetry: Optional[Telemetry] = None
+_telemetry_lock = threading.Lock()
+
+
+def get_telemetry() -> Optional[Telemetry]:
+    """Get the telemetry of config.telemetry_directory, or None when it is unset."""
+    global _telemetry
+
+    directory = get_config().telemetry_directory
+    if directory is None:
+        return None
+    with _telemetry_lock:
+        if _telemetry is None or _telemetry.directory != Path(directory):
+            _telemetry = Telemetry(Path(directory))
+        return _telemetry
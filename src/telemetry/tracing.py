@@ -0,0 +1,187 @@
+"""
+Spans in the OpenTelemetry (OTLP) JSON encoding, written to a file.
+
+Each flush appends one ExportTraceServiceRequest as a single JSON line, which
+is the format of the OpenTelemetry Collector's otlpjsonfile receiver, so a
+local collector can ship the spans without the tool talking to the network.
+
+Spans opened on a thread nest under that thread's open span. Spans opened on
+a thread without one (e.g. Run All workers) nest under the current root span,
+set by Tracer.span(..., root=True).
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+SERVICE_NAME = "product-kpis"
+SCOPE_NAME = "src.telemetry"
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+@dataclass
+class Span:
+    """A timed operation (run, KPI, query or export)."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str] = None
+    kind: int = SPAN_KIND_INTERNAL
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def duration_seconds(self) -> float:
+        """Seconds between start and end (or now, while open)."""
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e9
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Encode as an OTLP JSON span."""
+        span: Dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [
+                {"key": key, "value": otlp_value(value)}
+                for key, value in self.attributes.items()
+                if value is not None
+            ],
+            "status": (
+                {"code": STATUS_ERROR, "message": self.error}
+                if self.error is not None
+                else {"code": STATUS_OK}
+            ),
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+def otlp_value(value: Any) -> Dict[str, Any]:
+    """Encode an attribute value as an OTLP AnyValue."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _new_id(num_bytes: int) -> str:
+    """Return a random hex trace or span ID."""
+    return os.urandom(num_bytes).hex()
+
+
+class Tracer:
+    """Create spans and buffer the finished ones until written."""
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._finished: List[Span] = []
+        self._root: Optional[Span] = None
+
+    def _stack(self) -> List[Span]:
+        """Return the open spans of the calling thread."""
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def current(self) -> Optional[Span]:
+        """Return the innermost open span of the calling thread (or the root)."""
+        stack = self._stack()
+        return stack[-1] if stack else self._root
+
+    def start_span(self, name: str, kind: int = SPAN_KIND_INTERNAL, **attributes: Any) -> Span:
+        """Start a span under the current span, without making it current."""
+        parent = self.current()
+        return Span(
+            name=name,
+            trace_id=parent.trace_id if parent else _new_id(16),
+            span_id=_new_id(8),
+            parent_span_id=parent.span_id if parent else None,
+            kind=kind,
+            attributes=attributes,
+        )
+
+    def end_span(self, span: Span, error: Optional[str] = None) -> None:
+        """End a span and buffer it for writing."""
+        span.end_ns = time.time_ns()
+        if error is not None:
+            span.error = error
+        with self._lock:
+            self._finished.append(span)
+
+    @contextmanager
+    def span(self, name: str, root: bool = False, **attributes: Any) -> Iterator[Span]:
+        """
+        Open a span for the block, current on this thread while it runs.
+
+        With root=True the span also becomes the parent of spans opened on
+        threads that have no open span.
+        """
+        span = self.start_span(name, **attributes)
+        stack = self._stack()
+        stack.append(span)
+        if root:
+            self._root = span
+        error = None
+        try:
+            yield span
+        except BaseException as e:
+            error = str(e) or type(e).__name__
+            raise
+        finally:
+            stack.pop()
+            if root:
+                self._root = None
+            self.end_span(span, error)
+
+    def drain(self) -> List[Span]:
+        """Return and forget the finished spans."""
+        with self._lock:
+            finished, self._finished = self._finished, []
+        return finished
+
+    def write(self, path: Path) -> int:
+        """
+        Append the finished spans to an OTLP JSON lines file.
+
+        Returns:
+            Number of spans written.
+        """
+        spans = self.drain()
+        if not spans:
+            return 0
+        request = {
+            "resourceSpans": [{
+                "resource": {
+                    "attributes": [{"key": "service.name", "value": otlp_value(SERVICE_NAME)}],
+                },
+                "scopeSpans": [{
+                    "scope": {"name": SCOPE_NAME},
+                    "spans": [span.to_otlp() for span in spans],
+                }],
+            }],
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(request) + "\n")
+        return len(spans)
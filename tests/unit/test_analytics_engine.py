@@ -0,0 +1,88 @@
+"""Unit tests for the DuckDB analytics engine."""
+
+import pytest
+
+from src.analytics import table_name_for
+from src.models.result import KPIResult
+
+pytest.importorskip("duckdb")
+pytest.importorskip("pyarrow")
+
+from src.analytics import AnalyticsEngine  # noqa: E402
+
+
+class TestAnalyticsEngine:
+    """Tests for AnalyticsEngine."""
+
+    @pytest.fixture
+    def analytics(self):
+        """Create an in-memory analytics engine."""
+        with AnalyticsEngine() as engine:
+            yield engine
+
+    @pytest.fixture
+    def orders_result(self, sample_kpi_result):
+        """Orders-by-date style KPI result."""
+        return KPIResult(kpi_name="Orders by Date", **sample_kpi_result)
+
+    def test_table_name_for_is_sql_safe(self):
+        """Verify KPI names are turned into SQL identifiers."""
+        assert table_name_for("First Time Right (Exports)") == "first_time_right_exports"
+        assert table_name_for("7 Day Orders") == "kpi_7_day_orders"
+
+    def test_register_result_and_query(self, analytics, orders_result):
+        """Verify registered results can be queried with SQL."""
+        table = analytics.register_result(orders_result)
+
+        columns, rows = analytics.query(f"SELECT SUM(orders_count) AS total FROM {table}")
+
+        assert table == "orders_by_date"
+        assert columns == ["total"]
+        assert rows == [{"total": 80}]
+
+    def test_register_results_skips_failed(self, analytics, orders_result):
+        """Verify failed results are not registered."""
+        failed = KPIResult(kpi_name="Broken", columns=[], rows=[], error="boom")
+
+        tables = analytics.register_results([orders_result, failed])
+
+        assert tables == ["orders_by_date"]
+
+    def test_join_between_results(self, analytics, orders_result):
+        """Verify two KPI results can be joined locally."""
+        exports = KPIResult(
+            kpi_name="Exports by Date",
+            columns=["date", "exports"],
+            rows=[{"date": "2026-01-20", "exports": 10}],
+        )
+        analytics.register_results([orders_result, exports])
+
+        _, rows = analytics.query(
+            "SELECT o.date, o.orders_count, e.exports "
+            "FROM orders_by_date o JOIN exports_by_date e USING (date)"
+        )
+
+        assert rows == [{"date": "2026-01-20", "orders_count": 42, "exports": 10}]
+
+    def test_register_csv_extract(self, analytics, tmp_path):
+        """Verify CSV extracts on disk are queryable as views."""
+        extract = tmp_path / "orders.csv"
+        extract.write_text("shop_id,total\na,3\nb,4\n")
+
+        view = analytics.register_extract("orders extract", extract)
+        _, rows = analytics.query(f"SELECT SUM(total) AS total FROM {view}")
+
+        assert view == "orders_extract"
+        assert rows[0]["total"] == 7
+
+    def test_register_extract_rejects_unknown_format(self, analytics, tmp_path):
+        """Verify unsupported extract formats raise ValueError."""
+        with pytest.raises(ValueError):
+            analytics.register_extract("x", tmp_path / "data.xlsx")
+
+    def test_to_result_captures_errors(self, analytics):
+        """Verify SQL errors are returned in KPIResult.error."""
+        result = analytics.to_result("Derived", "SELECT * FROM missing_table")
+
+        assert result.success is False
+        assert "missing_table" in result.error
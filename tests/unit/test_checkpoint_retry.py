@@ -0,0 +1,151 @@
+"""Unit tests for Run All checkpoints, resume and transient-error retries."""
+
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from src.config import reset_config
+from src.kpis.base import BaseKPI, Parameter
+from src.models.result import KPIResult
+from src.runner.checkpoint import CheckpointStore, new_run_id
+from src.runner.executor import KPIExecutor
+from src.runner.history import RunHistory
+from src.runner.retry import backoff_delay, is_transient_error
+
+
+class FlakyKPI(BaseKPI):
+    """KPI that fails with a dropped connection a set number of times."""
+
+    name = "Flaky"
+    description = "Test KPI"
+    failures = 0
+    calls = 0
+
+    def get_parameters(self) -> List[Parameter]:
+        return []
+
+    def execute(self, engine: Any, params: Dict[str, Any]) -> KPIResult:
+        FlakyKPI.calls += 1
+        if FlakyKPI.calls <= FlakyKPI.failures:
+            return KPIResult(
+                kpi_name=self.name, columns=[], rows=[],
+                error="server closed the connection unexpectedly",
+            )
+        return KPIResult(kpi_name=self.name, columns=["n"], rows=[{"n": 1}])
+
+
+class StableKPI(FlakyKPI):
+    name = "Stable"
+
+    def execute(self, engine: Any, params: Dict[str, Any]) -> KPIResult:
+        return KPIResult(kpi_name=self.name, columns=["n"], rows=[{"n": 1}])
+
+
+@pytest.fixture
+def executor(tmp_path, monkeypatch):
+    """Executor with history and checkpoints in a temporary directory."""
+    monkeypatch.setattr("src.runner.checkpoint.CHECKPOINT_DIR", tmp_path / "runs")
+    monkeypatch.setattr("src.runner.executor.time.sleep", lambda seconds: None)
+    config = reset_config()
+    config.output_directory = tmp_path
+    FlakyKPI.failures = 0
+    FlakyKPI.calls = 0
+
+    executor = KPIExecutor(history=RunHistory(tmp_path / "history.sqlite3"))
+    with patch.object(executor, "_get_engine"), patch.object(executor, "_export_report"):
+        yield executor
+    reset_config()
+
+
+class TestRetryHelpers:
+    """Tests for transient error classification and backoff."""
+
+    def test_connection_errors_are_transient(self):
+        """Verify dropped connections are retried but SQL errors are not."""
+        assert is_transient_error(OperationalError("SELECT 1", {}, Exception("boom")))
+        assert is_transient_error("could not connect to server: Connection refused")
+        assert not is_transient_error('column "foo" does not exist')
+        assert not is_transient_error(None)
+
+    def test_backoff_doubles_up_to_max(self):
+        """Verify exponential growth capped at max_delay."""
+        delays = [backoff_delay(n, 1.0, max_delay=5.0, jitter=False) for n in range(4)]
+        assert delays == [1.0, 2.0, 4.0, 5.0]
+        assert 2.0 <= backoff_delay(2, 1.0, jitter=True) <= 4.0
+
+
+class TestCheckpointStore:
+    """Tests for CheckpointStore."""
+
+    def test_round_trip_skips_failures(self, tmp_path):
+        """Verify successful results are stored and failed ones are not."""
+        store = CheckpointStore("run1", tmp_path)
+        store.save(KPIResult(kpi_name="A (x)", columns=["n"], rows=[{"n": 1}], metadata={"k": "v"}))
+        store.save(KPIResult(kpi_name="B", columns=[], rows=[], error="boom"))
+
+        loaded = store.load()
+
+        assert list(loaded) == ["A (x)"]
+        assert loaded["A (x)"].rows == [{"n": 1}]
+        assert loaded["A (x)"].metadata == {"k": "v"}
+
+    def test_latest_returns_newest_run(self, tmp_path):
+        """Verify the most recent run ID is picked."""
+        (tmp_path / "20240101_000000").mkdir()
+        (tmp_path / "20240102_000000").mkdir()
+
+        assert CheckpointStore.latest(tmp_path).run_id == "20240102_000000"
+        assert CheckpointStore.latest(tmp_path / "missing") is None
+
+    def test_run_ids_are_unique_and_ordered(self, tmp_path):
+        """Verify runs started in the same second get distinct, time-ordered IDs."""
+        run_ids = [new_run_id() for _ in range(50)]
+        for run_id in run_ids:
+            (tmp_path / run_id).mkdir()
+
+        assert len(set(run_ids)) == 50
+        assert [r[:22] for r in CheckpointStore.list_runs(tmp_path)] == [r[:22] for r in run_ids]
+
+
+class TestRetryAndResume:
+    """Tests for retries and resuming in KPIExecutor."""
+
+    def test_transient_failure_is_retried(self, executor):
+        """Verify a dropped connection is retried and the retry count recorded."""
+        FlakyKPI.failures = 2
+        with patch("src.runner.executor.discover_kpis", return_value=[FlakyKPI]):
+            report = executor.execute_all()
+
+        assert report.results[0].success
+        assert report.results[0].metadata["retries"] == 2
+
+    def test_retries_are_bounded(self, executor):
+        """Verify the KPI fails after config.max_retries retries."""
+        FlakyKPI.failures = 10
+        with patch("src.runner.executor.discover_kpis", return_value=[FlakyKPI]):
+            report = executor.execute_all()
+
+        assert not report.results[0].success
+        assert FlakyKPI.calls == 4
+
+    def test_resume_reruns_only_failed_kpis(self, executor):
+        """Verify checkpointed KPIs are reused and failed ones re-executed."""
+        FlakyKPI.failures = 4
+        with patch("src.runner.executor.discover_kpis", return_value=[StableKPI, FlakyKPI]):
+            first = executor.execute_all()
+            assert first.failure_count == 1
+
+            calls_before = FlakyKPI.calls
+            resumed = executor.resume(first.run_id)
+
+        assert resumed.run_id == first.run_id
+        assert resumed.failure_count == 0
+        # Only the failed KPI ran again
+        assert FlakyKPI.calls == calls_before + 1
+        assert [r.kpi_name for r in resumed.results] == ["Stable", "Flaky"]
+
+    def test_resume_without_runs(self, executor):
+        """Verify resume reports that there is nothing to resume."""
+        assert executor.resume() is None
@@ -0,0 +1,161 @@
+"""Unit tests for derived KPIs and dependency-aware Run All."""
+
+import threading
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import pytest
+
+from src.config import reset_config
+from src.kpis import discover_kpis
+from src.kpis.base import BaseKPI, Parameter
+from src.kpis.derived import DerivedKPI
+from src.kpis.export_failure_breakdown import ExportFailureBreakdownKPI
+from src.models.result import KPIResult
+from src.runner.dag import DependencyError, build_graph, execute_graph, topological_order
+from src.runner.executor import KPIExecutor
+from src.runner.history import RunHistory
+
+
+class Node:
+    """Minimal object with a name and dependencies."""
+
+    def __init__(self, name: str, depends_on: List[str] = ()):
+        self.name = name
+        self.depends_on = list(depends_on)
+
+
+class BaseCountKPI(BaseKPI):
+    """Upstream KPI counting its executions."""
+
+    name = "Base Count"
+    description = "Test KPI"
+    calls = 0
+
+    def get_parameters(self) -> List[Parameter]:
+        return []
+
+    def execute(self, engine: Any, params: Dict[str, Any]) -> KPIResult:
+        BaseCountKPI.calls += 1
+        return KPIResult(kpi_name=self.name, columns=["n"], rows=[{"n": 21}])
+
+
+class DoubledKPI(DerivedKPI):
+    """Derived KPI doubling the upstream count."""
+
+    name = "Doubled"
+    description = "Test KPI"
+    depends_on = ["Base Count"]
+
+    def compute(self, upstream: Dict[str, KPIResult], params: Dict[str, Any]) -> KPIResult:
+        n = upstream["Base Count"].rows[0]["n"]
+        return KPIResult(kpi_name=self.name, columns=["n"], rows=[{"n": n * 2}])
+
+
+class TestGraph:
+    """Tests for graph construction and scheduling."""
+
+    def test_topological_order(self):
+        """Verify dependencies come first and ties keep insertion order."""
+        graph = build_graph([Node("c", ["a", "b"]), Node("a"), Node("b", ["a"])])
+        assert topological_order(graph) == ["a", "b", "c"]
+
+    def test_unknown_dependency_and_cycle_are_rejected(self):
+        """Verify invalid graphs raise DependencyError."""
+        with pytest.raises(DependencyError, match="unknown"):
+            build_graph([Node("a", ["missing"])])
+        with pytest.raises(DependencyError, match="cycle"):
+            build_graph([Node("a", ["b"]), Node("b", ["a"])])
+
+    def test_execute_graph_passes_upstream_results(self):
+        """Verify nodes run after their dependencies and receive their results."""
+        graph = {"a": [], "b": [], "c": ["a", "b"]}
+        seen: Dict[str, Dict[str, int]] = {}
+        lock = threading.Lock()
+
+        def run(name: str, upstream: Dict[str, int]) -> int:
+            with lock:
+                seen[name] = upstream
+            return sum(upstream.values()) + 1
+
+        results = execute_graph(graph, run, max_workers=2)
+
+        assert results == {"a": 1, "b": 1, "c": 3}
+        assert seen["c"] == {"a": 1, "b": 1}
+
+    def test_completed_nodes_are_not_rerun(self):
+        """Verify checkpointed results feed dependents without re-running."""
+        ran: List[str] = []
+
+        def run(name: str, upstream: Dict[str, int]) -> int:
+            ran.append(name)
+            return upstream.get("a", 0) + 1
+
+        results = execute_graph({"a": [], "b": ["a"]}, run, completed={"a": 10})
+
+        assert ran == ["b"]
+        assert results["b"] == 11
+
+
+class TestDerivedKPIs:
+    """Tests for DerivedKPI and Run All with dependencies."""
+
+    def test_run_all_runs_upstream_once(self, tmp_path, monkeypatch):
+        """Verify the derived KPI reuses the upstream result in memory."""
+        monkeypatch.setattr("src.runner.checkpoint.CHECKPOINT_DIR", tmp_path / "runs")
+        config = reset_config()
+        config.output_directory = tmp_path
+        config.max_workers = 2
+        BaseCountKPI.calls = 0
+
+        executor = KPIExecutor(history=RunHistory(tmp_path / "history.sqlite3"))
+        with patch("src.runner.executor.discover_kpis", return_value=[DoubledKPI, BaseCountKPI]), \
+                patch.object(executor, "_get_engine"), \
+                patch.object(executor, "_export_report"):
+            report = executor.execute_all()
+
+        assert BaseCountKPI.calls == 1
+        assert [r.kpi_name for r in report.results] == ["Doubled", "Base Count"]
+        assert report.results[0].rows == [{"n": 42}]
+        assert report.results[0].metadata["depends_on"] == ["Base Count"]
+        reset_config()
+
+    def test_upstream_failure_fails_dependent(self):
+        """Verify a derived KPI reports failed upstream KPIs."""
+        failed = KPIResult(kpi_name="Base Count", columns=[], rows=[], error="boom")
+
+        result = DoubledKPI().compute_from({"Base Count": failed}, {})
+
+        assert result.error == "Upstream KPI failed: Base Count"
+
+    def test_individual_run_executes_upstream(self, mock_engine):
+        """Verify execute() runs upstream KPIs itself outside Run All."""
+        with patch("src.kpis.discover_kpis", return_value=[BaseCountKPI]):
+            result = DoubledKPI().execute(mock_engine, {})
+
+        assert result.rows == [{"n": 42}]
+
+    def test_export_failure_breakdown(self):
+        """Verify failure rates and shares are derived from First Time Right rows."""
+        upstream = KPIResult(
+            kpi_name="First Time Right (Exports)",
+            columns=[],
+            rows=[
+                {"action_type": "a", "total_exports": 100, "failed_exports": 10},
+                {"action_type": "b", "total_exports": 10, "failed_exports": 30},
+                {"action_type": "c", "total_exports": 0, "failed_exports": 0},
+            ],
+        )
+
+        result = ExportFailureBreakdownKPI().compute({"First Time Right (Exports)": upstream}, {})
+
+        assert [r["action_type"] for r in result.rows] == ["b", "a", "c"]
+        assert result.rows[1]["failure_rate"] == 10.0
+        assert result.rows[1]["failure_share"] == 25.0
+        assert result.rows[2]["failure_rate"] == 0.0
+
+    def test_discover_kpis_returns_each_class_once(self):
+        """Verify KPIs re-exported by a package are not discovered twice."""
+        names = [kpi.name for kpi in discover_kpis()]
+        assert len(names) == len(set(names))
+        assert "Export Failure Breakdown" in names
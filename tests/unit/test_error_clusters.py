@@ -0,0 +1,85 @@
+"""Unit tests for the Export Error Clusters KPI."""
+
+import re
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.kpis.error_clusters import (
+    NUMBER_PATTERN,
+    UUID_PATTERN,
+    ErrorClustersKPI,
+    like_pattern,
+)
+
+
+class TestErrorClustersKPI:
+    """Tests for ErrorClustersKPI."""
+
+    @pytest.fixture
+    def kpi(self):
+        return ErrorClustersKPI()
+
+    @pytest.fixture
+    def mock_conn(self, mock_engine):
+        """Connection returning two clusters out of 10 errors."""
+        seen = datetime(2026, 1, 5, 12, 0)
+        mock_conn = MagicMock()
+        mock_conn.execute.return_value = [
+            ("a1b2c3", "E42", "order <n> not found", 6, 10, seen, seen, "Order 17 not found"),
+            ("d4e5f6", "E7", "timeout after <n>s", 3, 10, seen, seen, "Timeout after 30s"),
+        ]
+        mock_engine.connect.return_value.__enter__ = MagicMock(return_value=mock_conn)
+        mock_engine.connect.return_value.__exit__ = MagicMock(return_value=False)
+        return mock_conn
+
+    def test_top_clusters_with_share(self, kpi, mock_engine, mock_conn):
+        """Verify clusters and their share of all export errors."""
+        result = kpi.execute(mock_engine, {"top_n": 2})
+
+        assert result.success
+        assert [(r["fingerprint"], r["occurrences"], r["share"]) for r in result.rows] == [
+            ("a1b2c3", 6, 60.0), ("d4e5f6", 3, 30.0),
+        ]
+        assert result.rows[0]["sample_message"] == "Order 17 not found"
+        assert result.metadata["total_errors"] == 10
+
+    def test_grouping_happens_server_side(self, kpi, mock_engine, mock_conn):
+        """Verify messages are normalized, grouped and limited in the query."""
+        kpi.execute(mock_engine, {"top_n": 5, "from_service": "exporter"})
+
+        query, query_params = mock_conn.execute.call_args[0]
+        sql = " ".join(str(query).split())
+        assert "WHERE e.entity_type = 'export'" in sql
+        assert "GROUP BY error_code, signature" in sql
+        assert "md5(coalesce(error_code, '') || chr(31) || signature)" in sql
+        assert "LIMIT :top_n" in sql
+        assert "e.from_service = :from_service" in sql
+        assert "ILIKE" not in sql
+        assert query_params["top_n"] == 5
+
+    def test_search_drill_down(self, kpi, mock_engine, mock_conn):
+        """Verify a search term adds an escaped ILIKE filter."""
+        kpi.execute(mock_engine, {"search": "100%_done"})
+
+        query, query_params = mock_conn.execute.call_args[0]
+        assert "e.error_message ILIKE :search" in str(query)
+        assert query_params["search"] == "%100\\%\\_done%"
+        assert like_pattern("abc") == "%abc%"
+
+    def test_patterns_strip_identifiers(self):
+        """Verify the placeholder patterns match ids and numbers."""
+        message = "shipment 3f2b8c1a-1d2e-4f5a-9b8c-7d6e5f4a3b2c failed 3 times"
+        normalized = re.sub(NUMBER_PATTERN, "<n>", re.sub(UUID_PATTERN, "<id>", message))
+
+        assert normalized == "shipment <id> failed <n> times"
+
+    def test_validation_and_errors(self, kpi, mock_engine):
+        """Verify invalid parameters and database errors are returned in the result."""
+        invalid = kpi.execute(mock_engine, {"top_n": 0})
+        mock_engine.connect.side_effect = Exception("Connection failed")
+        failed = kpi.execute(mock_engine, {})
+
+        assert "top_n" in invalid.error
+        assert "Connection failed" in failed.error
@@ -0,0 +1,168 @@
+"""Unit tests for structured, buffered execution events."""
+
+import io
+import json
+import threading
+from typing import Any, Dict, List
+from unittest.mock import MagicMock
+
+import pytest
+
+from src import events
+from src.config import reset_config
+from src.events import (
+    DEBUG,
+    INFO,
+    KPI_FINISHED,
+    KPI_STARTED,
+    QUERY_ISSUED,
+    ROWS_FETCHED,
+    WARNING,
+    ConsoleSink,
+    Event,
+    EventLog,
+    EventSink,
+)
+from src.kpis.base import BaseKPI, Parameter
+from src.kpis.first_time_right_exports import FirstTimeRightExportsKPI
+from src.models.result import KPIResult
+from src.runner.executor import KPIExecutor
+
+
+class RecordingSink(EventSink):
+    """Sink keeping the batches it was handed."""
+
+    def __init__(self) -> None:
+        self.batches: List[List[Event]] = []
+
+    def write(self, batch: List[Event]) -> None:
+        self.batches.append(batch)
+
+
+class CountingStream(io.StringIO):
+    """StringIO counting write() calls."""
+
+    writes = 0
+
+    def write(self, text: str) -> int:
+        self.writes += 1
+        return super().write(text)
+
+
+@pytest.fixture
+def jsonl_events(tmp_path):
+    """Route events to events.jsonl in a temporary output directory."""
+    config = reset_config()
+    config.output_directory = tmp_path
+    config.event_sink = "jsonl"
+
+    def read() -> List[Dict[str, Any]]:
+        events.flush()
+        with open(tmp_path / "events.jsonl") as f:
+            return [json.loads(line) for line in f]
+
+    yield read
+    events.close()
+    reset_config()
+
+
+class TestEventLog:
+    """Tests for EventLog and the sinks."""
+
+    def test_emit_does_not_wait_for_a_slow_sink(self):
+        """Verify emit() returns while the sink is blocked, and events arrive in order."""
+        release = threading.Event()
+        sink = RecordingSink()
+        original_write = sink.write
+
+        def slow_write(batch: List[Event]) -> None:
+            release.wait(5)
+            original_write(batch)
+
+        sink.write = slow_write  # type: ignore[method-assign]
+        log = EventLog(sink)
+        for i in range(100):
+            log.emit(Event(name=ROWS_FETCHED, fields={"page": i}))
+        assert sink.batches == []
+
+        release.set()
+        log.flush()
+        log.close()
+
+        pages = [event.fields["page"] for batch in sink.batches for event in batch]
+        assert pages == list(range(100))
+        assert len(sink.batches) < 100
+
+    def test_console_sink_filters_and_writes_once_per_batch(self):
+        """Verify debug events are hidden at info level and a batch is one write."""
+        stream = CountingStream()
+        sink = ConsoleSink(INFO, stream)
+
+        sink.write([
+            Event(name=QUERY_ISSUED, level=DEBUG, kpi="Orders", fields={"strategy": "grouped"}),
+            Event(name="kpi.retry", level=INFO, kpi="Orders", fields={"message": "retry 1/3"}),
+            Event(name="warning", level=WARNING, fields={"message": "history unavailable"}),
+        ])
+
+        assert stream.getvalue() == "  [Orders] retry 1/3\n  Warning: history unavailable\n"
+        assert stream.writes == 1
+        assert ConsoleSink(DEBUG).format(Event(name=ROWS_FETCHED, fields={"rows": 3})) == (
+            "  rows.fetched rows=3"
+        )
+
+    def test_jsonl_sink_and_off_switch(self, jsonl_events, tmp_path):
+        """Verify the config selects the JSON lines file, and "off" drops events."""
+        events.emit(ROWS_FETCHED, "Orders", rows=5, day=tmp_path)
+
+        [record] = jsonl_events()
+        assert record["event"] == ROWS_FETCHED
+        assert record["kpi"] == "Orders"
+        assert record["rows"] == 5
+        assert record["day"] == str(tmp_path)
+
+        reset_config().event_sink = "off"
+        assert events.get_event_log() is None
+        events.emit(ROWS_FETCHED, "Orders", rows=6)
+
+
+class OneRowKPI(BaseKPI):
+    """KPI returning one row."""
+
+    name = "One Row"
+    description = "Test KPI"
+
+    def get_parameters(self) -> List[Parameter]:
+        return []
+
+    def execute(self, engine: Any, params: Dict[str, Any]) -> KPIResult:
+        return KPIResult(kpi_name=self.name, columns=["n"], rows=[{"n": 1}], duration_seconds=0.5)
+
+
+class TestEmitters:
+    """Tests for events emitted by the executor and KPIs."""
+
+    def test_executor_emits_started_and_finished(self, jsonl_events, mock_engine):
+        """Verify a run is bracketed by KPI_STARTED and KPI_FINISHED."""
+        executor = KPIExecutor(history=MagicMock())
+        executor._get_engine = lambda: mock_engine
+
+        executor.run(OneRowKPI(), {})
+
+        records = jsonl_events()
+        assert [r["event"] for r in records] == [KPI_STARTED, KPI_FINISHED]
+        assert records[1]["rows"] == 1
+        assert records[1]["error"] is None
+
+    def test_first_time_right_emits_instead_of_printing(self, jsonl_events, mock_engine, capsys):
+        """Verify the KPI reports its query and fetch as events, with no console output."""
+        mock_conn = MagicMock()
+        mock_conn.execute.return_value.fetchone.return_value = (10, 9)
+        mock_engine.connect.return_value.__enter__ = MagicMock(return_value=mock_conn)
+        mock_engine.connect.return_value.__exit__ = MagicMock(return_value=False)
+
+        result = FirstTimeRightExportsKPI().execute(mock_engine, {})
+
+        records = jsonl_events()
+        assert [r["event"] for r in records] == [QUERY_ISSUED, ROWS_FETCHED]
+        assert records[1]["rows"] == result.row_count
+        assert capsys.readouterr().out == ""
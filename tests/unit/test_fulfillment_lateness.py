@@ -0,0 +1,225 @@
+"""Unit tests for quantile sketches and the Fulfillment Lateness KPI."""
+
+import json
+import random
+import threading
+from datetime import date
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.engine import make_url
+
+from src.cache import query_cache
+from src.cache.sketch_cache import save_day
+from src.config import reset_config
+from src.kpis.fulfillment_lateness import FulfillmentLatenessKPI
+from src.kpis.sketches import QuantileSketch
+
+TODAY = date(2026, 1, 20)
+
+
+def exact_quantile(values, q):
+    """Nearest-rank quantile matching QuantileSketch's rank convention."""
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def sketch_rows(kpi, values_by_day):
+    """Build the bucket rows the database would return for {day: {warehouse: [hours]}}."""
+    rows = []
+    for day, warehouses in values_by_day.items():
+        for warehouse, values in warehouses.items():
+            for metric in ("hours_late", "warehouse_late_hours"):
+                sketch = QuantileSketch(kpi.relative_accuracy)
+                for value in values:
+                    sketch.add(value)
+                if sketch.zero_count:
+                    rows.append((day, warehouse, metric, None, sketch.zero_count))
+                for key, count in sketch.bins.items():
+                    rows.append((day, warehouse, metric, key, count))
+    return rows
+
+
+class TestQuantileSketch:
+    """Tests for QuantileSketch."""
+
+    def test_quantiles_within_relative_accuracy(self):
+        """Verify estimates are within 1% of the exact quantiles."""
+        rng = random.Random(42)
+        values = [rng.lognormvariate(3, 1) for _ in range(5000)]
+        sketch = QuantileSketch(0.01)
+        for value in values:
+            sketch.add(value)
+
+        for q in (0.5, 0.9, 0.99):
+            exact = exact_quantile(values, q)
+            assert abs(sketch.quantile(q) - exact) <= 0.01 * exact + 1e-9
+
+    def test_merge_equals_sketch_of_union(self):
+        """Verify merged sketches match a sketch built from all values."""
+        a, b, both = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        for value in (0, 1, 5, 10):
+            a.add(value)
+            both.add(value)
+        for value in (0, 100, 200):
+            b.add(value)
+            both.add(value)
+
+        merged = QuantileSketch.merged([a, b])
+
+        assert merged.bins == both.bins
+        assert merged.zero_count == 2
+        assert merged.quantile(0.5) == both.quantile(0.5)
+
+    def test_round_trip_and_empty(self):
+        """Verify serialization and empty-sketch behaviour."""
+        sketch = QuantileSketch()
+        assert sketch.quantile(0.5) is None
+        sketch.add(0, count=3)
+        sketch.add(12)
+
+        restored = QuantileSketch.from_dict(sketch.to_dict())
+
+        assert restored.count == 4
+        assert restored.quantile(0.5) == 0.0
+        with pytest.raises(ValueError):
+            restored.merge(QuantileSketch(0.05))
+
+
+class TestFulfillmentLatenessKPI:
+    """Tests for FulfillmentLatenessKPI."""
+
+    @pytest.fixture(autouse=True)
+    def cache_dir(self, tmp_path, monkeypatch):
+        """Redirect the cache to a temporary directory."""
+        monkeypatch.setattr(query_cache, "CACHE_DIR", tmp_path / "cache")
+        return tmp_path / "cache"
+
+    @pytest.fixture
+    def dev_mode(self):
+        """Enable dev mode (and with it the sketch cache) for one test."""
+        reset_config().dev_mode = True
+        yield
+        reset_config()
+
+    @pytest.fixture
+    def kpi(self):
+        return FulfillmentLatenessKPI()
+
+    def engine_with_rows(self, mock_engine, rows, url="postgresql://kpi@db-a:5432/shop"):
+        """Return mock_engine whose queries yield rows."""
+        mock_engine.url = make_url(url)
+        mock_conn = MagicMock()
+        mock_conn.execute.return_value = rows
+        mock_engine.connect.return_value.__enter__ = MagicMock(return_value=mock_conn)
+        mock_engine.connect.return_value.__exit__ = MagicMock(return_value=False)
+        return mock_conn
+
+    def test_per_day_percentiles(self, kpi, mock_engine):
+        """Verify one row per day and warehouse with percentiles."""
+        rows = sketch_rows(kpi, {
+            date(2026, 1, 10): {"wh-1": [0, 0, 10, 20, 100]},
+            date(2026, 1, 11): {"wh-1": [5], "wh-2": [50, 50]},
+        })
+        mock_conn = self.engine_with_rows(mock_engine, rows)
+
+        result = kpi.execute(
+            mock_engine, {"start_date": "2026-01-10", "end_date": "2026-01-11"}, today=TODAY
+        )
+
+        assert result.success
+        assert [(r["date"], r["warehouse_id"]) for r in result.rows] == [
+            ("2026-01-10", "wh-1"), ("2026-01-11", "wh-1"), ("2026-01-11", "wh-2"),
+        ]
+        first = result.rows[0]
+        assert first["fulfillments"] == 5
+        assert first["hours_late_p50"] == pytest.approx(10, rel=0.01)
+        assert first["hours_late_p99"] == pytest.approx(20, rel=0.01)
+        assert "shop_id" not in str(mock_conn.execute.call_args[0][0])
+
+    def test_range_merge_and_sketch_cache(self, kpi, mock_engine, dev_mode):
+        """Verify cached days are merged without rescanning."""
+        rows = sketch_rows(kpi, {
+            date(2026, 1, 10): {"wh-1": [1, 2, 3]},
+            date(2026, 1, 11): {"wh-1": [4, 5, 6]},
+        })
+        mock_conn = self.engine_with_rows(mock_engine, rows)
+        params = {"start_date": "2026-01-10", "end_date": "2026-01-11", "per_day": False}
+
+        first = kpi.execute(mock_engine, params, today=TODAY)
+        mock_conn.execute.reset_mock()
+        second = kpi.execute(mock_engine, params, today=TODAY)
+
+        mock_conn.execute.assert_not_called()
+        assert second.metadata["days_from_sketch_cache"] == 2
+        assert second.rows == first.rows
+        assert second.rows[0]["date"] == "2026-01-10..2026-01-11"
+        assert second.rows[0]["fulfillments"] == 6
+
+    def test_sketch_cache_is_per_database(self, kpi, dev_mode):
+        """Verify sketches cached from one database are never served for another."""
+        params = {"start_date": "2026-01-10", "end_date": "2026-01-10"}
+        engine_a, engine_b = MagicMock(), MagicMock()
+        self.engine_with_rows(engine_a, sketch_rows(kpi, {date(2026, 1, 10): {"wh-1": [1]}}))
+        conn_b = self.engine_with_rows(
+            engine_b,
+            sketch_rows(kpi, {date(2026, 1, 10): {"wh-1": [7, 8]}}),
+            url="postgresql://kpi@db-b:5432/shop",
+        )
+
+        kpi.execute(engine_a, params, today=TODAY)
+        result = kpi.execute(engine_b, params, today=TODAY)
+
+        conn_b.execute.assert_called_once()
+        assert result.metadata["days_from_sketch_cache"] == 0
+        assert result.rows[0]["fulfillments"] == 2
+
+    def test_production_does_not_use_sketch_cache(self, kpi, mock_engine, cache_dir):
+        """Verify production runs always scan and write nothing to the cache."""
+        rows = sketch_rows(kpi, {date(2026, 1, 10): {"wh-1": [1, 2]}})
+        mock_conn = self.engine_with_rows(mock_engine, rows)
+        params = {"start_date": "2026-01-10", "end_date": "2026-01-10"}
+
+        kpi.execute(mock_engine, params, today=TODAY)
+        result = kpi.execute(mock_engine, params, today=TODAY)
+
+        assert mock_conn.execute.call_count == 2
+        assert result.metadata["days_from_sketch_cache"] == 0
+        assert not cache_dir.exists()
+
+    def test_concurrent_saves_of_a_day(self, tmp_path):
+        """Verify concurrent writers of the same day leave one complete file."""
+        def save(n: int) -> None:
+            for _ in range(20):
+                save_day(tmp_path, date(2026, 1, 10), {"wh-1": {"writer": n}})
+
+        threads = [threading.Thread(target=save, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert [path.name for path in tmp_path.iterdir()] == ["2026-01-10.json"]
+        assert json.loads((tmp_path / "2026-01-10.json").read_text())["wh-1"]["writer"] in range(4)
+
+    def test_shop_filter_and_open_day(self, kpi, mock_engine):
+        """Verify the shop filter is applied and today is never cached."""
+        mock_conn = self.engine_with_rows(mock_engine, [])
+        params = {"start_date": "2026-01-20", "end_date": "2026-01-20", "shop_id": "shop-1"}
+
+        kpi.execute(mock_engine, params, today=TODAY)
+        kpi.execute(mock_engine, params, today=TODAY)
+
+        query, query_params = mock_conn.execute.call_args[0]
+        assert "f.shop_id = :shop_id" in str(query)
+        assert query_params["shop_id"] == "shop-1"
+        assert mock_conn.execute.call_count == 2
+
+    def test_database_error(self, kpi, mock_engine):
+        """Verify errors are returned in the result."""
+        mock_engine.connect.side_effect = Exception("Connection failed")
+
+        result = kpi.execute(mock_engine, {}, today=TODAY)
+
+        assert not result.success
+        assert "Connection failed" in result.error
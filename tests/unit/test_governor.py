@@ -0,0 +1,266 @@
+"""Unit tests for the database load governor."""
+
+import threading
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, List
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.cache import query_cache
+from src.config import reset_config
+from src.kpis.base import BaseKPI, Parameter
+from src.kpis.error_clusters import ErrorClustersKPI
+from src.models.result import KPIResult
+from src.runner.executor import KPIExecutor
+from src.runner.governor import DEFAULT_WEIGHT, LoadGovernor, estimate_weight
+
+
+class WeightedKPI(BaseKPI):
+    """KPI that records how much governor weight was in use while it ran."""
+
+    name = "Weighted"
+    description = "Test KPI"
+    cost_weight = 2.0
+    governor: LoadGovernor
+
+    def get_parameters(self) -> List[Parameter]:
+        return []
+
+    def execute(self, engine: Any, params: Dict[str, Any]) -> KPIResult:
+        in_use = WeightedKPI.governor.in_use
+        return KPIResult(kpi_name=self.name, columns=["in_use"], rows=[{"in_use": in_use}])
+
+
+class DailyKPI(BaseKPI):
+    """Bucketed KPI counting its executions."""
+
+    name = "Daily Weighted"
+    description = "Test KPI"
+    bucket_column = "date"
+    calls = 0
+
+    def get_parameters(self) -> List[Parameter]:
+        return []
+
+    def execute(self, engine: Any, params: Dict[str, Any]) -> KPIResult:
+        DailyKPI.calls += 1
+        start_date, end_date = self.resolve_date_range(params)
+        days = range((end_date - start_date).days + 1)
+        rows = [{"date": (start_date + timedelta(days=i)).isoformat()} for i in days]
+        return KPIResult(kpi_name=self.name, columns=["date"], rows=rows)
+
+
+def explain_engine(total_cost: float) -> MagicMock:
+    """PostgreSQL engine mock answering EXPLAIN with total_cost."""
+    engine = MagicMock()
+    engine.dialect.name = "postgresql"
+    conn = engine.connect.return_value.__enter__.return_value
+    conn.execute.return_value.scalar.return_value = [{"Plan": {"Total Cost": total_cost}}]
+    return engine
+
+
+class TestLoadGovernor:
+    """Tests for LoadGovernor admission."""
+
+    def test_work_over_budget_queues_until_release(self):
+        """Verify work that does not fit waits for running work to finish."""
+        governor = LoadGovernor(budget=3)
+        admitted = threading.Event()
+        waits: List[float] = []
+
+        def heavy() -> None:
+            with governor.admit(2) as wait:
+                waits.append(wait)
+                admitted.set()
+
+        with governor.admit(2):
+            worker = threading.Thread(target=heavy)
+            worker.start()
+            assert not admitted.wait(0.1)
+            assert governor.in_use == 2
+        worker.join(timeout=5)
+
+        assert admitted.is_set()
+        assert waits[0] >= 0.1
+        assert governor.in_use == 0
+
+    def test_light_work_runs_side_by_side_and_oversize_is_capped(self):
+        """Verify weights that fit are admitted at once and oversize work runs alone."""
+        governor = LoadGovernor(budget=2)
+
+        with governor.admit(1) as first, governor.admit(1) as second:
+            assert (first, second) < (0.05, 0.05)
+            assert governor.in_use == 2
+        with governor.admit(50):
+            assert governor.in_use == 2
+
+        with pytest.raises(ValueError):
+            LoadGovernor(budget=0)
+
+    def test_arrival_order_is_kept(self):
+        """Verify light work arriving after queued heavy work does not overtake it."""
+        governor = LoadGovernor(budget=2)
+        order: List[str] = []
+
+        def run(name: str, weight: float) -> None:
+            with governor.admit(weight):
+                order.append(name)
+
+        with governor.admit(1):
+            heavy = threading.Thread(target=run, args=("heavy", 2))
+            heavy.start()
+            time.sleep(0.05)
+            light = threading.Thread(target=run, args=("light", 1))
+            light.start()
+            time.sleep(0.05)
+            assert order == []
+        heavy.join(timeout=5)
+        light.join(timeout=5)
+
+        assert order == ["heavy", "light"]
+
+
+class TestEstimateWeight:
+    """Tests for cost weight resolution."""
+
+    def test_declared_then_history_then_default(self):
+        """Verify declared weights win, then history, then the default."""
+        history = MagicMock()
+        history.expected_duration.return_value = 120.0
+
+        assert estimate_weight(WeightedKPI(), {}, history=history) == 2.0
+        WeightedKPI.cost_weight = None
+        try:
+            assert estimate_weight(WeightedKPI(), {}, history=history) == 4.0
+            history.expected_duration.return_value = 3.0
+            assert estimate_weight(WeightedKPI(), {}, history=history) == 1.0
+            assert estimate_weight(WeightedKPI(), {}) == 1.0
+        finally:
+            WeightedKPI.cost_weight = 2.0
+
+    def test_explain_cost_of_cost_query(self):
+        """Verify KPIs without history are weighed by the planner's estimate."""
+        kpi = MagicMock(cost_weight=None)
+        kpi.cost_query.return_value = ("SELECT * FROM export", {})
+        engine = explain_engine(450000.0)
+        conn = engine.connect.return_value.__enter__.return_value
+
+        assert estimate_weight(kpi, {}, engine=engine) == 4.5
+        assert "EXPLAIN (FORMAT JSON) SELECT * FROM export" in str(conn.execute.call_args[0][0])
+
+    def test_cost_query_of_regular_kpi(self):
+        """Verify a KPI without bulk or drill-down query can still be EXPLAINed."""
+        engine = explain_engine(300000.0)
+        conn = engine.connect.return_value.__enter__.return_value
+
+        assert estimate_weight(ErrorClustersKPI(), {}, engine=engine) == 3.0
+        assert "FROM error_log e" in str(conn.execute.call_args[0][0])
+
+    def test_failing_cost_query_falls_back_to_default(self):
+        """Verify a KPI whose query cannot be built gets the default weight."""
+        kpi = MagicMock(cost_weight=None)
+        kpi.cost_query.side_effect = ValueError("bad date")
+
+        assert estimate_weight(kpi, {}, engine=explain_engine(1e9)) == DEFAULT_WEIGHT
+
+
+class TestExecutorGovernor:
+    """Tests for load governing in KPIExecutor."""
+
+    def test_execution_is_admitted_and_instrumented(self, tmp_path, mock_engine):
+        """Verify KPIs run under the budget and report their queue wait."""
+        config = reset_config()
+        config.output_directory = tmp_path
+        config.load_budget = 3
+        executor = KPIExecutor(history=MagicMock())
+        executor._get_engine = lambda: mock_engine
+        WeightedKPI.governor = executor._get_governor()
+        try:
+            result = executor.run(WeightedKPI(), {})
+        finally:
+            reset_config()
+
+        assert result.rows == [{"in_use": 2.0}]
+        assert result.metadata["cost_weight"] == 2.0
+        assert result.metadata["queue_wait_seconds"] >= 0
+
+    def test_weights_are_per_parameters(self, mock_engine):
+        """Verify cost weights are cached per KPI and parameters."""
+        executor = KPIExecutor(history=MagicMock())
+        with patch("src.runner.executor.estimate_weight", side_effect=[1.0, 3.0]) as estimate:
+            weights = [
+                executor._cost_weight(WeightedKPI(), mock_engine, params)
+                for params in ({"days": 1}, {"days": 90}, {"days": 1})
+            ]
+
+        assert weights == [1.0, 3.0, 1.0]
+        assert estimate.call_count == 2
+
+    def test_cached_range_does_not_queue(self, tmp_path, monkeypatch):
+        """Verify a fully cached dev mode range is served while the budget is taken."""
+        monkeypatch.setattr(query_cache, "CACHE_DIR", tmp_path / "cache")
+        config = reset_config()
+        config.output_directory = tmp_path
+        config.dev_mode = True
+        config.load_budget = 1
+        history = MagicMock()
+        history.expected_duration.return_value = None
+        executor = KPIExecutor(history=history)
+        executor._get_engine = lambda: None
+        params = {"start_date": date(2026, 1, 1), "end_date": date(2026, 1, 5)}
+        DailyKPI.calls = 0
+        results: List[KPIResult] = []
+        try:
+            first = executor.run(DailyKPI(), params)
+            with executor._get_governor().admit(1):
+                worker = threading.Thread(
+                    target=lambda: results.append(executor.run(DailyKPI(), params))
+                )
+                worker.start()
+                worker.join(timeout=2)
+                assert not worker.is_alive()
+        finally:
+            reset_config()
+
+        assert first.metadata["queue_wait_seconds"] >= 0
+        assert results[0].from_cache
+        assert "queue_wait_seconds" not in results[0].metadata
+        assert DailyKPI.calls == 1
+
+    def test_range_gaps_take_admission_before_profiling(self, tmp_path, monkeypatch):
+        """Verify a range gap waiting for admission does not hold the profiler lock."""
+        from src.runner.profiling import Profiler
+
+        monkeypatch.setattr(query_cache, "CACHE_DIR", tmp_path / "cache")
+        config = reset_config()
+        config.output_directory = tmp_path
+        config.dev_mode = True
+        config.load_budget = 1
+        history = MagicMock()
+        history.expected_duration.return_value = None
+        executor = KPIExecutor(history=history)
+        executor._get_engine = lambda: None
+        executor._profiler = Profiler(tmp_path / "profile")
+        params = {"start_date": date(2026, 1, 1), "end_date": date(2026, 1, 5)}
+        results: List[KPIResult] = []
+        try:
+            with executor._get_governor().admit(1):
+                worker = threading.Thread(
+                    target=lambda: results.append(executor.run(DailyKPI(), params))
+                )
+                worker.start()
+                time.sleep(0.2)
+                # What a governed KPI does next: take the profiler after admission.
+                acquired = executor._profiler._lock.acquire(timeout=1)
+                if acquired:
+                    executor._profiler._lock.release()
+            worker.join(timeout=5)
+        finally:
+            reset_config()
+
+        assert acquired
+        assert not worker.is_alive()
+        assert results[0].success
+        assert "profile" in results[0].metadata
@@ -0,0 +1,88 @@
+"""Unit tests for the Import Health KPI."""
+
+from datetime import date
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.cache import query_cache
+from src.cache.range_cache import execute_with_range_cache
+from src.kpis.import_health import ImportHealthKPI
+
+
+class TestImportHealthKPI:
+    """Tests for ImportHealthKPI."""
+
+    @pytest.fixture(autouse=True)
+    def cache_dir(self, tmp_path, monkeypatch):
+        """Redirect the cache to a temporary directory."""
+        monkeypatch.setattr(query_cache, "CACHE_DIR", tmp_path / "cache")
+
+    @pytest.fixture
+    def kpi(self):
+        return ImportHealthKPI()
+
+    @pytest.fixture
+    def mock_conn(self, mock_engine):
+        """Connection returning one grouped row per query."""
+        mock_conn = MagicMock()
+        mock_conn.execute.side_effect = lambda query, params: [
+            (params["start_date"], "order", "lp-1", 10, 8, 1),
+        ]
+        mock_engine.connect.return_value.__enter__ = MagicMock(return_value=mock_conn)
+        mock_engine.connect.return_value.__exit__ = MagicMock(return_value=False)
+        return mock_conn
+
+    def test_rates_from_grouped_counts(self, kpi, mock_engine, mock_conn):
+        """Verify first-time-right and open-error rates per row."""
+        result = kpi.execute(mock_engine, {"start_date": "2026-01-01", "end_date": "2026-01-01"})
+
+        assert result.success
+        assert result.rows == [{
+            "date": "2026-01-01", "item_type": "order", "logistics_partner_id": "lp-1",
+            "total_imports": 10, "first_time_right": 8, "open_errors": 1,
+            "first_time_right_rate": 80.0, "open_error_rate": 10.0,
+        }]
+
+    def test_query_matches_partial_index_predicates(self, kpi, mock_engine, mock_conn):
+        """Verify the query repeats the partial index predicates and filters."""
+        kpi.execute(mock_engine, {"item_type": "order", "logistics_partner_id": "lp-1"})
+
+        query, query_params = mock_conn.execute.call_args[0]
+        sql = " ".join(str(query).split())
+        assert "i.logistics_partner_id IS NOT NULL AND i.parent_id IS NULL" in sql
+        assert "e.import_id = i.id" in sql
+        assert "i.item_type = :item_type" in sql
+        assert query_params["logistics_partner_id"] == "lp-1"
+
+    def test_long_ranges_are_chunked(self, kpi, mock_engine, mock_conn):
+        """Verify a 30-day range runs as 7-day chunks."""
+        result = kpi.execute(mock_engine, {"start_date": "2026-01-01", "end_date": "2026-01-30"})
+
+        assert kpi.chunks(date(2026, 1, 1), date(2026, 1, 30))[-1] == (date(2026, 1, 29), date(2026, 1, 30))
+        assert mock_conn.execute.call_count == 5
+        assert result.metadata["chunks"] == 5
+        assert [r["date"] for r in result.rows] == [
+            "2026-01-01", "2026-01-08", "2026-01-15", "2026-01-22", "2026-01-29",
+        ]
+
+    def test_range_cache_reuses_days(self, kpi, mock_engine, mock_conn):
+        """Verify cached days are not queried again in range cache mode."""
+        params = {"start_date": "2026-01-01", "end_date": "2026-01-03"}
+        execute_with_range_cache(kpi, mock_engine, params, today=date(2026, 2, 1))
+        mock_conn.execute.reset_mock()
+
+        result = execute_with_range_cache(kpi, mock_engine, params, today=date(2026, 2, 1))
+
+        mock_conn.execute.assert_not_called()
+        assert result.from_cache
+        assert result.rows[0]["first_time_right_rate"] == 80.0
+
+    def test_database_error(self, kpi, mock_engine):
+        """Verify errors are returned in the result."""
+        mock_engine.connect.side_effect = Exception("Connection failed")
+
+        result = kpi.execute(mock_engine, {})
+
+        assert not result.success
+        assert "Connection failed" in result.error
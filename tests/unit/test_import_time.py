@@ -0,0 +1,115 @@
+"""Unit tests for lazy imports and the start-up import time benchmark."""
+
+import os
+import subprocess
+import sys
+
+from src.benchmarks import importtime
+from src.benchmarks.importtime import (
+    ImportReport,
+    imported_heavy_modules,
+    package_time_us,
+    parse_importtime,
+)
+
+SAMPLE_STDERR = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       900 |       1020 | site
+import time:       300 |        300 |     argparse
+import time:      2000 |       2000 |       keyring.core
+import time:       150 |       2150 |     keyring
+import time:       500 |       2950 |   src.config
+import time:       400 |       3350 | src.main
+some other stderr output
+import time:       700 |        700 | src.menu.console
+"""
+
+
+def run_python(code: str, cwd) -> str:
+    """Run code in a fresh interpreter with the project importable; return stdout."""
+    env = dict(os.environ, PYTHONPATH=str(importtime.PROJECT_ROOT))
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=cwd,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return completed.stdout
+
+
+class TestParseImporttime:
+    """Tests for parsing -X importtime output."""
+
+    def test_parses_timings_and_depth(self):
+        """Verify self/cumulative times and nesting depth are read from each line."""
+        timings = parse_importtime(SAMPLE_STDERR)
+
+        assert [(t.module, t.depth) for t in timings] == [
+            ("_io", 1),
+            ("site", 0),
+            ("argparse", 2),
+            ("keyring.core", 3),
+            ("keyring", 2),
+            ("src.config", 1),
+            ("src.main", 0),
+            ("src.menu.console", 0),
+        ]
+        assert (timings[6].self_us, timings[6].cumulative_us) == (400, 3350)
+
+    def test_package_time_and_heavy_modules(self):
+        """Verify only the package's top-level imports count, including what they import."""
+        timings = parse_importtime(SAMPLE_STDERR)
+
+        assert package_time_us(timings) == 3350 + 700
+        assert imported_heavy_modules(timings) == ["keyring"]
+
+    def test_report_failures(self):
+        """Verify the benchmark fails on the threshold and on heavy imports."""
+        report = ImportReport(total_ms=180.0, runs_ms=[180.0], heavy_modules=["sqlalchemy"])
+
+        assert report.failures(threshold_ms=200.0) == [
+            "heavy modules imported at start-up: sqlalchemy"
+        ]
+        assert len(report.failures(threshold_ms=150.0)) == 2
+        assert ImportReport(total_ms=50.0, runs_ms=[50.0]).failures(150.0) == []
+
+
+class TestLazyImports:
+    """Tests that entry paths defer heavy dependencies."""
+
+    def test_entry_modules_import_no_heavy_dependencies(self):
+        """Verify importing src.main and the menu pulls in no heavy dependency."""
+        timings = importtime.run_importtime()
+
+        assert any(t.module == "src.menu.console" for t in timings)
+        assert imported_heavy_modules(timings) == []
+
+    def test_menu_renders_without_heavy_dependencies(self, tmp_path):
+        """Verify the interactive menu starts and exits without SQLAlchemy or keyring."""
+        output = run_python(
+            "import sys\n"
+            "from src.main import main\n"
+            "main([])\n"
+            "print(sorted(m for m in ('sqlalchemy', 'keyring') if m in sys.modules))\n",
+            tmp_path,
+        )
+
+        assert "1. Run All KPIs" in output
+        assert output.rstrip().endswith("[]")
+
+    def test_json_exporter_does_not_import_csv_copy_support(self, tmp_path):
+        """Verify get_exporter only imports the requested exporter."""
+        output = run_python(
+            "import sys\n"
+            "from src.config import ExportFormat\n"
+            "from src.export import get_exporter\n"
+            "get_exporter(ExportFormat.JSON)\n"
+            "print('src.export.csv_exporter' in sys.modules, 'sqlalchemy' in sys.modules)\n",
+            tmp_path,
+        )
+
+        assert output.split() == ["False", "False"]
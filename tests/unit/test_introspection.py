@@ -0,0 +1,123 @@
+"""Unit tests for index introspection and the export query strategy."""
+
+from unittest.mock import MagicMock, patch
+
+from src.database.introspection import (
+    clear_index_cache,
+    list_indexes,
+    normalize_expression,
+    parse_index_definition,
+)
+from src.kpis.first_time_right_exports import FirstTimeRightExportsKPI
+from src.kpis.first_time_right_exports.first_time_right_exports import (
+    STRATEGY_ACTION_TYPE_LED,
+    STRATEGY_CREATION_DATE_LED,
+    choose_query_strategy,
+)
+
+# Index definitions as returned by pg_indexes for everstox_qm__export_http
+EXPORT_INDEXES = [
+    ("ix_everstox_qm__export_http_creation_date",
+     "CREATE INDEX ix_everstox_qm__export_http_creation_date ON public.everstox_qm__export_http "
+     "USING btree (creation_date)"),
+    ("ix_everstox_qm__export_http_tags_gdpr",
+     "CREATE INDEX ix_everstox_qm__export_http_tags_gdpr ON public.everstox_qm__export_http "
+     "USING btree (((tags -> 'action_type'::text)), ((tags -> 'gdpr_request_id'::text)), url)"),
+]
+
+
+class TestIndexParsing:
+    """Tests for parsing pg_indexes definitions."""
+
+    def test_normalize_expression_strips_casts_and_parens(self):
+        """Verify hstore expressions normalize to a comparable form."""
+        assert normalize_expression("((tags -> 'action_type'::text))") == "tags->'action_type'"
+        assert normalize_expression("creation_date DESC") == "creation_date"
+
+    def test_parse_expression_index(self):
+        """Verify multi-key expression indexes are split into keys."""
+        name, definition = EXPORT_INDEXES[1]
+
+        info = parse_index_definition(name, definition)
+
+        assert info.keys == ["tags->'action_type'", "tags->'gdpr_request_id'", "url"]
+        assert info.predicate is None
+
+    def test_parse_partial_index_predicate(self):
+        """Verify WHERE clauses of partial indexes are captured."""
+        info = parse_index_definition(
+            "error_log_export_idx",
+            "CREATE INDEX error_log_export_idx ON public.error_log USING btree "
+            "(creation_date DESC, from_service) WHERE (entity_type = 'export'::entity_type_enum)",
+        )
+
+        assert info.keys == ["creation_date", "from_service"]
+        assert "entity_type" in info.predicate
+
+    def test_list_indexes_is_cached(self, mock_engine):
+        """Verify the catalog is queried once per engine and table."""
+        clear_index_cache()
+        mock_conn = MagicMock()
+        mock_conn.execute.return_value = iter(EXPORT_INDEXES)
+        mock_engine.connect.return_value.__enter__ = MagicMock(return_value=mock_conn)
+        mock_engine.connect.return_value.__exit__ = MagicMock(return_value=False)
+
+        first = list_indexes(mock_engine, "everstox_qm__export_http")
+        second = list_indexes(mock_engine, "everstox_qm__export_http")
+
+        assert first is second
+        assert mock_conn.execute.call_count == 1
+        clear_index_cache()
+
+
+class TestExportQueryStrategy:
+    """Tests for choose_query_strategy and its use in the KPI."""
+
+    def test_production_indexes_choose_creation_date_led(self):
+        """Verify the action_type/gdpr index does not win over a date index."""
+        indexes = [parse_index_definition(n, d) for n, d in EXPORT_INDEXES]
+
+        strategy, reason = choose_query_strategy(indexes)
+
+        assert strategy == STRATEGY_CREATION_DATE_LED
+        assert "ix_everstox_qm__export_http_creation_date" in reason
+
+    def test_composite_index_chooses_action_type_led(self):
+        """Verify an (action_type, creation_date) index is preferred."""
+        indexes = [
+            parse_index_definition(n, d) for n, d in EXPORT_INDEXES
+        ] + [parse_index_definition(
+            "ix_action_type_creation_date",
+            "CREATE INDEX ix_action_type_creation_date ON public.everstox_qm__export_http "
+            "USING btree (((tags -> 'action_type'::text)), creation_date)",
+        )]
+
+        strategy, _ = choose_query_strategy(indexes)
+
+        assert strategy == STRATEGY_ACTION_TYPE_LED
+
+    def test_no_indexes_falls_back_to_per_type_queries(self):
+        """Verify the original per-type queries are used without index information."""
+        strategy, _ = choose_query_strategy([])
+
+        assert strategy == STRATEGY_ACTION_TYPE_LED
+
+    def test_grouped_strategy_used_and_reported(self, mock_engine):
+        """Verify the grouped query runs once and the strategy is in metadata."""
+        mock_conn = MagicMock()
+        mock_conn.execute.return_value = iter([("export_order_status", 10, 9)])
+        mock_engine.connect.return_value.__enter__ = MagicMock(return_value=mock_conn)
+        mock_engine.connect.return_value.__exit__ = MagicMock(return_value=False)
+        indexes = [parse_index_definition(n, d) for n, d in EXPORT_INDEXES]
+
+        with patch(
+            "src.kpis.first_time_right_exports.first_time_right_exports.list_indexes",
+            return_value=indexes,
+        ):
+            result = FirstTimeRightExportsKPI().execute(mock_engine, {})
+
+        assert mock_conn.execute.call_count == 1
+        assert result.metadata["query_strategy"] == STRATEGY_CREATION_DATE_LED
+        by_type = {r["action_type"]: r for r in result.rows}
+        assert by_type["export_order_status"]["failed_exports"] == 1
+        assert by_type["export_fulfillment_create"]["total_exports"] == 0
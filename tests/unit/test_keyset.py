@@ -0,0 +1,214 @@
+"""Unit tests for keyset pagination and paged drill-down results."""
+
+import csv
+import json
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from src.config import ExportFormat, reset_config
+from src.database.keyset import KeysetPager
+from src.events import KPI_FINISHED, KPI_STARTED
+from src.kpis.base import BaseKPI
+from src.kpis.failed_exports import FailedExportsKPI
+from src.models.result import KPIResult
+from src.runner.executor import KPIExecutor
+
+DETAIL_QUERY = "SELECT creation_date, id, state FROM export WHERE state = :state"
+
+
+@pytest.fixture
+def export_engine(tmp_path):
+    """SQLite engine with 45 failed exports, several sharing a creation_date."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'exports.db'}")
+    start = datetime(2026, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE export (creation_date TEXT, id TEXT, state TEXT)"))
+        for i in range(50):
+            conn.execute(
+                text("INSERT INTO export VALUES (:creation_date, :id, :state)"),
+                {
+                    "creation_date": (start + timedelta(hours=i // 3)).isoformat(),
+                    "id": f"exp-{49 - i:02d}",
+                    "state": "failed" if i % 10 else "ok",
+                },
+            )
+    yield engine
+    engine.dispose()
+
+
+class DetailKPI(BaseKPI):
+    """Drill-down KPI over the SQLite export table."""
+
+    name = "Detail Exports"
+    description = "Failed exports"
+
+    def get_parameters(self):
+        return []
+
+    def drilldown_query(self, params):
+        return DETAIL_QUERY, {"state": "failed"}
+
+    def execute(self, engine, params):
+        raise AssertionError("drill-down KPIs are paged, not executed")
+
+
+class TestKeysetPager:
+    """Tests for KeysetPager."""
+
+    def test_pages_cover_all_rows_in_key_order(self, export_engine):
+        """Verify pages are contiguous, ordered and without duplicates."""
+        pager = KeysetPager(export_engine, DETAIL_QUERY, {"state": "failed"}, page_size=10)
+
+        pages = list(pager.pages())
+        keys = [(row["creation_date"], row["id"]) for page in pages for row in page.rows]
+
+        assert [len(page.rows) for page in pages] == [10, 10, 10, 10, 5]
+        assert [page.has_more for page in pages] == [True, True, True, True, False]
+        assert keys == sorted(keys)
+        assert len(set(keys)) == 45
+        assert pager.columns == ["creation_date", "id", "state"]
+
+    def test_page_query_continues_after_last_key(self, export_engine):
+        """Verify the next page is selected by a row comparison, not OFFSET."""
+        pager = KeysetPager(export_engine, DETAIL_QUERY + ";", {"state": "failed"}, page_size=5)
+
+        sql, params = pager.page_query(("2026-01-01T03:00:00", "exp-40"))
+
+        assert "WHERE (creation_date, id) > (:keyset_after_0, :keyset_after_1)" in sql
+        assert "ORDER BY creation_date, id LIMIT :keyset_limit" in sql
+        assert "OFFSET" not in sql and ";" not in sql
+        assert params["keyset_limit"] == 6
+        assert params["state"] == "failed"
+
+    def test_empty_result_and_validation(self, export_engine):
+        """Verify an empty result yields one empty page and bad sizes are rejected."""
+        pager = KeysetPager(export_engine, DETAIL_QUERY, {"state": "missing"})
+
+        assert [page.rows for page in pager.pages()] == [[]]
+        assert list(pager.rows()) == []
+        with pytest.raises(ValueError):
+            KeysetPager(export_engine, DETAIL_QUERY, {}, page_size=0)
+
+
+class TestFailedExportsKPI:
+    """Tests for FailedExportsKPI."""
+
+    @pytest.fixture
+    def kpi(self):
+        return FailedExportsKPI()
+
+    def test_drilldown_query_filters(self, kpi):
+        """Verify filters are added to the detail query without ORDER BY/LIMIT."""
+        query, params = kpi.drilldown_query({
+            "start_date": "2026-01-01", "end_date": "2026-01-07",
+            "shop_id": "shop-1", "action_type": "export_order_status",
+        })
+
+        assert "x.shop_id = :shop_id" in query
+        assert "x.tags -> 'action_type' = :action_type" in query
+        assert "ORDER BY x." not in query and "LIMIT :" not in query
+        assert params["end_date"] == date(2026, 1, 7)
+
+    def test_execute_returns_first_page(self, kpi, mock_engine):
+        """Verify execute() fetches one page and flags further pages."""
+        kpi.page_size = 2
+        rows = [(datetime(2026, 1, 1, h), f"exp-{h}", "order", "failed", 500, "E1", "boom") for h in range(3)]
+        result_proxy = MagicMock()
+        result_proxy.keys.return_value = [
+            "creation_date", "id", "action_type", "state", "response_code", "error_code", "error_message",
+        ]
+        result_proxy.__iter__.return_value = iter(rows)
+        mock_conn = MagicMock()
+        mock_conn.execute.return_value = result_proxy
+        mock_engine.connect.return_value.__enter__ = MagicMock(return_value=mock_conn)
+        mock_engine.connect.return_value.__exit__ = MagicMock(return_value=False)
+
+        result = kpi.execute(mock_engine, {})
+
+        assert result.success
+        assert [row["id"] for row in result.rows] == ["exp-0", "exp-1"]
+        assert result.metadata["has_more"] is True
+
+
+class TestExecutorDrilldown:
+    """Tests for paged drill-down in KPIExecutor.execute_single."""
+
+    def run(
+        self, export_engine, tmp_path, export_format, browse=None, **settings: Any
+    ) -> KPIResult:
+        config = reset_config()
+        config.export_format = export_format
+        config.output_directory = tmp_path
+        for name, value in settings.items():
+            setattr(config, name, value)
+        history = MagicMock()
+        history.expected_duration.return_value = None
+        history.check_regression.return_value = None
+        executor = KPIExecutor(history=history)
+        try:
+            with patch.object(executor, "_get_engine", return_value=export_engine):
+                result = executor.execute_single(DetailKPI(), {}, browse=browse)
+        finally:
+            reset_config()
+        return result
+
+    def test_browse_pages_then_export_all_rows(self, export_engine, tmp_path):
+        """Verify pages are shown on request and the export holds every row."""
+        shown: List[int] = []
+
+        def browse(page: Any) -> bool:
+            shown.append(page.number)
+            return page.number < 2
+
+        result = self.run(export_engine, tmp_path, ExportFormat.CSV, browse)
+
+        assert result.success
+        assert shown == [1, 2]
+        assert len(result.rows) == 20
+        assert result.row_count == 45
+        with open(next(tmp_path.glob("detail_exports_*.csv")), newline="") as f:
+            exported: List[Dict[str, str]] = list(csv.DictReader(f))
+        assert len(exported) == 45
+        assert exported[0] == result.rows[0]
+
+    def test_json_export_streams_pages(self, export_engine, tmp_path):
+        """Verify the JSON export is a complete document with all rows."""
+        result = self.run(export_engine, tmp_path, ExportFormat.JSON)
+
+        with open(next(tmp_path.glob("detail_exports_*.json"))) as f:
+            document = json.load(f)
+        assert document["row_count"] == 45 == result.row_count
+        assert len(document["data"]) == 45
+        assert document["columns"] == ["creation_date", "id", "state"]
+
+    def test_pages_are_governed_and_emit_events(self, export_engine, tmp_path):
+        """Verify every page query is admitted and the run emits KPI events."""
+        with patch("src.runner.executor.emit") as emit:
+            result = self.run(
+                export_engine, tmp_path, ExportFormat.CSV, lambda page: True, load_budget=2
+            )
+
+        assert result.success
+        assert result.metadata["cost_weight"] == 1.0
+        assert result.metadata["queue_wait_seconds"] >= 0
+        assert [c.args[0] for c in emit.call_args_list] == [KPI_STARTED, KPI_FINISHED]
+        assert emit.call_args_list[-1].kwargs["rows"] == 45
+
+    def test_transient_page_failure_is_retried(self, export_engine, tmp_path):
+        """Verify a dropped connection during paging retries the drill-down."""
+        flaky = MagicMock(wraps=export_engine)
+        flaky.connect.side_effect = [
+            OperationalError("SELECT", {}, Exception("server closed the connection")),
+            *[export_engine.connect() for _ in range(4)],
+        ]
+
+        result = self.run(flaky, tmp_path, ExportFormat.CSV, retry_base_delay=0.0)
+
+        assert result.success
+        assert result.metadata["retries"] == 1
+        assert result.row_count == 45
@@ -0,0 +1,72 @@
+"""Unit tests for the Latest Parcel Status KPI."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.kpis.latest_parcel_status import LatestParcelStatusKPI
+
+
+class TestLatestParcelStatusKPI:
+    """Tests for LatestParcelStatusKPI."""
+
+    @pytest.fixture
+    def kpi(self):
+        return LatestParcelStatusKPI()
+
+    @pytest.fixture
+    def mock_conn(self, mock_engine):
+        """Connection returning a phase distribution."""
+        mock_conn = MagicMock()
+        mock_conn.execute.return_value = [("delivered", 75), ("in_transit", 20), ("no_events", 5)]
+        mock_engine.connect.return_value.__enter__ = MagicMock(return_value=mock_conn)
+        mock_engine.connect.return_value.__exit__ = MagicMock(return_value=False)
+        return mock_conn
+
+    def test_phase_distribution_with_shares(self, kpi, mock_engine, mock_conn):
+        """Verify counts and shares per phase."""
+        result = kpi.execute(mock_engine, {"start_date": "2026-01-01", "end_date": "2026-01-07"})
+
+        assert result.success
+        assert result.rows[0] == {"phase": "delivered", "shipments": 75, "share": 75.0}
+        assert sum(r["share"] for r in result.rows) == 100.0
+
+    def test_missing_phase_is_not_counted_as_no_events(self, kpi, mock_engine, mock_conn):
+        """Verify shipments whose latest event has no phase keep their own row."""
+        mock_conn.execute.return_value = [("delivered", 3), (None, 1), ("no_events", 1)]
+
+        result = kpi.execute(mock_engine, {})
+
+        assert [(r["phase"], r["shipments"]) for r in result.rows] == [
+            ("delivered", 3), (None, 1), ("no_events", 1),
+        ]
+
+    def test_query_uses_lateral_latest_event(self, kpi, mock_engine, mock_conn):
+        """Verify the latest event is resolved per shipment with LIMIT 1."""
+        kpi.execute(mock_engine, {"shop_id": "shop-1"})
+
+        query, query_params = mock_conn.execute.call_args[0]
+        sql = " ".join(str(query).split())
+        assert "LEFT JOIN LATERAL" in sql
+        assert "ORDER BY pe.event_time DESC LIMIT 1" in sql
+        assert "GROUP BY pe." not in sql
+        assert "CASE WHEN latest.shipment_id IS NULL THEN :no_events ELSE latest.phase END" in sql
+        assert "s.shop_id = :shop_id" in sql
+        assert query_params["shop_id"] == "shop-1"
+
+    def test_no_shop_filter_by_default(self, kpi, mock_engine, mock_conn):
+        """Verify the shop filter is optional."""
+        kpi.execute(mock_engine, {})
+
+        query, query_params = mock_conn.execute.call_args[0]
+        assert "shop_id" not in str(query)
+        assert (query_params["end_date"] - query_params["start_date"]).days == 6
+
+    def test_invalid_range_and_errors(self, kpi, mock_engine):
+        """Verify validation and database errors are returned in the result."""
+        invalid = kpi.execute(mock_engine, {"start_date": "2026-01-07", "end_date": "2026-01-01"})
+        mock_engine.connect.side_effect = Exception("Connection failed")
+        failed = kpi.execute(mock_engine, {})
+
+        assert "Invalid date range" in invalid.error
+        assert "Connection failed" in failed.error
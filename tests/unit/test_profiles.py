@@ -0,0 +1,153 @@
+"""Unit tests for connection profiles and multi-environment Run All."""
+
+import threading
+from datetime import date
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import pytest
+
+from src.config import get_config, reset_config
+from src.cache import query_cache
+from src.credentials import keychain
+from src.kpis.base import BaseKPI, Parameter
+from src.kpis.fulfillment_lateness import FulfillmentLatenessKPI
+from src.kpis.sketches import QuantileSketch
+from src.models.result import KPIResult
+from src.runner.executor import KPIExecutor
+
+
+@pytest.fixture
+def fake_keyring(monkeypatch):
+    """Replace the system keychain with a dict."""
+    store: Dict[str, str] = {}
+    monkeypatch.setattr(keychain.keyring, "get_password", lambda service, key: store.get(key))
+    monkeypatch.setattr(
+        keychain.keyring, "set_password", lambda service, key, value: store.__setitem__(key, value)
+    )
+    monkeypatch.setattr(keychain.keyring, "delete_password", lambda service, key: store.pop(key, None))
+    monkeypatch.setattr(keychain, "_db_url_cache", None)
+    monkeypatch.setattr(keychain, "_profile_url_cache", {})
+    return store
+
+
+class TestConnectionProfiles:
+    """Tests for named connection profiles in the keychain."""
+
+    def test_add_list_and_get_profiles(self, fake_keyring):
+        """Verify profiles are stored by name and listed after the default."""
+        keychain.set_db_url("postgresql://primary/db")
+        keychain.set_profile_url("eu", "postgresql://eu/db ")
+        keychain.set_profile_url("us", "postgresql://us/db")
+        keychain.set_profile_url("eu", "postgresql://eu2/db")
+
+        assert keychain.list_profiles() == ["default", "eu", "us"]
+        assert keychain.get_profile_url("eu") == "postgresql://eu2/db"
+        assert keychain.get_profile_url("default") == "postgresql://primary/db"
+
+    def test_delete_and_missing_profiles(self, fake_keyring):
+        """Verify deleted profiles disappear and unknown ones raise."""
+        keychain.set_profile_url("eu", "postgresql://eu/db")
+        keychain.delete_profile("eu")
+
+        assert keychain.list_profiles() == []
+        with pytest.raises(ValueError):
+            keychain.get_profile_url("eu")
+        with pytest.raises(ValueError):
+            keychain.set_profile_url(" ", "postgresql://x/db")
+
+
+class EnvironmentKPI(BaseKPI):
+    """KPI reporting which database it ran against, once all profiles are running."""
+
+    name = "Environment"
+    description = "Test KPI"
+    barrier: threading.Barrier
+
+    def get_parameters(self) -> List[Parameter]:
+        return []
+
+    def execute(self, engine: Any, params: Dict[str, Any]) -> KPIResult:
+        # Only passes if every profile's suite runs at the same time
+        EnvironmentKPI.barrier.wait()
+        return KPIResult(kpi_name=self.name, columns=["db"], rows=[{"db": engine.url.database}])
+
+
+class SketchEnvironmentKPI(FulfillmentLatenessKPI):
+    """Sketch-cached KPI whose scan returns one fulfillment per day, lateness by database."""
+
+    name = "Sketch Environment"
+    scans: List[str] = []
+
+    def get_parameters(self) -> List[Parameter]:
+        return []
+
+    def _scan(self, engine, start_date, end_date, shop_id):
+        SketchEnvironmentKPI.scans.append(engine.url.database)
+        hours = 10.0 if engine.url.database.endswith("eu.db") else 90.0
+        sketch = QuantileSketch(self.relative_accuracy)
+        sketch.add(hours)
+        day = start_date
+        days = {}
+        while day <= end_date:
+            days[day.isoformat()] = {"wh-1": {"hours_late": sketch}}
+            day = date.fromordinal(day.toordinal() + 1)
+        return days
+
+    def execute(self, engine, params, today=None):
+        params = {"start_date": "2026-01-10", "end_date": "2026-01-11"}
+        return super().execute(engine, params, today=date(2026, 1, 20))
+
+
+class TestMultiEnvironmentRunAll:
+    """Tests for KPIExecutor.execute_all_profiles."""
+
+    @pytest.fixture
+    def executor(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("src.runner.executor.HISTORY_PATH", tmp_path / "run_history.sqlite3")
+        monkeypatch.setattr(
+            "src.runner.executor.get_profile_url", lambda name: f"sqlite:///{tmp_path / name}.db"
+        )
+        config = reset_config()
+        config.output_directory = tmp_path
+        executor = KPIExecutor()
+        with patch.object(KPIExecutor, "_export_report"):
+            yield executor
+        reset_config()
+
+    def test_profiles_run_concurrently_and_are_tagged(self, executor, tmp_path):
+        """Verify each profile runs on its own engine, concurrently, tagged by environment."""
+        EnvironmentKPI.barrier = threading.Barrier(2, timeout=5)
+
+        with patch("src.runner.executor.discover_kpis", return_value=[EnvironmentKPI]):
+            report = executor.execute_all_profiles(["eu", "us"])
+
+        assert report.success_count == 2
+        assert [(r.metadata["environment"], r.rows[0]["db"]) for r in report.results] == [
+            ("eu", str(tmp_path / "eu.db")), ("us", str(tmp_path / "us.db")),
+        ]
+        assert (tmp_path / "run_history_eu.sqlite3").exists()
+
+    def test_sketch_cache_is_not_shared_between_environments(
+        self, executor, tmp_path, monkeypatch
+    ):
+        """Verify a sketch-cached KPI returns each environment's own numbers in dev mode."""
+        monkeypatch.setattr(query_cache, "CACHE_DIR", tmp_path / "cache")
+        get_config().dev_mode = True
+        SketchEnvironmentKPI.scans = []
+
+        with patch("src.runner.executor.discover_kpis", return_value=[SketchEnvironmentKPI]):
+            executor.execute_all_profiles(["eu", "us"])
+            report = executor.execute_all_profiles(["eu", "us"])
+
+        p50 = {r.metadata["environment"]: r.rows[0]["hours_late_p50"] for r in report.results}
+        assert p50 == {"eu": pytest.approx(10, rel=0.02), "us": pytest.approx(90, rel=0.02)}
+        assert sorted(SketchEnvironmentKPI.scans) == [
+            str(tmp_path / "eu.db"), str(tmp_path / "us.db"),
+        ]
+        assert all(r.metadata["days_from_sketch_cache"] == 2 for r in report.results)
+
+    def test_no_profiles(self, executor):
+        """Verify an empty profile list does nothing."""
+        with patch("src.runner.executor.discover_kpis", return_value=[EnvironmentKPI]):
+            assert executor.execute_all_profiles([]) is None
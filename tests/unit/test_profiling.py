@@ -0,0 +1,103 @@
+"""Unit tests for profiling mode."""
+
+from typing import Any, Dict, List
+from unittest.mock import MagicMock
+
+from src.config import reset_config
+from src.kpis.base import BaseKPI, Parameter
+from src.models.result import KPIResult
+from src.runner.executor import KPIExecutor
+from src.runner.profiling import Profiler
+
+
+def build_rows(count: int) -> List[Dict[str, Any]]:
+    """Allocate and return some rows."""
+    return [{"n": i, "label": f"row-{i}" * 4} for i in range(count)]
+
+
+def post_process(count: int) -> List[Dict[str, Any]]:
+    """Call build_rows, so the profile has a two-level stack."""
+    return sorted(build_rows(count), key=lambda row: -row["n"])
+
+
+class RowsKPI(BaseKPI):
+    """KPI doing some Python work to profile."""
+
+    name = "Profiled Rows"
+    description = "Test KPI"
+
+    def get_parameters(self) -> List[Parameter]:
+        return []
+
+    def execute(self, engine: Any, params: Dict[str, Any]) -> KPIResult:
+        rows = post_process(2000)
+        return KPIResult(kpi_name=self.name, columns=["n", "label"], rows=rows)
+
+
+class TestProfiler:
+    """Tests for Profiler artifacts."""
+
+    def test_profile_writes_artifacts(self, tmp_path):
+        """Verify pstats, collapsed stacks and allocations are written for a block."""
+        profiler = Profiler(tmp_path / "profile")
+
+        with profiler.profile("Orders by Date", "execute") as records:
+            rows = post_process(5000)
+
+        [record] = records
+        assert record.pstats_path == tmp_path / "profile" / "orders_by_date.execute.pstats"
+        assert record.pstats_path.stat().st_size > 0
+        assert record.peak_memory_bytes > 0
+
+        stacks = record.collapsed_path.read_text().splitlines()
+        nested = [line for line in stacks if "post_process (" in line and ";build_rows (" in line]
+        assert nested
+        frames, micros = nested[0].rsplit(" ", 1)
+        assert int(micros) > 0 and frames.index("post_process") < frames.index("build_rows")
+
+        allocations = record.allocations_path.read_text()
+        assert allocations.startswith("Peak traced memory:")
+        assert "test_profiling.py" in allocations
+        assert len(rows) == 5000
+
+
+class TestExecutorProfiling:
+    """Tests for profiling mode in KPIExecutor."""
+
+    def test_single_run_profiles_execute_and_export(self, tmp_path, mock_engine):
+        """Verify a profiled run writes execute and export artifacts next to the report."""
+        config = reset_config()
+        config.output_directory = tmp_path
+        config.profiling = True
+        executor = KPIExecutor(history=MagicMock())
+        executor._get_engine = lambda: mock_engine
+        try:
+            result = executor.execute_single(RowsKPI(), {})
+        finally:
+            reset_config()
+
+        [profile_dir] = tmp_path.glob("profile_*")
+        assert sorted(path.name for path in profile_dir.iterdir()) == [
+            "profiled_rows.execute.allocations.txt",
+            "profiled_rows.execute.collapsed",
+            "profiled_rows.execute.pstats",
+            "profiled_rows.export.allocations.txt",
+            "profiled_rows.export.collapsed",
+            "profiled_rows.export.pstats",
+        ]
+        assert result.metadata["profile"] == str(profile_dir / "profiled_rows.execute.pstats")
+        assert result.metadata["peak_memory_bytes"] > 0
+
+    def test_profiling_off_writes_nothing(self, tmp_path, mock_engine):
+        """Verify no profile directory is created when profiling is off."""
+        config = reset_config()
+        config.output_directory = tmp_path
+        executor = KPIExecutor(history=MagicMock())
+        executor._get_engine = lambda: mock_engine
+        try:
+            result = executor.execute_single(RowsKPI(), {})
+        finally:
+            reset_config()
+
+        assert list(tmp_path.glob("profile_*")) == []
+        assert "profile" not in result.metadata
@@ -0,0 +1,47 @@
+"""Unit tests for the dev mode query cache."""
+
+import pytest
+
+from src.cache import query_cache
+
+
+class TestQueryCache:
+    """Tests for load_from_cache/save_to_cache."""
+
+    @pytest.fixture(autouse=True)
+    def cache_dir(self, tmp_path, monkeypatch):
+        """Redirect the cache to a temporary directory."""
+        monkeypatch.setattr(query_cache, "CACHE_DIR", tmp_path / "cache")
+        return tmp_path / "cache"
+
+    def test_round_trip(self, sample_kpi_result):
+        """Verify saved results can be loaded back."""
+        params = {"shop_id": "shop-1"}
+        query_cache.save_to_cache(
+            "Orders", "Orders:{}", params,
+            sample_kpi_result["columns"], sample_kpi_result["rows"], 1.5,
+        )
+
+        columns, rows, metadata = query_cache.load_from_cache("Orders", "Orders:{}", params)
+
+        assert columns == sample_kpi_result["columns"]
+        assert rows == sample_kpi_result["rows"]
+        assert metadata["duration_seconds"] == 1.5
+
+    def test_miss_returns_none(self):
+        """Verify unknown queries are cache misses."""
+        assert query_cache.load_from_cache("Orders", "unknown", {}) is None
+
+    def test_entries_organized_by_shop(self, cache_dir):
+        """Verify entries are stored under cache/{shop_id}/queries/."""
+        query_cache.save_to_cache("Orders", "q", {"shop_id": None}, [], [], 0.0)
+
+        assert len(list((cache_dir / "all" / "queries").glob("*.json"))) == 1
+
+    def test_clear_cache(self, cache_dir):
+        """Verify clear_cache removes all entries."""
+        query_cache.save_to_cache("Orders", "q", {}, [], [], 0.0)
+
+        assert query_cache.clear_cache() is True
+        assert not cache_dir.exists()
+        assert query_cache.clear_cache() is False
@@ -0,0 +1,144 @@
+"""Unit tests for the range-aware dev mode cache."""
+
+from datetime import date, timedelta
+from typing import Any, Dict, List
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.cache import query_cache
+from src.cache.range_cache import execute_with_range_cache, find_gaps
+from src.kpis.base import BaseKPI, Parameter
+from src.kpis.orders_by_date import OrdersByDateKPI
+from src.models.result import KPIResult
+
+TODAY = date(2026, 1, 20)
+
+
+class DailyKPI(BaseKPI):
+    """Bucketed KPI that records the ranges it was executed for."""
+
+    name = "Daily Test"
+    description = "One row per day"
+    bucket_column = "date"
+
+    def __init__(self):
+        self.calls: List[tuple] = []
+
+    def get_parameters(self) -> List[Parameter]:
+        return []
+
+    def execute(self, engine: Any, params: Dict[str, Any]) -> KPIResult:
+        start_date, end_date = self.resolve_date_range(params)
+        self.calls.append((start_date, end_date))
+        rows = []
+        day = start_date
+        while day <= end_date:
+            rows.append({"date": day.isoformat(), "value": day.day})
+            day += timedelta(days=1)
+        return KPIResult(kpi_name=self.name, columns=["date", "value"], rows=rows)
+
+
+class TestRangeCache:
+    """Tests for execute_with_range_cache."""
+
+    @pytest.fixture(autouse=True)
+    def cache_dir(self, tmp_path, monkeypatch):
+        """Redirect the cache to a temporary directory."""
+        monkeypatch.setattr(query_cache, "CACHE_DIR", tmp_path / "cache")
+
+    def test_find_gaps_merges_consecutive_days(self):
+        """Verify missing days are grouped into contiguous ranges."""
+        days = [date(2026, 1, 1), date(2026, 1, 2), date(2026, 1, 5)]
+
+        assert find_gaps(days) == [
+            (date(2026, 1, 1), date(2026, 1, 2)),
+            (date(2026, 1, 5), date(2026, 1, 5)),
+        ]
+
+    def test_shifted_range_only_queries_new_days(self):
+        """Verify a range shifted by one day queries only the new day."""
+        kpi = DailyKPI()
+        params = {"start_date": date(2026, 1, 1), "end_date": date(2026, 1, 14)}
+        execute_with_range_cache(kpi, None, params, today=TODAY)
+
+        shifted = {"start_date": date(2026, 1, 2), "end_date": date(2026, 1, 15)}
+        result = execute_with_range_cache(kpi, None, shifted, today=TODAY)
+
+        assert kpi.calls[-1] == (date(2026, 1, 15), date(2026, 1, 15))
+        assert [r["date"] for r in result.rows][0] == "2026-01-02"
+        assert result.row_count == 14
+        assert result.from_cache is False
+
+    def test_full_hit_does_not_execute(self):
+        """Verify a fully cached range is served without running the KPI."""
+        kpi = DailyKPI()
+        params = {"start_date": date(2026, 1, 1), "end_date": date(2026, 1, 5)}
+        execute_with_range_cache(kpi, None, params, today=TODAY)
+
+        result = execute_with_range_cache(kpi, None, params, today=TODAY)
+
+        assert len(kpi.calls) == 1
+        assert result.from_cache is True
+        assert result.columns == ["date", "value"]
+
+    def test_open_day_is_never_cached(self):
+        """Verify today's bucket is re-queried on every run."""
+        kpi = DailyKPI()
+        params = {"start_date": TODAY - timedelta(days=1), "end_date": TODAY}
+        execute_with_range_cache(kpi, None, params, today=TODAY)
+
+        execute_with_range_cache(kpi, None, params, today=TODAY)
+
+        assert kpi.calls[-1] == (TODAY, TODAY)
+
+    def test_dimensions_are_cached_separately(self):
+        """Verify different non-range parameters do not share buckets."""
+        kpi = DailyKPI()
+        base = {"start_date": date(2026, 1, 1), "end_date": date(2026, 1, 3)}
+        execute_with_range_cache(kpi, None, {**base, "shop_id": "a"}, today=TODAY)
+
+        execute_with_range_cache(kpi, None, {**base, "shop_id": "b"}, today=TODAY)
+
+        assert len(kpi.calls) == 2
+
+    def test_failed_gap_is_not_cached(self, mock_engine):
+        """Verify errors are returned and leave the cache empty."""
+        kpi = OrdersByDateKPI()
+        mock_engine.connect.side_effect = Exception("Connection failed")
+        params = {"start_date": date(2026, 1, 1), "end_date": date(2026, 1, 3)}
+
+        result = execute_with_range_cache(kpi, mock_engine, params, today=TODAY)
+
+        assert result.success is False
+        assert result.parameters == params
+
+
+class TestOrdersByDateRange:
+    """Tests for the date range parameters of OrdersByDateKPI."""
+
+    def test_zero_fills_requested_range(self, mock_engine):
+        """Verify every day in the requested range is present."""
+        mock_conn = MagicMock()
+        mock_conn.execute.return_value.fetchall.return_value = [(date(2026, 1, 2), 5)]
+        mock_engine.connect.return_value.__enter__ = MagicMock(return_value=mock_conn)
+        mock_engine.connect.return_value.__exit__ = MagicMock(return_value=False)
+
+        result = OrdersByDateKPI().execute(
+            mock_engine, {"start_date": "2026-01-01", "end_date": "2026-01-03"}
+        )
+
+        assert result.rows == [
+            {"date": "2026-01-01", "orders_count": 0},
+            {"date": "2026-01-02", "orders_count": 5},
+            {"date": "2026-01-03", "orders_count": 0},
+        ]
+
+    def test_invalid_range_returns_error(self, mock_engine):
+        """Verify start_date after end_date returns a validation error."""
+        result = OrdersByDateKPI().execute(
+            mock_engine, {"start_date": "2026-01-05", "end_date": "2026-01-01"}
+        )
+
+        assert result.success is False
+        assert "date" in result.error.lower()
@@ -0,0 +1,181 @@
+"""Unit tests for read-replica routing with lag-aware fallback."""
+
+from typing import Any, Dict, List, Optional
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.config import reset_config
+from src.credentials import keychain
+from src.database import replica as replica_module
+from src.database.replica import ReplicaRouter, lag_from_status, replication_lag
+from src.kpis.base import BaseKPI, Parameter
+from src.models.result import KPIResult
+from src.runner.executor import KPIExecutor
+
+
+class DatabaseKPI(BaseKPI):
+    """KPI reporting which database it ran against."""
+
+    name = "Database"
+    description = "Test KPI"
+
+    def get_parameters(self) -> List[Parameter]:
+        return []
+
+    def execute(self, engine: Any, params: Dict[str, Any]) -> KPIResult:
+        return KPIResult(kpi_name=self.name, columns=["db"], rows=[{"db": engine.url.database}])
+
+
+class FreshDatabaseKPI(DatabaseKPI):
+    """KPI that tolerates at most ten seconds of replication lag."""
+
+    name = "Fresh Database"
+    max_replica_lag = 10.0
+
+
+class TestReplicaRouter:
+    """Tests for ReplicaRouter lag measurement."""
+
+    def test_lag_is_cached_for_check_interval(self, monkeypatch):
+        """Verify the replica is asked again only after check_interval."""
+        measurements = iter([4.0, 40.0])
+        monkeypatch.setattr(replica_module, "replication_lag", lambda engine: next(measurements))
+        now = [100.0]
+        router = ReplicaRouter(MagicMock(), check_interval=10.0, clock=lambda: now[0])
+
+        assert router.lag() == 4.0
+        now[0] = 105.0
+        assert router.lag() == 4.0
+        now[0] = 110.0
+        assert router.lag() == 40.0
+
+    def test_failed_check_means_unknown_lag(self, monkeypatch):
+        """Verify an unreachable replica reports unknown lag until re-checked."""
+        def fail(engine: Any) -> Optional[float]:
+            raise ConnectionError("replica down")
+
+        monkeypatch.setattr(replica_module, "replication_lag", fail)
+        router = ReplicaRouter(MagicMock())
+
+        assert router.lag() is None
+        monkeypatch.setattr(replica_module, "replication_lag", lambda engine: 0.0)
+        assert router.lag() is None
+        router.invalidate()
+        assert router.lag() == 0.0
+
+
+class TestLagFromStatus:
+    """Tests for computing the lag from a replica's status."""
+
+    def test_caught_up_streaming_replica_has_no_lag(self):
+        """Verify an idle but connected replica is fresh however old its last transaction."""
+        assert lag_from_status(True, True, "streaming", 5.0, 3600.0) == 0.0
+        assert lag_from_status(False, None, None, None, None) == 0.0
+
+    def test_disconnected_replica_reports_replay_age(self):
+        """Verify a replica that replayed all it received but lost its primary is stale."""
+        assert lag_from_status(True, True, None, None, 3600.0) == 3600.0
+        assert lag_from_status(True, True, "waiting", 2.0, 900.0) == 900.0
+        assert lag_from_status(True, True, "streaming", 300.0, 900.0) == 900.0
+        assert lag_from_status(True, None, None, None, None) is None
+
+    def test_replaying_replica_reports_replay_age(self):
+        """Verify a streaming replica behind on replay reports the age of its last replay."""
+        assert lag_from_status(True, False, "streaming", 1.0, 42.5) == 42.5
+
+    def test_replication_lag_reads_status_row(self):
+        """Verify replication_lag passes the status row to lag_from_status."""
+        engine = MagicMock()
+        conn = engine.connect.return_value.__enter__.return_value
+        conn.execute.return_value.one.return_value = (True, True, None, None, 120.0)
+
+        assert replication_lag(engine) == 120.0
+
+
+class TestExecutorReplicaRouting:
+    """Tests for KPIExecutor routing KPIs between replica and primary."""
+
+    @pytest.fixture
+    def executor(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("src.runner.executor.get_db_url", lambda: f"sqlite:///{tmp_path}/primary.db")
+        monkeypatch.setattr(
+            "src.runner.executor.get_replica_url", lambda profile: f"sqlite:///{tmp_path}/replica.db"
+        )
+        config = reset_config()
+        config.output_directory = tmp_path
+        config.use_replica = True
+        config.replica_max_lag = 60.0
+        executor = KPIExecutor(history=MagicMock())
+        yield executor
+        executor.close()
+        reset_config()
+
+    def run(self, executor: KPIExecutor, kpi: BaseKPI, lag: Optional[float], monkeypatch) -> KPIResult:
+        monkeypatch.setattr(replica_module, "replication_lag", lambda engine: lag)
+        executor.close()  # drop the cached lag of a previous run
+        return executor.run(kpi, {})
+
+    def test_routes_to_replica_within_tolerance(self, executor, tmp_path, monkeypatch):
+        """Verify a KPI runs on the replica when the lag is within the default tolerance."""
+        result = self.run(executor, DatabaseKPI(), 30.0, monkeypatch)
+
+        assert result.rows[0]["db"] == f"{tmp_path}/replica.db"
+        assert result.metadata["db_route"] == "replica"
+        assert result.metadata["replica_lag_seconds"] == 30.0
+
+    def test_falls_back_to_primary_past_kpi_tolerance(self, executor, tmp_path, monkeypatch):
+        """Verify a KPI with a tighter max_replica_lag falls back to the primary."""
+        assert self.run(executor, DatabaseKPI(), 30.0, monkeypatch).metadata["db_route"] == "replica"
+
+        result = self.run(executor, FreshDatabaseKPI(), 30.0, monkeypatch)
+
+        assert result.rows[0]["db"] == f"{tmp_path}/primary.db"
+        assert result.metadata["db_route"] == "primary"
+
+    def test_unknown_lag_uses_primary(self, executor, tmp_path, monkeypatch):
+        """Verify an unmeasurable lag is never treated as fresh."""
+        result = self.run(executor, DatabaseKPI(), None, monkeypatch)
+
+        assert result.rows[0]["db"] == f"{tmp_path}/primary.db"
+        assert result.metadata["db_route"] == "primary"
+
+    def test_routing_off_or_mirror_uses_primary(self, executor, tmp_path, monkeypatch):
+        """Verify no routing metadata is added when the replica does not apply."""
+        reset_config().use_replica = False
+        assert "db_route" not in self.run(executor, DatabaseKPI(), 0.0, monkeypatch).metadata
+
+        config = reset_config()
+        config.use_replica = True
+        config.mirror_url = f"sqlite:///{tmp_path}/mirror.db"
+        result = self.run(executor, DatabaseKPI(), 0.0, monkeypatch)
+
+        assert result.rows[0]["db"] == f"{tmp_path}/mirror.db"
+        assert "db_route" not in result.metadata
+
+
+class TestReplicaURL:
+    """Tests for storing replica URLs in the keychain."""
+
+    def test_replica_url_per_profile(self, monkeypatch):
+        """Verify replica URLs are stored per database and can be cleared."""
+        store: Dict[str, str] = {}
+        monkeypatch.setattr(keychain.keyring, "get_password", lambda service, key: store.get(key))
+        monkeypatch.setattr(
+            keychain.keyring, "set_password", lambda service, key, value: store.__setitem__(key, value)
+        )
+        monkeypatch.setattr(keychain.keyring, "delete_password", lambda service, key: store.pop(key, None))
+        monkeypatch.setattr(keychain, "_replica_url_cache", {})
+
+        keychain.set_replica_url("postgresql://replica/db ")
+        keychain.set_replica_url("postgresql://eu-replica/db", profile="eu")
+
+        assert keychain.get_replica_url() == "postgresql://replica/db"
+        assert keychain.get_replica_url("default") == "postgresql://replica/db"
+        assert store["replica_url:eu"] == "postgresql://eu-replica/db"
+        assert keychain.get_replica_url("us") is None
+
+        keychain.clear_replica_url()
+        assert keychain.get_replica_url() is None
+        with pytest.raises(ValueError):
+            keychain.set_replica_url(" ")
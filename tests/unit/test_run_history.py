@@ -0,0 +1,166 @@
+"""Unit tests for the run history store and duration-aware Run All."""
+
+import sqlite3
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import pytest
+
+from src.config import reset_config
+from src.kpis.base import BaseKPI, Parameter
+from src.models.result import KPIResult
+from src.runner.executor import KPIExecutor
+from src.runner.history import RunHistory, params_hash
+
+
+def make_result(name: str, duration: float, **kwargs: Any) -> KPIResult:
+    """Build a KPIResult with a given duration."""
+    return KPIResult(kpi_name=name, columns=[], rows=[], duration_seconds=duration, **kwargs)
+
+
+class NamedKPI(BaseKPI):
+    """Minimal KPI whose name is set per subclass."""
+
+    description = "Test KPI"
+    started: List[str] = []
+
+    def get_parameters(self) -> List[Parameter]:
+        return []
+
+    def execute(self, engine: Any, params: Dict[str, Any]) -> KPIResult:
+        NamedKPI.started.append(self.name)
+        return make_result(self.name, 0.01)
+
+
+class FastKPI(NamedKPI):
+    name = "Fast"
+
+
+class SlowKPI(NamedKPI):
+    name = "Slow"
+
+
+class TestRunHistory:
+    """Tests for RunHistory."""
+
+    @pytest.fixture
+    def history(self, tmp_path):
+        """Run history in a temporary directory."""
+        return RunHistory(tmp_path / "history.sqlite3")
+
+    def test_expected_duration_is_median_of_live_runs(self, history):
+        """Verify cached and failed runs are excluded from the baseline."""
+        for duration in (1.0, 2.0, 9.0):
+            history.record(make_result("A", duration), {})
+        history.record(make_result("A", 0.0, from_cache=True), {})
+        history.record(make_result("A", 50.0, error="boom"), {})
+
+        assert history.expected_duration("A") == 2.0
+        assert history.expected_duration("unknown") is None
+
+    def test_previews_are_marked_and_excluded(self, history):
+        """Verify sampled previews are recorded but kept out of baselines."""
+        for duration in (10.0, 10.0, 10.0):
+            history.record(make_result("A", duration), {})
+        preview = make_result("A", 0.5, approximate=True)
+        history.record(preview, {"preview": True})
+
+        assert history.expected_duration("A") == 10.0
+        assert history.check_regression(preview) is None
+        slow_preview = make_result("A", 40.0, approximate=True)
+        history.record(slow_preview, {"preview": True})
+        assert history.check_regression(slow_preview) is None
+
+    def test_history_without_approximate_column_is_migrated(self, tmp_path):
+        """Verify history files from before previews were marked still open."""
+        path = tmp_path / "old.sqlite3"
+        with sqlite3.connect(path) as conn:
+            conn.execute(
+                "CREATE TABLE kpi_runs (id INTEGER PRIMARY KEY AUTOINCREMENT, run_id TEXT, "
+                "kpi_name TEXT NOT NULL, params_hash TEXT NOT NULL, executed_at TEXT NOT NULL, "
+                "duration_seconds REAL NOT NULL, row_count INTEGER NOT NULL, "
+                "from_cache INTEGER NOT NULL, error TEXT)"
+            )
+            conn.execute(
+                "INSERT INTO kpi_runs (kpi_name, params_hash, executed_at, duration_seconds, "
+                "row_count, from_cache) VALUES ('A', 'x', '2026-01-01', 3.0, 1, 0)"
+            )
+        conn.close()
+
+        history = RunHistory(path)
+        history.record(make_result("A", 1.0, approximate=True), {})
+
+        assert history.expected_duration("A") == 3.0
+
+    def test_order_longest_first(self, history):
+        """Verify slow KPIs come first and unknown KPIs lead."""
+        history.record(make_result("Fast", 1.0), {})
+        history.record(make_result("Slow", 30.0), {})
+
+        ordered = history.order_longest_first([FastKPI(), SlowKPI(), NamedKPI()])
+
+        assert [k.name for k in ordered] == ["", "Slow", "Fast"]
+
+    def test_check_regression_flags_slow_run(self, history):
+        """Verify a run much slower than the rolling median is flagged."""
+        for _ in range(3):
+            history.record(make_result("A", 10.0), {})
+        slow = make_result("A", 30.0)
+        history.record(slow, {})
+
+        assert "baseline 10.0s" in history.check_regression(slow)
+
+    def test_check_regression_needs_baseline(self, history):
+        """Verify no regression is reported without enough history."""
+        history.record(make_result("A", 10.0), {})
+        slow = make_result("A", 30.0)
+        history.record(slow, {})
+
+        assert history.check_regression(slow) is None
+
+    def test_baseline_only_compares_same_parameters(self, history):
+        """Verify a longer date range is not compared with runs over short ones."""
+        week = {"start_date": "2026-01-01", "end_date": "2026-01-07"}
+        year = {"start_date": "2025-01-01", "end_date": "2025-12-31"}
+        for _ in range(3):
+            history.record(make_result("A", 10.0), week)
+        long_run = make_result("A", 60.0)
+        history.record(long_run, year)
+
+        assert history.check_regression(long_run, year) is None
+        assert history.expected_duration("A", year) == 60.0
+        assert history.expected_duration("A", week) == 10.0
+
+        slow_week = make_result("A", 30.0)
+        history.record(slow_week, week)
+        assert "baseline 10.0s" in history.check_regression(slow_week, week)
+
+    def test_params_hash_is_stable(self):
+        """Verify parameter order does not change the hash."""
+        assert params_hash({"a": 1, "b": None}) == params_hash({"b": None, "a": 1})
+
+
+class TestDurationAwareRunAll:
+    """Tests for execute_all scheduling and history recording."""
+
+    def test_slowest_kpi_starts_first_and_report_keeps_order(self, tmp_path, monkeypatch):
+        """Verify LPT scheduling while the report keeps discovery order."""
+        monkeypatch.setattr("src.runner.checkpoint.CHECKPOINT_DIR", tmp_path / "runs")
+        config = reset_config()
+        config.output_directory = tmp_path
+        history = RunHistory(tmp_path / "history.sqlite3")
+        history.record(make_result("Fast", 1.0), {})
+        history.record(make_result("Slow", 30.0), {})
+        NamedKPI.started = []
+
+        executor = KPIExecutor(history=history)
+        with patch("src.runner.executor.discover_kpis", return_value=[FastKPI, SlowKPI]), \
+                patch.object(executor, "_get_engine"), \
+                patch.object(executor, "_export_report"):
+            report = executor.execute_all()
+
+        assert NamedKPI.started == ["Slow", "Fast"]
+        assert [r.kpi_name for r in report.results] == ["Fast", "Slow"]
+        assert report.run_id is not None
+        assert len(history.recent_durations("Fast")) == 2
+        reset_config()
@@ -0,0 +1,169 @@
+"""Unit tests for sampled fast-preview runs."""
+
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.config import reset_config
+from src.kpis.first_time_right_exports import FirstTimeRightExportsKPI
+from src.kpis.orders_by_date import OrdersByDateKPI
+from src.kpis.sampling import (
+    count_estimate,
+    is_preview,
+    preview_params,
+    proportion_interval,
+    sample_settings,
+    tablesample_clause,
+)
+from src.runner.executor import KPIExecutor
+from src.service.server import ServiceError, coerce_parameters
+
+
+def engine_returning(mock_engine, rows):
+    """Make mock_engine's connection return rows from execute()."""
+    mock_conn = MagicMock()
+    mock_conn.execute.return_value = rows
+    mock_engine.connect.return_value.__enter__ = MagicMock(return_value=mock_conn)
+    mock_engine.connect.return_value.__exit__ = MagicMock(return_value=False)
+    return mock_conn
+
+
+class TestSamplingHelpers:
+    """Tests for the sampling helpers."""
+
+    def test_preview_params_round_trip(self):
+        """Verify preview params are added, normalized and read back."""
+        params = preview_params({"shop_id": "s"}, 5, "bernoulli")
+
+        assert is_preview(params)
+        assert not is_preview({"shop_id": "s"})
+        assert sample_settings(params) == (5.0, "BERNOULLI")
+        assert sample_settings({}) is None
+
+    @pytest.mark.parametrize("percent, method", [(0, "SYSTEM"), (150, "SYSTEM"), (1, "RANDOM")])
+    def test_invalid_samples_are_rejected(self, percent, method):
+        """Verify out-of-range percentages and unknown methods raise."""
+        with pytest.raises(ValueError):
+            preview_params({}, percent, method)
+
+    def test_tablesample_clause_binds_percent(self):
+        """Verify the percentage is a bind parameter and the method is checked."""
+        assert tablesample_clause("system") == "TABLESAMPLE SYSTEM (:sample_percent)"
+        with pytest.raises(ValueError):
+            tablesample_clause("SYSTEM; DROP TABLE x")
+
+    def test_count_estimate_scales_with_interval(self):
+        """Verify counts scale by 1/p and the interval brackets the estimate."""
+        estimate, low, high = count_estimate(100, 10.0)
+
+        assert estimate == 1000
+        assert 100 <= low < estimate < high
+        assert count_estimate(7, 100.0) == (7, 7, 7)
+
+    def test_count_estimate_zero_and_small_counts(self):
+        """Verify small sampled counts get an exact, non-degenerate upper bound."""
+        # Rule of three (two-sided 95%): about 3.7 / p rows for a count of 0
+        assert count_estimate(0, 10.0) == (0, 0, 35)
+        assert count_estimate(0, 1.0) == (0, 0, 367)
+        # Poisson 97.5% upper bound of a count of 3 is 8.77
+        estimate, low, high = count_estimate(3, 1.0)
+        assert (estimate, low) == (300, 3)
+        assert 860 <= high <= 880
+        assert count_estimate(0, 100.0) == (0, 0, 0)
+
+    def test_proportion_interval(self):
+        """Verify the Wilson interval contains the sample rate."""
+        rate, low, high = proportion_interval(80, 100)
+
+        assert rate == 80.0
+        assert low < 80.0 < high
+        assert proportion_interval(0, 0) == (0.0, 0.0, 0.0)
+
+
+class TestPreviewKPIs:
+    """Tests for preview execution of the sampled KPIs."""
+
+    def test_orders_preview_scales_daily_counts(self, mock_engine):
+        """Verify the order table is sampled and counts scaled up."""
+        mock_conn = MagicMock()
+        mock_conn.execute.return_value.fetchall.return_value = [(date(2026, 1, 1), 10)]
+        mock_engine.connect.return_value.__enter__ = MagicMock(return_value=mock_conn)
+        mock_engine.connect.return_value.__exit__ = MagicMock(return_value=False)
+        params = preview_params({"start_date": "2026-01-01", "end_date": "2026-01-02"}, 10)
+
+        result = OrdersByDateKPI().execute(mock_engine, params)
+
+        query, query_params = mock_conn.execute.call_args[0]
+        assert "TABLESAMPLE SYSTEM (:sample_percent)" in str(query)
+        assert query_params["sample_percent"] == 10.0
+        assert result.approximate
+        assert result.metadata["sample_method"] == "SYSTEM"
+        assert result.rows[0]["orders_count"] == 100
+        assert result.rows[0]["orders_count_low"] < 100 < result.rows[0]["orders_count_high"]
+        assert result.rows[1]["orders_count"] == 0
+
+    def test_orders_exact_run_is_not_approximate(self, mock_engine):
+        """Verify exact runs keep the original columns."""
+        mock_conn = MagicMock()
+        mock_conn.execute.return_value.fetchall.return_value = []
+        mock_engine.connect.return_value.__enter__ = MagicMock(return_value=mock_conn)
+        mock_engine.connect.return_value.__exit__ = MagicMock(return_value=False)
+
+        result = OrdersByDateKPI().execute(mock_engine, {})
+
+        assert not result.approximate
+        assert result.columns == ["date", "orders_count"]
+        assert "TABLESAMPLE" not in str(mock_conn.execute.call_args[0][0])
+
+    def test_ftr_preview_uses_sampled_grouped_query(self, mock_engine):
+        """Verify FTR previews skip introspection and report intervals."""
+        mock_conn = engine_returning(mock_engine, [("export_fulfillment_create", 50, 40)])
+        params = preview_params({}, 2, "BERNOULLI")
+
+        with patch(
+            "src.kpis.first_time_right_exports.first_time_right_exports.load_action_types",
+            return_value=["export_fulfillment_create"],
+        ), patch(
+            "src.kpis.first_time_right_exports.first_time_right_exports.list_indexes"
+        ) as list_indexes:
+            result = FirstTimeRightExportsKPI().execute(mock_engine, params)
+
+        list_indexes.assert_not_called()
+        assert "TABLESAMPLE BERNOULLI" in str(mock_conn.execute.call_args[0][0])
+        assert result.approximate
+        assert result.metadata["query_strategy"] == "sampled"
+        row = result.rows[0]
+        assert row["total_exports"] == 2500
+        assert row["successful_exports"] == 2000
+        assert row["success_rate"] == 80.0
+        assert row["success_rate_low"] < 80.0 < row["success_rate_high"]
+
+
+class TestPreviewPlumbing:
+    """Tests for preview handling outside the KPIs."""
+
+    def test_service_accepts_preview_params_for_supporting_kpis(self):
+        """Verify sample_percent is accepted only where previews are supported."""
+        params = coerce_parameters(OrdersByDateKPI(), {"sample_percent": "5"})
+
+        assert sample_settings(params) == (5.0, "SYSTEM")
+        with pytest.raises(ServiceError):
+            coerce_parameters(OrdersByDateKPI(), {"sample_percent": "500"})
+
+    def test_dev_mode_preview_bypasses_range_cache(self, mock_engine):
+        """Verify approximate day counts are never stored as exact cache buckets."""
+        config = reset_config()
+        config.dev_mode = True
+        engine_returning(mock_engine, MagicMock())
+        kpi = MagicMock(bucket_column="date")
+        kpi.name = "Orders by Date"
+
+        with patch("src.runner.executor.execute_with_range_cache") as range_cache, \
+                patch("src.runner.executor.load_from_cache", return_value=None), \
+                patch("src.runner.executor.save_to_cache"):
+            KPIExecutor()._execute_with_cache(kpi, mock_engine, preview_params({}, 1))
+
+        range_cache.assert_not_called()
+        kpi.execute.assert_called_once()
+        reset_config()
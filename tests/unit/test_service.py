@@ -0,0 +1,198 @@
+"""Unit tests for the long-running KPI service."""
+
+import json
+import threading
+import time
+from datetime import date
+from typing import Any, Dict, List
+from unittest.mock import MagicMock, patch
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from src.kpis.base import BaseKPI, Parameter, ParameterType
+from src.kpis.orders_by_date import OrdersByDateKPI
+from src.cache.query_cache import make_query_id
+from src.models.result import KPIResult
+from src.runner import executor as executor_module
+from src.runner.executor import KPIExecutor
+from src.service.server import KPIService, ServiceError, coerce_parameters, create_server
+
+
+class SlowKPI(BaseKPI):
+    """KPI that blocks until released, counting executions."""
+
+    name = "Slow KPI"
+    description = "Test KPI"
+    calls = 0
+    release = threading.Event()
+
+    def get_parameters(self) -> List[Parameter]:
+        return [
+            Parameter("limit", "Limit", ParameterType.INTEGER, False, 10, "Row limit"),
+            Parameter("shop_id", "Shop", ParameterType.STRING, False, None, "Shop filter"),
+        ]
+
+    def execute(self, engine: Any, params: Dict[str, Any]) -> KPIResult:
+        SlowKPI.calls += 1
+        SlowKPI.release.wait(timeout=5)
+        return KPIResult(kpi_name=self.name, columns=["limit"], rows=[{"limit": params["limit"]}])
+
+
+class FakeExecutor(KPIExecutor):
+    """Executor that runs KPIs without a database or run history."""
+
+    def __init__(self):
+        super().__init__(history=MagicMock())
+
+    def _get_engine(self) -> Any:
+        return None
+
+    def check_connection(self):
+        return None
+
+
+@pytest.fixture
+def service():
+    """Service with a single test KPI."""
+    SlowKPI.calls = 0
+    SlowKPI.release = threading.Event()
+    with patch("src.service.server.discover_kpis", return_value=[SlowKPI]):
+        yield KPIService(executor=FakeExecutor())
+    SlowKPI.release.set()
+
+
+class TestKPIService:
+    """Tests for KPIService."""
+
+    def test_coerce_parameters(self):
+        """Verify defaults are filled and types converted."""
+        assert coerce_parameters(SlowKPI(), {"limit": "5"}) == {"limit": 5, "shop_id": None}
+        with pytest.raises(ServiceError):
+            coerce_parameters(SlowKPI(), {"bogus": 1})
+
+    def test_coerce_parameters_validates_dates(self):
+        """Verify DATE parameters are parsed and malformed dates are a 400."""
+        kpi = OrdersByDateKPI()
+
+        values = coerce_parameters(kpi, {"start_date": "2026-01-05"})
+        with pytest.raises(ServiceError) as excinfo:
+            coerce_parameters(kpi, {"start_date": "2026-13-45"})
+
+        assert values["start_date"] == date(2026, 1, 5)
+        assert values["end_date"] is None
+        assert excinfo.value.status == 400
+
+    def test_identical_requests_are_coalesced(self, service):
+        """Verify concurrent identical requests share one execution of the executor."""
+        first = service.submit("Slow KPI", {"limit": 5})
+        second = service.submit("Slow KPI", {"limit": "5"})
+        flight_key = make_query_id("Slow KPI", {"limit": 5, "shop_id": None})
+        for _ in range(100):
+            if executor_module._flights.waiting(flight_key):
+                break
+            time.sleep(0.01)
+        SlowKPI.release.set()
+        first.done.wait(timeout=5)
+        second.done.wait(timeout=5)
+
+        assert first is not second
+        assert SlowKPI.calls == 1
+        assert first.result.rows == second.result.rows == [{"limit": 5}]
+        coalesced = [job.result.metadata.get("coalesced", False) for job in (first, second)]
+        assert sorted(coalesced) == [False, True]
+
+    def test_results_are_served_from_memory(self, service):
+        """Verify a finished result is reused within the TTL."""
+        SlowKPI.release.set()
+        service.submit("Slow KPI", {}).done.wait(timeout=5)
+
+        job = service.submit("Slow KPI", {})
+
+        assert job.from_memory
+        assert SlowKPI.calls == 1
+
+    def test_result_cache_is_bounded(self, service):
+        """Verify the least recently used result is evicted beyond max_results."""
+        SlowKPI.release.set()
+        service.max_results = 2
+        for limit in (1, 2):
+            service.submit("Slow KPI", {"limit": limit}).done.wait(timeout=5)
+        assert service.submit("Slow KPI", {"limit": 1}).from_memory
+
+        service.submit("Slow KPI", {"limit": 3}).done.wait(timeout=5)
+
+        assert service.submit("Slow KPI", {"limit": 1}).from_memory
+        evicted = service.submit("Slow KPI", {"limit": 2})
+        evicted.done.wait(timeout=5)
+        assert not evicted.from_memory
+        assert SlowKPI.calls == 4
+
+    def test_expired_results_are_evicted_on_insert(self, service):
+        """Verify storing a result drops entries older than the TTL."""
+        SlowKPI.release.set()
+        service.submit("Slow KPI", {"limit": 1}).done.wait(timeout=5)
+        service.result_ttl = 0.0
+        time.sleep(0.01)
+
+        service.submit("Slow KPI", {"limit": 2}).done.wait(timeout=5)
+
+        assert service.health()["cached_results"] == 1
+
+    def test_unknown_kpi(self, service):
+        """Verify unknown KPIs are reported as 404."""
+        with pytest.raises(ServiceError) as exc:
+            service.submit("Missing", {})
+        assert exc.value.status == 404
+
+
+class TestHTTPAPI:
+    """Tests for the HTTP endpoints."""
+
+    @pytest.fixture
+    def base_url(self, service):
+        """Serve the service on a free local port."""
+        server = create_server(service, port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+        server.shutdown()
+        server.server_close()
+
+    def request(self, url: str, body: Any = None) -> Dict[str, Any]:
+        """Send a request and decode the JSON response."""
+        data = json.dumps(body).encode() if body is not None else None
+        with urlopen(Request(url, data=data, method="POST" if data else "GET"), timeout=5) as r:
+            return json.loads(r.read())
+
+    def test_list_and_run(self, base_url):
+        """Verify listing KPIs and running one synchronously."""
+        SlowKPI.release.set()
+
+        kpis = self.request(f"{base_url}/kpis")["kpis"]
+        response = self.request(f"{base_url}/kpis/Slow%20KPI/run", {"limit": 3})
+
+        assert kpis[0]["name"] == "Slow KPI"
+        assert response["status"] == "done"
+        assert response["result"]["data"] == [{"limit": 3}]
+
+    def test_async_run_and_job_lookup(self, base_url):
+        """Verify ?async=1 returns a job that can be polled."""
+        job = self.request(f"{base_url}/kpis/Slow%20KPI/run?async=1", {})
+        assert job["status"] == "running"
+
+        SlowKPI.release.set()
+        for _ in range(50):
+            status = self.request(f"{base_url}/jobs/{job['job_id']}")
+            if status["status"] == "done":
+                break
+            threading.Event().wait(0.05)
+
+        assert status["result"]["success"]
+
+    def test_bad_parameters_return_400(self, base_url):
+        """Verify request errors are returned as JSON with a status code."""
+        with pytest.raises(HTTPError) as exc:
+            self.request(f"{base_url}/kpis/Slow%20KPI/run", {"limit": "many"})
+        assert exc.value.code == 400
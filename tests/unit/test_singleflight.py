@@ -0,0 +1,155 @@
+"""Unit tests for single-flight coalescing of KPI executions."""
+
+import threading
+import time
+from typing import Any, Dict, List
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.cache import make_query_id
+from src.config import reset_config
+from src.kpis.base import BaseKPI, Parameter
+from src.models.result import KPIResult
+from src.runner.executor import KPIExecutor, _flights
+from src.runner.singleflight import SingleFlight
+
+
+def wait_for(condition, timeout: float = 5.0) -> None:
+    """Poll until condition() is true."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Timed out waiting for condition")
+        time.sleep(0.01)
+
+
+class BlockingKPI(BaseKPI):
+    """KPI that blocks until released, counting executions."""
+
+    name = "Blocking"
+    description = "Test KPI"
+    calls = 0
+    release = threading.Event()
+
+    def get_parameters(self) -> List[Parameter]:
+        return []
+
+    def execute(self, engine: Any, params: Dict[str, Any]) -> KPIResult:
+        BlockingKPI.calls += 1
+        BlockingKPI.release.wait(timeout=5)
+        return KPIResult(kpi_name=self.name, columns=["n"], rows=[{"n": 1}], parameters=params)
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight."""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Verify waiters get the leader's result."""
+        flights: SingleFlight[int] = SingleFlight()
+        release = threading.Event()
+        calls: List[int] = []
+        outcomes: List[Any] = []
+
+        def work() -> int:
+            calls.append(1)
+            release.wait(timeout=5)
+            return 42
+
+        threads = [
+            threading.Thread(target=lambda: outcomes.append(flights.do("k", work)))
+            for _ in range(3)
+        ]
+        threads[0].start()
+        wait_for(lambda: flights.in_flight() == 1)
+        for thread in threads[1:]:
+            thread.start()
+        wait_for(lambda: flights.waiting("k") == 2)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert sorted(outcomes) == [(42, False), (42, True), (42, True)]
+        assert flights.in_flight() == 0
+
+    def test_errors_propagate_to_waiters(self):
+        """Verify a failing leader raises in waiting threads too."""
+        flights: SingleFlight[int] = SingleFlight()
+        release = threading.Event()
+        errors: List[BaseException] = []
+
+        def fail() -> int:
+            release.wait(timeout=5)
+            raise ValueError("boom")
+
+        def call() -> None:
+            try:
+                flights.do("k", fail)
+            except ValueError as e:
+                errors.append(e)
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        wait_for(lambda: flights.in_flight() == 1)
+        waiter = threading.Thread(target=call)
+        waiter.start()
+        wait_for(lambda: flights.waiting("k") == 1)
+        release.set()
+        leader.join()
+        waiter.join()
+
+        assert len(errors) == 2
+
+    def test_sequential_calls_are_not_cached(self):
+        """Verify a finished call is not reused."""
+        flights: SingleFlight[int] = SingleFlight()
+        assert flights.do("k", lambda: 1) == (1, False)
+        assert flights.do("k", lambda: 2) == (2, False)
+
+
+class TestExecutorCoalescing:
+    """Tests for coalescing in KPIExecutor._execute_with_cache."""
+
+    @pytest.fixture(autouse=True)
+    def reset(self):
+        """Reset test KPI state and config."""
+        BlockingKPI.calls = 0
+        BlockingKPI.release = threading.Event()
+        reset_config()
+        yield
+        BlockingKPI.release.set()
+
+    def test_identical_params_are_coalesced(self):
+        """Verify concurrent identical executions hit the database once."""
+        executors = [KPIExecutor(), KPIExecutor()]
+        results: List[KPIResult] = []
+
+        def run(executor: KPIExecutor, params: Dict[str, Any]) -> None:
+            results.append(executor._execute_with_cache(BlockingKPI(), MagicMock(), params))
+
+        leader = threading.Thread(target=run, args=(executors[0], {"a": 1, "b": 2}))
+        leader.start()
+        wait_for(lambda: BlockingKPI.calls == 1)
+        follower = threading.Thread(target=run, args=(executors[1], {"b": 2, "a": 1}))
+        follower.start()
+        key = make_query_id(BlockingKPI.name, {"a": 1, "b": 2})
+        wait_for(lambda: _flights.waiting(key) == 1)
+        BlockingKPI.release.set()
+        leader.join()
+        follower.join()
+
+        assert BlockingKPI.calls == 1
+        assert sorted(r.metadata.get("coalesced", False) for r in results) == [False, True]
+        # The follower's copy does not share metadata with the leader's result
+        assert results[0].metadata is not results[1].metadata
+
+    def test_different_params_run_separately(self):
+        """Verify different parameters are not coalesced."""
+        BlockingKPI.release.set()
+        executor = KPIExecutor()
+        executor._execute_with_cache(BlockingKPI(), MagicMock(), {"a": 1})
+        executor._execute_with_cache(BlockingKPI(), MagicMock(), {"a": 2})
+
+        assert BlockingKPI.calls == 2
+
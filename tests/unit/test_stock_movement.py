@@ -0,0 +1,110 @@
+"""Unit tests for the Stock Movement KPI."""
+
+from datetime import date
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.kpis.stock_movement import MAX_STOCKS_WITHOUT_SHOP, StockMovementKPI
+
+TODAY = date(2026, 3, 10)
+
+
+class TestStockMovementKPI:
+    """Tests for StockMovementKPI."""
+
+    @pytest.fixture
+    def kpi(self):
+        return StockMovementKPI()
+
+    def engine_with_results(self, mock_engine, *results):
+        """Return mock_engine whose queries yield results in order."""
+        mock_conn = MagicMock()
+        mock_conn.execute.side_effect = list(results)
+        mock_engine.connect.return_value.__enter__ = MagicMock(return_value=mock_conn)
+        mock_engine.connect.return_value.__exit__ = MagicMock(return_value=False)
+        return mock_conn
+
+    def test_history_curve_with_seed_and_carry_forward(self, kpi, mock_engine):
+        """Verify levels come from the rollup, seeded and carried forward."""
+        history = [
+            ("s1", "SKU-1", "wh-1", date(2026, 2, 20), 50),
+            ("s1", "SKU-1", "wh-1", date(2026, 3, 2), 40),
+            ("s1", "SKU-1", "wh-1", date(2026, 3, 4), 45),
+        ]
+        mock_conn = self.engine_with_results(mock_engine, history)
+
+        result = kpi.execute(
+            mock_engine, {"start_date": "2026-03-01", "end_date": "2026-03-04", "shop_id": "shop-1"},
+            today=TODAY,
+        )
+
+        assert result.success
+        assert [(r["date"], r["quantity"], r["change"]) for r in result.rows] == [
+            ("2026-03-01", 50, 0), ("2026-03-02", 40, -10),
+            ("2026-03-03", 40, 0), ("2026-03-04", 45, 5),
+        ]
+        assert mock_conn.execute.call_count == 1
+        query, query_params = mock_conn.execute.call_args[0]
+        assert "stock_update_rollup" in str(query)
+        assert "p.shop_id = :shop_id" in str(query)
+        assert query_params["end_date"] == date(2026, 3, 4)
+
+    def test_open_day_reads_stock_update(self, kpi, mock_engine):
+        """Verify today comes from stock_update on the partial index predicates."""
+        history = [("s1", "SKU-1", "wh-1", date(2026, 3, 9), 10)]
+        open_day = [("s1", "SKU-1", "wh-1", 7), ("s2", "SKU-2", "wh-1", 3)]
+        mock_conn = self.engine_with_results(mock_engine, history, open_day)
+
+        result = kpi.execute(
+            mock_engine, {"start_date": "2026-03-09", "end_date": "2026-03-10", "shop_id": "shop-1"},
+            today=TODAY,
+        )
+
+        history_call, open_day_call = mock_conn.execute.call_args_list
+        assert history_call[0][1]["end_date"] == date(2026, 3, 9)
+        open_sql = " ".join(str(open_day_call[0][0]).split())
+        assert "FROM stock_update su" in open_sql
+        assert "su.shop_id = :shop_id" in open_sql
+        assert "LIMIT" not in open_sql
+        assert "su.processing_state IN ('updated', 'unchanged') AND su.errors IS NULL" in open_sql
+        assert [(r["date"], r["sku"], r["quantity"], r["change"]) for r in result.rows] == [
+            ("2026-03-09", "SKU-1", 10, None),
+            ("2026-03-10", "SKU-1", 7, -3),
+            ("2026-03-10", "SKU-2", 3, None),
+        ]
+
+    def test_only_open_day_skips_rollup(self, kpi, mock_engine):
+        """Verify a range of just today does not query the rollup."""
+        mock_conn = self.engine_with_results(mock_engine, [])
+
+        result = kpi.execute(mock_engine, {"start_date": "2026-03-10", "sku": "SKU-1"}, today=TODAY)
+
+        query, query_params = mock_conn.execute.call_args[0]
+        assert "stock_update_rollup" not in str(query)
+        assert query_params["sku"] == "SKU-1"
+        assert result.rows == []
+
+    def test_without_shop_bounds_open_day_and_stocks(self, kpi, mock_engine):
+        """Verify the open day uses update_datetime and stocks are capped without a shop."""
+        mock_conn = self.engine_with_results(mock_engine, [], [])
+
+        result = kpi.execute(mock_engine, {"start_date": "2026-03-09"}, today=TODAY)
+
+        history_call, open_day_call = mock_conn.execute.call_args_list
+        open_sql = " ".join(str(open_day_call[0][0]).split())
+        assert "su.update_datetime >= :today" in open_sql
+        assert "su.shop_id" not in open_sql
+        for call in (history_call, open_day_call):
+            assert "LIMIT :stock_limit" in str(call[0][0])
+            assert call[0][1]["stock_limit"] == MAX_STOCKS_WITHOUT_SHOP
+        assert result.metadata["stock_limit"] == MAX_STOCKS_WITHOUT_SHOP
+
+    def test_invalid_range_and_errors(self, kpi, mock_engine):
+        """Verify validation and database errors are returned in the result."""
+        invalid = kpi.execute(mock_engine, {"start_date": "2026-03-07", "end_date": "2026-03-01"})
+        mock_engine.connect.side_effect = Exception("Connection failed")
+        failed = kpi.execute(mock_engine, {}, today=TODAY)
+
+        assert "Invalid date range" in invalid.error
+        assert "Connection failed" in failed.error
@@ -0,0 +1,182 @@
+"""Unit tests for Prometheus textfile metrics and OTLP JSON traces."""
+
+import json
+from typing import Any, Dict, List
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.config import reset_config
+from src.kpis.base import BaseKPI, Parameter
+from src.models.result import KPIResult
+from src.runner.executor import KPIExecutor
+from src.telemetry import (
+    METRICS_FILENAME,
+    TRACES_FILENAME,
+    Counter,
+    Histogram,
+    MetricsRegistry,
+    Tracer,
+)
+
+
+class CountKPI(BaseKPI):
+    """KPI running two statements."""
+
+    name = "Order Count"
+    description = "Test KPI"
+
+    def get_parameters(self) -> List[Parameter]:
+        return []
+
+    def execute(self, engine: Any, params: Dict[str, Any]) -> KPIResult:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            rows = [dict(row._mapping) for row in conn.execute(text("SELECT 3 AS orders"))]
+        return KPIResult(kpi_name=self.name, columns=["orders"], rows=rows, duration_seconds=0.2)
+
+
+@pytest.fixture
+def telemetry_dir(tmp_path):
+    """Enable telemetry into a temporary directory for one test."""
+    config = reset_config()
+    config.output_directory = tmp_path / "output"
+    config.telemetry_directory = tmp_path / "telemetry"
+    yield config.telemetry_directory
+    reset_config()
+
+
+def read_spans(path) -> List[Dict[str, Any]]:
+    """Return all spans of an OTLP JSON lines file."""
+    spans = []
+    for line in path.read_text().splitlines():
+        request = json.loads(line)
+        for resource in request["resourceSpans"]:
+            for scope in resource["scopeSpans"]:
+                spans.extend(scope["spans"])
+    return spans
+
+
+class TestMetrics:
+    """Tests for the text exposition format."""
+
+    def test_counter_and_histogram_rendering(self, tmp_path):
+        """Verify HELP/TYPE lines, labels and cumulative histogram buckets."""
+        registry = MetricsRegistry()
+        rows = registry.register(Counter("kpi_rows_total", "Rows.", ("kpi",)))
+        duration = registry.register(Histogram("kpi_seconds", "Time.", ("kpi",), (1.0, 5.0)))
+        rows.inc(3, kpi='Orders "EU"')
+        rows.inc(2, kpi='Orders "EU"')
+        duration.observe(0.5, kpi="a")
+        duration.observe(2.0, kpi="a")
+
+        path = tmp_path / "metrics.prom"
+        registry.write_textfile(path)
+
+        assert path.read_text().splitlines() == [
+            "# HELP kpi_rows_total Rows.",
+            "# TYPE kpi_rows_total counter",
+            'kpi_rows_total{kpi="Orders \\"EU\\""} 5',
+            "# HELP kpi_seconds Time.",
+            "# TYPE kpi_seconds histogram",
+            'kpi_seconds_bucket{kpi="a",le="1"} 1',
+            'kpi_seconds_bucket{kpi="a",le="5"} 2',
+            'kpi_seconds_bucket{kpi="a",le="+Inf"} 2',
+            'kpi_seconds_sum{kpi="a"} 2.5',
+            'kpi_seconds_count{kpi="a"} 2',
+        ]
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_counter_rejects_decrease(self):
+        """Verify counters cannot go down."""
+        with pytest.raises(ValueError):
+            Counter("c", "Counter.").inc(-1)
+
+
+class TestTracer:
+    """Tests for span nesting and the OTLP JSON encoding."""
+
+    def test_spans_nest_and_share_trace(self, tmp_path):
+        """Verify child spans reference their parent and the run's trace ID."""
+        tracer = Tracer()
+        with tracer.span("run", root=True) as run:
+            with tracer.span("kpi", kpi="Orders") as kpi:
+                query = tracer.start_span("query", rows=3)
+                tracer.end_span(query, "timeout")
+
+        assert tracer.write(tmp_path / "traces.jsonl") == 3
+        spans = {span["name"]: span for span in read_spans(tmp_path / "traces.jsonl")}
+        assert "parentSpanId" not in spans["run"]
+        assert spans["kpi"]["parentSpanId"] == run.span_id
+        assert spans["query"]["parentSpanId"] == kpi.span_id
+        assert {span["traceId"] for span in spans.values()} == {run.trace_id}
+        assert spans["query"]["status"] == {"code": 2, "message": "timeout"}
+        assert spans["query"]["attributes"] == [{"key": "rows", "value": {"intValue": "3"}}]
+        assert tracer.write(tmp_path / "traces.jsonl") == 0
+
+
+class TestExecutorTelemetry:
+    """Tests for KPIExecutor telemetry output."""
+
+    def test_single_run_writes_metrics_and_traces(self, telemetry_dir):
+        """Verify a run records KPI metrics and run, KPI, query and export spans."""
+        engine = create_engine("sqlite://")
+        executor = KPIExecutor(history=MagicMock())
+        executor._get_engine = lambda: engine
+
+        result = executor.execute_single(CountKPI(), {})
+
+        assert result.success
+        metrics = (telemetry_dir / METRICS_FILENAME).read_text()
+        assert (
+            'product_kpis_kpi_duration_seconds_bucket{kpi="Order Count",status="success",le="0.25"} 1'
+            in metrics
+        )
+        assert 'product_kpis_kpi_rows_sum{kpi="Order Count"} 1' in metrics
+        assert 'product_kpis_query_duration_seconds_count{kpi="Order Count"} 2' in metrics
+        assert 'product_kpis_db_wait_seconds_count{kpi="Order Count"} 1' in metrics
+        assert 'product_kpis_export_bytes_total{format="csv"}' in metrics
+
+        spans = read_spans(telemetry_dir / TRACES_FILENAME)
+        by_id = {span["spanId"]: span for span in spans}
+        parents = {
+            span["name"]: by_id[span["parentSpanId"]]["name"] if "parentSpanId" in span else None
+            for span in spans
+        }
+        assert parents == {
+            "query": "kpi Order Count",
+            "kpi Order Count": "run",
+            "export Order Count": "run",
+            "run": None,
+        }
+        assert len([span for span in spans if span["name"] == "query"]) == 2
+
+    def test_failed_kpi_counts_as_error(self, telemetry_dir, mock_engine):
+        """Verify a failing KPI is observed with status="error" and an error span."""
+        kpi = CountKPI()
+        kpi.execute = MagicMock(side_effect=RuntimeError("syntax error"))
+        executor = KPIExecutor(history=MagicMock())
+        executor._get_engine = lambda: mock_engine
+
+        result = executor.execute_single(kpi, {})
+
+        assert not result.success
+        metrics = (telemetry_dir / METRICS_FILENAME).read_text()
+        assert 'product_kpis_kpi_duration_seconds_count{kpi="Order Count",status="error"} 1' in metrics
+        spans = {span["name"]: span for span in read_spans(telemetry_dir / TRACES_FILENAME)}
+        assert spans["kpi Order Count"]["status"] == {"code": 2, "message": "syntax error"}
+
+    def test_telemetry_off_writes_nothing(self, tmp_path, mock_engine):
+        """Verify nothing is instrumented or written without a telemetry directory."""
+        config = reset_config()
+        config.output_directory = tmp_path
+        executor = KPIExecutor(history=MagicMock())
+        executor._get_engine = lambda: mock_engine
+        try:
+            executor.execute_single(CountKPI(), {})
+        finally:
+            reset_config()
+
+        assert not list(tmp_path.glob("*.prom"))
+        assert not list(tmp_path.glob("traces.jsonl"))
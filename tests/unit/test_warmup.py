@@ -0,0 +1,116 @@
+"""Unit tests for background warm-up and KPI prefetch."""
+
+from typing import Any, Dict, List
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.config import reset_config
+from src.kpis.base import BaseKPI, Parameter
+from src.models.result import KPIResult
+from src.runner.executor import KPIExecutor
+from src.runner.history import RunHistory
+from src.runner.warmup import BackgroundWarmup
+
+
+class CountingKPI(BaseKPI):
+    """KPI that counts its executions."""
+
+    name = "Counting"
+    description = "Test KPI"
+    calls = 0
+
+    def get_parameters(self) -> List[Parameter]:
+        return []
+
+    def execute(self, engine: Any, params: Dict[str, Any]) -> KPIResult:
+        CountingKPI.calls += 1
+        return KPIResult(kpi_name=self.name, columns=["n"], rows=[{"n": CountingKPI.calls}])
+
+
+@pytest.fixture
+def executor(tmp_path):
+    """Executor with a temporary run history and a mocked engine."""
+    reset_config()
+    CountingKPI.calls = 0
+    executor = KPIExecutor(history=RunHistory(tmp_path / "history.sqlite3"))
+    with patch.object(executor, "_get_engine", return_value=MagicMock()):
+        yield executor
+
+
+class TestPrefetch:
+    """Tests for KPIExecutor prefetching."""
+
+    def test_prefetched_result_is_used_once(self, executor):
+        """Verify the first run gets the prefetched result and later runs are live."""
+        assert executor.prefetch(CountingKPI())
+
+        engine = executor._get_engine()
+        first = executor._execute_with_cache(CountingKPI(), engine, {})
+        second = executor._execute_with_cache(CountingKPI(), engine, {})
+
+        assert first.metadata["prefetched"] is True
+        assert first.rows == [{"n": 1}]
+        assert "prefetched" not in second.metadata
+        assert CountingKPI.calls == 2
+
+    def test_prefetch_is_keyed_on_params(self, executor):
+        """Verify a run with other parameters does not use the prefetched result."""
+        executor.prefetch(CountingKPI())
+
+        engine = executor._get_engine()
+        result = executor._execute_with_cache(CountingKPI(), engine, {"shop_id": "x"})
+
+        assert "prefetched" not in result.metadata
+
+    def test_prefetch_is_keyed_on_database(self, executor):
+        """Verify a run against another database (e.g. a mirror) is not served the prefetch."""
+        executor.prefetch(CountingKPI())
+        mirror = MagicMock()
+        mirror.url = "postgresql://localhost/kpis_mirror"
+
+        other = executor._execute_with_cache(CountingKPI(), mirror, {})
+        same = executor._execute_with_cache(CountingKPI(), executor._get_engine(), {})
+
+        assert "prefetched" not in other.metadata
+        assert other.rows == [{"n": 2}]
+        assert same.metadata["prefetched"] is True
+
+    def test_most_frequent_kpis_are_prefetched(self, executor):
+        """Verify prefetch_frequent picks KPIs from the run history."""
+        history = executor._get_history()
+        for name in ("Counting", "Counting", "Other"):
+            history.record(KPIResult(kpi_name=name, columns=[], rows=[]), {})
+
+        assert history.most_frequent(2) == ["Counting", "Other"]
+        assert executor.prefetch_frequent([CountingKPI], 1) == ["Counting"]
+
+
+class TestBackgroundWarmup:
+    """Tests for BackgroundWarmup."""
+
+    def test_warmup_connects_and_prefetches(self, executor):
+        """Verify warm-up reaches ready and prefetches frequent KPIs."""
+        executor._get_history().record(KPIResult(kpi_name="Counting", columns=[], rows=[]), {})
+
+        warmup = BackgroundWarmup(executor, prefetch_count=1)
+        with patch("src.runner.warmup.discover_kpis", return_value=[CountingKPI]):
+            warmup.start()
+            assert warmup.wait(timeout=5)
+
+        assert warmup.status == "ready"
+        assert warmup.prefetched == ["Counting"]
+
+    def test_connection_failure_is_reported(self):
+        """Verify connection errors are kept instead of raised."""
+        executor = MagicMock()
+        executor.check_connection.return_value = "could not connect to server"
+
+        warmup = BackgroundWarmup(executor, prefetch_count=3)
+        with patch("src.runner.warmup.discover_kpis", return_value=[]):
+            warmup.start()
+            warmup.wait(timeout=5)
+
+        assert warmup.status == "connection failed"
+        assert warmup.error == "could not connect to server"
+        executor.prefetch_frequent.assert_not_called()